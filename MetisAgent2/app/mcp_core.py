@@ -4,7 +4,9 @@ MCP Core - Base classes and utilities for MCP tools
 
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Iterable
 from abc import ABC, abstractmethod
 from datetime import datetime
 
@@ -119,18 +121,121 @@ class MCPTool(ABC):
         except Exception as e:
             return MCPToolResult(success=False, error=str(e))
 
+def _freeze(value: Any) -> Any:
+    """Read-only copy of tool info: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Plain, mutable copy of a frozen catalog entry"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ToolCatalog:
+    """Immutable snapshot of the registry, tagged with the generation it was built from
+
+    Views are computed once per snapshot; consumers cache derived data on
+    `generation` instead of re-reading every tool on each request. Entries are
+    frozen so no consumer can change the snapshot others read; use `thaw` for a
+    mutable copy.
+    """
+
+    def __init__(self, generation: int, tools: Iterable[Dict], user_tools: Dict[str, frozenset] = None):
+        self.generation = generation
+        self.tools = tuple(_freeze(tool) for tool in tools)
+        self.by_name = MappingProxyType({tool['name']: tool for tool in self.tools})
+        self.enabled = tuple(tool for tool in self.tools if tool.get('is_enabled', True))
+        self._user_tools = MappingProxyType(dict(user_tools or {}))
+        self._user_views: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+        # Prompt/routing views
+        self.summaries = tuple(
+            MappingProxyType({
+                'name': tool['name'],
+                'description': tool.get('description', ''),
+                'actions': tuple(tool.get('actions', {}).keys())
+            })
+            for tool in self.enabled
+        )
+        self.description_json = json.dumps(
+            {summary['name']: {'description': summary['description'], 'actions': list(summary['actions'])}
+             for summary in self.summaries},
+            indent=2
+        )
+        action_index: Dict[str, List[str]] = {}
+        for summary in self.summaries:
+            for action_name in summary['actions']:
+                action_index.setdefault(action_name, []).append(summary['name'])
+        self.action_index = MappingProxyType({action: tuple(names) for action, names in action_index.items()})
+
+    def tools_for_action(self, action_name: str) -> tuple:
+        """Names of enabled tools that expose the given action"""
+        return self.action_index.get(action_name, ())
+
+    def for_user(self, user_id: str = None) -> tuple:
+        """Enabled tool summaries visible to a user (all enabled tools without an allowlist)"""
+        allowed = self._user_tools.get(user_id) if user_id else None
+        if allowed is None:
+            return self.summaries
+        with self._lock:
+            view = self._user_views.get(user_id)
+            if view is None:
+                view = tuple(summary for summary in self.summaries if summary['name'] in allowed)
+                self._user_views[user_id] = view
+            return view
+
+
 class MCPToolRegistry:
     """Registry for managing MCP tools"""
     
     def __init__(self):
         self.tools: Dict[str, MCPTool] = {}
         self.tool_configs = {}
+        self.user_tools: Dict[str, frozenset] = {}
+        self.generation = 0
+        self._catalog: Optional[ToolCatalog] = None
+        self._catalog_lock = threading.Lock()
         
+    def _bump_generation(self):
+        with self._catalog_lock:
+            self.generation += 1
+            self._catalog = None
+
+    def invalidate_catalog(self):
+        """Force a catalog rebuild, e.g. after a tool registered actions post-registration"""
+        self._bump_generation()
+
+    def catalog(self) -> ToolCatalog:
+        """Current catalog snapshot; rebuilt only after the registry changed"""
+        catalog = self._catalog
+        if catalog is not None:
+            return catalog
+        with self._catalog_lock:
+            if self._catalog is None:
+                infos = []
+                for tool_name, tool in list(self.tools.items()):
+                    try:
+                        infos.append(tool.get_info())
+                    except Exception as e:
+                        logger.error(f"Failed to read info for tool '{tool_name}': {str(e)}")
+                self._catalog = ToolCatalog(self.generation, infos, self.user_tools)
+            return self._catalog
+
     def register_tool(self, tool: MCPTool) -> bool:
         """Register a tool in the registry"""
         try:
             self.tools[tool.name] = tool
             self.tool_configs[tool.name] = tool.get_info()
+            self._bump_generation()
             logger.info(f"Tool '{tool.name}' registered successfully")
             return True
         except Exception as e:
@@ -142,21 +247,42 @@ class MCPToolRegistry:
         try:
             if tool_name in self.tools:
                 del self.tools[tool_name]
-                del self.tool_configs[tool_name]
+                self.tool_configs.pop(tool_name, None)
+                self._bump_generation()
                 logger.info(f"Tool '{tool_name}' unregistered successfully")
                 return True
             return False
         except Exception as e:
             logger.error(f"Failed to unregister tool '{tool_name}': {str(e)}")
             return False
-    
+
+    def set_tool_enabled(self, tool_name: str, enabled: bool) -> bool:
+        """Enable or disable a registered tool"""
+        tool = self.tools.get(tool_name)
+        if not tool:
+            return False
+        if tool.is_enabled != enabled:
+            tool.is_enabled = enabled
+            self._bump_generation()
+            logger.info(f"Tool '{tool_name}' {'enabled' if enabled else 'disabled'}")
+        return True
+
+    def set_user_tools(self, user_id: str, tool_names: Optional[Iterable[str]]):
+        """Restrict the tools a user sees in catalog views; None removes the restriction"""
+        with self._catalog_lock:
+            if tool_names is None:
+                self.user_tools.pop(user_id, None)
+            else:
+                self.user_tools[user_id] = frozenset(tool_names)
+        self._bump_generation()
+
     def get_tool(self, tool_name: str) -> Optional[MCPTool]:
         """Get a tool by name"""
         return self.tools.get(tool_name)
     
     def list_tools(self) -> List[Dict]:
         """List all registered tools"""
-        return [tool.get_info() for tool in self.tools.values()]
+        return [thaw(tool) for tool in self.catalog().tools]
     
     def execute_tool_action(self, tool_name: str, action_name: str, **kwargs) -> MCPToolResult:
         """Execute an action on a specific tool"""
@@ -213,6 +339,7 @@ def _register_internal_tools():
         
         # Register todo tool as internal tool
         registry.tools['todo_tool'] = get_todo_tool()
+        registry.invalidate_catalog()
         registry.tool_configs['todo_tool'] = {
             'name': 'todo_tool',
             'description': 'Internal todo list management with workflow integration',
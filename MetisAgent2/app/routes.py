@@ -2,7 +2,7 @@
 Flask routes for MetisAgent2 API
 """
 
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify, send_from_directory, send_file
 from functools import wraps
 import logging
 from typing import Optional, List, Dict, Any
@@ -11,6 +11,7 @@ from .tool_coordinator import coordinator
 from .session_manager import session_manager
 from .auth_manager import auth_manager
 from .workflow_orchestrator import orchestrator
+from tools.external.browser_pool import lease_scope
 from datetime import datetime
 import sys
 import os
@@ -110,6 +111,7 @@ def get_tool_info(tool_name):
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/tools/<tool_name>/execute', methods=['POST'])
+@optional_auth
 def execute_tool_action(tool_name):
     """Execute an action on a specific tool"""
     try:
@@ -123,7 +125,13 @@ def execute_tool_action(tool_name):
         
         params = data.get('params', {})
         
-        result = registry.execute_tool_action(tool_name, action, **params)
+        # Separate requests (start_browser, navigate, close_browser) run on arbitrary
+        # worker threads: lease browser sessions per caller, not per thread
+        current_user = getattr(request, 'current_user', None)
+        lease_owner = (current_user or {}).get('user_id') or data.get('user_id') or data.get('session_id') or 'anonymous'
+        
+        with lease_scope(f"rest:{lease_owner}"):
+            result = registry.execute_tool_action(tool_name, action, **params)
         
         return jsonify(result.to_dict())
         
@@ -341,19 +349,26 @@ def chat():
                             logger.debug(f"🔍 ROUTES DEBUG - Has base64_image: {bool(step_data.get('base64_image'))}")
                             logger.info(f"🔍 ROUTES DEBUG - Has display_ready: {bool(step_data.get('display_ready'))}")
                             
-                            if step_data.get('base64_image'):  # Remove display_ready requirement for debugging
+                            if step_data.get('base64_image') or step_data.get('image_handle'):  # Remove display_ready requirement for debugging
                                 # Found step with image data
                                 final_data = step_data
                                 image_found = True
                                 logger.info(f"🎯 ROUTES IMAGE FIX - Found image in step: {step.title}")
                                 break
                 
-                if image_found and (final_data.get('saved_path') or final_data.get('base64_image')):
+                if image_found and (final_data.get('saved_path') or final_data.get('base64_image') or final_data.get('image_handle')):
                             # **EFFICIENT FIX**: Use file serving instead of base64 transfer
                             saved_path = final_data.get('saved_path')
                             filename = final_data.get('local_filename') or final_data.get('filename')
                             
-                            if saved_path and filename:
+                            if final_data.get('image_handle'):
+                                # Content-addressed handle from the image catalog
+                                response_data['image_url'] = final_data.get('catalog_url') or f"/api/images/{final_data['image_handle']}"
+                                response_data['image_handle'] = final_data['image_handle']
+                                response_data['thumbnail_url'] = final_data.get('thumbnail_url')
+                                response_data['saved_path'] = saved_path
+                                logger.info(f"🔗 EFFICIENT IMAGE - Using handle URL: {response_data['image_url']}")
+                            elif saved_path and filename:
                                 # Create URL for static file serving (API prefixed)
                                 image_url = f"/api/generated_images/{filename}"
                                 response_data['image_url'] = image_url
@@ -438,7 +453,8 @@ def chat():
                             
                     # Explicit image object for frontend compatibility
                     response_data['image_data'] = {
-                        'base64': final_data['base64_image'],
+                        'base64': final_data.get('base64_image'),
+                        'url': response_data.get('image_url'),
                         'filename': final_data.get('filename'),
                         'format': final_data.get('format', 'PNG'),
                         'size': final_data.get('file_size'),
@@ -778,7 +794,9 @@ def clear_all_conversations():
     try:
         # Get LLM tool and clear all conversations
         llm_tool = registry.get_tool('llm_tool')
-        if llm_tool and hasattr(llm_tool, 'conversations'):
+        if llm_tool and hasattr(llm_tool, 'clear_all_conversations'):
+            llm_tool.clear_all_conversations()
+        elif llm_tool and hasattr(llm_tool, 'conversations'):
             llm_tool.conversations.clear()
         
         return jsonify({
@@ -897,10 +915,19 @@ def get_stats():
         
         # Get LLM tool stats
         llm_tool = registry.get_tool('llm_tool')
-        conversation_stats = {
-            'total_conversations': len(llm_tool.conversations) if llm_tool else 0,
-            'total_users_with_conversations': len(llm_tool.user_conversations) if llm_tool else 0
-        }
+        if llm_tool and hasattr(llm_tool, 'conversation_log'):
+            log_stats = llm_tool.conversation_log.stats()
+            conversation_stats = {
+                'total_conversations': log_stats['conversations'],
+                'total_users_with_conversations': log_stats['users'],
+                'total_messages': log_stats['messages'],
+                'hot_conversations': len(llm_tool.conversations)
+            }
+        else:
+            conversation_stats = {
+                'total_conversations': len(llm_tool.conversations) if llm_tool else 0,
+                'total_users_with_conversations': len(llm_tool.user_conversations) if llm_tool else 0
+            }
         
         return jsonify({
             'success': True,
@@ -1011,6 +1038,41 @@ def serve_generated_image(filename):
         logger.error(f"Error serving image {filename}: {str(e)}")
         return jsonify({'error': 'Image not found'}), 404
 
+@api_bp.route('/images/<handle>')
+def serve_catalog_image(handle):
+    """Serve an image by its content handle (image catalog)"""
+    try:
+        from tools.internal.image_catalog import get_image_catalog
+        generated_images_path = os.path.join(os.getcwd(), "generated_images")
+        catalog = get_image_catalog(os.path.join(generated_images_path, ".catalog"))
+        record = catalog.resolve(handle, root=generated_images_path)  # Never serve folder_path scans
+        if not record:
+            return jsonify({'error': 'Image not found'}), 404
+        response = send_file(record['filepath'], conditional=True)
+        response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'  # Content-addressed
+        return response
+    except Exception as e:
+        logger.error(f"Error serving image {handle}: {str(e)}")
+        return jsonify({'error': 'Image not found'}), 404
+
+@api_bp.route('/images/<handle>/thumbnail')
+def serve_catalog_thumbnail(handle):
+    """Serve a cached thumbnail; falls back to the full image when Pillow is missing"""
+    try:
+        from tools.internal.image_catalog import get_image_catalog, THUMBNAIL_SIZE
+        generated_images_path = os.path.join(os.getcwd(), "generated_images")
+        catalog = get_image_catalog(os.path.join(generated_images_path, ".catalog"))
+        size = min(max(request.args.get('size', THUMBNAIL_SIZE, type=int), 16), 1024)
+        thumbnail_path = catalog.thumbnail(handle, size, root=generated_images_path)
+        if not thumbnail_path:
+            return serve_catalog_image(handle)
+        response = send_file(thumbnail_path, mimetype='image/png', conditional=True)
+        response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
+    except Exception as e:
+        logger.error(f"Error serving thumbnail {handle}: {str(e)}")
+        return jsonify({'error': 'Image not found'}), 404
+
 @api_bp.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
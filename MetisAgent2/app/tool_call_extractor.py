@@ -0,0 +1,222 @@
+"""
+Tool Call Extractor - Single-pass, incremental scanner for tool_calls JSON in LLM output
+
+The scanner walks the text once, tracking brace depth and JSON string/escape
+state, and accepts chunks as the LLM streams them. An object is parsed with
+json.loads only when it has a "tool_calls" key at its own level, so prose,
+code and unrelated JSON never reach the parser. Matching objects are emitted
+as soon as their outermost enclosing brace closes.
+"""
+
+import bisect
+import json
+import re
+from typing import Dict, List, Optional
+
+TOOL_CALLS_KEY = "tool_calls"
+
+# Next character that changes state, by scanner mode
+_OUTSIDE_RE = re.compile(r'[{}"\n]')
+_IN_STRING_RE = re.compile(r'["\\\n]')
+_NON_SPACE_RE = re.compile(r'\S')
+
+
+class _OpenObject:
+    __slots__ = ("start", "has_key", "deferred")
+
+    def __init__(self, start: int):
+        self.start = start          # Absolute offset of '{'
+        self.has_key = False        # "tool_calls": seen at this object's own level
+        self.deferred = []          # Closed, keyed descendants: (start, end) spans
+
+
+class ToolCallExtractor:
+    """Incremental extractor that yields tool_calls objects in O(n) over the stream
+
+    Prose outside braces is skipped with a C-level search for '{'. Inside an
+    object, string literals are honoured (braces in strings do not count);
+    a raw newline inside a string ends it, since JSON strings cannot contain
+    one, so a stray quote cannot swallow the rest of the response.
+
+    A keyed object nested in another object is held until the outermost object
+    closes, because the enclosing object's own "tool_calls" key may come after
+    it. Candidates are then tried outermost first; an accepted object hides
+    the candidates inside it, so the outer keyed object wins and inner ones are
+    only used if it fails to parse.
+    """
+
+    def __init__(self):
+        # Retained chunks and their absolute start offsets; chunks are never
+        # concatenated while scanning, so long-open objects do not cost O(n) per feed
+        self._chunks: List[str] = []
+        self._chunk_starts: List[int] = []
+        self._length = 0        # Total characters fed so far
+        self._pos = 0           # Absolute scan position
+        self._stack: List[_OpenObject] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._pending_key = False   # A "tool_calls" string just closed; waiting for ':'
+        self.emitted: List[Dict] = []
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume the next chunk; returns tool_calls objects completed by it"""
+        if not chunk:
+            return []
+        self._chunks.append(chunk)
+        self._chunk_starts.append(self._length)
+        self._length += len(chunk)
+        found = self._scan(chunk, self._length - len(chunk))
+        self._compact()
+        return found
+
+    def finish(self) -> List[Dict]:
+        """End of stream: try keyed objects whose enclosing braces never closed"""
+        found = []
+        for obj in self._stack:
+            found.extend(self._try_spans(obj.deferred))
+        self._stack = []
+        self._compact()
+        return found
+
+    @classmethod
+    def extract_all(cls, text: str) -> List[Dict]:
+        """Convenience wrapper for complete responses"""
+        extractor = cls()
+        return extractor.feed(text) + extractor.finish()
+
+    # --- Scanning ------------------------------------------------------
+
+    def _text(self, start: int, end: int) -> str:
+        """Absolute [start, end) slice across retained chunks"""
+        first = bisect.bisect_right(self._chunk_starts, start) - 1
+        parts = []
+        for index in range(first, len(self._chunks)):
+            chunk_start = self._chunk_starts[index]
+            if chunk_start >= end:
+                break
+            parts.append(self._chunks[index][max(start - chunk_start, 0):end - chunk_start])
+        return "".join(parts)
+
+    def _scan(self, buffer: str, base: int) -> List[Dict]:
+        found = []
+        end = base + len(buffer)
+        pos = self._pos
+
+        while pos < end:
+            local = pos - base
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _IN_STRING_RE.search(buffer, local)
+                if not match:
+                    pos = end
+                    break
+                char = match.group()
+                pos = base + match.start() + 1
+                if char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if pos - self._string_start == len(TOOL_CALLS_KEY) + 2 and \
+                            self._text(self._string_start + 1, pos - 1) == TOOL_CALLS_KEY:
+                        self._pending_key = True
+                else:  # newline: not valid inside a JSON string, recover
+                    self._in_string = False
+                continue
+
+            if not self._stack:
+                brace = buffer.find('{', local)
+                if brace == -1:
+                    pos = end
+                    break
+                self._stack.append(_OpenObject(base + brace))
+                pos = base + brace + 1
+                continue
+
+            if self._pending_key:
+                match = _NON_SPACE_RE.search(buffer, local)
+                if not match:
+                    pos = end
+                    break
+                self._pending_key = False
+                if match.group() == ':':
+                    self._stack[-1].has_key = True
+                    pos = base + match.start() + 1
+                    continue
+                pos = base + match.start()
+                local = match.start()
+
+            match = _OUTSIDE_RE.search(buffer, local)
+            if not match:
+                pos = end
+                break
+            char = match.group()
+            pos = base + match.start() + 1
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos - 1
+            elif char == '{':
+                self._stack.append(_OpenObject(pos - 1))
+            elif char == '}':
+                found.extend(self._close(pos))
+
+        self._pos = pos
+        return found
+
+    def _close(self, end: int) -> List[Dict]:
+        obj = self._stack.pop()
+        if self._stack:
+            # An enclosing object may still turn out to be keyed; decide when it closes
+            parent = self._stack[-1]
+            if obj.has_key:
+                parent.deferred.append((obj.start, end))
+            parent.deferred.extend(obj.deferred)
+            return []
+
+        if obj.has_key:
+            parsed = self._parse(obj.start, end)
+            if parsed is not None:
+                return [parsed]
+
+        # The outermost object did not yield a result: its keyed descendants get a chance
+        return self._try_spans(obj.deferred)
+
+    def _try_spans(self, spans) -> List[Dict]:
+        """Parse candidate spans in start order, skipping spans inside an accepted one"""
+        found = []
+        accepted_end = -1
+        for start, end in sorted(spans):
+            if start < accepted_end:
+                continue
+            parsed = self._parse(start, end)
+            if parsed is not None:
+                found.append(parsed)
+                accepted_end = end
+        return found
+
+    def _parse(self, start: int, end: int) -> Optional[Dict]:
+        try:
+            parsed = json.loads(self._text(start, end))
+        except (json.JSONDecodeError, ValueError):
+            return None
+        if isinstance(parsed, dict) and TOOL_CALLS_KEY in parsed:
+            self.emitted.append(parsed)
+            return parsed
+        return None
+
+    def _compact(self):
+        """Drop text that no open object can refer to any more"""
+        keep_from = self._stack[0].start if self._stack else self._pos
+        if self._in_string:
+            keep_from = min(keep_from, self._string_start)
+        drop = 0
+        while drop < len(self._chunks) and \
+                self._chunk_starts[drop] + len(self._chunks[drop]) <= keep_from:
+            drop += 1
+        if drop:
+            del self._chunks[:drop]
+            del self._chunk_starts[:drop]
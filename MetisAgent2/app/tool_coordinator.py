@@ -6,10 +6,13 @@ import json
 import logging
 import re
 import time
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from .mcp_core import registry, MCPToolResult
 from .workflow_orchestrator import orchestrator, WorkflowStatus
+from .tool_call_extractor import ToolCallExtractor
+from tools.external.browser_pool import lease_scope
 from config.llm_tool_router import LLMToolRouter
 
 logger = logging.getLogger(__name__)
@@ -68,8 +71,8 @@ class ToolCoordinator:
         self.tool_capability_manager = None  # Will be injected
         logger.info("Tool Coordinator initialized with LLM-based routing (CLAUDE.md compliant)")
         
-        # Tool relevance cache
-        self.tool_relevance_cache = {}
+        # Tool relevance cache, keyed on (catalog generation, user input)
+        self.tool_relevance_cache = OrderedDict()
     
     def initialize_llm_router(self, llm_tool, tool_capability_manager):
         """Initialize LLM-based tool router after dependencies are ready"""
@@ -96,9 +99,10 @@ class ToolCoordinator:
             if tool_response and 'tool_calls' in tool_response:
                 # Execute tool calls
                 tool_results = []
-                for tool_call in tool_response['tool_calls']:
-                    result = self._execute_tool_call(tool_call, user_id=user_id)
-                    tool_results.append(result)
+                with lease_scope(conversation_id):
+                    for tool_call in tool_response['tool_calls']:
+                        result = self._execute_tool_call(tool_call, user_id=user_id)
+                        tool_results.append(result)
                 
                 # Add tool results to conversation for next interaction
                 self._add_tool_results_to_conversation(conversation_id, tool_results)
@@ -152,7 +156,7 @@ class ToolCoordinator:
                             if result['data'] and result['data'].get('stderr'):
                                 results_summary += f"Command {i+1} error:\n{result['data']['stderr']}\n"
                             # Handle image generation results without including base64
-                            if result['data'] and result['data'].get('base64_image'):
+                            if result['data'] and (result['data'].get('base64_image') or result['data'].get('image_handle')):
                                 filename = result['data'].get('local_filename', 'image.png')
                                 prompt = result['data'].get('prompt', 'No prompt')
                                 results_summary += f"Command {i+1}: Image generated successfully - {filename}\n"
@@ -187,7 +191,7 @@ class ToolCoordinator:
                     if result.get('success'):
                         # Check for single image or multi-provider images
                         data = result.get('data', {})
-                        if data.get('base64_image'):
+                        if data.get('base64_image') or data.get('image_handle'):
                             return 'Image generated successfully and is ready for display.'
                         elif data.get('generation_type') == 'multi_provider_parallel':
                             success_count = data.get('success_count', 0)
@@ -233,62 +237,8 @@ class ToolCoordinator:
     def _extract_tool_calls(self, response_text: str) -> Optional[Dict]:
         """Extract tool calls from LLM response if present"""
         try:
-            # Check if entire response is JSON first
-            response_clean = response_text.strip()
-            if response_clean.startswith('{') and response_clean.endswith('}'):
-                try:
-                    parsed = json.loads(response_clean)
-                    if 'tool_calls' in parsed:
-                        return parsed
-                except json.JSONDecodeError:
-                    pass
-            
-            # Look for JSON in code blocks
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if json_match:
-                try:
-                    json_str = json_match.group(1).strip()
-                    parsed = json.loads(json_str)
-                    if 'tool_calls' in parsed:
-                        return parsed
-                except json.JSONDecodeError:
-                    pass
-            
-            # Look for JSON objects with balanced braces
-            def find_json_objects(text):
-                results = []
-                start_idx = 0
-                while True:
-                    start = text.find('{', start_idx)
-                    if start == -1:
-                        break
-                    
-                    # Find matching closing brace
-                    brace_count = 0
-                    end = start
-                    for i in range(start, len(text)):
-                        if text[i] == '{':
-                            brace_count += 1
-                        elif text[i] == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                end = i
-                                break
-                    
-                    if brace_count == 0:
-                        try:
-                            json_str = text[start:end+1]
-                            parsed = json.loads(json_str)
-                            if 'tool_calls' in parsed:
-                                results.append(parsed)
-                        except json.JSONDecodeError:
-                            pass
-                    
-                    start_idx = start + 1
-                
-                return results
-            
-            json_objects = find_json_objects(response_text)
+            # Single pass over the response; only objects with a "tool_calls" key are parsed
+            json_objects = ToolCallExtractor.extract_all(response_text)
             if json_objects:
                 return json_objects[0]  # Return first valid JSON with tool_calls
             
@@ -420,14 +370,10 @@ class ToolCoordinator:
         """Analyze response text for potential tool suggestions using LLM intelligence"""
         try:
             # Get available tools
-            available_tools = registry.list_tools()
-            tools_info = {}
-            
-            for tool in available_tools:
-                tools_info[tool['name']] = {
-                    'description': tool['description'],
-                    'actions': list(tool['actions'].keys())
-                }
+            tools_info = {
+                summary['name']: {'description': summary['description'], 'actions': summary['actions']}
+                for summary in registry.catalog().summaries
+            }
             
             analysis_prompt = f"""
 You are a tool suggestion system. Analyze the response text and suggest relevant tools if needed.
@@ -581,8 +527,9 @@ Analyze and suggest tools:
         """Create an enhanced prompt that encourages tool usage when appropriate"""
         
         # Get all available tools including dynamic ones
-        available_tools = registry.list_tools()
-        tool_names = [tool['name'] for tool in available_tools]
+        catalog = registry.catalog()
+        available_tools = catalog.tools
+        tool_names = list(catalog.by_name)
         
         # Analyze user message for tool needs using configurable router
         try:
@@ -1011,7 +958,7 @@ Provide a clear, user-friendly answer about the requirements for this task.
     
     def _create_workflow_evaluation_prompt(self, user_input: str) -> str:
         """Create intelligent evaluation prompt for LLM workflow detection"""
-        available_tools = registry.list_tools()
+        available_tools = registry.catalog().tools
         tool_capabilities = {tool['name']: tool['description'] for tool in available_tools}
         
         prompt = f"""
@@ -1379,23 +1326,12 @@ Analyze the request intelligently and provide your decision:
         CLAUDE.md compliant: No regex, no hardcoded patterns, LLM evaluation only
         """
         try:
-            # Check cache first
-            cache_key = f"tool_relevance_{hash(user_input)}"
+            # Check cache first; a registry change bumps the generation and misses
+            catalog = registry.catalog()
+            cache_key = (catalog.generation, user_input)
             if cache_key in self.tool_relevance_cache:
-                cached_time, cached_result = self.tool_relevance_cache[cache_key]
-                if time.time() - cached_time < self.cache_ttl:
-                    return cached_result
-            
-            # Get available tools
-            available_tools = registry.list_tools()
-            
-            # LLM-based tool analysis prompt
-            tools_description = {}
-            for tool in available_tools:
-                tools_description[tool['name']] = {
-                    'description': tool['description'],
-                    'actions': list(tool['actions'].keys())
-                }
+                self.tool_relevance_cache.move_to_end(cache_key)
+                return self.tool_relevance_cache[cache_key]
             
             # Use LLM to analyze tool relevance (no hardcoded patterns)
             analysis_prompt = f"""
@@ -1404,7 +1340,7 @@ Analyze the user input and determine which tools are most relevant for completin
 USER INPUT: "{user_input}"
 
 AVAILABLE TOOLS:
-{json.dumps(tools_description, indent=2)}
+{catalog.description_json}
 
 ANALYSIS CRITERIA:
 1. What is the primary action the user wants to perform?
@@ -1493,14 +1429,12 @@ Be precise and only return tools that are directly relevant to the user's reques
                     })()
                     tool_matches.append(tool_match)
                 
-                # Cache result
-                self.tool_relevance_cache[cache_key] = (time.time(), tool_matches)
-                
-                # Clean old cache entries
+                # Cache result, dropping entries from older catalog generations
+                for stale_key in [key for key in self.tool_relevance_cache if key[0] != catalog.generation]:
+                    del self.tool_relevance_cache[stale_key]
+                self.tool_relevance_cache[cache_key] = tool_matches
                 if len(self.tool_relevance_cache) > self.cache_max_size:
-                    oldest_key = min(self.tool_relevance_cache.keys(), 
-                                   key=lambda k: self.tool_relevance_cache[k][0])
-                    del self.tool_relevance_cache[oldest_key]
+                    self.tool_relevance_cache.popitem(last=False)
                 
                 logger.info(f"LLM tool analysis: Found {len(tool_matches)} relevant tools for: {user_input[:50]}...")
                 return tool_matches
@@ -18,6 +18,7 @@ class WebSocketManager:
         self.socketio = None
         self.connected_users: Dict[str, Set[str]] = {}  # user_id -> set of session_ids
         self.user_sessions: Dict[str, str] = {}  # session_id -> user_id
+        self._todo_unsubscribe = None
         
     def init_app(self, app):
         """Initialize SocketIO with Flask app"""
@@ -40,6 +41,9 @@ class WebSocketManager:
         self.socketio.on_event('clear_todos', self._handle_clear_todos)
         self.socketio.on_event('get_todos', self._handle_get_todos)
         self.socketio.on_event('update_todo_status', self._handle_update_todo_status)
+        self.socketio.on_event('get_todo_changes', self._handle_get_todo_changes)
+        
+        self._subscribe_todo_changes()
         
         logger.info("WebSocket Manager initialized")
         return self.socketio
@@ -149,7 +153,28 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"Failed to broadcast step update: {e}")
     
-    def broadcast_todo_update(self, user_id: str, event_type: str, todo_data: Dict[str, Any], workflow_id: str = None):
+    def _subscribe_todo_changes(self):
+        """Push todo store changes to user rooms instead of having clients re-poll"""
+        if self._todo_unsubscribe:
+            return
+        try:
+            from tools.internal.todo_manager import get_todo_tool
+            self._todo_unsubscribe = get_todo_tool().subscribe_changes(self._on_todo_change)
+        except Exception as e:
+            logger.error(f"Failed to subscribe to todo changes: {e}")
+    
+    def _on_todo_change(self, change: Dict[str, Any]):
+        """Todo store change feed listener"""
+        self.broadcast_todo_update(
+            change['user_id'],
+            change['event'],
+            change['data'],
+            change.get('workflow_id'),
+            seq=change.get('seq')
+        )
+    
+    def broadcast_todo_update(self, user_id: str, event_type: str, todo_data: Dict[str, Any], workflow_id: str = None,
+                              seq: int = None):
         """Broadcast todo updates to specific user"""
         if not self.socketio:
             return
@@ -162,6 +187,7 @@ class WebSocketManager:
                 'event': event_type,
                 'data': todo_data,
                 'workflow_id': workflow_id,
+                'seq': seq,
                 'timestamp': datetime.now().isoformat()
             }, room=room_name)
             
@@ -273,7 +299,8 @@ class WebSocketManager:
             emit('todos_loaded', {
                 'todos': result.get('todos', []),
                 'total': result.get('total', 0),
-                'workflow_id': workflow_id
+                'workflow_id': workflow_id,
+                'latest_seq': result.get('latest_seq', 0)
             })
             
             logger.info(f"Sent {result.get('total', 0)} todos to user {user_id}")
@@ -320,6 +347,32 @@ class WebSocketManager:
             logger.error(f"Error handling update todo status: {e}")
             emit('error', {'message': f'Error updating todo: {str(e)}'})
 
+    def _handle_get_todo_changes(self, data):
+        """Replay todo changes after a client's last seen seq (reconnect catch-up)"""
+        try:
+            session_id = request.sid
+            user_id = self.user_sessions.get(session_id)
+            
+            if not user_id:
+                emit('error', {'message': 'User not authenticated'})
+                return
+            
+            from tools.internal.todo_manager import get_todo_tool
+            todo_tool = get_todo_tool()
+            
+            since_seq = int(data.get('since_seq', 0))
+            changes = todo_tool.store.changes_since(user_id, since_seq)
+            
+            emit('todo_changes', {
+                'changes': changes,
+                'since_seq': since_seq,
+                'latest_seq': changes[-1]['seq'] if changes else since_seq
+            })
+            
+        except Exception as e:
+            logger.error(f"Error handling get todo changes: {e}")
+            emit('error', {'message': f'Error getting todo changes: {str(e)}'})
+
 # Global WebSocket manager instance
 websocket_manager = WebSocketManager()
 
@@ -11,8 +11,9 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass, asdict
-from .mcp_core import registry, MCPToolResult
+from .mcp_core import registry, MCPToolResult, thaw
 from .utils.llm_eval import summarize_for_llm
+from tools.external.browser_pool import lease_scope
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Usage patterns removed for simplicity
 
@@ -91,6 +92,7 @@ class WorkflowOrchestrator:
         self.max_step_duration = 300  # 5 minutes per step
         self._tool_cache = {}  # Cache for available tools
         self._last_registry_update = None
+        self._catalog_generation = None  # Registry catalog generation behind _tool_cache
         self.workflow_eval_cache = {}  # Cache for LLM evaluation results
         self.cache_max_size = 100
         self.cache_ttl = 3600  # 1 hour
@@ -219,6 +221,7 @@ class WorkflowOrchestrator:
         """Tool cache'ini yenile (tool_manager'dan sonra çağrılır)"""
         try:
             self._tool_cache = {}
+            self._catalog_generation = None
             self._last_registry_update = datetime.now()
             logger.info("Tool cache refreshed - dynamic tools updated")
         except Exception as e:
@@ -227,17 +230,15 @@ class WorkflowOrchestrator:
     def get_available_tools(self):
         """Cache'lenmiş veya fresh tool listesi döner"""
         try:
-            # Fresh registry data al
-            available_tools = registry.list_tools()
-            
-            # Cache'i güncelle
-            current_time = datetime.now()
-            if (not self._last_registry_update or 
-                (current_time - self._last_registry_update).seconds > 10):
-                self._tool_cache = {tool['name']: tool for tool in available_tools}
-                self._last_registry_update = current_time
+            # Registry snapshot al; tool cache yalnızca generation değişince yenilenir
+            catalog = registry.catalog()
+            if catalog.generation != self._catalog_generation:
+                self._tool_cache = dict(catalog.by_name)  # Girdiler donmuş (read-only) snapshot kayıtları
+                self._catalog_generation = catalog.generation
+                self._last_registry_update = datetime.now()
                 
-            return available_tools
+            # Çağıran listeyi değiştirebilir; paylaşılan snapshot yerine kopya döner
+            return [thaw(tool) for tool in catalog.tools]
         except Exception as e:
             logger.error(f"Error getting available tools: {e}")
             return []
@@ -498,7 +499,9 @@ class WorkflowOrchestrator:
                     continue
                 
                 # Execute step - SINGLE THREADED
-                step_result = self._execute_step(step, workflow)
+                # Browser sessions are leased per workflow, so steps share one driver
+                with lease_scope(workflow.id):
+                    step_result = self._execute_step(step, workflow)
                 execution_log['steps_executed'].append(step_result)
                 
                 # GMAIL EXPLICIT LOGGING: Track Gmail tool results
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Browser Pool Benchmark - soğuk başlatma ile havuzdan kiralama (lease) gecikmesi karşılaştırması
+
+Tamamen offline çalışır: yerel bir http.server sayfası ve bir file:// sayfası açılır.
+  cold    - her iterasyonda tarayıcı başlat + sayfa aç + kapat (eski davranış)
+  leased  - BrowserPool'dan oturum kirala + sayfa aç + iade et (havuz önceden ısıtılır)
+Ayrıca farklı workflow anahtarlarının izole oturum aldığı (cookie paylaşmadığı) doğrulanır.
+
+Kullanım:
+    python benchmark_browser_pool.py [--backend playwright|selenium] [--iterations 10] [--pool-size 2]
+"""
+
+import argparse
+import http.server
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from tools.external.browser_pool import BrowserPool
+
+PAGE = "<html><head><title>pool-bench</title></head><body><h1>ok</h1></body></html>"
+
+
+def serve_directory(directory: str):
+    handler = partial(http.server.SimpleHTTPRequestHandler, directory=directory)
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class PlaywrightBackend:
+    name = "playwright"
+
+    def __init__(self):
+        from playwright.sync_api import sync_playwright
+        self._playwright = sync_playwright().start()
+        self._browser = None
+
+    def cold(self, url: str):
+        browser = self._playwright.chromium.launch(headless=True, args=["--no-sandbox"])
+        try:
+            page = browser.new_page()
+            page.goto(url)
+            return page.title()
+        finally:
+            browser.close()
+
+    def pool(self, size: int) -> BrowserPool:
+        self._browser = self._playwright.chromium.launch(headless=True, args=["--no-sandbox"])
+        return BrowserPool(
+            name="bench-playwright",
+            factory=lambda member_id: {"context": self._browser.new_context()},
+            closer=lambda handle: handle["context"].close(),
+            health_check=lambda handle: self._browser.is_connected(),
+            reset=lambda member: member.handle["context"].clear_cookies(),
+            max_size=size
+        )
+
+    def visit(self, member, url: str, cookie: str = None):
+        page = member.handle["context"].new_page()
+        try:
+            page.goto(url)
+            if cookie:
+                page.evaluate(f"document.cookie = '{cookie}'")
+            return page.title(), page.evaluate("document.cookie")
+        finally:
+            page.close()
+
+    def close(self):
+        if self._browser:
+            self._browser.close()
+        self._playwright.stop()
+
+
+class SeleniumBackend:
+    name = "selenium"
+
+    def __init__(self):
+        from selenium import webdriver
+        self._webdriver = webdriver
+
+    def _driver(self):
+        options = self._webdriver.ChromeOptions()
+        for arg in ("--headless", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"):
+            options.add_argument(arg)
+        options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
+        return self._webdriver.Chrome(options=options)
+
+    def cold(self, url: str):
+        driver = self._driver()
+        try:
+            driver.get(url)
+            return driver.title
+        finally:
+            driver.quit()
+
+    def pool(self, size: int) -> BrowserPool:
+        def reset(member):
+            member.handle["driver"].delete_all_cookies()
+            member.handle["driver"].get("about:blank")
+
+        return BrowserPool(
+            name="bench-selenium",
+            factory=lambda member_id: {"driver": self._driver()},
+            closer=lambda handle: handle["driver"].quit(),
+            health_check=lambda handle: bool(handle["driver"].window_handles),
+            reset=reset,
+            max_size=size
+        )
+
+    def visit(self, member, url: str, cookie: str = None):
+        driver = member.handle["driver"]
+        driver.get(url)
+        if cookie:
+            driver.execute_script(f"document.cookie = '{cookie}'")
+        return driver.title, driver.execute_script("return document.cookie")
+
+    def close(self):
+        pass
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def report(label: str, samples):
+    print(f"{label:<22} | p50 {statistics.median(samples):8.1f} ms | "
+          f"p95 {percentile(samples, 95):8.1f} ms | max {max(samples):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Browser pool benchmark")
+    parser.add_argument("--backend", choices=["playwright", "selenium"], default="playwright")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+
+    backend = PlaywrightBackend() if args.backend == "playwright" else SeleniumBackend()
+    site_dir = tempfile.mkdtemp()
+    with open(os.path.join(site_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(PAGE)
+    server = serve_directory(site_dir)
+    http_url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+    file_url = Path(site_dir, "index.html").as_uri()
+
+    pool = None
+    try:
+        cold = []
+        for i in range(args.iterations):
+            start = time.perf_counter()
+            backend.cold(http_url if i % 2 == 0 else file_url)
+            cold.append((time.perf_counter() - start) * 1000)
+
+        pool = backend.pool(args.pool_size)
+        pool.warm(args.pool_size)
+        leased = []
+        acquire_only = []
+        for i in range(args.iterations):
+            key = f"workflow-{i % args.pool_size}"
+            start = time.perf_counter()
+            member = pool.acquire(key)
+            acquire_only.append((time.perf_counter() - start) * 1000)
+            try:
+                backend.visit(member, http_url if i % 2 == 0 else file_url)
+            finally:
+                pool.release(key)
+            leased.append((time.perf_counter() - start) * 1000)
+
+        # Isolation: a cookie set under one lease must not be visible to the next
+        member = pool.acquire("isolation-a")
+        backend.visit(member, http_url, cookie="bench=1")
+        pool.release("isolation-a")
+        member = pool.acquire("isolation-b")
+        _, cookies = backend.visit(member, http_url)
+        pool.release("isolation-b")
+
+        print(f"backend={backend.name} iterations={args.iterations} pool_size={args.pool_size}")
+        report("cold start + visit", cold)
+        report("lease + visit", leased)
+        report("lease only", acquire_only)
+        print(f"session isolation: {'ok' if 'bench=1' not in cookies else 'LEAKED'}")
+        print(f"pool stats: {pool.info()['stats']}")
+    finally:
+        if pool:
+            pool.close()
+        backend.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Graph Store Benchmark - graph.json (tam okuma/yazma) ile SQLite graph store karşılaştırması
+
+Her boyutta N adet tool_operation entity'si oluşturulur ve şu işlemler ölçülür:
+  latest_operation   - en son operasyon (filtre yok / tool filtresi)
+  append             - tek operasyon ekleme (entity + observations)
+  search             - observation içinde alt dizgi araması (FTS5 trigram)
+JSON tarafı eski davranışı (load + scan + dump indent=2) ölçer.
+
+Kullanım:
+    python benchmark_graph_store.py [--sizes 1000,10000,100000] [--repeat 20] [--json-max 10000]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from tools.internal.graph_store import GraphStore, parse_operation_fields
+
+TOOLS = ["simple_visual_creator", "gmail_helper", "command_executor", "llm_tool"]
+
+
+def make_graph(size: int) -> dict:
+    started = datetime(2025, 1, 1)
+    entities = []
+    for i in range(size):
+        entities.append({
+            "type": "entity",
+            "name": f"operation_{i:08d}",
+            "entityType": "tool_operation",
+            "observations": [
+                f"Tool: {TOOLS[i % len(TOOLS)]}",
+                f"Action: {'generate_image' if i % 2 else 'run'}",
+                "User: bench",
+                f"Success: {i % 5 != 0}",
+                "Parameters: {}",
+                f"Timestamp: {(started + timedelta(seconds=i)).isoformat()}",
+                f"Output: result number {i}..."
+            ],
+            "created": started.isoformat(),
+            "last_updated": started.isoformat(),
+            "user_id": "bench"
+        })
+    return {"entities": entities, "relations": []}
+
+
+def timed(fn, repeat: int) -> float:
+    """Median latency in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def json_latest(path: str, tool: str = None):
+    with open(path, 'r', encoding='utf-8') as f:
+        graph = json.load(f)
+    operations = []
+    for entity in graph["entities"]:
+        data = parse_operation_fields(entity["observations"])
+        if tool and data.get("tool") != tool:
+            continue
+        operations.append(data)
+    operations.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+    return operations[0] if operations else None
+
+
+def json_append(path: str, counter: list):
+    with open(path, 'r', encoding='utf-8') as f:
+        graph = json.load(f)
+    counter[0] += 1
+    graph["entities"].append({"name": f"json_new_{counter[0]}", "entityType": "tool_operation",
+                              "observations": ["Tool: llm_tool", f"Timestamp: {datetime.now().isoformat()}"]})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(graph, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Graph store latency benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json-max", type=int, default=10000,
+                        help="Largest size to also measure with graph.json (it is slow)")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    header = f"{'entities':>9} | {'latest':>9} | {'latest+tool':>11} | {'append':>9} | {'search':>9} | {'json latest':>11} | {'json append':>11}"
+    print(header)
+    print("-" * len(header))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            graph = make_graph(size)
+            store = GraphStore(os.path.join(tmp, f"graph_{size}.db"))
+            store.import_graph(graph)
+
+            counter = [0]
+
+            def append():
+                counter[0] += 1
+                store.upsert_entity(f"operation_new_{counter[0]}", "tool_operation", [
+                    "Tool: llm_tool", "Action: run", "Success: True",
+                    f"Timestamp: {datetime.now().isoformat()}"
+                ], "bench")
+
+            latest = timed(lambda: store.latest_operation(), args.repeat)
+            latest_tool = timed(lambda: store.latest_operation("simple_visual_creator", "run"), args.repeat)
+            append_ms = timed(append, args.repeat)
+            search = timed(lambda: store.search(f"result number {size // 2}"), args.repeat)
+            store.close()
+
+            json_latest_ms = json_append_ms = "-"
+            if size <= args.json_max:
+                json_path = os.path.join(tmp, f"graph_{size}.json")
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(graph, f, ensure_ascii=False, indent=2)
+                json_repeat = max(3, args.repeat // 4)
+                json_latest_ms = f"{timed(lambda: json_latest(json_path, 'simple_visual_creator'), json_repeat):9.2f}"
+                json_counter = [0]
+                json_append_ms = f"{timed(lambda: json_append(json_path, json_counter), json_repeat):9.2f}"
+
+            print(f"{size:>9} | {latest:9.3f} | {latest_tool:11.3f} | {append_ms:9.3f} | {search:9.3f} | "
+                  f"{json_latest_ms:>11} | {json_append_ms:>11}")
+
+    print("\nAll values are median milliseconds.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tool Call Extractor Benchmark - eski brace eşleştirici ile tek geçişli tarayıcının karşılaştırması
+
+Adversarial yanıtlar (1 MB):
+  open_braces    - kapanmayan '{' dizisi (eski algoritmada her '{' metnin sonuna kadar tarar)
+  code_blocks    - tool_calls içermeyen iç içe JSON/kod blokları, sonda gerçek tool call
+  brace_strings  - string içinde bol '{' / '}' olan JSON, sonda gerçek tool call
+Eski algoritma ikinci dereceden olduğu için küçük bir boyutta ölçülür ve 1 MB'a
+ölçeklenmiş tahmini de gösterilir.
+
+Kullanım:
+    python benchmark_tool_call_extractor.py [--size 1048576] [--legacy-size 16384] [--chunk 64]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from app.tool_call_extractor import ToolCallExtractor
+
+TOOL_CALL = json.dumps({"response": "ok", "tool_calls": [
+    {"tool": "command_executor", "action": "execute", "params": {"command": "ls"}}
+]})
+
+
+def legacy_find_json_objects(text):
+    """Previous ToolCoordinator implementation (restarts at every '{')"""
+    results = []
+    start_idx = 0
+    while True:
+        start = text.find('{', start_idx)
+        if start == -1:
+            break
+        brace_count = 0
+        end = start
+        for i in range(start, len(text)):
+            if text[i] == '{':
+                brace_count += 1
+            elif text[i] == '}':
+                brace_count -= 1
+                if brace_count == 0:
+                    end = i
+                    break
+        if brace_count == 0:
+            try:
+                parsed = json.loads(text[start:end + 1])
+                if 'tool_calls' in parsed:
+                    results.append(parsed)
+            except json.JSONDecodeError:
+                pass
+        start_idx = start + 1
+    return results
+
+
+def make_inputs(size: int) -> dict:
+    nested = '{"a": {"b": [1, 2, {"c": "d"}]}, "e": "f"}\n'
+    in_strings = json.dumps({"code": "function f() { if (x) { return {}; } }" * 4}) + "\n"
+    return {
+        "open_braces": ("{ " * (size // 2))[:size],
+        "code_blocks": (nested * (size // len(nested) + 1))[:size - len(TOOL_CALL)] + TOOL_CALL,
+        "brace_strings": (in_strings * (size // len(in_strings) + 1))[:size - len(TOOL_CALL) - 1] + "\n" + TOOL_CALL,
+    }
+
+
+def time_call(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def streamed(text: str, chunk: int):
+    extractor = ToolCallExtractor()
+    found = []
+    for i in range(0, len(text), chunk):
+        found.extend(extractor.feed(text[i:i + chunk]))
+    return found + extractor.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool call extractor benchmark")
+    parser.add_argument("--size", type=int, default=1024 * 1024)
+    parser.add_argument("--legacy-size", type=int, default=16 * 1024)
+    parser.add_argument("--chunk", type=int, default=64, help="Stream chunk size in characters")
+    args = parser.parse_args()
+
+    full = make_inputs(args.size)
+    small = make_inputs(args.legacy_size)
+    scale = (args.size / args.legacy_size) ** 2
+
+    print(f"{'input':<14} | {'new whole':>10} | {'new stream':>10} | {'legacy @small':>13} | {'legacy est. @size':>17}")
+    print("-" * 76)
+    for name in full:
+        whole = time_call(lambda: ToolCallExtractor.extract_all(full[name]))
+        stream = time_call(lambda: streamed(full[name], args.chunk))
+        legacy_small = time_call(lambda: legacy_find_json_objects(small[name]))
+        print(f"{name:<14} | {whole:8.1f}ms | {stream:8.1f}ms | {legacy_small:11.1f}ms | {legacy_small * scale / 1000:15.1f} s")
+
+    print(f"\nsize={args.size} chars, legacy measured at {args.legacy_size} chars and scaled quadratically")
+
+
+if __name__ == "__main__":
+    main()
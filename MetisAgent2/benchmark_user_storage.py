@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+UserStorage Benchmark - çağrı başına bağlantı + Fernet çözme ile havuzlu/önbellekli okuma karşılaştırması
+
+Geçici bir dizinde çalışır (users.db ve storage.key orada oluşturulur):
+  legacy   - her okumada sqlite3.connect + Fernet decrypt (eski davranış)
+  pooled   - UserStorage.get_property (havuzlu bağlantı + çözülmüş değer önbelleği)
+  batch    - UserStorage.get_properties ile tek sorguda N özellik
+Hedef: tek iş parçacığında saniyede en az 10k özellik okuması.
+
+Kullanım:
+    python benchmark_user_storage.py [--reads 10000] [--users 50] [--threads 4]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = str(Path(__file__).parent)
+sys.path.append(PROJECT_ROOT)
+
+TARGET_READS_PER_SECOND = 10_000
+PROPERTY_NAMES = ["oauth_google", "api_key_openai", "mapping_google", "display_name", "email"]
+
+
+def legacy_get_property(db_path: str, fernet, user_id: str, property_name: str):
+    """Eski get_property: her çağrıda yeni bağlantı ve şifre çözme"""
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute(
+            "SELECT property_value, is_encrypted, property_type FROM user_properties "
+            "WHERE user_id = ? AND property_name = ?", (user_id, property_name)
+        ).fetchone()
+    if not row:
+        return None
+    value_str, is_encrypted, property_type = row
+    if is_encrypted:
+        value_str = fernet.decrypt(base64.b64decode(value_str.encode('utf-8'))).decode('utf-8')
+    return json.loads(value_str) if property_type == 'json' else value_str
+
+
+def rate(label: str, reads: int, seconds: float):
+    per_second = reads / seconds if seconds else float('inf')
+    marker = "✅" if per_second >= TARGET_READS_PER_SECOND else "⚠️ "
+    print(f"{marker} {label:<28} {reads:>7} reads in {seconds:6.2f}s -> {per_second:>10,.0f} reads/s")
+    return per_second
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UserStorage read benchmark")
+    parser.add_argument("--reads", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="user_storage_bench_")
+    os.chdir(workdir)  # storage.key and the module-level users.db land here
+
+    from cryptography.fernet import Fernet
+    from tools.internal.user_storage import UserStorage
+
+    db_path = os.path.join(workdir, "bench_users.db")
+    storage = UserStorage(db_path)
+    fernet = Fernet(storage.encryption_key)
+
+    users = [f"user{i}@example.com" for i in range(args.users)]
+    for user_id in users:
+        storage.set_oauth_token(user_id, 'google', {
+            'access_token': 'ya29.' + 'x' * 150, 'refresh_token': '1//' + 'y' * 100,
+            'expires_at': '2030-01-01T00:00:00', 'scopes': ['gmail.readonly', 'drive.file']
+        })
+        storage.set_api_key(user_id, 'openai', 'sk-' + 'z' * 48)
+        storage.set_user_mapping(user_id, 'google', user_id)
+        storage.set_property(user_id, 'display_name', user_id.split('@')[0])
+        storage.set_property(user_id, 'email', user_id)
+    storage.clear_cache()
+
+    print(f"users={args.users} reads={args.reads} threads={args.threads} db={db_path}")
+    print("-" * 80)
+
+    def workload(count: int, offset: int = 0):
+        for i in range(count):
+            yield users[(i + offset) % len(users)], PROPERTY_NAMES[i % 2]  # Encrypted hot-path properties
+
+    start = time.perf_counter()
+    for user_id, name in workload(args.reads):
+        assert legacy_get_property(db_path, fernet, user_id, name)
+    legacy = rate("legacy connect+decrypt", args.reads, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for user_id, name in workload(args.reads):
+        assert storage.get_property(user_id, name)
+    pooled = rate("pooled get_property", args.reads, time.perf_counter() - start)
+
+    batches = max(args.reads // len(PROPERTY_NAMES), 1)
+    start = time.perf_counter()
+    for i in range(batches):
+        values = storage.get_properties(users[i % len(users)], PROPERTY_NAMES)
+        assert all(values.values())
+    rate("batch get_properties (x5)", batches * len(PROPERTY_NAMES), time.perf_counter() - start)
+
+    per_thread = args.reads // args.threads
+    errors = []
+
+    def reader(offset: int):
+        try:
+            for user_id, name in workload(per_thread, offset):
+                assert storage.get_property(user_id, name)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader, args=(n * 7,)) for n in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    rate(f"pooled, {args.threads} threads", per_thread * args.threads, time.perf_counter() - start)
+
+    # Invalidation: a write must never be answered from the stale cache entry
+    storage.set_oauth_token(users[0], 'google', {'access_token': 'rotated'})
+    assert legacy_get_property(db_path, fernet, users[0], 'oauth_google')['access_token'] == 'rotated'
+    other = UserStorage(db_path)  # Second instance stands in for another process
+    other.set_oauth_token(users[1], 'google', {'access_token': 'rotated-elsewhere'})
+    invalidation_ok = (storage.get_oauth_token(users[0], 'google')['access_token'] == 'rotated' and
+                       storage.get_oauth_token(users[1], 'google')['access_token'] == 'rotated-elsewhere')
+
+    print("-" * 80)
+    print(f"speedup: {pooled / legacy:.1f}x | cache stats: {storage.cache_stats} | "
+          f"thread errors: {len(errors)} | write invalidation: {'ok' if invalidation_ok else 'STALE'}")
+    return 0 if invalidation_ok and not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
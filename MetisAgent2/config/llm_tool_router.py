@@ -32,6 +32,8 @@ class LLMToolRouter:
             "language_detection": True,
             "context_analysis": True
         }
+        # Parsed user tool lists, keyed on (user_id, registry catalog generation)
+        self._available_tools_cache: Dict[tuple, List[Dict]] = {}
     
     def route_request(self, user_request: str, user_id: str = "system", context: Dict = None) -> LLMToolMatch:
         """
@@ -69,6 +71,14 @@ class LLMToolRouter:
                 logger.warning("Tool capability manager not available")
                 return []
             
+            # Parsed once per registry generation instead of on every request
+            from app.mcp_core import registry
+            generation = registry.catalog().generation
+            cache_key = (user_id, generation)
+            cached = self._available_tools_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             # Get user tools from graph memory
             tools_prompt = self.tool_capability_manager.get_user_tool_prompt(user_id)
             
@@ -78,6 +88,10 @@ class LLMToolRouter:
             
             # Parse tools from prompt (simple extraction)
             tools = self._parse_tools_from_prompt(tools_prompt)
+            self._available_tools_cache = {
+                key: value for key, value in self._available_tools_cache.items() if key[1] == generation
+            }
+            self._available_tools_cache[cache_key] = tools
             return tools
             
         except Exception as e:
@@ -124,17 +124,20 @@ class UserContextManager:
         try:
             mapping_data = {}
             
-            # Get Google mapping
-            google_account = self.user_storage.get_user_mapping(user_id, 'google')
+            # Google mapping and other properties in one query
+            properties = self.user_storage.get_properties(
+                user_id, ['mapping_google', 'system_email', 'display_name']
+            )
+            
+            google_account = properties['mapping_google']
             if google_account:
                 mapping_data['google_account'] = google_account
             
-            # Get other properties
-            system_email = self.user_storage.get_property(user_id, 'system_email')
+            system_email = properties['system_email']
             if system_email:
                 mapping_data['system_email'] = system_email
             
-            display_name = self.user_storage.get_property(user_id, 'display_name')
+            display_name = properties['display_name']
             if display_name:
                 mapping_data['display_name'] = display_name
             
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Conversation Migration Script - JSON ve Chroma konuşmalarını SQLite mesaj log'una aktarır
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from tools.internal.conversation_log import ConversationLog
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def import_chroma(log: ConversationLog, chroma_path: str) -> int:
+    """Eski Chroma 'conversations' collection'ını aktar (chromadb kurulu değilse atlanır)"""
+    try:
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
+    except ImportError:
+        print("⏭️  chromadb not installed, skipping Chroma import")
+        return 0
+
+    client = chromadb.PersistentClient(
+        path=chroma_path,
+        settings=ChromaSettings(anonymized_telemetry=False, allow_reset=True)
+    )
+    try:
+        collection = client.get_collection(name="conversations")
+    except Exception:
+        print("⏭️  No Chroma 'conversations' collection")
+        return 0
+    return log.import_chroma_collection(collection)
+
+
+def main():
+    """conversation_storage/*.json ve Chroma konuşmalarını conversations.db'ye aktar"""
+    parser = argparse.ArgumentParser(description="Import legacy conversations into the SQLite message log")
+    parser.add_argument("--storage", default=os.path.join(os.getcwd(), "conversation_storage"),
+                        help="Conversation storage directory (default: ./conversation_storage)")
+    parser.add_argument("--chroma", default=os.path.join(os.getcwd(), "metis_data", "chroma_db"),
+                        help="Legacy ChromaDB path (default: ./metis_data/chroma_db)")
+    args = parser.parse_args()
+
+    print("💬 MetisAgent2 Conversation Migration")
+    print("=" * 50)
+
+    os.makedirs(args.storage, exist_ok=True)
+    log = ConversationLog(os.path.join(args.storage, "conversations.db"))
+    try:
+        json_counts = log.import_json_dir(args.storage)
+        for filename, count in json_counts.items():
+            print(f"✅ {filename}: {count} conversations")
+        if not json_counts:
+            print("⏭️  No legacy JSON conversation files")
+
+        chroma_count = import_chroma(log, args.chroma) if os.path.isdir(args.chroma) else 0
+        print(f"✅ Chroma: {chroma_count} conversations")
+
+        stats = log.stats()
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return 1
+    finally:
+        log.close()
+
+    print("-" * 30)
+    print(f"📊 Total: {stats['conversations']} conversations, {stats['users']} users, {stats['messages']} messages")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
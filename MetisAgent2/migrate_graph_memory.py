@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Graph Memory Migration Script - graph.json dosyalarını SQLite graph store'a aktarır
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from tools.internal.graph_store import GraphStore
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Her kullanıcı dizinindeki graph.json'u aynı dizindeki graph.db'ye aktar"""
+    parser = argparse.ArgumentParser(description="Import legacy graph.json files into SQLite graph stores")
+    parser.add_argument("--storage", default=os.path.join(os.getcwd(), "graph_memory_storage"),
+                        help="Graph memory storage root (default: ./graph_memory_storage)")
+    args = parser.parse_args()
+
+    print("🧠 MetisAgent2 Graph Memory Migration")
+    print("=" * 50)
+
+    if not os.path.isdir(args.storage):
+        print(f"❌ Storage directory not found: {args.storage}")
+        return 1
+
+    total_entities = 0
+    total_relations = 0
+    for user_id in sorted(os.listdir(args.storage)):
+        user_dir = os.path.join(args.storage, user_id)
+        graph_path = os.path.join(user_dir, "graph.json")
+        if not os.path.isfile(graph_path):
+            continue
+
+        store = GraphStore(os.path.join(user_dir, "graph.db"))
+        try:
+            counts = store.import_graph_json(graph_path)
+        except Exception as e:
+            logger.error(f"Migration failed for {user_id}: {e}")
+            continue
+        finally:
+            store.close()
+
+        if counts:
+            total_entities += counts["entities"]
+            total_relations += counts["relations"]
+            print(f"✅ {user_id}: {counts['entities']} entities, {counts['relations']} relations")
+        else:
+            print(f"⏭️  {user_id}: already migrated")
+
+    print("-" * 30)
+    print(f"📊 Total: {total_entities} entities, {total_relations} relations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Todo Migration Script - <user>_todos.json dosyalarını SQLite todo store'a aktarır
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from tools.internal.todo_store import TodoStore
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Todo dizinindeki tüm <user>_todos.json dosyalarını todos.db'ye aktar"""
+    parser = argparse.ArgumentParser(description="Import legacy todo JSON files into the SQLite todo store")
+    parser.add_argument("--storage", default=str(Path(__file__).parent / "tools" / "storage" / "todos"),
+                        help="Todo storage directory (default: tools/storage/todos)")
+    args = parser.parse_args()
+
+    print("📋 MetisAgent2 Todo Migration")
+    print("=" * 50)
+
+    if not os.path.isdir(args.storage):
+        print(f"❌ Storage directory not found: {args.storage}")
+        return 1
+
+    store = TodoStore(os.path.join(args.storage, "todos.db"))
+    try:
+        counts = store.import_json_dir(args.storage)
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return 1
+    finally:
+        store.close()
+
+    for user_id, count in counts.items():
+        print(f"✅ {user_id}: {count} todos")
+    if not counts:
+        print("⏭️  Nothing to migrate")
+
+    print("-" * 30)
+    print(f"📊 Total: {sum(counts.values())} todos for {len(counts)} users")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Browser Pool test - sahte oturumlarla kiralama, iade/sıfırlama ve süre aşımı kontrolü
+
+Tarayıcı başlatmaz: factory her oturum için cookie sözlüğü tutan bir nesne döner.
+  1. Aynı anahtar aynı oturumu alır (re-entrant), iade sonrası son oturumunu tercih eder
+  2. Sıfırlama bitene kadar iade edilen oturum başka anahtara verilmez
+  3. Çöken / sıfırlaması başarısız / süresi aşan (discard_on) oturum kapatılıp yenisi başlatılır
+  4. Terk edilmiş kiralar ve boştaki oturumlar süre aşımında kapatılır
+  5. lease_scope anahtarı thread'den bağımsızdır
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from tools.external.browser_pool import BrowserPool, BrowserPoolError, current_lease_key, lease_scope
+
+
+class FakeSession:
+    def __init__(self, member_id: int):
+        self.member_id = member_id
+        self.cookies = {}
+        self.alive = True
+        self.closed = False
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def make_pool(reset_delay: float = 0.0, **kwargs) -> BrowserPool:
+    def reset(member):
+        time.sleep(reset_delay)
+        if member.handle.cookies.get("reset") == "fail":
+            raise RuntimeError("reset failed")
+        member.handle.cookies.clear()
+
+    return BrowserPool(
+        name="test",
+        factory=FakeSession,
+        closer=lambda handle: setattr(handle, "closed", True),
+        health_check=lambda handle: handle.alive,
+        reset=reset,
+        **kwargs
+    )
+
+
+def main():
+    results = []
+
+    # 1. Lease reuse
+    pool = make_pool(max_size=2, idle_timeout=300)
+    first = pool.acquire("wf-a")
+    again = pool.acquire("wf-a")
+    other = pool.acquire("wf-b")
+    results.append(check("same key re-enters its session, other key gets a new one",
+                         first is again and other is not first and pool.stats["created"] == 2))
+    pool.release("wf-a")
+    results.append(check("nested lease is still held after one release", pool.leased("wf-a") is first))
+    pool.release("wf-a")
+    pool.release("wf-b")
+    results.append(check("released key gets its previous session back",
+                         pool.acquire("wf-b") is other and pool.acquire("wf-a") is first))
+    pool.release("wf-a")
+    pool.release("wf-b")
+    try:
+        pool.acquire("wf-c"), pool.acquire("wf-d"), pool.acquire("wf-e", timeout=0.1)
+        exhausted = False
+    except BrowserPoolError:
+        exhausted = True
+    results.append(check("max_size bounds the pool", exhausted and pool.info()["size"] == 2))
+    pool.close()
+
+    # 2. Release keeps the session reserved until reset finishes
+    pool = make_pool(reset_delay=0.3, max_size=1, idle_timeout=300)
+    member = pool.acquire("wf-a")
+    member.handle.cookies["sid"] = "alice"
+    releaser = threading.Thread(target=pool.release, args=("wf-a",))
+    releaser.start()
+    time.sleep(0.05)
+    seen = {}
+
+    def next_lessee():
+        leased = pool.acquire("wf-b", timeout=5)
+        seen["cookies"] = dict(leased.handle.cookies)
+        seen["member"] = leased
+
+    started = time.perf_counter()
+    acquirer = threading.Thread(target=next_lessee)
+    acquirer.start()
+    releaser.join()
+    acquirer.join()
+    waited = time.perf_counter() - started
+    results.append(check(f"next lessee waited {waited * 1000:.0f}ms for the reset and saw no cookies",
+                         seen["member"] is member and seen["cookies"] == {} and waited >= 0.2))
+    pool.close()
+
+    # 3. Crash and reset-failure recycling
+    pool = make_pool(max_size=1, idle_timeout=300)
+    crashed = pool.acquire("wf-a")
+    crashed.handle.alive = False
+    pool.release("wf-a")
+    replacement = pool.acquire("wf-a")
+    results.append(check("crashed session is closed and replaced",
+                         crashed.handle.closed and replacement is not crashed and pool.stats["recycled"] == 1))
+    replacement.handle.cookies["reset"] = "fail"
+    pool.release("wf-a")
+    results.append(check("session whose reset fails is not reused",
+                         replacement.handle.closed and pool.acquire("wf-b") is not replacement))
+    pool.release("wf-b")
+    try:
+        with pool.lease("wf-c") as leased:
+            leased.handle.alive = False
+            raise RuntimeError("driver crashed mid-action")
+    except RuntimeError:
+        pass
+    results.append(check("lease() discards a session that crashed inside the block",
+                         leased.handle.closed and pool.info()["size"] == 0))
+    outcomes = []
+    for error in (ValueError("bad selector"), TimeoutError("scrape timed out")):
+        try:
+            with pool.lease("wf-d", discard_on=(TimeoutError,)) as leased:
+                leased.handle.cookies["session"] = "wf-d"
+                raise error
+        except Exception:
+            pass
+        outcomes.append((leased.handle.closed, dict(leased.handle.cookies)))
+    results.append(check("healthy session is reset after other errors, discarded after a discard_on error",
+                         outcomes == [(False, {}), (True, {"session": "wf-d"})] and pool.info()["size"] == 0))
+    pool.close()
+
+    # 4. Expiry
+    pool = make_pool(max_size=2, idle_timeout=0.2, lease_timeout=0.4)
+    abandoned = pool.acquire("wf-a")
+    idle = pool.acquire("wf-b")
+    pool.release("wf-b")
+    time.sleep(0.3)
+    pool.evict_idle()
+    results.append(check("idle session closed after idle_timeout, lease kept",
+                         pool.leased("wf-a") is abandoned and pool.info()["size"] == 1))
+    time.sleep(0.5)
+    pool.evict_idle()
+    time.sleep(0.05)
+    results.append(check("untouched lease reclaimed after lease_timeout",
+                         pool.leased("wf-a") is None and abandoned.handle.closed and idle.handle.closed
+                         and pool.info()["size"] == 0))
+    pool.close()
+
+    # 5. Lease keys
+    keys = []
+    with lease_scope("rest:alice"):
+        worker = threading.Thread(target=lambda: keys.append(current_lease_key()))
+        worker.start()
+        worker.join()
+        keys.append(current_lease_key())
+    results.append(check("lease_scope key applies in scope; other threads fall back to their own",
+                         keys[1] == "rest:alice" and keys[0].startswith("thread-")))
+
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
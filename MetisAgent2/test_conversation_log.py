@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Conversation Log test - append-only mesaj günlüğü ve sıcak konuşma önbelleği kontrolü
+
+Geçici bir veritabanı üzerinde:
+  1. Append yalnızca yeni mesajları yazar; sıra ve ek alanlar korunur
+  2. Aynı start_seq ile tekrar edilen kayıt mesajları çoğaltmaz
+  3. Sayfalama birincil anahtar aralığıyla, negatif offset sondan sayar
+  4. Eşzamanlı farklı konuşmalara yazanlar birbirini bozmaz
+  5. Eski JSON dosyası bir kez içe aktarılır, mevcut konuşmalar korunur
+  6. HotConversations LRU sınırını uygular, atılan konuşmayı on_evict'e verir
+  7. HotConversations eşzamanlı thread'lerden güvenle kullanılır
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from tools.internal.conversation_log import ConversationLog, HotConversations
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def message(role: str, content, index: int, **extra):
+    return dict({"role": role, "content": content, "timestamp": f"2025-07-01T10:{index:02d}:00"}, **extra)
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="conversation_log_test_")
+    log = ConversationLog(os.path.join(workdir, "conversations.db"))
+    results = []
+
+    # 1. Append and round-trip
+    first_turn = [message("user", "Bugünkü e-postalarımı listele", 0),
+                  message("assistant", "3 okunmamış e-posta var", 1, tool_calls=[{"tool": "gmail_helper"}])]
+    count = log.append("conv-1", "alice", first_turn)
+    multimodal = [{"type": "text", "text": "Bu görseli açıkla"}, {"type": "image_url", "image_url": "data:..."}]
+    count = log.append("conv-1", "alice", [message("user", multimodal, 2)])
+    loaded = log.load("conv-1")
+    results.append(check("messages round-trip in order with extra keys and structured content",
+                         count == 3 and loaded == first_turn + [message("user", multimodal, 2)]))
+    conversation = log.get_conversation("conv-1")
+    results.append(check("conversation named after the first user message, activity tracked",
+                         conversation["name"] == "Bugünkü e-postalarımı listele"
+                         and conversation["message_count"] == 3
+                         and conversation["last_activity"] == "2025-07-01T10:02:00"))
+
+    # 2. Retried save
+    retry = [message("assistant", "Görselde bir kazan var", 3)]
+    log.append("conv-1", "alice", retry, start_seq=3)
+    log.append("conv-1", "alice", retry, start_seq=3)
+    results.append(check("retried save with the same start_seq does not duplicate",
+                         log.count("conv-1") == 4 and log.load("conv-1")[-1] == retry[0]))
+
+    # 3. Paging
+    log.append("conv-2", "alice", [message("user", f"m{i}", i) for i in range(30)])
+    results.append(check("page(10, 5) and page(-3) return the right slices",
+                         [m["content"] for m in log.page("conv-2", 10, 5)] == ["m10", "m11", "m12", "m13", "m14"]
+                         and [m["content"] for m in log.page("conv-2", -3)] == ["m27", "m28", "m29"]))
+    results.append(check("unknown conversation loads as None", log.load("missing") is None))
+
+    # 4. Concurrent writers
+    def writer(index):
+        for n in range(25):
+            log.append(f"conc-{index}", "bob", [message("user", f"{index}-{n}", n % 60)])
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(check("6 threads x 25 appends -> every conversation complete and ordered",
+                         all([m["content"] for m in log.load(f"conc-{i}")] == [f"{i}-{n}" for n in range(25)]
+                             for i in range(6))
+                         and len(log.user_conversations("bob")) == 6))
+
+    # 5. Legacy JSON import
+    legacy_path = os.path.join(workdir, "conversations_carol.json")
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump({"conversations": {
+                       "conv-1": {"messages": [message("user", "overwrite attempt", 0)]},
+                       "legacy-1": {"messages": [message("user", "Eski konuşma", 0)]}},
+                   "user_conversations": {"legacy-1": "Eski isim", "empty-1": "Boş"}}, f, ensure_ascii=False)
+    counts = log.import_json_dir(workdir)
+    results.append(check("legacy file imported once; existing conversation untouched",
+                         counts == {"conversations_carol.json": 1}
+                         and log.load("conv-1")[0]["content"] == "Bugünkü e-postalarımı listele"
+                         and log.get_conversation("legacy-1")["name"] == "Eski isim"
+                         and log.get_conversation("empty-1")["message_count"] == 0
+                         and os.path.exists(legacy_path + ".migrated")))
+
+    # 6. Hot conversation LRU
+    evicted = []
+    hot = HotConversations(max_size=2, loader=log.load, on_evict=lambda cid, msgs: evicted.append(cid))
+    hot.get_or_load("conv-1")
+    hot.get_or_load("conv-2")
+    hot["conv-1"]  # Touch: conv-2 becomes least recently used
+    hot.get_or_load("legacy-1")
+    results.append(check("LRU evicts the least recently used conversation",
+                         evicted == ["conv-2"] and list(hot) == ["conv-1", "legacy-1"]))
+    results.append(check("missing conversations are not cached",
+                         hot.get_or_load("missing") is None and "missing" not in hot))
+
+    # 7. Hot conversations under concurrent request threads
+    evicted.clear()
+    errors = []
+    hot = HotConversations(max_size=5, loader=log.load, on_evict=lambda cid, msgs: evicted.append(cid))
+
+    def request(index):
+        try:
+            for n in range(300):
+                conversation_id = f"conc-{(index + n) % 6}"
+                if hot.get_or_load(conversation_id) is None:
+                    errors.append(conversation_id)
+                hot[f"tmp-{index}-{n % 4}"] = []
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(check("8 threads x 300 loads/inserts -> no errors, size bounded, evictions reported",
+                         not errors and len(hot) == 5 and len(evicted) > 0))
+
+    stats = log.stats()
+    log.close()
+    print("-" * 50)
+    print(f"stats: {stats}")
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
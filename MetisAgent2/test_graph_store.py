@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Graph Store test - SQLite graph deposu davranış kontrolü
+
+Geçici bir veritabanı üzerinde:
+  1. Upsert mevcut varlığa gözlem ekler, tipli operasyon kolonları güncellenir
+  2. Gözlem silinince latest_operation yeni değerleri görür
+  3. FTS5 araması ile tarama (fallback) araması aynı sonucu verir
+  4. Varlık silme ilişkileri de siler, tekrar eden ilişki eklenmez
+  5. graph.json yalnızca bir kez içe aktarılır
+  6. Eşzamanlı yazıcılar gözlem kaybetmez
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from tools.internal.graph_store import GraphStore
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def operation(tool: str, action: str, timestamp: str, success: bool = True):
+    return [f"Tool: {tool}", f"Action: {action}", f"Timestamp: {timestamp}", f"Success: {success}"]
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="graph_store_test_")
+    store = GraphStore(os.path.join(workdir, "graph.db"))
+    results = []
+
+    # 1. Upsert merges observations and fills operation columns
+    store.upsert_entity("op_1", "tool_operation", operation("gmail_helper", "list_emails", "2025-07-01T10:00:00"), "alice")
+    store.upsert_entity("op_2", "tool_operation", operation("gmail_helper", "send_email", "2025-07-02T10:00:00"), "alice")
+    merged = store.upsert_entity("op_1", "tool_operation", ["Note: retried"], "alice")
+    results.append(check("upsert appends to the existing entity",
+                         store.count_entities() == 2 and merged["observations"][-1] == "Note: retried"
+                         and len(merged["observations"]) == 5))
+    latest = store.latest_operation("gmail_helper")
+    results.append(check("latest_operation uses the newest timestamp",
+                         latest["entity"]["name"] == "op_2" and latest["action"] == "send_email"))
+    results.append(check("latest_operation filters by action substring",
+                         store.latest_operation("gmail_helper", "list")["entity"]["name"] == "op_1"))
+
+    # 2. Deleting observations refreshes the typed columns
+    store.delete_observations("op_2", ["Timestamp: 2025-07-02T10:00:00"])
+    results.append(check("op without timestamp sorts after timestamped ones",
+                         store.latest_operation("gmail_helper")["entity"]["name"] == "op_1"))
+
+    # 3. FTS and scan search agree
+    store.upsert_entity("Boiler B-12", "equipment", ["Basınç sensörü arızalı", "Bakım: 2025-06"], "alice")
+    store.create_relation("Boiler B-12", "op_1", "reported_by", "alice")
+    fts_result = store.search("SENSÖR")
+    fts_enabled = store.fts_enabled
+    store.fts_enabled = False
+    scan_result = store.search("SENSÖR")
+    store.fts_enabled = fts_enabled
+    results.append(check(f"search is case-insensitive (fts={fts_enabled}) and matches the scan path",
+                         [e["name"] for e in fts_result["entities"]] == ["Boiler B-12"]
+                         and fts_result == scan_result))
+    results.append(check("relations are searchable", len(store.search("reported")["relations"]) == 1))
+
+    # 4. Relations: dedupe and cascade on entity delete
+    results.append(check("duplicate relation is ignored",
+                         store.create_relation("Boiler B-12", "op_1", "reported_by", "alice") is None))
+    deleted = store.delete_entities(["Boiler B-12"])
+    results.append(check("entity delete removes its relations",
+                         deleted == (1, 1) and store.read_graph()["relations"] == []))
+
+    # 5. One-shot graph.json import
+    legacy_path = os.path.join(workdir, "graph.json")
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump({"entities": [{"name": "legacy", "entityType": "note", "observations": ["eski kayıt"], "color": "red"}],
+                   "relations": [{"from": "legacy", "to": "op_1", "relationType": "mentions"}]}, f)
+    counts = store.import_graph_json(legacy_path)
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump({"entities": [{"name": "again", "entityType": "note", "observations": []}]}, f)
+    results.append(check("graph.json imported once, extra keys kept",
+                         counts == {"entities": 1, "relations": 1}
+                         and store.import_graph_json(legacy_path) is None
+                         and store.get_entity("again") is None
+                         and store.get_entity("legacy")["color"] == "red"))
+
+    # 6. Concurrent writers
+    def writer(index):
+        for n in range(50):
+            store.add_observations("legacy", [f"writer {index} obs {n}"])
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(check("8 threads x 50 observations -> none lost",
+                         len(store.get_entity("legacy")["observations"]) == 1 + 8 * 50))
+
+    store.close()
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Image Catalog test - içerik handle çözümleme ve generated_images kök kontrolü
+
+Geçici bir generated_images klasörü ve dışarıda bir klasör üzerinde:
+  1. Handle (tam veya kısaltılmış) en yeni dosyayı döner; geçersiz handle None
+  2. root verildiğinde kök dışındaki (folder_path ile taranmış) dosyalar çözülmez
+  3. Aynı içerik hem içeride hem dışarıda ise içerideki kopya döner
+  4. Kök içinden dışarıyı gösteren symlink de reddedilir
+  5. Thumbnail aynı kök kontrolünden geçer
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from tools.internal.image_catalog import ImageCatalog, is_within
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def write_png(path: str, width: int, height: int):
+    """Minimal valid PNG (single-color) so the catalog can read dimensions"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    raw = b"".join(b"\x00" + b"\x00" * width * 3 for _ in range(height))
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n"
+                + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+                + chunk(b"IDAT", zlib.compress(raw))
+                + chunk(b"IEND", b""))
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="image_catalog_test_")
+    root = os.path.join(workdir, "generated_images")
+    outside = os.path.join(workdir, "home_pictures")
+    os.makedirs(root)
+    os.makedirs(outside)
+    catalog = ImageCatalog(os.path.join(root, ".catalog"))
+    results = []
+
+    # 1. Handle resolution
+    generated = os.path.join(root, "20250701_100000_kirmizi_kazan.png")
+    write_png(generated, 4, 3)
+    record = catalog.register(generated, prompt="kırmızı kazan")
+    handle = record["handle"]
+    resolved = catalog.resolve(handle, root=root)
+    results.append(check("handle resolves to the generated image with its prompt and size",
+                         resolved["filepath"] == generated and resolved["prompt"] == "kırmızı kazan"
+                         and (resolved["width"], resolved["height"]) == (4, 3)))
+    results.append(check("short prefix and upper case resolve too",
+                         catalog.resolve(handle[:8].upper(), root=root)["filepath"] == generated))
+    results.append(check("malformed handle -> None",
+                         catalog.resolve("../etc/passwd") is None and catalog.resolve("abc") is None))
+
+    # 2. Out-of-root files (indexed by a folder_path scan)
+    private = os.path.join(outside, "passport.png")
+    write_png(private, 5, 5)
+    catalog.scan(outside)
+    private_handle = catalog.get(private)["handle"]
+    results.append(check("out-of-root image resolves without root (tool use) but not under root (route use)",
+                         catalog.resolve(private_handle)["filepath"] == private
+                         and catalog.resolve(private_handle, root=root) is None))
+
+    # 3. Same content inside and outside: the in-root copy wins even if older
+    time.sleep(0.01)
+    copy = os.path.join(outside, "copy_of_generated.png")
+    with open(generated, "rb") as src, open(copy, "wb") as dst:
+        dst.write(src.read())
+    catalog.scan(outside, force=True)
+    results.append(check("newer out-of-root duplicate is skipped under root",
+                         catalog.resolve(handle)["filepath"] == copy
+                         and catalog.resolve(handle, root=root)["filepath"] == generated))
+
+    # 4. Symlink escaping the root
+    link_ok = True
+    link = os.path.join(root, "innocent.png")
+    try:
+        os.symlink(private, link)
+    except (OSError, NotImplementedError):
+        link_ok = False
+    if link_ok:
+        os.remove(private)
+        write_png(os.path.join(outside, "passport.png"), 6, 6)
+        catalog.scan(root, force=True)
+        linked_handle = catalog.get(link)["handle"]
+        results.append(check("symlink inside root pointing outside is rejected",
+                             not is_within(link, root) and catalog.resolve(linked_handle, root=root) is None))
+    results.append(check("sibling directory sharing the root's name prefix is outside",
+                         not is_within(os.path.join(workdir, "generated_images_other", "x.png"), root)
+                         and is_within(generated, root)))
+
+    # 5. Thumbnails go through the same check
+    results.append(check("thumbnail for an out-of-root handle -> None",
+                         catalog.thumbnail(private_handle, root=root) is None))
+
+    catalog.close()
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
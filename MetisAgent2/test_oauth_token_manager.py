@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+OAuth Token Manager test - yerel sahte token sunucusu ile single-flight ve heap zamanlayıcı kontrolü
+
+Google'a istek atmaz: http.server üzerinde /token endpoint'i taklit edilir.
+  1. Süresi dolmuş token'a 20 eşzamanlı çağrı -> tek yenileme isteği
+  2. Geçerli token -> önbellekten, istek yok
+  3. invalid_grant -> hata döner, hesap zamanlayıcıdan çıkar
+  4. Heap sırası ve arka plan zamanlayıcısının bitişten önce yenilemesi
+"""
+
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qs
+
+sys.path.append(str(Path(__file__).parent))
+os.chdir(tempfile.mkdtemp(prefix="oauth_token_test_"))  # storage.key / users.db burada oluşur
+
+from tools.internal.user_storage import UserStorage
+from tools.internal.oauth_token_manager import GoogleTokenEndpoint, OAuthTokenManager
+
+
+class FakeTokenServer:
+    """refresh_token grant'ına cevap veren yerel token endpoint'i"""
+
+    def __init__(self, delay: float = 0.2, expires_in: int = 3600):
+        self.requests = []
+        self.delay = delay
+        self.expires_in = expires_in
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+                refresh_token = body['refresh_token'][0]
+                server.requests.append(refresh_token)
+                time.sleep(server.delay)
+                if refresh_token.startswith('revoked'):
+                    status, payload = 400, {'error': 'invalid_grant'}
+                else:
+                    status, payload = 200, {
+                        'access_token': f"access-{len(server.requests)}",
+                        'expires_in': server.expires_in,
+                        'token_type': 'Bearer'
+                    }
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/token"
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    server = FakeTokenServer()
+    storage = UserStorage(os.path.join(os.getcwd(), "users.db"))
+    manager = OAuthTokenManager(
+        storage=storage,
+        endpoint=GoogleTokenEndpoint(server.url),
+        client_credentials=lambda: ("test-client-id", "test-client-secret")
+    )
+    results = []
+
+    # 1. Single-flight: 20 concurrent callers, one refresh request
+    storage.set_user_mapping("alice", "google", "alice@example.com")
+    storage.set_oauth_token("alice@example.com", "google", {
+        'access_token': 'stale', 'refresh_token': 'rt-alice', 'expires_at': time.time() - 10
+    })
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(manager.get_valid_token("alice"))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(check(f"20 concurrent callers -> {len(server.requests)} refresh request(s)",
+                         len(server.requests) == 1))
+    results.append(check("all callers got the refreshed token",
+                         len({token['access_token'] for token in tokens}) == 1 and tokens[0]['access_token'] == 'access-1'))
+    results.append(check("refreshed token persisted",
+                         storage.get_oauth_token("alice@example.com", "google")['access_token'] == 'access-1'))
+
+    # 2. Cached valid token: no storage refresh, no endpoint call
+    before = len(server.requests)
+    for _ in range(1000):
+        manager.get_valid_token("alice")
+    results.append(check(f"1000 calls on a valid token -> cache hits {manager.stats['cache_hits']}, no requests",
+                         len(server.requests) == before))
+
+    # 3. invalid_grant: error surfaces, account leaves the schedule
+    storage.set_oauth_token("bob@example.com", "google", {
+        'access_token': 'stale', 'refresh_token': 'revoked-bob', 'expires_at': time.time() - 10
+    })
+    results.append(check("revoked refresh token -> None", manager.get_valid_token("bob@example.com") is None))
+    manager.refresh_due()
+    next_refresh = manager.next_refresh()
+    results.append(check("revoked account dropped from schedule",
+                         next_refresh is None or next_refresh[1] != "bob@example.com"))
+
+    # 4. Expiry-ordered schedule and proactive background refresh
+    fast = OAuthTokenManager(
+        storage=storage,
+        endpoint=GoogleTokenEndpoint(server.url),
+        client_credentials=lambda: ("test-client-id", "test-client-secret"),
+        refresh_margin=1
+    )
+    now = time.time()
+    for name, expires_in in (("carol", 60), ("dave", 1.5), ("erin", 30)):
+        storage.set_oauth_token(f"{name}@example.com", "google", {
+            'access_token': f'{name}-initial', 'refresh_token': f'rt-{name}', 'expires_at': now + expires_in
+        })
+    storage.set_oauth_token("bob@example.com", "google", {'access_token': 'x'})  # No refresh token
+    fast.load_schedule()
+    results.append(check("soonest expiry is first in the heap", fast.next_refresh()[1] == "dave@example.com"))
+
+    before = len(server.requests)
+    fast.start_scheduler()
+    time.sleep(1.5)
+    fast.stop_scheduler()
+    dave = storage.get_oauth_token("dave@example.com", "google")
+    results.append(check("scheduler refreshed dave before expiry, nobody else",
+                         dave['access_token'].startswith('access-') and len(server.requests) == before + 1))
+
+    print("-" * 50)
+    print(f"stats: {manager.stats}")
+    server.httpd.shutdown()
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
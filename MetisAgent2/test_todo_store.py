@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Todo Store test - SQLite todo deposu ve değişiklik akışı kontrolü
+
+Geçici bir veritabanı üzerinde:
+  1. Filtreler kullanıcıya göre ayrılır, workflow todo'ları eskiden yeniye döner
+  2. Durum güncellemesi eski durumu döner, olmayan todo için None
+  3. Her commit değişiklik akışına sırayla yazılır ve abonelere iletilir
+  4. changes_since kullanıcıya göre filtreler; hatalı abone diğerlerini bozmaz
+  5. Eşzamanlı güncellemeler kaybolmaz, seq değerleri tekrarlanmaz
+  6. Eski <user>_todos.json bir kez içe aktarılır, mevcut satırlar korunur
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from tools.internal.todo_store import TodoStore, get_todo_store
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def todo(todo_id: str, user_id: str, workflow_id: str = None, status: str = "pending", created_at: str = None):
+    now = created_at or datetime.now().isoformat()
+    return {"id": todo_id, "content": f"Todo {todo_id}", "status": status, "priority": "medium",
+            "created_at": now, "updated_at": now, "user_id": user_id, "workflow_id": workflow_id, "step_id": None}
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="todo_store_test_")
+    store = TodoStore(os.path.join(workdir, "todos.db"))
+    received = []
+    unsubscribe = store.subscribe(received.append)
+    store.subscribe(lambda change: 1 / 0)  # Failing listener must not break the others
+    results = []
+
+    # 1. Queries
+    store.upsert_many([
+        todo("t1", "alice", "wf-1", created_at="2025-07-01T10:00:00"),
+        todo("t2", "alice", "wf-1", created_at="2025-07-01T10:05:00"),
+        todo("t3", "alice", None, status="completed", created_at="2025-07-01T11:00:00"),
+        todo("t1", "bob", "wf-9"),
+    ])
+    results.append(check("same todo id for two users are separate rows",
+                         store.count("alice") == 3 and store.count("bob") == 1))
+    results.append(check("workflow todos oldest first, query newest first",
+                         [t["id"] for t in store.workflow_todos("alice", "wf-1")] == ["t1", "t2"]
+                         and [t["id"] for t in store.query("alice")] == ["t3", "t2", "t1"]))
+    results.append(check("status filter", [t["id"] for t in store.query("alice", status="completed")] == ["t3"]))
+
+    # 2. Status updates
+    updated = store.update_status("alice", "t1", "in_progress")
+    results.append(check("update_status returns old status and touches one row",
+                         updated["old_status"] == "pending" and updated["todo"]["status"] == "in_progress"
+                         and store.get("bob", "t1")["status"] == "pending"))
+    results.append(check("missing todo -> None", store.update_status("alice", "nope", "completed") is None))
+
+    # 3. Change feed
+    events = [change["event"] for change in received]
+    seqs = [change["seq"] for change in received]
+    results.append(check("subscribers get one change per row, in commit order",
+                         events == ["created"] * 4 + ["status_updated"] and seqs == sorted(seqs)
+                         and received[-1]["data"]["old_status"] == "pending"))
+    cleared = store.clear("alice", workflow_id="wf-1")
+    results.append(check("clear deletes the workflow's todos and logs one change",
+                         [t["id"] for t in cleared] == ["t1", "t2"] and received[-1]["event"] == "cleared"
+                         and received[-1]["data"]["todo_ids"] == ["t1", "t2"]))
+
+    # 4. Catch-up
+    alice_changes = store.changes_since("alice", seqs[1])
+    results.append(check("changes_since returns only that user's later changes",
+                         all(change["user_id"] == "alice" for change in alice_changes)
+                         and [c["event"] for c in alice_changes] == ["created", "status_updated", "cleared"]
+                         and store.latest_seq() == received[-1]["seq"]))
+    unsubscribe()
+    store.delete("alice", "t3")
+    results.append(check("unsubscribed listener gets nothing more", received[-1]["event"] == "cleared"))
+
+    # 5. Concurrency
+    store.upsert_many([todo(f"c{i}", "carol", "wf-c") for i in range(40)])
+    before = store.latest_seq()
+
+    def worker(offset):
+        for i in range(offset, 40, 4):
+            store.update_status("carol", f"c{i}", "completed")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    feed = store.changes_since("carol", before)
+    results.append(check("4 threads x 10 updates -> all applied, 40 unique seqs",
+                         len(store.query("carol", status="completed")) == 40
+                         and len({change["seq"] for change in feed}) == 40))
+
+    # 6. Legacy import
+    legacy_path = os.path.join(workdir, "dave_todos.json")
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump([{"id": "d1", "content": "Eski görev"}, {"id": "d2", "content": "İkinci", "status": "completed"},
+                   {"content": "id yok"}], f, ensure_ascii=False)
+    store.upsert_many([dict(todo("d1", "dave"), content="Yeni görev")])
+    counts = store.import_json_dir(workdir)
+    results.append(check("JSON imported once, existing rows win",
+                         counts == {"dave": 1} and store.get("dave", "d1")["content"] == "Yeni görev"
+                         and store.get("dave", "d2")["status"] == "completed"
+                         and os.path.exists(legacy_path + ".migrated")
+                         and store.import_user_json("dave", legacy_path + ".migrated") is None))
+
+    shared = get_todo_store(os.path.join(workdir, "shared.db"))
+    results.append(check("get_todo_store shares one store per file",
+                         shared is get_todo_store(os.path.join(workdir, ".", "shared.db"))))
+
+    store.close()
+    shared.close()
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
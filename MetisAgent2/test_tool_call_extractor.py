@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tool Call Extractor test - nested, partial and streamed tool_calls JSON
+
+  1. Prose, code and unrelated JSON are skipped; braces inside strings do not count
+  2. Nested keyed objects: the outer one wins even when its key comes last
+  3. Inner candidates are used when the outer object does not parse
+  4. Partial / unterminated input does not swallow later objects
+  5. Streaming in any chunk size gives the same result as the whole text
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from app.tool_call_extractor import ToolCallExtractor
+
+CALL = {"tool": "command_executor", "action": "execute", "params": {"command": "echo '{not json}'"}}
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def streamed(text: str, size: int):
+    extractor = ToolCallExtractor()
+    found = []
+    for start in range(0, len(text), size):
+        found.extend(extractor.feed(text[start:start + size]))
+    return found + extractor.finish()
+
+
+def main():
+    results = []
+    keyed = json.dumps({"response": "ok", "tool_calls": [CALL]})
+
+    # 1. Skipping
+    text = f'Here is code: function() {{ return "}}"; }} and {{"other": 1}}\n```json\n{keyed}\n```'
+    results.append(check("only the tool_calls object is returned",
+                         ToolCallExtractor.extract_all(text) == [json.loads(keyed)]))
+    results.append(check("no tool_calls -> nothing", ToolCallExtractor.extract_all('{"a": {"b": "}"}} text') == []))
+
+    # 2. Outer keyed object wins, whichever order its members come in
+    key_last = '{"resp": {"tool_calls": [1]}, "tool_calls": [2]}'
+    key_first = '{"tool_calls": [2], "resp": {"tool_calls": [1]}}'
+    results.append(check("outer object wins when its key comes after the inner one",
+                         ToolCallExtractor.extract_all(key_last) == [json.loads(key_last)]))
+    results.append(check("outer object wins when its key comes first",
+                         ToolCallExtractor.extract_all(key_first) == [json.loads(key_first)]))
+    siblings = '{"a": {"tool_calls": [1]}, "b": {"tool_calls": [2]}} {"tool_calls": [3]}'
+    results.append(check("unkeyed wrapper yields its keyed children in order, then later objects",
+                         [obj["tool_calls"] for obj in ToolCallExtractor.extract_all(siblings)] == [[1], [2], [3]]))
+
+    # 3. Fallback to inner candidates
+    broken_outer = '{"resp": {"tool_calls": [1]}, "tool_calls": [oops]}'
+    results.append(check("inner object used when the outer one fails to parse",
+                         ToolCallExtractor.extract_all(broken_outer) == [{"tool_calls": [1]}]))
+
+    # 4. Partial input
+    unterminated = '{"plan": "start", "steps": [ {"tool_calls": [1]} '
+    results.append(check("keyed object inside an unterminated wrapper is found at finish",
+                         ToolCallExtractor.extract_all(unterminated) == [{"tool_calls": [1]}]))
+    stray_quote = 'He said "hi\n' + keyed
+    results.append(check("a stray quote ends at the newline",
+                         ToolCallExtractor.extract_all(stray_quote) == [json.loads(keyed)]))
+    results.append(check("truncated object yields nothing",
+                         ToolCallExtractor.extract_all(keyed[:-5]) == []))
+
+    # 5. Streaming
+    samples = [text, key_last, key_first, siblings, broken_outer, unterminated, stray_quote]
+    expected = [ToolCallExtractor.extract_all(sample) for sample in samples]
+    same = all(streamed(sample, size) == want
+               for sample, want in zip(samples, expected) for size in (1, 2, 3, 7, 64))
+    results.append(check("chunk sizes 1..64 give the same result as the whole text", same))
+
+    extractor = ToolCallExtractor()
+    early = extractor.feed("Let me check. " + keyed)
+    results.append(check("top-level object is emitted as soon as it closes",
+                         early == [json.loads(keyed)] and extractor.feed(" done") == []))
+
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
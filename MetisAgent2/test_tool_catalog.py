@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tool Catalog test - MCPToolRegistry'nin versiyonlu, değişmez katalog snapshot'ı
+
+Bellek içi sahte araçlarla:
+  1. register/unregister/enable/disable generation'ı artırır; değişmeyen registry aynı snapshot'ı verir
+  2. Snapshot donmuştur; list_tools değiştirilebilir kopya döner
+  3. Prompt JSON'u ve action index yalnızca etkin araçları içerir
+  4. Kullanıcı bazlı filtre (set_user_tools / for_user) generation'a bağlıdır
+  5. Araçlar graph memory'ye senkronlanınca katalog geçersiz kılınır
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from app.mcp_core import MCPTool, MCPToolRegistry, MCPToolResult, registry, thaw
+from tool_capability_manager import ToolCapabilityManager
+
+
+def make_tool(name: str, *actions: str) -> MCPTool:
+    tool = MCPTool(name, f"{name} aracı")
+    for action in actions:
+        tool.register_action(action, lambda **kwargs: kwargs, required_params=["target"])
+    return tool
+
+
+class FakeGraphMemory:
+    """store_tool_capability çağrılarını sayar"""
+
+    def __init__(self):
+        self.stored = []
+
+    def execute_action(self, action_name, **kwargs):
+        self.stored.append((kwargs.get("user_id"), kwargs.get("tool_name")))
+        return MCPToolResult(success=True)
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    tools = MCPToolRegistry()
+    results = []
+
+    # 1. Generation
+    start = tools.catalog()
+    tools.register_tool(make_tool("gmail_helper", "list_emails", "send_email"))
+    after_register = tools.catalog()
+    tools.register_tool(make_tool("command_executor", "execute", "list_files"))
+    tools.set_tool_enabled("command_executor", False)
+    after_disable = tools.catalog()
+    tools.set_tool_enabled("command_executor", False)
+    tools.set_tool_enabled("command_executor", True)
+    after_enable = tools.catalog()
+    tools.register_tool(make_tool("selenium_browser", "navigate", "send_email"))
+    tools.unregister_tool("selenium_browser")
+    after_unregister = tools.catalog()
+    generations = [c.generation for c in (start, after_register, after_disable, after_enable, after_unregister)]
+    results.append(check(f"generation bumps on every change: {generations}",
+                         generations == [0, 1, 3, 4, 6]))
+    results.append(check("unchanged registry returns the same snapshot; unregister of unknown tool keeps it",
+                         tools.catalog() is after_unregister and not tools.unregister_tool("missing")
+                         and tools.catalog() is after_unregister))
+
+    # 2. Frozen snapshot, mutable copies
+    entry = after_enable.by_name["gmail_helper"]
+    writes = [lambda: entry.__setitem__("description", "değişti"),
+              lambda: entry["actions"].pop("send_email"),
+              lambda: entry["actions"]["list_emails"]["required_params"].append("x")]
+    frozen = 0
+    for write in writes:
+        try:
+            write()
+        except (TypeError, AttributeError):
+            frozen += 1
+    listed = tools.list_tools()
+    listed[0]["description"] = "değişti"
+    listed[0]["actions"]["list_emails"]["required_params"].append("x")
+    snapshot = tools.catalog().by_name["gmail_helper"]
+    results.append(check("snapshot entries and nested actions are read-only",
+                         frozen == len(writes) and isinstance(snapshot["capabilities"], tuple)))
+    results.append(check("list_tools copies can be edited without touching the snapshot",
+                         snapshot["description"] == "gmail_helper aracı"
+                         and snapshot["actions"]["list_emails"]["required_params"] == ("target",)
+                         and thaw(snapshot) == json.loads(json.dumps(thaw(snapshot)))))
+
+    # 3. Prompt views
+    tools.set_tool_enabled("command_executor", False)
+    catalog = tools.catalog()
+    description = json.loads(catalog.description_json)
+    results.append(check("prompt JSON and summaries list enabled tools only",
+                         list(description) == ["gmail_helper"]
+                         and description["gmail_helper"]["actions"] == ["list_emails", "send_email"]
+                         and [s["name"] for s in catalog.summaries] == ["gmail_helper"]))
+    results.append(check("action index skips disabled tools",
+                         catalog.tools_for_action("send_email") == ("gmail_helper",)
+                         and catalog.tools_for_action("execute") == ()))
+    tools.set_tool_enabled("command_executor", True)
+
+    # 4. Per-user views
+    tools.register_tool(make_tool("visual_creator", "generate_image"))
+    before = tools.catalog().generation
+    tools.set_user_tools("alice", ["gmail_helper", "visual_creator", "uninstalled_tool"])
+    alice_catalog = tools.catalog()
+    alice_view = alice_catalog.for_user("alice")
+    results.append(check("allowlisted user sees only allowed, installed tools; others see all",
+                         alice_catalog.generation == before + 1
+                         and [s["name"] for s in alice_view] == ["gmail_helper", "visual_creator"]
+                         and [s["name"] for s in alice_catalog.for_user("bob")]
+                         == ["gmail_helper", "command_executor", "visual_creator"]
+                         and alice_catalog.for_user(None) is alice_catalog.summaries))
+    results.append(check("per-user view is computed once per snapshot",
+                         alice_catalog.for_user("alice") is alice_view))
+    tools.set_tool_enabled("visual_creator", False)
+    results.append(check("per-user view follows the next generation",
+                         [s["name"] for s in tools.catalog().for_user("alice")] == ["gmail_helper"]
+                         and [s["name"] for s in alice_view] == ["gmail_helper", "visual_creator"]))
+    tools.set_user_tools("alice", None)
+    results.append(check("removing the allowlist restores the full view",
+                         len(tools.catalog().for_user("alice")) == 2))
+
+    # 5. Sync to graph memory
+    manager = ToolCapabilityManager()
+    manager.graph_memory = FakeGraphMemory()
+    generation = registry.catalog().generation
+    synced = manager.sync_all_tools_to_memory("alice")
+    results.append(check("sync_all_tools_to_memory invalidates the shared catalog",
+                         synced and manager.graph_memory.stored
+                         and registry.catalog().generation == generation + 1))
+    generation = registry.catalog().generation
+    manager.add_tool_for_user("alice", "gmail_helper", thaw(after_enable.by_name["gmail_helper"]))
+    results.append(check("add_tool_for_user invalidates the shared catalog",
+                         registry.catalog().generation == generation + 1))
+
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
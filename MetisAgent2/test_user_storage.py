@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+UserStorage test - havuzlu bağlantılar ve çözülmüş değer önbelleği kontrolü
+
+Geçici bir dizinde (users.db ve storage.key orada oluşturulur):
+  1. Bir örnek üzerinden yazma, aynı veritabanındaki ikinci örneğin önbelleğini geçersiz kılar
+  2. get_properties ve find_users_with_property tekil sorgularla aynı sonucu verir
+  3. ConnectionPool birden çok iş parçacığından sınırı aşmadan kullanılır
+  4. UserStorage eşzamanlı okuma/yazmalarda tutarlı kalır
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+WORKDIR = tempfile.mkdtemp(prefix="user_storage_test_")
+os.chdir(WORKDIR)  # storage.key ve modül düzeyindeki users.db buraya yazılır
+
+from tools.internal.sqlite_pool import ConnectionPool
+from tools.internal.user_storage import UserStorage
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    db_path = os.path.join(WORKDIR, "shared.db")
+    first = UserStorage(db_path)
+    second = UserStorage(db_path)
+    results = []
+
+    # 1. Örnekler arası geçersiz kılma
+    first.set_property("alice", "api_key_openai", {"api_key": "sk-old"}, encrypt=True, property_type="json")
+    warm = [second.get_property("alice", "api_key_openai") for _ in range(3)]
+    hits_before = second.cache_stats["hits"]
+    first.set_property("alice", "api_key_openai", {"api_key": "sk-new"}, encrypt=True, property_type="json")
+    fresh = second.get_property("alice", "api_key_openai")
+    results.append(check("second instance serves warm reads from cache, then sees the other instance's write",
+                         warm == [{"api_key": "sk-old"}] * 3 and hits_before == 2
+                         and fresh == {"api_key": "sk-new"}))
+    first.set_property("alice", "api_key_openai", "plain", property_type="string")
+    plain = second.get_property("alice", "api_key_openai")
+    first.delete_property("alice", "api_key_openai")
+    results.append(check("switch to plaintext and delete are visible to the second instance",
+                         plain == "plain" and second.get_property("alice", "api_key_openai", "gone") == "gone"
+                         and second.get_properties("alice", ["api_key_openai"], "gone") == {"api_key_openai": "gone"}))
+
+    # 2. Toplu okumalar tekil okumalarla aynı
+    for index, user_id in enumerate(["alice", "bob", "carol", "dave"]):
+        first.set_property(user_id, "display_name", user_id.title())
+        first.set_property(user_id, "login_count", index, property_type="int")
+        first.set_property(user_id, "beta", index % 2 == 0, property_type="bool")
+        if index % 2:
+            first.set_property(user_id, "oauth_google", {"token": f"t-{user_id}"}, encrypt=True, property_type="json")
+    names = ["display_name", "login_count", "beta", "oauth_google", "missing", "display_name"]
+    mismatched = [user_id for user_id in second.list_users()
+                  if second.get_properties(user_id, names, "-")
+                  != {name: second.get_property(user_id, name, "-") for name in names}]
+    results.append(check("get_properties matches get_property for every user, missing names get the default",
+                         not mismatched and second.get_properties("bob", names)["oauth_google"] == {"token": "t-bob"}
+                         and second.get_properties("bob", []) == {}))
+    expected = sorted(user_id for user_id in second.list_users()
+                      if second.get_property(user_id, "oauth_google") is not None)
+    results.append(check("find_users_with_property matches a per-user scan",
+                         second.find_users_with_property("oauth_google") == expected == ["bob", "dave"]
+                         and second.find_users_with_property("missing") == []))
+
+    # 3. Havuz çoklu iş parçacığında
+    pool = ConnectionPool(os.path.join(WORKDIR, "pool.db"), max_size=3)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE events (worker INTEGER, n INTEGER)")
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    in_use, peak, errors = [0], [0], []
+    counter_lock = threading.Lock()
+
+    def writer(worker):
+        try:
+            for n in range(50):
+                with pool.connection() as conn:
+                    with counter_lock:
+                        in_use[0] += 1
+                        peak[0] = max(peak[0], in_use[0])
+                    conn.execute("INSERT INTO events VALUES (?, ?)", (worker, n))
+                    with counter_lock:
+                        in_use[0] -= 1
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with pool.connection() as conn:
+        rows = conn.execute("SELECT COUNT(*), COUNT(DISTINCT worker) FROM events").fetchone()
+    results.append(check(f"8 threads x 50 writes through a pool of 3 (peak {peak[0]} connections)",
+                         not errors and rows == (400, 8) and peak[0] <= 3 and pool._created <= 3
+                         and journal_mode == "wal"))
+    try:
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO events VALUES (99, 0)")
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    with pool.connection() as conn:
+        rolled_back = conn.execute("SELECT COUNT(*) FROM events WHERE worker = 99").fetchone()[0] == 0
+    pool.close()
+    results.append(check("an error inside the block rolls back, close() empties the pool",
+                         rolled_back and pool._created == 0))
+
+    # 4. UserStorage eşzamanlı kullanım
+    def user_worker(index):
+        storage = first if index % 2 else second
+        try:
+            for n in range(30):
+                user_id = f"user-{index}"
+                storage.set_property(user_id, "token", {"n": n}, encrypt=True, property_type="json")
+                if storage.get_property(user_id, "token") != {"n": n}:
+                    errors.append(f"{user_id}: stale read at {n}")
+                storage.get_properties("bob", names)
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=user_worker, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(check("6 threads on two instances: every read sees its own latest write",
+                         not errors and all(first.get_property(f"user-{i}", "token") == {"n": 29}
+                                            for i in range(6))))
+
+    print("-" * 50)
+    print(f"cache: first={first.cache_stats} second={second.cache_stats}")
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -70,6 +70,9 @@ class ToolCapabilityManager:
                     logger.error(f"Error syncing tool {tool_info.get('name', 'unknown')}: {e}")
             
             logger.info(f"Successfully synced {success_count}/{len(all_tools)} tools to graph memory")
+            if success_count:
+                # User tool prompts changed: consumers keyed on the catalog generation must refresh
+                registry.invalidate_catalog()
             return success_count == len(all_tools)
             
         except Exception as e:
@@ -138,6 +141,8 @@ class ToolCapabilityManager:
             
             if result.success:
                 logger.info(f"Added tool {tool_name} for user {user_id}")
+                # User tool prompts changed: consumers keyed on the catalog generation must refresh
+                registry.invalidate_catalog()
                 return True
             else:
                 logger.error(f"Failed to add tool {tool_name}: {result.error}")
@@ -0,0 +1,355 @@
+"""
+Browser Pool - Warm, leased browser sessions shared by the browser tools
+
+A pool keeps up to `max_size` started browser sessions (Selenium drivers or
+Playwright contexts). Each session is isolated (own profile / context) and is
+leased to one key at a time - a workflow id, conversation id or user id - so
+concurrent workflows never share a driver and rarely pay browser startup.
+
+The pool itself is driver-agnostic: callers pass `factory`, `closer` and an
+optional `health_check`, which keeps it testable offline with local
+file:// or http.server pages.
+"""
+
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+_lease_key: contextvars.ContextVar = contextvars.ContextVar("browser_lease_key", default=None)
+
+
+def current_lease_key() -> str:
+    """Lease key of the running workflow; falls back to the current thread"""
+    key = _lease_key.get()
+    return key if key else f"thread-{threading.get_ident()}"
+
+
+@contextmanager
+def lease_scope(key: Optional[str]):
+    """Run browser tool actions on behalf of `key` (workflow, conversation or user)"""
+    token = _lease_key.set(key)
+    try:
+        yield
+    finally:
+        _lease_key.reset(token)
+
+
+class PooledBrowser:
+    """One warm browser session owned by a pool"""
+
+    def __init__(self, member_id: int, handle: Any):
+        self.member_id = member_id
+        self.handle = handle
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.lease_key: Optional[str] = None
+        self.last_lease_key: Optional[str] = None
+        self.lease_count = 0     # Nested acquires by the same key
+        self.resetting = False   # Released but still being checked/reset; not leasable yet
+        self.uses = 0
+        self.state: Dict[str, Any] = {}  # Per-member flags, e.g. saved login state
+
+    @property
+    def available(self) -> bool:
+        return self.lease_key is None and not self.resetting
+
+    def to_dict(self) -> Dict:
+        return {
+            'member_id': self.member_id,
+            'lease_key': self.lease_key,
+            'resetting': self.resetting,
+            'uses': self.uses,
+            'idle_seconds': round(time.time() - self.last_used, 1),
+            'state': sorted(self.state)
+        }
+
+
+class BrowserPoolError(Exception):
+    """Raised when no session can be leased"""
+
+
+class BrowserPool:
+    """Bounded pool of warm browser sessions with per-key leases
+
+    - acquire(key) returns the session already leased to `key`, else an idle
+      one (preferring the session `key` used last), else starts a new one while
+      below `max_size`, else waits for a release.
+    - Sessions failing `health_check` on acquire/release are closed and
+      replaced (crash recycling); `max_uses` recycles long-lived sessions.
+    - A released session stays reserved until its health check and `reset`
+      finish, so the next lessee never sees the previous lessee's state.
+    - Idle sessions are closed after `idle_timeout`; leases untouched for
+      `lease_timeout` are treated as abandoned and reclaimed.
+    """
+
+    def __init__(self, name: str, factory: Callable[[int], Any], closer: Callable[[Any], None],
+                 health_check: Callable[[Any], bool] = None, reset: Callable[[PooledBrowser], None] = None,
+                 max_size: int = 3, idle_timeout: float = 300, lease_timeout: float = 1800,
+                 max_uses: int = None):
+        self.name = name
+        self.factory = factory
+        self.closer = closer
+        self.health_check = health_check
+        self.reset = reset
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.lease_timeout = lease_timeout
+        self.max_uses = max_uses
+
+        self._members: List[PooledBrowser] = []
+        self._leases: Dict[str, PooledBrowser] = {}
+        self._starting = 0
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._reaper: Optional[threading.Thread] = None
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0, 'evicted': 0, 'waits': 0}
+
+    # --- Leasing -------------------------------------------------------
+
+    def acquire(self, key: str, timeout: float = 60) -> PooledBrowser:
+        """Lease a session to `key`; re-entrant for the same key"""
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise BrowserPoolError(f"Browser pool '{self.name}' is closed")
+                self._reclaim_locked()
+
+                member = self._leases.get(key)
+                if member:
+                    member.lease_count += 1
+                    member.last_used = time.time()
+                    return member
+
+                member = self._pick_idle_locked(key)
+                if member:
+                    self._lease_locked(member, key)
+                    break
+
+                if len(self._members) + self._starting < self.max_size:
+                    self._starting += 1
+                    member = None
+                    break
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise BrowserPoolError(
+                        f"Browser pool '{self.name}' exhausted ({self.max_size} sessions leased)"
+                    )
+                self.stats['waits'] += 1
+                self._cond.wait(remaining)
+
+        if member is not None:
+            # Health check outside the lock: it talks to the browser
+            if self._healthy(member):
+                self.stats['reused'] += 1
+                return member
+            self._drop(member, reason="failed health check")
+            return self.acquire(key, max(deadline - time.time(), 0))
+
+        return self._start_member(key)
+
+    def release(self, key: str, discard: bool = False):
+        """End the lease held by `key`; `discard` closes the session (e.g. after a crash)"""
+        with self._cond:
+            member = self._leases.get(key)
+            if not member:
+                return
+            member.lease_count -= 1
+            if member.lease_count > 0 and not discard:
+                return
+            del self._leases[key]
+            member.lease_key = None
+            member.resetting = True
+            member.last_used = time.time()
+
+        # Health check and reset talk to the browser: run them outside the lock,
+        # with the member reserved so acquire cannot hand it out half-reset
+        worn_out = self.max_uses is not None and member.uses >= self.max_uses
+        if discard or worn_out or not self._healthy(member):
+            self._drop(member, reason="discarded" if discard else "recycled")
+            return
+        if self.reset:
+            try:
+                self.reset(member)
+            except Exception as e:
+                logger.warning(f"[{self.name}] Session reset failed, recycling: {e}")
+                self._drop(member, reason="reset failed")
+                return
+        with self._cond:
+            member.resetting = False
+            member.last_used = time.time()
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, key: str, timeout: float = 60, discard_on: Tuple[Type[BaseException], ...] = ()):
+        """Context manager around acquire/release; a crashed session, or one whose
+        block raised one of `discard_on` (e.g. a timeout), is recycled"""
+        member = self.acquire(key, timeout)
+        crashed = False
+        try:
+            yield member
+        except Exception as e:
+            crashed = isinstance(e, discard_on) or not self._healthy(member)
+            raise
+        finally:
+            self.release(key, discard=crashed)
+
+    def leased(self, key: str) -> Optional[PooledBrowser]:
+        """Session currently leased to `key`, without acquiring"""
+        with self._cond:
+            member = self._leases.get(key)
+            if member:
+                member.last_used = time.time()
+            return member
+
+    def warm(self, count: int = 1) -> int:
+        """Pre-start idle sessions up to `count` (bounded by max_size)"""
+        started = 0
+        while True:
+            with self._cond:
+                idle = sum(1 for member in self._members if member.available)
+                if idle + self._starting >= count or len(self._members) + self._starting >= self.max_size:
+                    return started
+                self._starting += 1
+            member = self._start_member(None)
+            with self._cond:
+                self._cond.notify()
+            started += 1 if member else 0
+
+    # --- Maintenance ---------------------------------------------------
+
+    def evict_idle(self) -> int:
+        """Close idle sessions past idle_timeout and reclaim abandoned leases"""
+        with self._cond:
+            victims = self._reclaim_locked()
+        return len(victims)
+
+    def close(self):
+        """Close every session; leased sessions are closed too"""
+        with self._cond:
+            self._closed = True
+            members, self._members = self._members, []
+            self._leases.clear()
+            self._cond.notify_all()
+        for member in members:
+            self._close_handle(member)
+
+    def info(self) -> Dict:
+        with self._cond:
+            return {
+                'name': self.name,
+                'size': len(self._members),
+                'max_size': self.max_size,
+                'leased': len(self._leases),
+                'members': [member.to_dict() for member in self._members],
+                'stats': dict(self.stats)
+            }
+
+    # --- Internals -----------------------------------------------------
+
+    def _start_member(self, key: Optional[str]) -> Optional[PooledBrowser]:
+        member_id = next(self._ids)
+        try:
+            started = time.perf_counter()
+            handle = self.factory(member_id)
+            logger.info(f"[{self.name}] Started session {member_id} in {time.perf_counter() - started:.2f}s")
+        except Exception:
+            with self._cond:
+                self._starting -= 1
+                self._cond.notify()
+            raise
+
+        member = PooledBrowser(member_id, handle)
+        with self._cond:
+            self._starting -= 1
+            self._members.append(member)
+            self.stats['created'] += 1
+            if key is not None:
+                self._lease_locked(member, key)
+        self._ensure_reaper()
+        return member
+
+    def _pick_idle_locked(self, key: str) -> Optional[PooledBrowser]:
+        idle = [member for member in self._members if member.available]
+        if not idle:
+            return None
+        for member in idle:
+            if member.last_lease_key == key:
+                return member
+        return max(idle, key=lambda member: member.last_used)
+
+    def _lease_locked(self, member: PooledBrowser, key: str):
+        member.lease_key = key
+        member.last_lease_key = key
+        member.lease_count = 1
+        member.uses += 1
+        member.last_used = time.time()
+        self._leases[key] = member
+
+    def _reclaim_locked(self) -> List[PooledBrowser]:
+        now = time.time()
+        victims = []
+        for member in self._members:
+            idle_for = now - member.last_used
+            if member.available and idle_for > self.idle_timeout:
+                victims.append(member)
+            elif member.lease_key is not None and idle_for > self.lease_timeout:
+                logger.warning(f"[{self.name}] Reclaiming abandoned lease '{member.lease_key}'")
+                self._leases.pop(member.lease_key, None)
+                victims.append(member)
+        if victims:
+            self._members = [member for member in self._members if member not in victims]
+            self.stats['evicted'] += len(victims)
+            self._cond.notify_all()
+            # Closing talks to the browser; do it off the caller's path
+            threading.Thread(target=lambda: [self._close_handle(m) for m in victims], daemon=True).start()
+        return victims
+
+    def _healthy(self, member: PooledBrowser) -> bool:
+        if not self.health_check:
+            return True
+        try:
+            return bool(self.health_check(member.handle))
+        except Exception:
+            return False
+
+    def _drop(self, member: PooledBrowser, reason: str):
+        with self._cond:
+            if member in self._members:
+                self._members.remove(member)
+            if member.lease_key is not None and self._leases.get(member.lease_key) is member:
+                del self._leases[member.lease_key]
+            self.stats['recycled'] += 1
+            self._cond.notify()
+        logger.info(f"[{self.name}] Session {member.member_id} {reason}")
+        self._close_handle(member)
+
+    def _close_handle(self, member: PooledBrowser):
+        try:
+            self.closer(member.handle)
+        except Exception as e:
+            logger.debug(f"[{self.name}] Error closing session {member.member_id}: {e}")
+
+    def _ensure_reaper(self):
+        if self._reaper is not None or not self.idle_timeout:
+            return
+        interval = max(min(self.idle_timeout, self.lease_timeout) / 2, 1)
+
+        def reap():
+            while not self._closed:
+                time.sleep(interval)
+                try:
+                    self.evict_idle()
+                except Exception as e:
+                    logger.debug(f"[{self.name}] Idle eviction error: {e}")
+
+        self._reaper = threading.Thread(target=reap, name=f"{self.name}-reaper", daemon=True)
+        self._reaper.start()
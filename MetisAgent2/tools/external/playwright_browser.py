@@ -3,6 +3,7 @@ Playwright Browser Tool - Modern web automation
 """
 
 import asyncio
+import concurrent.futures
 import time
 import os
 import logging
@@ -10,14 +11,92 @@ import base64
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import sys
+import threading
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.mcp_core import MCPTool, MCPToolResult
 
 from playwright.async_api import async_playwright, Browser, Page
 
+from .browser_pool import BrowserPool, BrowserPoolError, PooledBrowser, current_lease_key
+
 logger = logging.getLogger(__name__)
 
+BROWSER_STATE_DIR = os.getenv("PLAYWRIGHT_STATE_DIR", "browser_state")
+
+
+class _PlaywrightHost:
+    """Background event loop that owns the Playwright driver and one Chromium per headless mode
+
+    Pool members are browser contexts on these browsers, so leasing a member
+    costs a context (milliseconds) instead of a browser launch.
+    """
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright = None
+        self._browsers: Dict[bool, Browser] = {}
+        self._lock = threading.Lock()
+    
+    def run(self, coro, timeout: float = 120):
+        """Run a coroutine on the host loop from any thread; on timeout the coroutine is cancelled"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="playwright-host", daemon=True)
+                self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Otherwise it keeps driving its context after the caller gave up
+            future.cancel()
+            raise
+    
+    async def browser(self, headless: bool) -> Browser:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        browser = self._browsers.get(headless)
+        if browser is None or not browser.is_connected():
+            # Launch browser - WSL2 fix
+            browser = await self._playwright.chromium.launch(
+                headless=headless,
+                args=[
+                    '--no-sandbox',
+                    '--disable-dev-shm-usage',
+                    '--disable-gpu',
+                    '--disable-web-security',
+                    '--disable-features=VizDisplayCompositor',
+                    '--single-process'
+                ],
+                timeout=30000
+            )
+            self._browsers[headless] = browser
+        return browser
+    
+    async def new_context(self, headless: bool, state_path: str) -> Dict:
+        browser = await self.browser(headless)
+        storage_state = state_path if os.path.exists(state_path) else None
+        context = await browser.new_context(storage_state=storage_state)
+        return {"context": context, "state_path": state_path}
+    
+    @staticmethod
+    async def alive(handle) -> bool:
+        context = handle["context"]
+        return context.browser is not None and context.browser.is_connected()
+    
+    async def shutdown(self):
+        for browser in self._browsers.values():
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers = {}
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
 
 class PlaywrightGeminiScraper(MCPTool):
     """Modern Gemini scraper using Playwright"""
@@ -28,8 +107,38 @@ class PlaywrightGeminiScraper(MCPTool):
             description="Modern Gemini image scraping with Playwright",
             version="1.0.0"
         )
+        self._host = _PlaywrightHost()
+        self._pools: Dict[bool, BrowserPool] = {}
+        self._pools_lock = threading.Lock()
+        self.pool_size = int(os.getenv("PLAYWRIGHT_POOL_SIZE", "2"))
         self._register_actions()
     
+    def _get_pool(self, headless: bool) -> BrowserPool:
+        """Warm context pool per headless mode; login state is shared via one storage-state file"""
+        headless = bool(headless)
+        with self._pools_lock:
+            pool = self._pools.get(headless)
+            if pool is None:
+                os.makedirs(BROWSER_STATE_DIR, exist_ok=True)
+                state_path = os.path.join(BROWSER_STATE_DIR, f"gemini_{'headless' if headless else 'headed'}.json")
+                pool = BrowserPool(
+                    name=f"playwright-{'headless' if headless else 'headed'}",
+                    factory=lambda member_id: self._host.run(self._host.new_context(headless, state_path)),
+                    closer=lambda handle: self._host.run(handle["context"].close()),
+                    health_check=lambda handle: self._host.run(self._host.alive(handle)),
+                    max_size=self.pool_size
+                )
+                self._pools[headless] = pool
+            return pool
+    
+    def shutdown_pools(self):
+        """Close pooled contexts and the hosted browsers (application shutdown)"""
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+        self._host.run(self._host.shutdown())
+    
     def _register_actions(self):
         """Register MCP actions"""
         self.register_action(
@@ -39,212 +148,204 @@ class PlaywrightGeminiScraper(MCPTool):
             optional_params=["save_path", "headless"]
         )
     
-    async def _scrape_async(self, prompt: str, save_path: str = None, headless: bool = True) -> Dict:
-        """Async Gemini scraping logic"""
-        async with async_playwright() as p:
-            # Launch browser - WSL2 fix
-            browser = await p.chromium.launch(
-                headless=headless,
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor',
-                    '--single-process'
-                ],
-                timeout=30000
-            )
+    async def _scrape_async(self, prompt: str, save_path: str = None, headless: bool = True,
+                            member: PooledBrowser = None) -> Dict:
+        """Async Gemini scraping logic, run on a pooled browser context"""
+        context = member.handle["context"]
+        page = await context.new_page()
+        try:
+            # Navigate to Gemini with extended timeout
+            await page.goto("https://gemini.google.com", wait_until="domcontentloaded", timeout=60000)
+            logger.info("Gemini sayfası yüklendi")
+            
+            # Wait for the page to fully load
+            await page.wait_for_timeout(3000)
             
+            # Check if login is required; only once per pool member - the context
+            # keeps its cookies, and new members load the saved storage state
             try:
-                page = await browser.new_page()
-                
-                # Navigate to Gemini with extended timeout
-                await page.goto("https://gemini.google.com", wait_until="domcontentloaded", timeout=60000)
-                logger.info("Gemini sayfası yüklendi")
-                
-                # Wait for the page to fully load
-                await page.wait_for_timeout(3000)
-                
-                # Check if login is required
-                try:
-                    # Look for sign-in button or login indicators
-                    login_selectors = [
-                        'button[data-test-id*="sign-in"]',
-                        'a[href*="accounts.google.com"]',
-                        'button:has-text("Sign in")',
-                        'a:has-text("Sign in")',
-                        '[aria-label*="Sign in"]'
-                    ]
-                    
-                    login_needed = False
-                    for selector in login_selectors:
-                        try:
-                            login_element = await page.wait_for_selector(selector, timeout=2000)
-                            if login_element:
-                                login_needed = True
-                                logger.warning(f"Login gerekli - bulunan element: {selector}")
-                                break
-                        except:
-                            continue
-                    
-                    if login_needed:
-                        logger.info("Login gerekli - otomatik login başlatılıyor...")
-                        
-                        # Otomatik login denemesi
-                        login_success = await self._perform_google_login(page)
-                        if not login_success:
-                            return {"success": False, "error": "Google login başarısız. Lütfen OAuth2 credentials'ınızı kontrol edin."}
-                        
-                        logger.info("Otomatik login başarılı!")
-                        # Login sonrası sayfanın yüklenmesini bekle
-                        await page.wait_for_timeout(3000)
-                    
-                except Exception as e:
-                    logger.debug(f"Login kontrolü hatası: {str(e)}")
-                    # Login kontrolü başarısız olsa bile devam et
-                
-                # Find and fill text input
-                text_selectors = [
-                    "textarea[placeholder*='Gemini']",
-                    "textarea[placeholder*='Enter a prompt']", 
-                    "textarea[placeholder*='Ask Gemini']",
-                    "textarea[aria-label*='prompt']",
-                    "textarea[data-test-id*='prompt']",
-                    "[role='textbox']",
-                    "textarea",
-                    ".ql-editor"
+                # Look for sign-in button or login indicators
+                login_selectors = [
+                    'button[data-test-id*="sign-in"]',
+                    'a[href*="accounts.google.com"]',
+                    'button:has-text("Sign in")',
+                    'a:has-text("Sign in")',
+                    '[aria-label*="Sign in"]'
                 ]
                 
-                input_filled = False
-                for selector in text_selectors:
+                login_needed = False
+                for selector in ([] if member.state.get("logged_in") else login_selectors):
                     try:
-                        text_input = await page.wait_for_selector(selector, timeout=10000)
-                        if text_input:
-                            image_prompt = f"'{prompt}' görseli oluştur. Renkli, detaylı ve güzel bir görsel olsun."
-                            await text_input.fill(image_prompt)
-                            logger.info(f"Prompt yazıldı: {selector}")
-                            
-                            # Enter tuşuna bas veya send butonunu ara
-                            try:
-                                await text_input.press('Enter')
-                                logger.info("Enter tuşu ile gönderildi")
-                            except:
-                                # Enter çalışmazsa send butonunu ara
-                                send_selectors = [
-                                    'button[aria-label*="Send"]',
-                                    'button[aria-label*="Gönder"]',
-                                    'button:has-text("Send")',
-                                    'button[data-test-id*="send"]',
-                                    '[role="button"][aria-label*="Send"]'
-                                ]
-                                
-                                sent = False
-                                for send_sel in send_selectors:
-                                    try:
-                                        send_btn = await page.wait_for_selector(send_sel, timeout=3000)
-                                        if send_btn:
-                                            await send_btn.click()
-                                            logger.info(f"Send butonu ile gönderildi: {send_sel}")
-                                            sent = True
-                                            break
-                                    except:
-                                        continue
-                                
-                                if not sent:
-                                    logger.warning("Send butonu bulunamadı, Enter ile devam ediliyor")
-                            
-                            input_filled = True
+                        login_element = await page.wait_for_selector(selector, timeout=2000)
+                        if login_element:
+                            login_needed = True
+                            logger.warning(f"Login gerekli - bulunan element: {selector}")
                             break
-                    except Exception as e:
-                        logger.debug(f"Selector {selector} failed: {str(e)}")
+                    except:
                         continue
                 
-                if not input_filled:
-                    return {"success": False, "error": "Input alanı bulunamadı ve prompt gönderilemedi"}
-                
-                # Wait for response with better detection
-                logger.info("Gemini yanıtını bekliyorum...")
-                
-                # Wait for response indicators
-                response_detected = False
-                max_wait_cycles = 30  # 30 * 2 = 60 saniye max
-                
-                for cycle in range(max_wait_cycles):
-                    await page.wait_for_timeout(2000)  # 2 saniye bekle
+                if login_needed:
+                    logger.info("Login gerekli - otomatik login başlatılıyor...")
                     
-                    # Yanıt geldi mi kontrol et
-                    response_indicators = [
-                        'div[data-test-id*="response"]',
-                        'div[role="response"]',
-                        'div[class*="response"]',
-                        'div[class*="message"]',
-                        'div[data-test-id*="conversation"]'
-                    ]
+                    # Otomatik login denemesi
+                    login_success = await self._perform_google_login(page)
+                    if not login_success:
+                        return {"success": False, "error": "Google login başarısız. Lütfen OAuth2 credentials'ınızı kontrol edin."}
                     
-                    for indicator in response_indicators:
+                    logger.info("Otomatik login başarılı!")
+                    # Login sonrası sayfanın yüklenmesini bekle
+                    await page.wait_for_timeout(3000)
+                    
+                    # Save cookies/storage so other pool members start logged in
+                    await context.storage_state(path=member.handle["state_path"])
+                    os.chmod(member.handle["state_path"], 0o600)
+                member.state["logged_in"] = True
+                
+            except Exception as e:
+                logger.debug(f"Login kontrolü hatası: {str(e)}")
+                # Login kontrolü başarısız olsa bile devam et
+            
+            # Find and fill text input
+            text_selectors = [
+                "textarea[placeholder*='Gemini']",
+                "textarea[placeholder*='Enter a prompt']", 
+                "textarea[placeholder*='Ask Gemini']",
+                "textarea[aria-label*='prompt']",
+                "textarea[data-test-id*='prompt']",
+                "[role='textbox']",
+                "textarea",
+                ".ql-editor"
+            ]
+            
+            input_filled = False
+            for selector in text_selectors:
+                try:
+                    text_input = await page.wait_for_selector(selector, timeout=10000)
+                    if text_input:
+                        image_prompt = f"'{prompt}' görseli oluştur. Renkli, detaylı ve güzel bir görsel olsun."
+                        await text_input.fill(image_prompt)
+                        logger.info(f"Prompt yazıldı: {selector}")
+                        
+                        # Enter tuşuna bas veya send butonunu ara
                         try:
-                            response_element = await page.query_selector(indicator)
-                            if response_element:
-                                response_detected = True
-                                logger.info(f"Yanıt algılandı: {indicator} (döngü {cycle+1})")
-                                break
+                            await text_input.press('Enter')
+                            logger.info("Enter tuşu ile gönderildi")
                         except:
-                            continue
-                    
-                    if response_detected:
-                        break
-                    
-                    # İmaj elementi kontrolü
-                    current_images = await page.query_selector_all("img")
-                    if len(current_images) > 3:  # Login öncesi sayısından fazla
-                        logger.info(f"Yeni görsel algılandı: {len(current_images)} img elementi")
-                        response_detected = True
+                            # Enter çalışmazsa send butonunu ara
+                            send_selectors = [
+                                'button[aria-label*="Send"]',
+                                'button[aria-label*="Gönder"]',
+                                'button:has-text("Send")',
+                                'button[data-test-id*="send"]',
+                                '[role="button"][aria-label*="Send"]'
+                            ]
+                            
+                            sent = False
+                            for send_sel in send_selectors:
+                                try:
+                                    send_btn = await page.wait_for_selector(send_sel, timeout=3000)
+                                    if send_btn:
+                                        await send_btn.click()
+                                        logger.info(f"Send butonu ile gönderildi: {send_sel}")
+                                        sent = True
+                                        break
+                                except:
+                                    continue
+                            
+                            if not sent:
+                                logger.warning("Send butonu bulunamadı, Enter ile devam ediliyor")
+                        
+                        input_filled = True
                         break
-                    
-                    logger.debug(f"Yanıt bekleniyor... döngü {cycle+1}/{max_wait_cycles}, img sayısı: {len(current_images)}")
-                
-                if not response_detected:
-                    logger.warning("Gemini yanıtı tespit edilemedi, screenshot alınacak")
-                
-                # Final image check
-                images = await page.query_selector_all("img")
-                image_found = len(images) > 3  # Login sayfasından daha fazla görsel varsa
-                
-                logger.info(f"Toplam {len(images)} adet img elementi bulundu, görsel oluşturuldu: {image_found}")
-                
-                # Take screenshot
-                if save_path is None:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    safe_prompt = "".join(c for c in prompt[:20] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    save_path = f"generated_images/gemini_pw_{timestamp}_{safe_prompt}.png"
+                except Exception as e:
+                    logger.debug(f"Selector {selector} failed: {str(e)}")
+                    continue
+            
+            if not input_filled:
+                return {"success": False, "error": "Input alanı bulunamadı ve prompt gönderilemedi"}
+            
+            # Wait for response with better detection
+            logger.info("Gemini yanıtını bekliyorum...")
+            
+            # Wait for response indicators
+            response_detected = False
+            max_wait_cycles = 30  # 30 * 2 = 60 saniye max
+            
+            for cycle in range(max_wait_cycles):
+                await page.wait_for_timeout(2000)  # 2 saniye bekle
                 
-                os.makedirs(os.path.dirname(save_path) if os.path.dirname(save_path) else "generated_images", exist_ok=True)
+                # Yanıt geldi mi kontrol et
+                response_indicators = [
+                    'div[data-test-id*="response"]',
+                    'div[role="response"]',
+                    'div[class*="response"]',
+                    'div[class*="message"]',
+                    'div[data-test-id*="conversation"]'
+                ]
                 
-                await page.screenshot(path=save_path, full_page=False)
+                for indicator in response_indicators:
+                    try:
+                        response_element = await page.query_selector(indicator)
+                        if response_element:
+                            response_detected = True
+                            logger.info(f"Yanıt algılandı: {indicator} (döngü {cycle+1})")
+                            break
+                    except:
+                        continue
                 
-                # Encode to base64
-                with open(save_path, "rb") as img_file:
-                    base64_image = base64.b64encode(img_file.read()).decode('utf-8')
+                if response_detected:
+                    break
                 
-                logger.info(f"Screenshot kaydedildi: {save_path}")
+                # İmaj elementi kontrolü
+                current_images = await page.query_selector_all("img")
+                if len(current_images) > 3:  # Login öncesi sayısından fazla
+                    logger.info(f"Yeni görsel algılandı: {len(current_images)} img elementi")
+                    response_detected = True
+                    break
                 
-                return {
-                    "success": True,
-                    "data": {
-                        "message": f"'{prompt}' görseli için Gemini sayfası kaydedildi",
-                        "image_path": save_path,
-                        "base64_image": base64_image,
-                        "prompt": prompt,
-                        "method": "playwright_scraping",
-                        "provider": "gemini_playwright",
-                        "image_found": image_found,
-                        "created_at": datetime.now().isoformat()
-                    }
+                logger.debug(f"Yanıt bekleniyor... döngü {cycle+1}/{max_wait_cycles}, img sayısı: {len(current_images)}")
+            
+            if not response_detected:
+                logger.warning("Gemini yanıtı tespit edilemedi, screenshot alınacak")
+            
+            # Final image check
+            images = await page.query_selector_all("img")
+            image_found = len(images) > 3  # Login sayfasından daha fazla görsel varsa
+            
+            logger.info(f"Toplam {len(images)} adet img elementi bulundu, görsel oluşturuldu: {image_found}")
+            
+            # Take screenshot
+            if save_path is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                safe_prompt = "".join(c for c in prompt[:20] if c.isalnum() or c in (' ', '-', '_')).rstrip()
+                save_path = f"generated_images/gemini_pw_{timestamp}_{safe_prompt}.png"
+            
+            os.makedirs(os.path.dirname(save_path) if os.path.dirname(save_path) else "generated_images", exist_ok=True)
+            
+            await page.screenshot(path=save_path, full_page=False)
+            
+            # Encode to base64
+            with open(save_path, "rb") as img_file:
+                base64_image = base64.b64encode(img_file.read()).decode('utf-8')
+            
+            logger.info(f"Screenshot kaydedildi: {save_path}")
+            
+            return {
+                "success": True,
+                "data": {
+                    "message": f"'{prompt}' görseli için Gemini sayfası kaydedildi",
+                    "image_path": save_path,
+                    "base64_image": base64_image,
+                    "prompt": prompt,
+                    "method": "playwright_scraping",
+                    "provider": "gemini_playwright",
+                    "image_found": image_found,
+                    "created_at": datetime.now().isoformat()
                 }
-                
-            finally:
-                await browser.close()
+            }
+            
+        finally:
+            await page.close()
     
     async def _perform_google_login(self, page) -> bool:
         """Adım adım debug Google login işlemi"""
@@ -704,45 +805,27 @@ class PlaywrightGeminiScraper(MCPTool):
             return False
     
     def scrape_gemini_image(self, prompt: str, save_path: str = None, headless: bool = True) -> MCPToolResult:
-        """Sync wrapper for async scraping"""
+        """Sync wrapper: leases a warm context and runs the scrape on the shared Playwright loop"""
         try:
-            # Check if there's already a running loop
-            try:
-                loop = asyncio.get_running_loop()
-                # If there's already a loop, create a new thread
-                import threading
-                import concurrent.futures
-                
-                def run_async():
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(
-                            self._scrape_async(prompt, save_path, headless)
-                        )
-                    finally:
-                        new_loop.close()
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_async)
-                    result = future.result(timeout=120)  # 2 minute timeout
-                    
-            except RuntimeError:
-                # No loop running, safe to create one
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                result = loop.run_until_complete(
-                    self._scrape_async(prompt, save_path, headless)
+            pool = self._get_pool(headless)
+            # A timed-out scrape may have left its context mid-navigation: discard it instead of releasing it
+            with pool.lease(current_lease_key(), discard_on=(concurrent.futures.TimeoutError,)) as member:
+                result = self._host.run(
+                    self._scrape_async(prompt, save_path, headless, member),
+                    timeout=120  # 2 minute timeout
                 )
-                
-                loop.close()
             
             if result["success"]:
                 return MCPToolResult(success=True, data=result["data"])
             else:
                 return MCPToolResult(success=False, error=result["error"])
                 
+        except BrowserPoolError as e:
+            logger.error(f"Playwright browser pool hatası: {str(e)}")
+            return MCPToolResult(success=False, error=str(e))
+        except concurrent.futures.TimeoutError:
+            logger.error("Playwright Gemini scraping zaman aşımı (120s)")
+            return MCPToolResult(success=False, error="Playwright scraping hatası: zaman aşımı (120s)")
         except Exception as e:
             logger.error(f"Playwright Gemini scraping hatası: {str(e)}")
             return MCPToolResult(success=False, error=f"Playwright scraping hatası: {str(e)}")
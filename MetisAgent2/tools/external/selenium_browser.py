@@ -9,6 +9,9 @@ from typing import Dict, List, Optional, Any
 from contextlib import contextmanager
 import sys
 import os
+import shutil
+import tempfile
+import threading
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.mcp_core import MCPTool, MCPToolResult
@@ -32,6 +35,8 @@ from selenium.common.exceptions import (
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.firefox import GeckoDriverManager
 
+from .browser_pool import BrowserPool, BrowserPoolError, current_lease_key
+
 logger = logging.getLogger(__name__)
 
 class SeleniumBrowser(MCPTool):
@@ -44,10 +49,13 @@ class SeleniumBrowser(MCPTool):
             version="1.0.0"
         )
         
-        self.driver = None
-        self.wait = None
-        self.current_browser = None
-        self.session_active = False
+        # Warm driver pools, one per browser configuration; sessions are leased
+        # per workflow (see browser_pool.lease_scope) so workflows never share a driver
+        self._pools: Dict[tuple, BrowserPool] = {}
+        self._pools_lock = threading.Lock()
+        self._lease_pools: Dict[str, BrowserPool] = {}
+        self.pool_size = int(os.getenv("SELENIUM_POOL_SIZE", "3"))
+        self.pool_idle_timeout = float(os.getenv("SELENIUM_POOL_IDLE_TIMEOUT", "300"))
         
         # Register actions
         self._register_actions()
@@ -259,6 +267,30 @@ class SeleniumBrowser(MCPTool):
             optional_params=["timeout", "selector", "text", "url"]
         )
     
+    # Per-lease session state: every action runs against the caller's leased driver
+    def _leased_session(self):
+        pool = self._lease_pools.get(current_lease_key())
+        return pool.leased(current_lease_key()) if pool else None
+    
+    @property
+    def driver(self):
+        member = self._leased_session()
+        return member.handle["driver"] if member else None
+    
+    @property
+    def wait(self):
+        member = self._leased_session()
+        return member.handle["wait"] if member else None
+    
+    @property
+    def current_browser(self):
+        member = self._leased_session()
+        return member.handle["browser"] if member else None
+    
+    @property
+    def session_active(self) -> bool:
+        return self._leased_session() is not None
+    
     def _check_session(self) -> bool:
         """Check if browser session is active"""
         return self.session_active and self.driver is not None
@@ -278,101 +310,161 @@ class SeleniumBrowser(MCPTool):
         return by_map.get(by.lower(), By.CSS_SELECTOR)
     
     # Browser Management Actions
+    def _create_driver(self, browser: str, headless: bool, window_size: str,
+                       user_agent: str = None, proxy: str = None):
+        """Start a new driver with its own profile directory (cold start)"""
+        if browser == "chrome":
+            options = webdriver.ChromeOptions()
+            if headless:
+                options.add_argument("--headless")
+            options.add_argument(f"--window-size={window_size}")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            
+            # DevToolsActivePort hatası için ek ayarlar
+            options.add_argument("--disable-gpu")
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-logging")
+            options.add_argument("--disable-web-security")
+            options.add_argument("--allow-running-insecure-content")
+            options.add_argument("--ignore-certificate-errors")
+            options.add_argument("--ignore-ssl-errors")
+            options.add_argument("--ignore-certificate-errors-spki-list")
+            options.add_argument("--disable-features=VizDisplayCompositor")
+            options.add_argument("--remote-debugging-port=0")  # Random port
+            options.add_argument("--disable-background-timer-throttling")
+            options.add_argument("--disable-renderer-backgrounding")
+            options.add_argument("--disable-backgrounding-occluded-windows")
+            options.add_argument("--disable-ipc-flooding-protection")
+            options.add_argument("--disable-hang-monitor")
+            options.add_argument("--disable-prompt-on-repost")
+            options.add_argument("--disable-background-networking")
+            options.add_argument("--disable-sync")
+            options.add_argument("--force-color-profile=srgb")
+            options.add_argument("--metrics-recording-only")
+            options.add_argument("--disable-default-apps")
+            options.add_argument("--no-first-run")
+            options.add_argument("--no-default-browser-check")
+            options.add_argument("--disable-plugins")
+            options.add_argument("--disable-translate")
+            
+            # Temporary directories - isolated profile per pooled session, removed by _quit_driver
+            user_data_dir = tempfile.mkdtemp(prefix="selenium_profile_")
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+            
+            # More crash prevention
+            options.add_argument("--disable-crash-reporter")
+            options.add_argument("--disable-in-process-stack-traces")
+            
+            # Explicit binary path
+            options.binary_location = os.getenv("CHROME_BINARY", "/usr/bin/google-chrome")
+            
+            if user_agent:
+                options.add_argument(f"--user-agent={user_agent}")
+            if proxy:
+                options.add_argument(f"--proxy-server={proxy}")
+            
+            try:
+                service = ChromeService(ChromeDriverManager().install())
+                driver = webdriver.Chrome(service=service, options=options)
+            except Exception:
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+                raise
+            
+        elif browser == "firefox":
+            options = webdriver.FirefoxOptions()
+            if headless:
+                options.add_argument("--headless")
+            
+            if user_agent:
+                options.set_preference("general.useragent.override", user_agent)
+            
+            service = FirefoxService(GeckoDriverManager().install())
+            driver = webdriver.Firefox(service=service, options=options)
+            
+            # Set window size for Firefox
+            width, height = window_size.split(",")
+            driver.set_window_size(int(width), int(height))
+            
+        else:
+            raise ValueError(f"Unsupported browser: {browser}. Use 'chrome' or 'firefox'.")
+        
+        return {"driver": driver, "wait": WebDriverWait(driver, 10), "browser": browser,
+                "profile_dir": user_data_dir if browser == "chrome" else None}
+    
+    @staticmethod
+    def _quit_driver(handle):
+        """Pool closer: quit the driver and remove its temporary profile directory"""
+        try:
+            handle["driver"].quit()
+        finally:
+            if handle.get("profile_dir"):
+                shutil.rmtree(handle["profile_dir"], ignore_errors=True)
+    
+    @staticmethod
+    def _driver_alive(handle) -> bool:
+        """Crash detection: a dead driver fails even trivial commands"""
+        return bool(handle["driver"].window_handles)
+    
+    @staticmethod
+    def _reset_session(member):
+        """Clear cookies and the last page's web storage before the session is leased to another workflow
+
+        delete_all_cookies covers every domain; localStorage/sessionStorage can
+        only be cleared for the origin of the page the workflow ended on.
+        """
+        driver = member.handle["driver"]
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass  # about:blank, data: URLs and file pages have no web storage
+        driver.get("about:blank")
+    
+    def _get_pool(self, browser: str, headless: bool, window_size: str,
+                  user_agent: str = None, proxy: str = None) -> BrowserPool:
+        config = (browser, bool(headless), window_size, user_agent, proxy)
+        with self._pools_lock:
+            pool = self._pools.get(config)
+            if pool is None:
+                pool = BrowserPool(
+                    name=f"selenium-{browser}",
+                    factory=lambda member_id: self._create_driver(browser, headless, window_size, user_agent, proxy),
+                    closer=self._quit_driver,
+                    health_check=self._driver_alive,
+                    reset=self._reset_session,
+                    max_size=self.pool_size,
+                    idle_timeout=self.pool_idle_timeout
+                )
+                self._pools[config] = pool
+            return pool
+    
     def _start_browser(self, browser: str, headless: bool = True, 
                       window_size: str = "1920,1080", user_agent: str = None,
                       proxy: str = None) -> MCPToolResult:
-        """Start browser session"""
+        """Lease a browser session from the warm pool (starts one if none is idle)"""
         try:
-            # Force close any existing session
+            key = current_lease_key()
+            
+            # Release any session this workflow already holds
             if self.session_active:
                 try:
                     self._close_browser()
                     logger.info("Closed existing browser session")
                 except:
                     pass
-                self.session_active = False
             
             browser = browser.lower()
-            
-            if browser == "chrome":
-                options = webdriver.ChromeOptions()
-                if headless:
-                    options.add_argument("--headless")
-                options.add_argument(f"--window-size={window_size}")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                
-                # DevToolsActivePort hatası için ek ayarlar
-                options.add_argument("--disable-gpu")
-                options.add_argument("--disable-extensions")
-                options.add_argument("--disable-logging")
-                options.add_argument("--disable-web-security")
-                options.add_argument("--allow-running-insecure-content")
-                options.add_argument("--ignore-certificate-errors")
-                options.add_argument("--ignore-ssl-errors")
-                options.add_argument("--ignore-certificate-errors-spki-list")
-                options.add_argument("--disable-features=VizDisplayCompositor")
-                options.add_argument("--remote-debugging-port=0")  # Random port
-                options.add_argument("--disable-background-timer-throttling")
-                options.add_argument("--disable-renderer-backgrounding")
-                options.add_argument("--disable-backgrounding-occluded-windows")
-                options.add_argument("--disable-ipc-flooding-protection")
-                options.add_argument("--disable-hang-monitor")
-                options.add_argument("--disable-prompt-on-repost")
-                options.add_argument("--disable-background-networking")
-                options.add_argument("--disable-sync")
-                options.add_argument("--force-color-profile=srgb")
-                options.add_argument("--metrics-recording-only")
-                options.add_argument("--disable-default-apps")
-                options.add_argument("--no-first-run")
-                options.add_argument("--no-default-browser-check")
-                options.add_argument("--disable-plugins")
-                options.add_argument("--disable-translate")
-                
-                # Temporary directories
-                import tempfile
-                user_data_dir = tempfile.mkdtemp()
-                options.add_argument(f"--user-data-dir={user_data_dir}")
-                
-                # More crash prevention
-                options.add_argument("--disable-crash-reporter")
-                options.add_argument("--disable-in-process-stack-traces")
-                
-                # Explicit binary path
-                options.binary_location = "/usr/bin/google-chrome"
-                
-                if user_agent:
-                    options.add_argument(f"--user-agent={user_agent}")
-                if proxy:
-                    options.add_argument(f"--proxy-server={proxy}")
-                
-                service = ChromeService(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=options)
-                
-            elif browser == "firefox":
-                options = webdriver.FirefoxOptions()
-                if headless:
-                    options.add_argument("--headless")
-                
-                if user_agent:
-                    options.set_preference("general.useragent.override", user_agent)
-                
-                service = FirefoxService(GeckoDriverManager().install())
-                self.driver = webdriver.Firefox(service=service, options=options)
-                
-                # Set window size for Firefox
-                width, height = window_size.split(",")
-                self.driver.set_window_size(int(width), int(height))
-                
-            else:
+            if browser not in ("chrome", "firefox"):
                 return MCPToolResult(
                     success=False,
                     error=f"Unsupported browser: {browser}. Use 'chrome' or 'firefox'."
                 )
             
-            self.wait = WebDriverWait(self.driver, 10)
-            self.current_browser = browser
-            self.session_active = True
+            pool = self._get_pool(browser, headless, window_size, user_agent, proxy)
+            started = time.perf_counter()
+            member = pool.acquire(key)
+            self._lease_pools[key] = pool
             
             return MCPToolResult(
                 success=True,
@@ -380,17 +472,22 @@ class SeleniumBrowser(MCPTool):
                     "browser": browser,
                     "headless": headless,
                     "window_size": window_size,
-                    "session_id": id(self.driver)
+                    "session_id": id(member.handle["driver"]),
+                    "pool_member": member.member_id,
+                    "lease_ms": round((time.perf_counter() - started) * 1000, 1)
                 },
                 metadata={"action": "start_browser"}
             )
             
+        except BrowserPoolError as e:
+            logger.error(f"Failed to start browser: {e}")
+            return MCPToolResult(success=False, error=str(e))
         except Exception as e:
             logger.error(f"Failed to start browser: {e}")
             return MCPToolResult(success=False, error=str(e))
     
     def _close_browser(self) -> MCPToolResult:
-        """Close browser session"""
+        """Close browser session (returns the leased driver to the pool)"""
         try:
             if not self.session_active:
                 return MCPToolResult(
@@ -398,12 +495,10 @@ class SeleniumBrowser(MCPTool):
                     error="No active browser session to close"
                 )
             
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
-                self.wait = None
-                self.current_browser = None
-                self.session_active = False
+            key = current_lease_key()
+            pool = self._lease_pools.pop(key, None)
+            if pool:
+                pool.release(key)
             
             return MCPToolResult(
                 success=True,
@@ -415,6 +510,14 @@ class SeleniumBrowser(MCPTool):
             logger.error(f"Failed to close browser: {e}")
             return MCPToolResult(success=False, error=str(e))
     
+    def shutdown_pools(self):
+        """Quit every pooled driver (application shutdown)"""
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        self._lease_pools.clear()
+        for pool in pools:
+            pool.close()
+    
     # Navigation Actions
     def _navigate(self, url: str, timeout: int = 30) -> MCPToolResult:
         """Navigate to URL"""
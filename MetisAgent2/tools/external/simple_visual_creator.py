@@ -17,6 +17,7 @@ from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.mcp_core import MCPTool, MCPToolResult
 from ..internal.user_storage import get_user_storage
+from ..internal.image_catalog import description_from_filename, get_image_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,9 @@ class SimpleVisualCreatorTool(MCPTool):
         if not os.path.exists(self.image_storage_path):
             os.makedirs(self.image_storage_path, exist_ok=True)
         
+        # SQLite image index (path, hash, dimensions, prompt) - replaces per-request globbing
+        self.image_catalog = get_image_catalog(os.path.join(self.image_storage_path, ".catalog"))
+        
         # Memory integration
         self.graph_memory = None
         self._initialize_memory()
@@ -158,6 +162,20 @@ class SimpleVisualCreatorTool(MCPTool):
             optional_params=["folder_path", "case_sensitive"]
         )
         
+        self.register_action(
+            "search_images",
+            self._search_images,
+            required_params=["query"],
+            optional_params=["folder_path", "limit"]
+        )
+        
+        self.register_action(
+            "get_image_by_handle",
+            self._get_image_by_handle,
+            required_params=["handle"],
+            optional_params=["thumbnail_size"]
+        )
+        
         self.register_action(
             "get_image_info",
             self._get_image_info,
@@ -346,8 +364,7 @@ class SimpleVisualCreatorTool(MCPTool):
                 
                 # Handle different possible response formats
                 image_url = None
-                base64_data = None
-                saved_path = None
+                image_bytes = None
                 revised_prompt = final_prompt  # Initialize with default
                 
                 if "data" in result and len(result["data"]) > 0:
@@ -364,9 +381,7 @@ class SimpleVisualCreatorTool(MCPTool):
                 # Prioritize base64 if available (newer models use this)
                 if b64_json:
                     try:
-                        base64_data = b64_json
-                        # Save base64 image to file
-                        saved_path = self._save_image_from_base64(base64_data, final_prompt)
+                        image_bytes = base64.b64decode(b64_json)
                         logger.debug("Image received as base64")
                     except Exception as e:
                         logger.error(f"Base64 processing error: {str(e)}")
@@ -377,42 +392,31 @@ class SimpleVisualCreatorTool(MCPTool):
                 
                 # Fallback to URL if no base64
                 elif image_url:
-                    try:
-                        # URL'den görsel indir ve base64'e çevir
-                        saved_path = self._save_image_from_url(image_url, final_prompt)
-                        base64_data = self._url_to_base64(image_url)
-                        
-                        if not base64_data:
-                            logger.warning("Base64 conversion failed, using URL only")
-                            
-                    except Exception as e:
-                        logger.error(f"Image URL processing error: {str(e)}")
-                        return MCPToolResult(
-                            success=False,
-                            error=f"Image URL processing failed: {str(e)}"
-                        )
+                    # URL'den görseli bir kez indir (kayıt ve base64 aynı byte'lardan)
+                    image_bytes = self._download_image(image_url)
+                    if image_bytes is None:
+                        logger.warning("Image download failed, using URL only")
                 
                 # Check if we got any image data
-                if not base64_data and not image_url:
+                if image_bytes is None and not image_url:
                     return MCPToolResult(
                         success=False,
                         error=f"No image data found in response. Response structure: {result}"
                     )
                 
+                record = self._store_image_bytes(image_bytes, final_prompt, "openai", "gpt-image-1") if image_bytes else None
                 image_data = {
                     "prompt": final_prompt,
                     "revised_prompt": revised_prompt,
                     "image_url": image_url,
-                    "base64_image": base64_data,
-                    "saved_path": saved_path,
-                    "local_filename": os.path.basename(saved_path) if saved_path else None,
                     "model": "gpt-image-1",
                     "size": size,
                     "quality": quality,
                     "created_at": datetime.now().isoformat(),
                     "success": True,
-                    "base64_preview": base64_data[:100] + "..." if base64_data else None  # Önizleme için
+                    **self._image_payload(record, image_bytes)
                 }
+                saved_path = image_data["saved_path"]
                 
                 logger.info(f"Image generated successfully with GPT-4o: {saved_path}")
                 
@@ -503,23 +507,20 @@ class SimpleVisualCreatorTool(MCPTool):
             if response.status_code == 200:
                 # HuggingFace returns image bytes directly
                 image_bytes = response.content
-                base64_data = base64.b64encode(image_bytes).decode('utf-8')
                 
                 # Save image
-                saved_path = self._save_image_from_base64(base64_data, final_prompt)
+                record = self._store_image_bytes(image_bytes, final_prompt, "huggingface", model)
                 
                 image_data = {
                     "prompt": final_prompt,
                     "revised_prompt": final_prompt,
-                    "image_url": None,
-                    "base64_image": base64_data,
-                    "saved_path": saved_path,
-                    "local_filename": os.path.basename(saved_path) if saved_path else None,
                     "model": model,
                     "provider": "huggingface",
                     "created_at": datetime.now().isoformat(),
-                    "success": True
+                    "success": True,
+                    **self._image_payload(record, image_bytes)
                 }
+                saved_path = image_data["saved_path"]
                 
                 logger.info(f"HuggingFace image generated successfully: {saved_path}")
                 
@@ -733,8 +734,12 @@ class SimpleVisualCreatorTool(MCPTool):
                             'saved_path': first_result['data'].get('saved_path'),
                             'image_path': first_result['data'].get('saved_path'),  # Alias for compatibility
                             'local_filename': first_result['data'].get('local_filename'),
-                            'base64_image': first_result['data'].get('base64_image')
+                            'image_handle': first_result['data'].get('image_handle'),
+                            'catalog_url': first_result['data'].get('catalog_url'),
+                            'thumbnail_url': first_result['data'].get('thumbnail_url')
                         }
+                        if first_result['data'].get('base64_image'):
+                            primary_image['base64_image'] = first_result['data']['base64_image']
                 
                 # Return ALL successful results for user choice
                 return MCPToolResult(
@@ -869,33 +874,8 @@ class SimpleVisualCreatorTool(MCPTool):
             logger.error(f"Variations generation failed: {str(e)}")
             return MCPToolResult(success=False, error=f"Variations generation failed: {str(e)}")
     
-    def _save_image_from_url(self, image_url: str, prompt: str) -> str:
-        """Download and save image from URL"""
-        try:
-            # Generate safe filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_prompt = "".join(c for c in prompt[:30] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_prompt = safe_prompt.replace(' ', '_')
-            filename = f"{timestamp}_{safe_prompt}.png"
-            filepath = os.path.join(self.image_storage_path, filename)
-            
-            # Download image
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # Save to file
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            logger.info(f"Image saved: {filepath}")
-            return filepath
-            
-        except Exception as e:
-            logger.error(f"Failed to save image: {str(e)}")
-            return None
-    
-    def _save_image_from_base64(self, b64_data: str, prompt: str) -> str:
-        """Save base64 image data to file"""
+    def _store_image_bytes(self, image_bytes: bytes, prompt: str, provider: str = None, model: str = None) -> Dict:
+        """Save image bytes to the storage folder and index them; returns the catalog record"""
         try:
             # Generate safe filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -904,47 +884,52 @@ class SimpleVisualCreatorTool(MCPTool):
             filename = f"{timestamp}_{safe_prompt}.png"
             filepath = os.path.join(self.image_storage_path, filename)
             
-            logger.info(f"Attempting to save base64 image: {filepath}")
-            logger.debug(f"Base64 data length: {len(b64_data) if b64_data else 'None'}")
-            logger.info(f"Image storage path exists: {os.path.exists(self.image_storage_path)}")
-            
-            # Decode base64 and save
-            image_bytes = base64.b64decode(b64_data)
-            logger.info(f"Decoded image bytes length: {len(image_bytes)}")
-            
             with open(filepath, 'wb') as f:
                 f.write(image_bytes)
             
-            # Verify file was created
-            if os.path.exists(filepath):
-                file_size = os.path.getsize(filepath)
-                logger.info(f"✅ Base64 image saved successfully: {filepath} ({file_size} bytes)")
-                return filepath
-            else:
-                logger.error(f"❌ File was not created: {filepath}")
-                return None
+            record = self.image_catalog.register(filepath, prompt=prompt, provider=provider, model=model)
+            logger.info(f"✅ Image saved: {filepath} ({len(image_bytes)} bytes, handle {record['handle']})")
+            return record
             
         except Exception as e:
-            logger.error(f"Failed to save base64 image: {str(e)}")
+            logger.error(f"Failed to save image: {str(e)}")
             return None
     
-    def _url_to_base64(self, image_url: str) -> str:
-        """Convert image URL to base64 string"""
+    def _download_image(self, image_url: str) -> bytes:
+        """Download image bytes from URL"""
         try:
-            # Download image
             response = requests.get(image_url, timeout=30)
             response.raise_for_status()
-            
-            # Convert to base64
-            image_base64 = base64.b64encode(response.content).decode('utf-8')
-            
-            logger.debug(f"Image converted to base64 successfully")
-            return image_base64
+            return response.content
             
         except Exception as e:
-            logger.error(f"Failed to convert image to base64: {str(e)}")
+            logger.error(f"Failed to download image: {str(e)}")
             return None
     
+    def _image_payload(self, record: Dict, image_bytes: bytes = None) -> Dict:
+        """Result fields for a stored image
+        
+        Workflow results carry the content handle and its URLs instead of inline
+        base64; standalone calls still get base64_image for direct display.
+        """
+        payload = {
+            "saved_path": record["filepath"] if record else None,
+            "local_filename": record["filename"] if record else None
+        }
+        if record:
+            payload.update({
+                "image_handle": record["handle"],
+                "catalog_url": f"/api/images/{record['handle']}",
+                "thumbnail_url": f"/api/images/{record['handle']}/thumbnail",
+                "width": record["width"],
+                "height": record["height"]
+            })
+        if image_bytes and not (record and self._detect_workflow_context()):
+            base64_data = base64.b64encode(image_bytes).decode('utf-8')
+            payload["base64_image"] = base64_data
+            payload["base64_preview"] = base64_data[:100] + "..."  # Önizleme için
+        return payload
+    
     def _load_and_display_image(self, image_path: str) -> MCPToolResult:
         """Load and display an existing image file with environment-aware display strategy"""
         try:
@@ -1026,6 +1011,11 @@ class SimpleVisualCreatorTool(MCPTool):
                 'execution_context': 'workflow' if is_workflow_context else 'standalone'
             }
             
+            record = self.image_catalog.get(full_path)
+            if record:
+                response_data['image_handle'] = record['handle']
+                response_data['catalog_url'] = f"/api/images/{record['handle']}"
+            
             # Only add base64 for non-workflow contexts
             if image_base64 is not None:
                 response_data['base64_image'] = image_base64
@@ -1240,8 +1230,6 @@ class SimpleVisualCreatorTool(MCPTool):
     def _list_available_images(self, folder_path: str = None, pattern: str = "*.png", limit: int = 50, **kwargs) -> MCPToolResult:
         """List available images in specified folder or default image storage"""
         try:
-            import glob
-            
             # Use provided folder or default image storage
             search_path = folder_path or self.image_storage_path
             
@@ -1251,51 +1239,8 @@ class SimpleVisualCreatorTool(MCPTool):
                     error=f"Folder does not exist: {search_path}"
                 )
             
-            # Search for images
-            search_pattern = os.path.join(search_path, pattern)
-            image_files = glob.glob(search_pattern)
-            
-            # Also search for other common image formats
-            for ext in ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.bmp", "*.webp"]:
-                if ext != pattern:
-                    additional_pattern = os.path.join(search_path, ext)
-                    image_files.extend(glob.glob(additional_pattern))
-            
-            # Remove duplicates and sort
-            image_files = list(set(image_files))
-            image_files.sort(key=os.path.getmtime, reverse=True)  # Sort by modification time, newest first
-            
-            # Apply limit
-            if limit:
-                image_files = image_files[:limit]
-            
-            # Get file info
-            image_info = []
-            for filepath in image_files:
-                try:
-                    stat = os.stat(filepath)
-                    filename = os.path.basename(filepath)
-                    
-                    # Extract date from filename if possible
-                    date_match = None
-                    if filename.startswith('2025'):
-                        date_part = filename[:15]  # 20250731_184455
-                        try:
-                            date_match = datetime.strptime(date_part, '%Y%m%d_%H%M%S').isoformat()
-                        except:
-                            pass
-                    
-                    image_info.append({
-                        "filepath": filepath,
-                        "filename": filename,
-                        "size_bytes": stat.st_size,
-                        "size_mb": round(stat.st_size / 1024 / 1024, 2),
-                        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        "created_date": date_match,
-                        "description": self._extract_description_from_filename(filename)
-                    })
-                except Exception as e:
-                    logger.warning(f"Error getting info for {filepath}: {e}")
+            # Catalog query, newest first (folder is rescanned only if it changed)
+            image_info = self.image_catalog.list_images(search_path, pattern=pattern, limit=limit)
             
             return MCPToolResult(
                 success=True,
@@ -1314,31 +1259,26 @@ class SimpleVisualCreatorTool(MCPTool):
     
     def _extract_description_from_filename(self, filename: str) -> str:
         """Extract description from generated image filename"""
-        try:
-            # Remove timestamp and extension
-            if filename.startswith('2025'):
-                # Format: 20250731_184455_description.png
-                parts = filename.split('_', 2)
-                if len(parts) >= 3:
-                    desc_part = parts[2].replace('.png', '').replace('.jpg', '').replace('.jpeg', '')
-                    # Replace underscores with spaces and clean up
-                    description = desc_part.replace('_', ' ').strip()
-                    return description[:100]  # Limit length
-            return "Image file"
-        except:
-            return "Image file"
+        return description_from_filename(filename)
+    
+    # Selection keywords -> search terms (Turkish and English prompts)
+    SELECTION_KEYWORDS = [
+        (["köpek", "dog", "puppy", "yavru"], "dog puppy köpek"),
+        (["kedi", "cat", "kitten"], "cat kitten kedi"),
+        (["çiçek", "flower", "gül", "rose"], "flower çiçek gül rose lale karanfil"),
+        (["güneş", "sun", "solar"], "sun güneş solar")
+    ]
     
     def _select_existing_image(self, selection_criteria: str, folder_path: str = None, 
                               copy_to_new_location: bool = False, **kwargs) -> MCPToolResult:
         """Select existing image based on criteria (latest, by name, by description)"""
         try:
-            # List available images first
-            list_result = self._list_available_images(folder_path=folder_path, limit=100)
-            if not list_result.success:
-                return list_result
+            search_path = folder_path or self.image_storage_path
+            if not os.path.exists(search_path):
+                return MCPToolResult(success=False, error=f"Folder does not exist: {search_path}")
             
-            images = list_result.data["images"]
-            if not images:
+            latest = self.image_catalog.latest(search_path)
+            if not latest:
                 return MCPToolResult(success=False, error="No images found")
             
             selected_image = None
@@ -1349,53 +1289,23 @@ class SimpleVisualCreatorTool(MCPTool):
             
             if any(word in criteria_lower for word in ["latest", "son", "en son", "newest", "last"]):
                 # Select latest image
-                selected_image = images[0]  # Already sorted by modification time
+                selected_image = latest
                 selection_method = "latest"
-                
-            elif any(word in criteria_lower for word in ["köpek", "dog", "puppy", "yavru"]):
-                # Search for dog-related images
-                for img in images:
-                    if any(word in img["description"].lower() for word in ["dog", "puppy", "köpek", "yavru"]):
-                        selected_image = img
-                        selection_method = "keyword_search"
-                        break
-                        
-            elif any(word in criteria_lower for word in ["kedi", "cat", "kitten"]):
-                # Search for cat-related images
-                for img in images:
-                    if any(word in img["description"].lower() for word in ["cat", "kitten", "kedi"]):
-                        selected_image = img
-                        selection_method = "keyword_search"
-                        break
-                        
-            elif any(word in criteria_lower for word in ["çiçek", "flower", "gül", "rose"]):
-                # Search for flower-related images
-                for img in images:
-                    if any(word in img["description"].lower() for word in ["flower", "çiçek", "gül", "rose", "lale", "karanfil"]):
-                        selected_image = img
-                        selection_method = "keyword_search"
-                        break
-                        
-            elif any(word in criteria_lower for word in ["güneş", "sun", "solar"]):
-                # Search for sun-related images
-                for img in images:
-                    if any(word in img["description"].lower() for word in ["sun", "güneş", "solar"]):
-                        selected_image = img
-                        selection_method = "keyword_search"
-                        break
-                        
             else:
-                # Try to find by filename or description containing the criteria
-                for img in images:
-                    if (selection_criteria.lower() in img["filename"].lower() or 
-                        selection_criteria.lower() in img["description"].lower()):
-                        selected_image = img
-                        selection_method = "text_search"
+                search_terms = selection_criteria
+                selection_method = "text_search"
+                for keywords, expanded_terms in self.SELECTION_KEYWORDS:
+                    if any(word in criteria_lower for word in keywords):
+                        search_terms = expanded_terms
+                        selection_method = "keyword_search"
                         break
                 
-                # If no match found, select the latest
-                if not selected_image:
-                    selected_image = images[0]
+                matches = self.image_catalog.search(search_terms, folder=search_path, limit=1)
+                if matches:
+                    selected_image = matches[0]
+                elif selection_method == "text_search":
+                    # If no match found, select the latest
+                    selected_image = latest
                     selection_method = "fallback_latest"
             
             if not selected_image:
@@ -1447,30 +1357,22 @@ class SimpleVisualCreatorTool(MCPTool):
                               case_sensitive: bool = False, **kwargs) -> MCPToolResult:
         """Search images by filename or description"""
         try:
-            # List available images
-            list_result = self._list_available_images(folder_path=folder_path, limit=200)
-            if not list_result.success:
-                return list_result
-            
-            images = list_result.data["images"]
-            matching_images = []
+            search_path = folder_path or self.image_storage_path
+            if not os.path.exists(search_path):
+                return MCPToolResult(success=False, error=f"Folder does not exist: {search_path}")
             
-            # Search through images
-            search_lower = search_term if case_sensitive else search_term.lower()
-            
-            for img in images:
-                filename_text = img["filename"] if case_sensitive else img["filename"].lower()
-                description_text = img["description"] if case_sensitive else img["description"].lower()
-                
-                if search_lower in filename_text or search_lower in description_text:
-                    matching_images.append(img)
+            # Token search in the catalog; case-sensitive mode narrows it to exact substrings
+            matching_images = self.image_catalog.search(search_term, folder=search_path, limit=200)
+            if case_sensitive:
+                matching_images = [img for img in matching_images
+                                   if search_term in img["filename"] or search_term in img["description"]]
             
             return MCPToolResult(
                 success=True,
                 data={
                     "search_term": search_term,
                     "case_sensitive": case_sensitive,
-                    "total_searched": len(images),
+                    "total_searched": self.image_catalog.count(search_path),
                     "matches_found": len(matching_images),
                     "matching_images": matching_images,
                     "message": f"Found {len(matching_images)} images matching '{search_term}'"
@@ -1481,6 +1383,50 @@ class SimpleVisualCreatorTool(MCPTool):
             logger.error(f"Error searching images: {str(e)}")
             return MCPToolResult(success=False, error=str(e))
     
+    def _search_images(self, query: str, folder_path: str = None, limit: int = 20, **kwargs) -> MCPToolResult:
+        """Search all indexed images by prompt tokens (best match first)"""
+        try:
+            if folder_path and not os.path.exists(folder_path):
+                return MCPToolResult(success=False, error=f"Folder does not exist: {folder_path}")
+            
+            self.image_catalog.scan(self.image_storage_path)
+            images = self.image_catalog.search(query, folder=folder_path, limit=int(limit))
+            
+            return MCPToolResult(
+                success=True,
+                data={
+                    "query": query,
+                    "total_found": len(images),
+                    "images": images,
+                    "message": f"Found {len(images)} images matching '{query}'"
+                }
+            )
+            
+        except Exception as e:
+            logger.error(f"Error searching images: {str(e)}")
+            return MCPToolResult(success=False, error=str(e))
+    
+    def _get_image_by_handle(self, handle: str, thumbnail_size: int = None, **kwargs) -> MCPToolResult:
+        """Resolve a content handle to its file (and optionally a cached thumbnail)"""
+        try:
+            record = self.image_catalog.resolve(handle)
+            if not record:
+                return MCPToolResult(success=False, error=f"Image not found for handle: {handle}")
+            
+            data = {
+                "image": record,
+                "catalog_url": f"/api/images/{record['handle']}",
+                "thumbnail_url": f"/api/images/{record['handle']}/thumbnail"
+            }
+            if thumbnail_size:
+                data["thumbnail_path"] = self.image_catalog.thumbnail(record["handle"], int(thumbnail_size))
+            
+            return MCPToolResult(success=True, data=data)
+            
+        except Exception as e:
+            logger.error(f"Error resolving image handle: {str(e)}")
+            return MCPToolResult(success=False, error=str(e))
+    
     def _get_image_info(self, image_path: str, **kwargs) -> MCPToolResult:
         """Get detailed information about a specific image"""
         try:
@@ -1490,29 +1436,34 @@ class SimpleVisualCreatorTool(MCPTool):
             stat = os.stat(image_path)
             filename = os.path.basename(image_path)
             
-            # Try to get image dimensions
+            # Dimensions and prompt come from the catalog (header parse, no image decode)
+            record = self.image_catalog.get(image_path) or {}
+            width, height = record.get("width"), record.get("height")
+            
+            # Color mode needs PIL; optional
             try:
                 from PIL import Image
                 with Image.open(image_path) as img:
-                    width, height = img.size
-                    format_info = img.format
                     mode = img.mode
             except ImportError:
-                width = height = format_info = mode = "Unknown (PIL not available)"
+                mode = "Unknown (PIL not available)"
             except Exception as e:
-                width = height = format_info = mode = f"Error: {e}"
+                mode = f"Error: {e}"
             
             info = {
                 "filepath": image_path,
                 "filename": filename,
+                "handle": record.get("handle"),
                 "size_bytes": stat.st_size,
                 "size_mb": round(stat.st_size / 1024 / 1024, 2),
                 "size_kb": round(stat.st_size / 1024, 2),
                 "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
                 "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                "description": self._extract_description_from_filename(filename),
-                "dimensions": f"{width}x{height}" if width != "Unknown (PIL not available)" else "Unknown",
-                "format": format_info,
+                "description": record.get("description") or self._extract_description_from_filename(filename),
+                "prompt": record.get("prompt"),
+                "provider": record.get("provider"),
+                "dimensions": f"{width}x{height}" if width else "Unknown",
+                "format": record.get("format"),
                 "color_mode": mode,
                 "directory": os.path.dirname(image_path)
             }
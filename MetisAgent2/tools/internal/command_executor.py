@@ -9,12 +9,17 @@ import logging
 import re
 import zipfile
 import tempfile
-from typing import List, Optional
+import shutil
+import time
+from typing import Any, Callable, Dict, List, Optional
 import sys
 import os
 from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.mcp_core import MCPTool, MCPToolResult
+from tools.internal.process_engine import OutputChunk, get_process_engine
+
+ZIP_COPY_BLOCK = 1024 * 1024
 
 logger = logging.getLogger(__name__)
 
@@ -99,10 +104,65 @@ class CommandExecutor(MCPTool):
             optional_params=["password"]
         )
         
+        # Shared async process engine: streamed output, capped buffers, group kill, per-user limit
+        self.process_engine = get_process_engine()
+        self._output_listeners: List[Callable[[Dict], None]] = []
+        
         # Initialize graph memory for context-aware command resolution
         self.graph_memory = None
         self._initialize_memory_integration()
     
+    def add_output_listener(self, listener: Callable[[Dict], None]):
+        """Receive streamed command output and archive progress as event dicts"""
+        self._output_listeners.append(listener)
+    
+    def remove_output_listener(self, listener: Callable[[Dict], None]):
+        if listener in self._output_listeners:
+            self._output_listeners.remove(listener)
+    
+    def _notify_listeners(self, event: Dict):
+        for listener in list(self._output_listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Command output listener failed: {e}")
+    
+    def _output_callback(self, command: str, user_id: str):
+        if not self._output_listeners:
+            return None
+        
+        def forward(chunk: OutputChunk):
+            self._notify_listeners({
+                "type": "output",
+                "command": command,
+                "user_id": user_id,
+                "stream": chunk.stream,
+                "text": chunk.text,
+                "offset": chunk.offset
+            })
+        return forward
+    
+    def _progress_callback(self, action: str):
+        if not self._output_listeners:
+            return None
+        last_emit = [0.0]
+        
+        def report(done_members: int, total_members: int, done_bytes: int, total_bytes: int, name: str):
+            now = time.monotonic()
+            if done_members < total_members and now - last_emit[0] < 0.25:
+                return
+            last_emit[0] = now
+            self._notify_listeners({
+                "type": "progress",
+                "action": action,
+                "done_members": done_members,
+                "total_members": total_members,
+                "done_bytes": done_bytes,
+                "total_bytes": total_bytes,
+                "member": name
+            })
+        return report
+    
     def _initialize_memory_integration(self):
         """Initialize graph memory connection for context-aware commands"""
         try:
@@ -297,37 +357,42 @@ class CommandExecutor(MCPTool):
             system = platform.system()
             
             if system == "Windows":
-                cmd = command
-                shell = True
+                cmd = command  # Shell string
             else:
                 # Use bash -c for consistent behavior on Unix-like systems
                 cmd = ["bash", "-c", command]
-                shell = False
             
-            # Execute command
+            # Execute command (runs on the engine loop; output streams to listeners)
             logger.info(f"Executing command: {command}")
             
-            result = subprocess.run(
+            result = self.process_engine.run_sync(
                 cmd,
-                shell=shell,
-                capture_output=True,
-                text=True,
                 timeout=timeout,
-                cwd=working_directory
+                cwd=working_directory,
+                user_id=user_id,
+                on_output=self._output_callback(command, user_id)
             )
             
+            if result.timed_out:
+                return MCPToolResult(
+                    success=False,
+                    error=f"Command timed out after {timeout} seconds",
+                    data={"stdout": result.stdout, "stderr": result.stderr, **result.output_info()}
+                )
+            
             # Prepare response
             response_data = {
                 "command": command,
-                "return_code": result.returncode,
+                "return_code": result.return_code,
                 "stdout": result.stdout,
                 "stderr": result.stderr,
                 "platform": system,
                 "working_directory": working_directory,
-                "execution_time": timeout  # This would be actual time in real implementation
+                "execution_time": round(result.duration_seconds, 3),
+                **result.output_info()
             }
             
-            if result.returncode == 0:
+            if result.return_code == 0:
                 return MCPToolResult(
                     success=True,
                     data=response_data,
@@ -336,16 +401,11 @@ class CommandExecutor(MCPTool):
             else:
                 return MCPToolResult(
                     success=False,
-                    error=f"Command failed with return code {result.returncode}",
+                    error=f"Command failed with return code {result.return_code}",
                     data=response_data,
                     metadata={"status": "completed_with_error"}
                 )
                 
-        except subprocess.TimeoutExpired:
-            return MCPToolResult(
-                success=False,
-                error=f"Command timed out after {timeout} seconds"
-            )
         except FileNotFoundError as e:
             return MCPToolResult(
                 success=False,
@@ -450,48 +510,25 @@ class CommandExecutor(MCPTool):
             # Create extraction directory if it doesn't exist
             extract_dir.mkdir(parents=True, exist_ok=True)
             
-            # Extract ZIP file
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Check if password protected
-                if zip_ref.testzip() is not None and password is None:
-                    return MCPToolResult(
-                        success=False,
-                        error="ZIP file appears corrupted or password protected"
-                    )
-                
-                # Set password if provided
-                pwd = password.encode('utf-8') if password else None
-                
-                # List contents for security check
-                file_list = zip_ref.namelist()
-                
-                # Security check for directory traversal
-                for filename in file_list:
-                    if '..' in filename or filename.startswith('/'):
-                        return MCPToolResult(
-                            success=False,
-                            error=f"Security violation: unsafe path in ZIP - {filename}"
-                        )
-                
-                # Extract all files
-                extracted_files = []
-                for filename in file_list:
-                    try:
-                        zip_ref.extract(filename, extract_dir, pwd=pwd)
-                        extracted_files.append(str(extract_dir / filename))
-                    except Exception as e:
-                        logger.warning(f"Failed to extract {filename}: {str(e)}")
-                
-                return MCPToolResult(
-                    success=True,
-                    data={
-                        "zip_path": str(zip_path),
-                        "extract_to": str(extract_dir),
-                        "extracted_files": extracted_files,
-                        "total_files": len(extracted_files),
-                        "file_list": file_list
-                    }
-                )
+            # Set password if provided
+            pwd = password.encode('utf-8') if password else None
+            
+            # Extract member by member through fixed-size buffers
+            outcome = stream_extract_zip(zip_path, extract_dir, pwd, self._progress_callback("extract_zip"))
+            if outcome.get("error"):
+                return MCPToolResult(success=False, error=outcome["error"])
+            
+            return MCPToolResult(
+                success=True,
+                data={
+                    "zip_path": str(zip_path),
+                    "extract_to": str(extract_dir),
+                    "extracted_files": outcome["extracted_files"],
+                    "total_files": len(outcome["extracted_files"]),
+                    "file_list": outcome["file_list"],
+                    "total_bytes": outcome["total_bytes"]
+                }
+            )
                 
         except zipfile.BadZipFile:
             return MCPToolResult(
@@ -525,45 +562,27 @@ class CommandExecutor(MCPTool):
             # Create parent directory for ZIP file if needed
             zip_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Determine compression method
-            compression = zipfile.ZIP_DEFLATED
             if compression_level < 0 or compression_level > 9:
                 compression_level = 6
             
-            added_files = []
+            if password:
+                # Note: Python's zipfile doesn't support password protection for writing
+                logger.warning("Password protection not supported for ZIP creation")
             
-            with zipfile.ZipFile(zip_path, 'w', compression=compression, 
-                               compresslevel=compression_level) as zip_ref:
-                
-                if source_path.is_file():
-                    # Add single file
-                    arcname = source_path.name
-                    if password:
-                        # Note: Python's zipfile doesn't support password protection for writing
-                        logger.warning("Password protection not supported for ZIP creation")
-                    zip_ref.write(source_path, arcname)
-                    added_files.append(arcname)
-                    
-                elif source_path.is_dir():
-                    # Add directory recursively
-                    for file_path in source_path.rglob('*'):
-                        if file_path.is_file():
-                            # Create relative path for archive
-                            arcname = file_path.relative_to(source_path)
-                            zip_ref.write(file_path, arcname)
-                            added_files.append(str(arcname))
-                
-                return MCPToolResult(
-                    success=True,
-                    data={
-                        "zip_path": str(zip_path),
-                        "source_path": str(source_path),
-                        "added_files": added_files,
-                        "total_files": len(added_files),
-                        "compression_level": compression_level,
-                        "zip_size_bytes": zip_path.stat().st_size
-                    }
-                )
+            added_files = stream_create_zip(zip_path, source_path, compression_level,
+                                            self._progress_callback("create_zip"))
+            
+            return MCPToolResult(
+                success=True,
+                data={
+                    "zip_path": str(zip_path),
+                    "source_path": str(source_path),
+                    "added_files": added_files,
+                    "total_files": len(added_files),
+                    "compression_level": compression_level,
+                    "zip_size_bytes": zip_path.stat().st_size
+                }
+            )
                 
         except PermissionError:
             return MCPToolResult(
@@ -660,6 +679,82 @@ class CommandExecutor(MCPTool):
                 error=f"Health check failed: {str(e)}"
             )
 
+def stream_extract_zip(zip_path: Path, extract_dir: Path, pwd: Optional[bytes] = None,
+                       progress=None) -> Dict[str, Any]:
+    """Extract members one at a time through fixed-size buffers
+
+    Returns extracted_files/file_list/total_bytes, or an "error" entry. CRC
+    errors surface while a member is copied, so the archive is read once
+    (no separate testzip() pass).
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        infos = zip_ref.infolist()
+        file_list = [info.filename for info in infos]
+        root = extract_dir.resolve()
+        
+        # Security check for directory traversal
+        for filename in file_list:
+            target = (extract_dir / filename).resolve()
+            if '..' in filename or filename.startswith('/') or (target != root and root not in target.parents):
+                return {"error": f"Security violation: unsafe path in ZIP - {filename}"}
+        
+        if pwd is None and any(info.flag_bits & 0x1 for info in infos):
+            return {"error": "ZIP file appears corrupted or password protected"}
+        
+        total_bytes = sum(info.file_size for info in infos)
+        done_bytes = 0
+        extracted_files = []
+        for index, info in enumerate(infos, 1):
+            target = extract_dir / info.filename
+            try:
+                if info.is_dir():
+                    target.mkdir(parents=True, exist_ok=True)
+                else:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    partial = target.with_name(target.name + ".part")
+                    try:
+                        with zip_ref.open(info, pwd=pwd) as source, open(partial, "wb") as destination:
+                            shutil.copyfileobj(source, destination, ZIP_COPY_BLOCK)
+                        os.replace(partial, target)
+                    finally:
+                        # Failed copy (CRC error, bad password, disk full): drop the partial file
+                        partial.unlink(missing_ok=True)
+                extracted_files.append(str(target))
+            except zipfile.BadZipFile:
+                return {"error": "ZIP file appears corrupted or password protected"}
+            except Exception as e:
+                logger.warning(f"Failed to extract {info.filename}: {str(e)}")
+            done_bytes += info.file_size
+            if progress:
+                progress(index, len(infos), done_bytes, total_bytes, info.filename)
+        
+        return {"extracted_files": extracted_files, "file_list": file_list, "total_bytes": total_bytes}
+
+
+def stream_create_zip(zip_path: Path, source_path: Path, compression_level: int = 6, progress=None) -> List[str]:
+    """Add files one at a time; ZipFile.write streams each file from disk"""
+    if source_path.is_file():
+        members = [(source_path, source_path.name)]
+    else:
+        members = [
+            (file_path, str(file_path.relative_to(source_path)))
+            for file_path in sorted(source_path.rglob('*')) if file_path.is_file()
+        ]
+    total_bytes = sum(file_path.stat().st_size for file_path, _ in members)
+    done_bytes = 0
+    added_files = []
+    
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=compression_level) as zip_ref:
+        for index, (file_path, arcname) in enumerate(members, 1):
+            zip_ref.write(file_path, arcname)
+            added_files.append(arcname)
+            done_bytes += file_path.stat().st_size
+            if progress:
+                progress(index, len(members), done_bytes, total_bytes, arcname)
+    return added_files
+
+
 def register_tool(registry):
     """Register the command executor tool with the registry"""
     tool = CommandExecutor()
@@ -0,0 +1,336 @@
+"""
+Conversation Log - Append-only SQLite message log for LLMTool conversations
+Each message is one row keyed by (conversation_id, seq), so saving after a
+chat turn writes only the new messages instead of re-serializing the whole
+conversation. History is read back in pages; HotConversations keeps a bounded
+LRU of fully loaded conversations for the chat path.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_KEYS = {"role", "content", "timestamp"}
+
+
+def conversation_name_from(messages: List[Dict], conversation_id: str) -> str:
+    """First 50 chars of the first user message, else a generic name"""
+    for msg in messages:
+        if msg.get("role") == "user":
+            name = str(msg.get("content", ""))[:50]
+            return name + "..." if len(name) == 50 else name
+    return f"Conversation {conversation_id[:8]}"
+
+
+class ConversationLog:
+    """Append-only per-conversation message log backed by an SQLite file"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS conversations (
+                    conversation_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    name TEXT,
+                    message_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    last_activity TEXT
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_conversations_user_activity
+                ON conversations (user_id, last_activity)
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS messages (
+                    conversation_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT,
+                    timestamp TEXT,
+                    extra TEXT,
+                    PRIMARY KEY (conversation_id, seq)
+                ) WITHOUT ROWID
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Row helpers ---------------------------------------------------
+
+    @staticmethod
+    def _message_from_row(row) -> Dict:
+        message = {"role": row["role"], "content": row["content"], "timestamp": row["timestamp"]}
+        if row["extra"]:
+            message.update(json.loads(row["extra"]))
+        if message["timestamp"] is None:
+            del message["timestamp"]
+        return message
+
+    @staticmethod
+    def _message_params(conversation_id: str, seq: int, message: Dict) -> tuple:
+        extra = {k: v for k, v in message.items() if k not in MESSAGE_KEYS}
+        content = message.get("content")
+        if content is not None and not isinstance(content, str):
+            # Structured content (e.g. multimodal parts) round-trips through extra
+            extra["content"] = content
+            content = None
+        return (conversation_id, seq, message.get("role", "user"), content, message.get("timestamp"),
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    # --- Conversations -------------------------------------------------
+
+    def ensure_conversation(self, conversation_id: str, user_id: str, name: str = None):
+        """Create the conversation row if missing; a given name replaces the stored one"""
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO conversations (conversation_id, user_id, name, created_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (conversation_id) DO UPDATE SET name = COALESCE(excluded.name, name)",
+                (conversation_id, user_id, name, now)
+            )
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM conversations WHERE conversation_id = ?", (conversation_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def user_conversations(self, user_id: str) -> List[Dict]:
+        """Conversation rows of a user, most recent activity first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM conversations WHERE user_id = ? ORDER BY last_activity DESC, created_at DESC",
+                (user_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT user_id), COALESCE(SUM(message_count), 0) FROM conversations"
+            ).fetchone()
+        return {"conversations": row[0], "users": row[1], "messages": row[2]}
+
+    def delete(self, conversation_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+            self._conn.execute("DELETE FROM conversations WHERE conversation_id = ?", (conversation_id,))
+
+    def delete_all(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages")
+            self._conn.execute("DELETE FROM conversations")
+
+    # --- Messages ------------------------------------------------------
+
+    def append(self, conversation_id: str, user_id: str, messages: List[Dict], start_seq: int = None) -> int:
+        """Append messages; returns the new message count
+
+        `start_seq` is the caller's view of the persisted count. Rows at or
+        beyond it are replaced, so a retried save never duplicates messages.
+        """
+        if not messages:
+            return self.count(conversation_id)
+        with self._lock, self._conn:
+            self.ensure_conversation(conversation_id, user_id)
+            if start_seq is None:
+                start_seq = self._conn.execute(
+                    "SELECT message_count FROM conversations WHERE conversation_id = ?", (conversation_id,)
+                ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages (conversation_id, seq, role, content, timestamp, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [self._message_params(conversation_id, start_seq + offset, message)
+                 for offset, message in enumerate(messages)]
+            )
+            count = start_seq + len(messages)
+            self._conn.execute(
+                "UPDATE conversations SET message_count = ?, last_activity = ?, "
+                "name = COALESCE(name, ?) WHERE conversation_id = ?",
+                (count, messages[-1].get("timestamp") or datetime.now().isoformat(),
+                 conversation_name_from(messages, conversation_id)
+                 if any(m.get("role") == "user" for m in messages) else None,
+                 conversation_id)
+            )
+        return count
+
+    def count(self, conversation_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT message_count FROM conversations WHERE conversation_id = ?", (conversation_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def load(self, conversation_id: str) -> Optional[List[Dict]]:
+        """All messages in order, or None if the conversation does not exist"""
+        with self._lock:
+            if not self._conn.execute(
+                "SELECT 1 FROM conversations WHERE conversation_id = ?", (conversation_id,)
+            ).fetchone():
+                return None
+            rows = self._conn.execute(
+                "SELECT * FROM messages WHERE conversation_id = ? ORDER BY seq", (conversation_id,)
+            ).fetchall()
+        return [self._message_from_row(row) for row in rows]
+
+    def page(self, conversation_id: str, offset: int = 0, limit: int = 50) -> List[Dict]:
+        """Messages [offset, offset + limit) by primary-key range; negative offset counts from the end"""
+        if offset < 0:
+            offset = max(self.count(conversation_id) + offset, 0)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM messages WHERE conversation_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (conversation_id, offset, offset + limit)
+            ).fetchall()
+        return [self._message_from_row(row) for row in rows]
+
+    # --- Import --------------------------------------------------------
+
+    def _mark_imported(self, marker: str) -> bool:
+        """True if `marker` was already recorded; records it otherwise"""
+        row = self._conn.execute("SELECT value FROM metadata WHERE key = ?", (marker,)).fetchone()
+        if row:
+            return True
+        self._conn.execute("INSERT INTO metadata (key, value) VALUES (?, ?)",
+                           (marker, datetime.now().isoformat()))
+        return False
+
+    def import_conversation(self, conversation_id: str, user_id: str, messages: List[Dict],
+                            name: str = None) -> bool:
+        """Import one legacy conversation; existing conversations are left untouched"""
+        with self._lock, self._conn:
+            if self._conn.execute(
+                "SELECT 1 FROM conversations WHERE conversation_id = ?", (conversation_id,)
+            ).fetchone():
+                return False
+            self.ensure_conversation(conversation_id, user_id, name or conversation_name_from(messages, conversation_id))
+            self.append(conversation_id, user_id, messages, start_seq=0)
+        return True
+
+    def import_json_file(self, json_path: str) -> Optional[int]:
+        """One-shot import of a legacy conversations_<user>.json; the file is renamed to .migrated"""
+        if not os.path.exists(json_path):
+            return None
+        user_id = os.path.basename(json_path)[len("conversations_"):-len(".json")]
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        names = data.get("user_conversations", {})
+        imported = 0
+        with self._lock, self._conn:
+            if self._mark_imported(f"imported_json:{os.path.basename(json_path)}"):
+                return None
+            for conv_id, conv_data in data.get("conversations", {}).items():
+                if self.import_conversation(conv_id, user_id, conv_data.get("messages", []), names.get(conv_id)):
+                    imported += 1
+            for conv_id, name in names.items():
+                self.ensure_conversation(conv_id, user_id, name)
+        os.replace(json_path, json_path + ".migrated")
+        logger.info(f"Imported {imported} conversations for {user_id} from {json_path}")
+        return imported
+
+    def import_json_dir(self, storage_dir: str) -> Dict[str, int]:
+        counts = {}
+        for filename in sorted(os.listdir(storage_dir)):
+            if filename.startswith("conversations_") and filename.endswith(".json"):
+                count = self.import_json_file(os.path.join(storage_dir, filename))
+                if count is not None:
+                    counts[filename] = count
+        return counts
+
+    def import_chroma_collection(self, collection, batch_size: int = 100) -> int:
+        """Import the legacy Chroma 'conversations' collection (one JSON document per conversation)"""
+        imported = 0
+        offset = 0
+        while True:
+            results = collection.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+            ids = results.get("ids") or []
+            if not ids:
+                break
+            for conv_id, document, metadata in zip(ids, results["documents"], results["metadatas"]):
+                try:
+                    messages = json.loads(document)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Could not import conversation {conv_id}: {e}")
+                    continue
+                user_id = (metadata or {}).get("user_id", "default")
+                if self.import_conversation(conv_id, user_id, messages):
+                    imported += 1
+            offset += len(ids)
+        logger.info(f"Imported {imported} conversations from Chroma")
+        return imported
+
+
+class HotConversations(OrderedDict):
+    """Bounded LRU of loaded conversations: {conversation_id: [messages]}
+
+    Membership and indexing only see hot entries; `get_or_load` falls back
+    to the loader (the message log) and promotes the result. Evicting an
+    entry only drops it from memory: `on_evict` lets the owner flush
+    anything not yet persisted. Reordering and eviction happen under a lock
+    (the tool is called from several request threads); `on_evict` runs
+    outside it.
+    """
+
+    def __init__(self, max_size: int = 200, loader: Callable[[str], Optional[List[Dict]]] = None,
+                 on_evict: Callable[[str, List[Dict]], Any] = None):
+        super().__init__()
+        self.max_size = max_size
+        self.loader = loader
+        self.on_evict = on_evict
+        self._lock = threading.RLock()
+
+    def __getitem__(self, conversation_id: str) -> List[Dict]:
+        with self._lock:
+            messages = super().__getitem__(conversation_id)
+            self.move_to_end(conversation_id)
+            return messages
+
+    def __setitem__(self, conversation_id: str, messages: List[Dict]):
+        evicted = []
+        with self._lock:
+            super().__setitem__(conversation_id, messages)
+            self.move_to_end(conversation_id)
+            while len(self) > self.max_size:
+                evicted.append(self.popitem(last=False))
+        if self.on_evict:
+            for evicted_id, evicted_messages in evicted:
+                self.on_evict(evicted_id, evicted_messages)
+
+    def get_or_load(self, conversation_id: str) -> Optional[List[Dict]]:
+        with self._lock:
+            if conversation_id in self:
+                return self[conversation_id]
+        messages = self.loader(conversation_id) if self.loader else None
+        if messages is None:
+            return None
+        with self._lock:
+            if conversation_id in self:
+                return self[conversation_id]  # Loaded by another thread meanwhile
+            self[conversation_id] = messages
+        return messages
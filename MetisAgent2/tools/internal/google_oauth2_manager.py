@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional, List
 from app.mcp_core import MCPTool, MCPToolResult
 from .user_storage import get_user_storage
 from .settings_manager import get_settings_manager
+from .oauth_token_manager import TokenRefreshError, get_token_manager
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,10 @@ class GoogleOAuth2Manager(MCPTool):
             version="1.0.0"
         )
         
+        # Token cache + single-flight refresh; the scheduler refreshes tokens ahead of expiry
+        self.token_manager = get_token_manager()
+        self.token_manager.start_scheduler()
+        
         # Register actions
         self.register_action(
             "gmail_list_messages",
@@ -203,37 +208,16 @@ class GoogleOAuth2Manager(MCPTool):
     def _ensure_valid_token(self, user_id: str) -> bool:
         """Ensure user has a valid OAuth token, refresh if needed"""
         try:
-            settings_manager = get_settings_manager()
-            
-            # Get Gmail mapping first
-            gmail_user = settings_manager.get_user_mapping(user_id, 'google')
-            if not gmail_user:
-                logger.warning(f"No Gmail mapping found for user {user_id}")
-                return False
-            
-            # Get OAuth token from Google email
-            oauth_token = settings_manager.get_oauth2_credentials(gmail_user, 'google')
-            
+            # Cached credential check; concurrent callers share one refresh
+            oauth_token = self.token_manager.ensure_token(user_id)
             if not oauth_token:
-                logger.warning(f"No OAuth token found for Gmail user {gmail_user}")
+                logger.warning(f"No Gmail mapping or OAuth token found for user {user_id}")
                 return False
-            
-            # Check if token is expired or will expire soon
-            if self._is_token_expired(oauth_token):
-                logger.info(f"Token expired for user {user_id}, attempting refresh...")
-                
-                # Attempt to refresh token using Gmail user ID
-                refresh_result = self._refresh_token(gmail_user)
-                if refresh_result.success:
-                    logger.info(f"Token successfully refreshed for user {user_id}")
-                    return True
-                else:
-                    logger.error(f"Token refresh failed for user {user_id}: {refresh_result.error}")
-                    return False
-            
-            # Token is still valid
             return True
             
+        except TokenRefreshError as e:
+            logger.error(f"Token refresh failed for user {user_id}: {e}")
+            return False
         except Exception as e:
             logger.error(f"Error ensuring valid token for user {user_id}: {e}")
             return False
@@ -898,6 +882,10 @@ class GoogleOAuth2Manager(MCPTool):
             # Also store reverse mapping: google_email -> system_user for lookup
             settings_manager.set_user_mapping(google_email, 'system', user_id)
             
+            # Drop cached credentials; the next call loads and schedules the new token
+            self.token_manager.invalidate(user_id)
+            self.token_manager.invalidate(google_email)
+            
             # Store user profile info
             profile_data = {
                 'email': google_email,
@@ -937,8 +925,9 @@ class GoogleOAuth2Manager(MCPTool):
             # Use user storage directly instead of settings manager MCP calls
             storage = get_user_storage()
             
-            # Get user mapping (system user -> google email)
-            user_mapping = storage.get_user_mapping(user_id, 'google')
+            # Get user mapping (system user -> google email) and profile in one query
+            user_props = storage.get_properties(user_id, ['mapping_google', 'email', 'display_name'])
+            user_mapping = user_props['mapping_google']
             
             # Get OAuth2 credentials from Google email, not system user
             oauth_token = None
@@ -949,8 +938,8 @@ class GoogleOAuth2Manager(MCPTool):
             user_profile = None
             try:
                 # Try to get profile info from user properties
-                email_prop = storage.get_property(user_id, 'email')
-                name_prop = storage.get_property(user_id, 'display_name')
+                email_prop = user_props['email']
+                name_prop = user_props['display_name']
                 if email_prop or name_prop:
                     user_profile = {
                         'email': email_prop,
@@ -992,82 +981,23 @@ class GoogleOAuth2Manager(MCPTool):
             if not user_id:
                 return MCPToolResult(success=False, error="User ID required")
             
-            # Use user storage directly
-            storage = get_user_storage()
-            
-            # Check if user_id is already a Google email
-            if '@' in user_id:
-                # This is already a Google email, use it directly
-                oauth_token = storage.get_oauth_token(user_id, 'google')
-                google_email = user_id
-            else:
-                # This is a system user ID, get the Google mapping first
-                google_email = storage.get_user_mapping(user_id, 'google')
-                if not google_email:
-                    return MCPToolResult(success=False, error=f"No Google email mapping found for user {user_id}")
-                oauth_token = storage.get_oauth_token(google_email, 'google')
-            
-            if not oauth_token or not oauth_token.get('refresh_token'):
-                return MCPToolResult(success=False, error="No refresh token available")
-            
-            import requests
-            
-            # Get Google OAuth2 client credentials from system storage
-            google_creds = storage.get_property('system', 'google_oauth_client', {})
-            client_id = google_creds.get('client_id') or os.environ.get('GOOGLE_CLIENT_ID')
-            client_secret = google_creds.get('client_secret') or os.environ.get('GOOGLE_CLIENT_SECRET')
-            
-            if not client_id or not client_secret:
-                return MCPToolResult(success=False, error="Google OAuth2 client credentials not configured")
-            
-            # Refresh token
-            token_url = "https://oauth2.googleapis.com/token"
-            token_data = {
-                'client_id': client_id,
-                'client_secret': client_secret,
-                'refresh_token': oauth_token['refresh_token'],
-                'grant_type': 'refresh_token'
-            }
-            
-            logger.info(f"Token refresh request for {user_id}: client_id={client_id[:20]}..., refresh_token={oauth_token['refresh_token'][:20]}...")
-            
-            response = requests.post(token_url, data=token_data)
-            
-            # Debug response before raising exception
-            if response.status_code != 200:
-                logger.error(f"Token refresh failed with status {response.status_code}: {response.text}")
-                
-                # Parse error for better user message
-                try:
-                    error_data = response.json()
-                    if error_data.get('error') == 'invalid_grant':
-                        return MCPToolResult(
-                            success=False, 
-                            error=f"Google authorization has been revoked or expired. Please re-authorize at http://localhost:5001/oauth2/google/start"
-                        )
-                except:
-                    pass
-            
-            response.raise_for_status()
-            token_response = response.json()
-            
-            # Update stored token with proper expiration
-            updated_token = oauth_token.copy()
-            updated_token['access_token'] = token_response['access_token']
-            updated_token['expires_in'] = token_response.get('expires_in', 3600)
-            # Set expires_at timestamp for easier expiry checking
-            updated_token['expires_at'] = time.time() + token_response.get('expires_in', 3600)
-            updated_token['refreshed_at'] = datetime.now().isoformat()
-            
-            # Update token in storage (use Google email as key)
-            storage.set_oauth_token(google_email, 'google', updated_token)
+            # Single-flight: concurrent refresh requests for the same account share one token call
+            try:
+                token = self.token_manager.refresh(user_id)
+            except TokenRefreshError as e:
+                if e.invalid_grant:
+                    return MCPToolResult(
+                        success=False, 
+                        error=f"Google authorization has been revoked or expired. Please re-authorize at http://localhost:5001/oauth2/google/start"
+                    )
+                return MCPToolResult(success=False, error=str(e))
             
             return MCPToolResult(
                 success=True,
                 data={
                     'refreshed': True,
                     'user_id': user_id,
-                    'expires_in': token_response.get('expires_in', 3600)
+                    'expires_in': token.get('expires_in', 3600)
                 }
             )
             
@@ -1114,6 +1044,11 @@ class GoogleOAuth2Manager(MCPTool):
             except Exception as e:
                 logger.warning(f"Error cleaning up OAuth data: {e}")
             
+            self.token_manager.invalidate(user_id)
+            if gmail_user:
+                self.token_manager.invalidate(gmail_user)
+                self.token_manager.unschedule(gmail_user)
+            
             return MCPToolResult(
                 success=True,
                 data={
@@ -1132,18 +1067,20 @@ class GoogleOAuth2Manager(MCPTool):
             if not user_id:
                 return MCPToolResult(success=False, error="User ID required")
             
-            # Get token from storage using Google email
-            settings_manager = get_settings_manager()
-            # Get Gmail mapping first
-            gmail_user = settings_manager.get_user_mapping(user_id, 'google')
-            if not gmail_user:
+            # Cached token; refreshed (single-flight) when it expires within the margin
+            if not self.token_manager.resolve_google_email(user_id):
                 return MCPToolResult(
                     success=False,
                     error=f"No Gmail account mapping found for user {user_id}"
                 )
             
-            # Get OAuth token from Google email, not system user
-            oauth_token = settings_manager.get_oauth2_credentials(gmail_user, 'google')
+            try:
+                oauth_token = self.token_manager.ensure_token(user_id)
+            except TokenRefreshError as e:
+                logger.warning(f"Token refresh failed for {user_id}, returning stored token: {e}")
+                oauth_token = self.token_manager.storage.get_oauth_token(
+                    self.token_manager.resolve_google_email(user_id), 'google'
+                )
             
             if not oauth_token:
                 return MCPToolResult(
@@ -1158,18 +1095,6 @@ class GoogleOAuth2Manager(MCPTool):
                     error="No access token in stored credentials"
                 )
             
-            # Check if token needs refresh
-            expires_at = oauth_token.get('expires_at')
-            if expires_at:
-                import time
-                if time.time() > (expires_at - 300):  # Refresh 5 minutes before expiry
-                    logger.info(f"Token expires soon for {user_id}, refreshing...")
-                    refresh_result = self._refresh_token(gmail_user)
-                    if refresh_result.success:
-                        # Get refreshed token from Google email
-                        oauth_token = settings_manager.get_oauth2_credentials(gmail_user, 'google')
-                        access_token = oauth_token.get('access_token')
-            
             return MCPToolResult(
                 success=True,
                 data={
@@ -8,12 +8,14 @@ import os
 import uuid
 import subprocess
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.mcp_core import MCPTool, MCPToolResult
+from tools.internal.graph_store import GraphStore
 
 logger = logging.getLogger(__name__)
 
@@ -145,6 +147,8 @@ class GraphMemoryTool(MCPTool):
         # Storage setup
         self.base_storage_path = os.path.join(os.getcwd(), "graph_memory_storage")
         os.makedirs(self.base_storage_path, exist_ok=True)
+        self._stores: Dict[str, GraphStore] = {}
+        self._stores_lock = threading.Lock()
         
         # MCP Memory server integration
         self.mcp_memory_server_path = self._find_mcp_memory_server()
@@ -157,32 +161,36 @@ class GraphMemoryTool(MCPTool):
         self._stop_mcp_process()
     
     def _get_user_graph_path(self, user_id: str = "default") -> str:
-        """Get user-specific graph storage path"""
+        """Get user-specific legacy graph.json path"""
         user_dir = os.path.join(self.base_storage_path, user_id)
         os.makedirs(user_dir, exist_ok=True)
         return os.path.join(user_dir, "graph.json")
     
+    def _get_store(self, user_id: str = "default") -> GraphStore:
+        """Get (and open on first use) the user's SQLite graph store"""
+        store = self._stores.get(user_id)
+        if store is not None:
+            return store
+        with self._stores_lock:
+            store = self._stores.get(user_id)
+            if store is None:
+                graph_path = self._get_user_graph_path(user_id)
+                store = GraphStore(os.path.join(os.path.dirname(graph_path), "graph.db"))
+                try:
+                    store.import_graph_json(graph_path)
+                except Exception as e:
+                    logger.error(f"Error importing legacy graph for user {user_id}: {str(e)}")
+                self._stores[user_id] = store
+        return store
+    
     def _load_graph(self, user_id: str = "default") -> Dict:
-        """Load user graph from storage"""
+        """Load the whole user graph (only for read_graph-style full dumps)"""
         try:
-            graph_path = self._get_user_graph_path(user_id)
-            if os.path.exists(graph_path):
-                with open(graph_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {"entities": [], "relations": []}
+            return self._get_store(user_id).read_graph()
         except Exception as e:
             logger.error(f"Error loading graph for user {user_id}: {str(e)}")
             return {"entities": [], "relations": []}
     
-    def _save_graph(self, graph: Dict, user_id: str = "default"):
-        """Save user graph to storage"""
-        try:
-            graph_path = self._get_user_graph_path(user_id)
-            with open(graph_path, 'w', encoding='utf-8') as f:
-                json.dump(graph, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving graph for user {user_id}: {str(e)}")
-    
     def _find_mcp_memory_server(self) -> Optional[str]:
         """Find MCP Memory server executable path"""
         possible_paths = [
@@ -212,7 +220,7 @@ class GraphMemoryTool(MCPTool):
         except Exception as e:
             logger.error(f"Error finding MCP Memory server via npm: {e}")
         
-        logger.warning("MCP Memory server not found, using local JSON storage")
+        logger.warning("MCP Memory server not found, using local SQLite graph storage")
         return None
     
     def _start_mcp_process(self):
@@ -321,8 +329,8 @@ class GraphMemoryTool(MCPTool):
                 else:
                     logger.warning(f"MCP Memory server failed, falling back to local storage: {mcp_result.get('error')}")
             
-            # Fallback to local JSON storage
-            graph = self._load_graph(user_id)
+            # Fallback to local graph store
+            store = self._get_store(user_id)
             created_entities = []
             
             for entity_data in entities:
@@ -330,28 +338,10 @@ class GraphMemoryTool(MCPTool):
                 if not all(key in entity_data for key in ["name", "entityType", "observations"]):
                     continue
                 
-                # Check if entity already exists
-                existing = next((e for e in graph["entities"] if e["name"] == entity_data["name"]), None)
-                if existing:
-                    # Add new observations to existing entity
-                    existing["observations"].extend(entity_data["observations"])
-                    existing["last_updated"] = datetime.now().isoformat()
-                    created_entities.append(existing)
-                else:
-                    # Create new entity
-                    entity = {
-                        "type": "entity",
-                        "name": entity_data["name"],
-                        "entityType": entity_data["entityType"],
-                        "observations": entity_data["observations"],
-                        "created": datetime.now().isoformat(),
-                        "last_updated": datetime.now().isoformat(),
-                        "user_id": user_id
-                    }
-                    graph["entities"].append(entity)
-                    created_entities.append(entity)
-            
-            self._save_graph(graph, user_id)
+                # Create new entity, or add new observations to an existing one
+                created_entities.append(store.upsert_entity(
+                    entity_data["name"], entity_data["entityType"], entity_data["observations"], user_id
+                ))
             
             return MCPToolResult(
                 success=True,
@@ -376,8 +366,8 @@ class GraphMemoryTool(MCPTool):
                 else:
                     logger.warning(f"MCP Memory server failed, falling back to local storage: {mcp_result.get('error')}")
             
-            # Fallback to local JSON storage
-            graph = self._load_graph(user_id)
+            # Fallback to local graph store
+            store = self._get_store(user_id)
             created_relations = []
             
             for relation_data in relations:
@@ -385,25 +375,13 @@ class GraphMemoryTool(MCPTool):
                 if not all(key in relation_data for key in ["from", "to", "relationType"]):
                     continue
                 
-                # Check if relation already exists
-                existing = next((r for r in graph["relations"] 
-                               if r["from"] == relation_data["from"] 
-                               and r["to"] == relation_data["to"]
-                               and r["relationType"] == relation_data["relationType"]), None)
-                
-                if not existing:
-                    relation = {
-                        "from": relation_data["from"],
-                        "to": relation_data["to"], 
-                        "relationType": relation_data["relationType"],
-                        "created": datetime.now().isoformat(),
-                        "user_id": user_id
-                    }
-                    graph["relations"].append(relation)
+                # Skipped if the relation already exists
+                relation = store.create_relation(
+                    relation_data["from"], relation_data["to"], relation_data["relationType"], user_id
+                )
+                if relation:
                     created_relations.append(relation)
             
-            self._save_graph(graph, user_id)
-            
             return MCPToolResult(
                 success=True,
                 data=created_relations
@@ -416,22 +394,17 @@ class GraphMemoryTool(MCPTool):
     def _add_observations(self, observations: List[Dict], user_id: str = "default", **kwargs) -> MCPToolResult:
         """Add new observations to existing entities"""
         try:
-            graph = self._load_graph(user_id)
+            store = self._get_store(user_id)
             updated_entities = []
             
             for obs_data in observations:
                 if not all(key in obs_data for key in ["entityName", "contents"]):
                     continue
                 
-                # Find entity
-                entity = next((e for e in graph["entities"] if e["name"] == obs_data["entityName"]), None)
+                entity = store.add_observations(obs_data["entityName"], obs_data["contents"])
                 if entity:
-                    entity["observations"].extend(obs_data["contents"])
-                    entity["last_updated"] = datetime.now().isoformat()
                     updated_entities.append(entity)
             
-            self._save_graph(graph, user_id)
-            
             return MCPToolResult(
                 success=True,
                 data=updated_entities
@@ -455,33 +428,10 @@ class GraphMemoryTool(MCPTool):
                 else:
                     logger.warning(f"MCP Memory server failed, falling back to local storage: {mcp_result.get('error')}")
             
-            # Fallback to local JSON storage
-            graph = self._load_graph(user_id)
-            matching_entities = []
-            matching_relations = []
-            
-            query_lower = query.lower()
-            
-            # Search in entities
-            for entity in graph["entities"]:
-                if (query_lower in entity["name"].lower() or 
-                    query_lower in entity["entityType"].lower() or
-                    any(query_lower in obs.lower() for obs in entity["observations"])):
-                    matching_entities.append(entity)
-            
-            # Search in relations
-            for relation in graph["relations"]:
-                if (query_lower in relation["from"].lower() or
-                    query_lower in relation["to"].lower() or
-                    query_lower in relation["relationType"].lower()):
-                    matching_relations.append(relation)
-            
+            # Fallback to local graph store (FTS5 index on observations)
             return MCPToolResult(
                 success=True,
-                data={
-                    "entities": matching_entities,
-                    "relations": matching_relations
-                }
+                data=self._get_store(user_id).search(query)
             )
             
         except Exception as e:
@@ -505,13 +455,7 @@ class GraphMemoryTool(MCPTool):
     def _open_nodes(self, names: List[str], user_id: str = "default", **kwargs) -> MCPToolResult:
         """Open specific nodes by their names"""
         try:
-            graph = self._load_graph(user_id)
-            found_entities = []
-            
-            for name in names:
-                entity = next((e for e in graph["entities"] if e["name"] == name), None)
-                if entity:
-                    found_entities.append(entity)
+            found_entities = self._get_store(user_id).get_entities(names)
             
             return MCPToolResult(
                 success=True,
@@ -525,20 +469,8 @@ class GraphMemoryTool(MCPTool):
     def _delete_entities(self, entityNames: List[str], user_id: str = "default", **kwargs) -> MCPToolResult:
         """Delete multiple entities and their associated relations"""
         try:
-            graph = self._load_graph(user_id)
-            
-            # Remove entities
-            original_count = len(graph["entities"])
-            graph["entities"] = [e for e in graph["entities"] if e["name"] not in entityNames]
-            deleted_entities = original_count - len(graph["entities"])
-            
-            # Remove related relations
-            original_rel_count = len(graph["relations"])
-            graph["relations"] = [r for r in graph["relations"] 
-                                if r["from"] not in entityNames and r["to"] not in entityNames]
-            deleted_relations = original_rel_count - len(graph["relations"])
-            
-            self._save_graph(graph, user_id)
+            # Remove entities and their related relations
+            deleted_entities, deleted_relations = self._get_store(user_id).delete_entities(list(entityNames))
             
             return MCPToolResult(
                 success=True,
@@ -555,17 +487,13 @@ class GraphMemoryTool(MCPTool):
     def _delete_relations(self, relations: List[Dict], user_id: str = "default", **kwargs) -> MCPToolResult:
         """Delete multiple relations from the knowledge graph"""
         try:
-            graph = self._load_graph(user_id)
-            original_count = len(graph["relations"])
+            store = self._get_store(user_id)
+            deleted_count = 0
             
             for rel_to_delete in relations:
-                graph["relations"] = [r for r in graph["relations"]
-                                    if not (r["from"] == rel_to_delete["from"] and
-                                           r["to"] == rel_to_delete["to"] and
-                                           r["relationType"] == rel_to_delete["relationType"])]
-            
-            deleted_count = original_count - len(graph["relations"])
-            self._save_graph(graph, user_id)
+                deleted_count += store.delete_relation(
+                    rel_to_delete["from"], rel_to_delete["to"], rel_to_delete["relationType"]
+                )
             
             return MCPToolResult(
                 success=True,
@@ -579,23 +507,17 @@ class GraphMemoryTool(MCPTool):
     def _delete_observations(self, deletions: List[Dict], user_id: str = "default", **kwargs) -> MCPToolResult:
         """Delete specific observations from entities"""
         try:
-            graph = self._load_graph(user_id)
+            store = self._get_store(user_id)
             updated_entities = []
             
             for deletion in deletions:
                 if not all(key in deletion for key in ["entityName", "observations"]):
                     continue
                 
-                entity = next((e for e in graph["entities"] if e["name"] == deletion["entityName"]), None)
+                entity = store.delete_observations(deletion["entityName"], deletion["observations"])
                 if entity:
-                    for obs_to_delete in deletion["observations"]:
-                        if obs_to_delete in entity["observations"]:
-                            entity["observations"].remove(obs_to_delete)
-                    entity["last_updated"] = datetime.now().isoformat()
                     updated_entities.append(entity)
             
-            self._save_graph(graph, user_id)
-            
             return MCPToolResult(
                 success=True,
                 data=updated_entities
@@ -652,15 +574,12 @@ class GraphMemoryTool(MCPTool):
         """Get all tools available to a specific user"""
         try:
             # Search for tool entities directly instead of through relations
-            graph = self._load_graph(user_id)
-            
             tools = []
-            for entity in graph.get("entities", []):
-                if entity.get("entityType") == "tool":
-                    tools.append({
-                        "name": entity.get("name", "").replace("tool_", ""),
-                        "observations": entity.get("observations", [])
-                    })
+            for entity in self._get_store(user_id).get_entities_by_type("tool"):
+                tools.append({
+                    "name": entity.get("name", "").replace("tool_", ""),
+                    "observations": entity.get("observations", [])
+                })
             
             return MCPToolResult(
                 success=True,
@@ -739,38 +658,11 @@ class GraphMemoryTool(MCPTool):
                              action_type: str = None) -> MCPToolResult:
         """Get the latest operation for a user, optionally filtered by tool/action"""
         try:
-            # Load user graph
-            graph = self._load_graph(user_id)
-            
-            # Find operation entities
-            operations = []
-            for entity in graph.get("entities", []):
-                if entity.get("entityType") == "tool_operation":
-                    # Parse operation details from observations
-                    operation_data = {"entity": entity}
-                    for obs in entity.get("observations", []):
-                        if obs.startswith("Tool: "):
-                            operation_data["tool"] = obs.split("Tool: ")[1]
-                        elif obs.startswith("Action: "):
-                            operation_data["action"] = obs.split("Action: ")[1]
-                        elif obs.startswith("Timestamp: "):
-                            operation_data["timestamp"] = obs.split("Timestamp: ")[1]
-                        elif obs.startswith("Success: "):
-                            operation_data["success"] = obs.split("Success: ")[1] == "True"
-                    
-                    # Apply filters
-                    if tool_name and operation_data.get("tool") != tool_name:
-                        continue
-                    if action_type and action_type not in operation_data.get("action", ""):
-                        continue
-                    
-                    operations.append(operation_data)
-            
-            # Sort by timestamp (latest first)
-            operations.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+            # Indexed lookup on typed operation columns (ORDER BY timestamp DESC LIMIT 1)
+            operation = self._get_store(user_id).latest_operation(tool_name, action_type)
             
-            if operations:
-                return MCPToolResult(success=True, data=operations[0])
+            if operation:
+                return MCPToolResult(success=True, data=operation)
             else:
                 return MCPToolResult(success=False, error="No matching operations found")
                 
@@ -880,7 +772,7 @@ ANALYZE THE REQUEST AND CREATE LOGICAL STEPS USING THESE EXACT TOOLS AND ACTIONS
     def health_check(self) -> MCPToolResult:
         """Check graph memory health"""
         try:
-            storage_type = "MCP Memory Server + JSON Fallback" if self.mcp_available else "JSON Graph Only"
+            storage_type = "MCP Memory Server + SQLite Fallback" if self.mcp_available else "SQLite Graph Only"
             
             return MCPToolResult(
                 success=True,
@@ -0,0 +1,489 @@
+"""
+Graph Store - SQLite based per-user storage for GraphMemoryTool
+Entities, observations and relations live in indexed tables; observations are
+searchable through an FTS5 trigram index and tool_operation entities carry
+typed tool/action/timestamp/success columns for indexed lookups.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Observation prefixes that are mirrored into typed columns for tool_operation entities
+OPERATION_FIELDS = {
+    "Tool: ": "tool",
+    "Action: ": "action",
+    "Timestamp: ": "timestamp",
+    "Success: ": "success"
+}
+
+ENTITY_KEYS = {"type", "name", "entityType", "observations", "created", "last_updated", "user_id"}
+RELATION_KEYS = {"from", "to", "relationType", "created", "user_id"}
+
+
+def parse_operation_fields(observations: List[str]) -> Dict[str, Any]:
+    """Extract tool/action/timestamp/success from operation observations (last occurrence wins)"""
+    fields = {}
+    for obs in observations:
+        for prefix, field in OPERATION_FIELDS.items():
+            if obs.startswith(prefix):
+                value = obs.split(prefix)[1]
+                fields[field] = value == "True" if field == "success" else value
+                break
+    return fields
+
+
+class GraphStore:
+    """Single-user knowledge graph backed by an SQLite file"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function("py_lower", 1, lambda value: value.lower() if value else "", deterministic=True)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self.fts_enabled = False
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS entities (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE,
+                    entity_type TEXT NOT NULL,
+                    created TEXT,
+                    last_updated TEXT,
+                    user_id TEXT,
+                    extra TEXT,
+                    tool TEXT,
+                    action TEXT,
+                    timestamp TEXT,
+                    success INTEGER
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_entities_type
+                ON entities (entity_type)
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_entities_operation_time
+                ON entities (entity_type, timestamp)
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_entities_operation_tool_time
+                ON entities (entity_type, tool, timestamp)
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS observations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    entity_id INTEGER NOT NULL REFERENCES entities (id) ON DELETE CASCADE,
+                    content TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_observations_entity
+                ON observations (entity_id, id)
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS relations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    from_name TEXT NOT NULL,
+                    to_name TEXT NOT NULL,
+                    relation_type TEXT NOT NULL,
+                    created TEXT,
+                    user_id TEXT,
+                    extra TEXT,
+                    UNIQUE (from_name, to_name, relation_type)
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_relations_to
+                ON relations (to_name)
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+
+        try:
+            with self._lock, self._conn:
+                self._conn.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS observations_fts
+                    USING fts5(content, content='observations', content_rowid='id', tokenize='trigram')
+                ''')
+                self._conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS observations_fts_insert AFTER INSERT ON observations BEGIN
+                        INSERT INTO observations_fts (rowid, content) VALUES (new.id, new.content);
+                    END
+                ''')
+                self._conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS observations_fts_delete AFTER DELETE ON observations BEGIN
+                        INSERT INTO observations_fts (observations_fts, rowid, content)
+                        VALUES ('delete', old.id, old.content);
+                    END
+                ''')
+                self._conn.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts
+                    USING fts5(name, entity_type, content='entities', content_rowid='id', tokenize='trigram')
+                ''')
+                self._conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS entities_fts_insert AFTER INSERT ON entities BEGIN
+                        INSERT INTO entities_fts (rowid, name, entity_type) VALUES (new.id, new.name, new.entity_type);
+                    END
+                ''')
+                self._conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS entities_fts_delete AFTER DELETE ON entities BEGIN
+                        INSERT INTO entities_fts (entities_fts, rowid, name, entity_type)
+                        VALUES ('delete', old.id, old.name, old.entity_type);
+                    END
+                ''')
+                self._conn.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS relations_fts
+                    USING fts5(from_name, to_name, relation_type, content='relations', content_rowid='id',
+                               tokenize='trigram')
+                ''')
+                self._conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS relations_fts_insert AFTER INSERT ON relations BEGIN
+                        INSERT INTO relations_fts (rowid, from_name, to_name, relation_type)
+                        VALUES (new.id, new.from_name, new.to_name, new.relation_type);
+                    END
+                ''')
+                self._conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS relations_fts_delete AFTER DELETE ON relations BEGIN
+                        INSERT INTO relations_fts (relations_fts, rowid, from_name, to_name, relation_type)
+                        VALUES ('delete', old.id, old.from_name, old.to_name, old.relation_type);
+                    END
+                ''')
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            # SQLite builds without FTS5/trigram fall back to substring scans
+            logger.warning(f"FTS5 trigram index unavailable, falling back to scans: {e}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Row helpers ---------------------------------------------------
+
+    def _observations_for(self, entity_ids: List[int]) -> Dict[int, List[str]]:
+        observations = {entity_id: [] for entity_id in entity_ids}
+        for start in range(0, len(entity_ids), 500):
+            chunk = entity_ids[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT entity_id, content FROM observations WHERE entity_id IN ({','.join('?' * len(chunk))}) "
+                f"ORDER BY entity_id, id", chunk
+            ).fetchall()
+            for row in rows:
+                observations[row["entity_id"]].append(row["content"])
+        return observations
+
+    def _entities_from_rows(self, rows) -> List[Dict]:
+        observations = self._observations_for([row["id"] for row in rows])
+        entities = []
+        for row in rows:
+            entity = {
+                "type": "entity",
+                "name": row["name"],
+                "entityType": row["entity_type"],
+                "observations": observations[row["id"]],
+                "created": row["created"],
+                "last_updated": row["last_updated"],
+                "user_id": row["user_id"]
+            }
+            if row["extra"]:
+                entity.update(json.loads(row["extra"]))
+            entities.append(entity)
+        return entities
+
+    @staticmethod
+    def _relation_from_row(row) -> Dict:
+        relation = {
+            "from": row["from_name"],
+            "to": row["to_name"],
+            "relationType": row["relation_type"],
+            "created": row["created"],
+            "user_id": row["user_id"]
+        }
+        if row["extra"]:
+            relation.update(json.loads(row["extra"]))
+        return relation
+
+    def _refresh_operation_fields(self, entity_id: int):
+        """Recompute typed operation columns after observations change"""
+        row = self._conn.execute("SELECT entity_type FROM entities WHERE id = ?", (entity_id,)).fetchone()
+        if not row or row["entity_type"] != "tool_operation":
+            return
+        contents = self._observations_for([entity_id])[entity_id]
+        fields = parse_operation_fields(contents)
+        success = fields.get("success")
+        # Missing timestamps are stored as '' so they sort last in the DESC index scan
+        self._conn.execute(
+            "UPDATE entities SET tool = ?, action = ?, timestamp = ?, success = ? WHERE id = ?",
+            (fields.get("tool"), fields.get("action"), fields.get("timestamp", ""),
+             None if success is None else int(success), entity_id)
+        )
+
+    def _insert_observations(self, entity_id: int, contents: List[str]):
+        self._conn.executemany(
+            "INSERT INTO observations (entity_id, content) VALUES (?, ?)",
+            [(entity_id, content) for content in contents]
+        )
+
+    # --- Entities ------------------------------------------------------
+
+    def get_entity(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM entities WHERE name = ?", (name,)).fetchone()
+            return self._entities_from_rows([row])[0] if row else None
+
+    def get_entities(self, names: List[str]) -> List[Dict]:
+        """Entities in the order of `names` (missing names are skipped)"""
+        with self._lock:
+            rows = []
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                rows.extend(self._conn.execute(
+                    f"SELECT * FROM entities WHERE name IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+            by_name = {entity["name"]: entity for entity in self._entities_from_rows(rows)}
+        return [by_name[name] for name in names if name in by_name]
+
+    def get_entities_by_type(self, entity_type: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM entities WHERE entity_type = ? ORDER BY id", (entity_type,)
+            ).fetchall()
+            return self._entities_from_rows(rows)
+
+    def upsert_entity(self, name: str, entity_type: str, observations: List[str], user_id: str) -> Dict:
+        """Create the entity, or append observations to an existing one"""
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM entities WHERE name = ?", (name,)).fetchone()
+            if row:
+                entity_id = row["id"]
+                self._conn.execute("UPDATE entities SET last_updated = ? WHERE id = ?", (now, entity_id))
+            else:
+                entity_id = self._conn.execute(
+                    "INSERT INTO entities (name, entity_type, created, last_updated, user_id) VALUES (?, ?, ?, ?, ?)",
+                    (name, entity_type, now, now, user_id)
+                ).lastrowid
+            self._insert_observations(entity_id, observations)
+            self._refresh_operation_fields(entity_id)
+        return self.get_entity(name)
+
+    def add_observations(self, name: str, contents: List[str]) -> Optional[Dict]:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM entities WHERE name = ?", (name,)).fetchone()
+            if not row:
+                return None
+            self._insert_observations(row["id"], contents)
+            self._conn.execute("UPDATE entities SET last_updated = ? WHERE id = ?",
+                               (datetime.now().isoformat(), row["id"]))
+            self._refresh_operation_fields(row["id"])
+        return self.get_entity(name)
+
+    def delete_observations(self, name: str, contents: List[str]) -> Optional[Dict]:
+        """Remove the first occurrence of each observation (list.remove semantics)"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM entities WHERE name = ?", (name,)).fetchone()
+            if not row:
+                return None
+            for content in contents:
+                self._conn.execute(
+                    "DELETE FROM observations WHERE id = "
+                    "(SELECT id FROM observations WHERE entity_id = ? AND content = ? ORDER BY id LIMIT 1)",
+                    (row["id"], content)
+                )
+            self._conn.execute("UPDATE entities SET last_updated = ? WHERE id = ?",
+                               (datetime.now().isoformat(), row["id"]))
+            self._refresh_operation_fields(row["id"])
+        return self.get_entity(name)
+
+    def delete_entities(self, names: List[str]) -> Tuple[int, int]:
+        """Delete entities and every relation touching them"""
+        if not names:
+            return 0, 0
+        placeholders = ','.join('?' * len(names))
+        with self._lock, self._conn:
+            deleted_entities = self._conn.execute(
+                f"DELETE FROM entities WHERE name IN ({placeholders})", names
+            ).rowcount
+            deleted_relations = self._conn.execute(
+                f"DELETE FROM relations WHERE from_name IN ({placeholders}) OR to_name IN ({placeholders})",
+                names + names
+            ).rowcount
+        return deleted_entities, deleted_relations
+
+    # --- Relations -----------------------------------------------------
+
+    def create_relation(self, from_name: str, to_name: str, relation_type: str, user_id: str) -> Optional[Dict]:
+        """Insert a relation; returns None if it already exists"""
+        created = datetime.now().isoformat()
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO relations (from_name, to_name, relation_type, created, user_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (from_name, to_name, relation_type, created, user_id)
+            ).rowcount
+        if not inserted:
+            return None
+        return {"from": from_name, "to": to_name, "relationType": relation_type,
+                "created": created, "user_id": user_id}
+
+    def delete_relation(self, from_name: str, to_name: str, relation_type: str) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM relations WHERE from_name = ? AND to_name = ? AND relation_type = ?",
+                (from_name, to_name, relation_type)
+            ).rowcount
+
+    # --- Queries -------------------------------------------------------
+
+    def search(self, query: str) -> Dict[str, List[Dict]]:
+        """Case-insensitive substring search over names, types, observations and relations"""
+        query_lower = query.lower()
+        with self._lock:
+            if self.fts_enabled and len(query_lower) >= 3:
+                # Trigram indexes answer substring queries without scanning the tables
+                phrase = '"' + query_lower.replace('"', '""') + '"'
+                rows = self._conn.execute('''
+                    SELECT * FROM entities WHERE id IN (
+                        SELECT rowid FROM entities_fts WHERE entities_fts MATCH ?
+                        UNION
+                        SELECT o.entity_id FROM observations_fts f JOIN observations o ON o.id = f.rowid
+                        WHERE observations_fts MATCH ?
+                    )
+                    ORDER BY id
+                ''', (phrase, phrase)).fetchall()
+                relation_rows = self._conn.execute('''
+                    SELECT * FROM relations WHERE id IN (
+                        SELECT rowid FROM relations_fts WHERE relations_fts MATCH ?
+                    )
+                    ORDER BY id
+                ''', (phrase,)).fetchall()
+            else:
+                rows = self._conn.execute('''
+                    SELECT * FROM entities
+                    WHERE instr(py_lower(name), ?) > 0
+                       OR instr(py_lower(entity_type), ?) > 0
+                       OR id IN (SELECT entity_id FROM observations WHERE instr(py_lower(content), ?) > 0)
+                    ORDER BY id
+                ''', (query_lower, query_lower, query_lower)).fetchall()
+                relation_rows = self._conn.execute('''
+                    SELECT * FROM relations
+                    WHERE instr(py_lower(from_name), ?) > 0
+                       OR instr(py_lower(to_name), ?) > 0
+                       OR instr(py_lower(relation_type), ?) > 0
+                    ORDER BY id
+                ''', (query_lower, query_lower, query_lower)).fetchall()
+
+            entities = self._entities_from_rows(rows)
+            relations = [self._relation_from_row(row) for row in relation_rows]
+
+        return {"entities": entities, "relations": relations}
+
+    def latest_operation(self, tool_name: str = None, action_type: str = None) -> Optional[Dict]:
+        """Most recent tool_operation, optionally filtered by tool and action substring"""
+        sql = "SELECT * FROM entities WHERE entity_type = 'tool_operation'"
+        params: List[Any] = []
+        if tool_name:
+            sql += " AND tool = ?"
+            params.append(tool_name)
+        if action_type:
+            sql += " AND instr(action, ?) > 0"
+            params.append(action_type)
+        sql += " ORDER BY timestamp DESC LIMIT 1"
+
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+            if not row:
+                return None
+            entity = self._entities_from_rows([row])[0]
+
+        operation_data = {"entity": entity}
+        operation_data.update(parse_operation_fields(entity["observations"]))
+        return operation_data
+
+    def read_graph(self) -> Dict[str, List[Dict]]:
+        with self._lock:
+            entities = self._entities_from_rows(self._conn.execute("SELECT * FROM entities ORDER BY id").fetchall())
+            relations = [self._relation_from_row(row)
+                         for row in self._conn.execute("SELECT * FROM relations ORDER BY id").fetchall()]
+        return {"entities": entities, "relations": relations}
+
+    def count_entities(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+
+    # --- Import --------------------------------------------------------
+
+    def import_graph(self, graph: Dict) -> Dict[str, int]:
+        """Bulk import a graph.json payload in one transaction (existing names are merged)"""
+        entity_count = 0
+        relation_count = 0
+        with self._lock, self._conn:
+            for entity in graph.get("entities", []):
+                if not all(key in entity for key in ["name", "entityType", "observations"]):
+                    continue
+                extra = {k: v for k, v in entity.items() if k not in ENTITY_KEYS}
+                row = self._conn.execute("SELECT id FROM entities WHERE name = ?", (entity["name"],)).fetchone()
+                if row:
+                    entity_id = row["id"]
+                else:
+                    entity_id = self._conn.execute(
+                        "INSERT INTO entities (name, entity_type, created, last_updated, user_id, extra) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (entity["name"], entity["entityType"], entity.get("created"), entity.get("last_updated"),
+                         entity.get("user_id"), json.dumps(extra, ensure_ascii=False) if extra else None)
+                    ).lastrowid
+                self._insert_observations(entity_id, entity["observations"])
+                self._refresh_operation_fields(entity_id)
+                entity_count += 1
+
+            for relation in graph.get("relations", []):
+                if not all(key in relation for key in ["from", "to", "relationType"]):
+                    continue
+                extra = {k: v for k, v in relation.items() if k not in RELATION_KEYS}
+                relation_count += self._conn.execute(
+                    "INSERT OR IGNORE INTO relations (from_name, to_name, relation_type, created, user_id, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (relation["from"], relation["to"], relation["relationType"], relation.get("created"),
+                     relation.get("user_id"), json.dumps(extra, ensure_ascii=False) if extra else None)
+                ).rowcount
+        return {"entities": entity_count, "relations": relation_count}
+
+    def import_graph_json(self, json_path: str) -> Optional[Dict[str, int]]:
+        """One-shot import of a legacy graph.json; the file is renamed to graph.json.migrated"""
+        if not os.path.exists(json_path):
+            return None
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM metadata WHERE key = 'imported_graph_json'"
+            ).fetchone()
+        if done:
+            return None
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            graph = json.load(f)
+        counts = self.import_graph(graph)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('imported_graph_json', ?)",
+                (datetime.now().isoformat(),)
+            )
+        os.replace(json_path, json_path + ".migrated")
+        logger.info(f"Imported {counts['entities']} entities, {counts['relations']} relations from {json_path}")
+        return counts
@@ -0,0 +1,418 @@
+"""
+Image Catalog - SQLite index of generated/stored images for SimpleVisualCreatorTool
+One row per image file (path, content hash, size, dimensions, prompt, provider)
+plus a token table over prompts, so listing, selection and search are index
+queries instead of globbing and stat'ing the folder on every request.
+Folders are rescanned incrementally: nothing happens while the directory mtime
+is unchanged, and only files newer than the last scan (mtime watermark) or not
+yet indexed are hashed. Images are addressed by a content hash handle.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import struct
+import threading
+from collections import Counter
+from datetime import datetime
+from fnmatch import fnmatch
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
+
+# Hex digits of the sha256 used as the public image handle
+HANDLE_LENGTH = 16
+
+THUMBNAIL_SIZE = 256
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_TIMESTAMP_PREFIX_RE = re.compile(r"^\d{8}_\d{6}_")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens (Unicode aware, so Turkish prompts index as typed)"""
+    return [token for token in _TOKEN_RE.findall((text or "").lower().replace('_', ' ')) if len(token) > 1]
+
+
+def description_from_filename(filename: str) -> str:
+    """Prompt text encoded in a generated filename: 20250731_184455_a_red_dog.png -> 'a red dog'"""
+    stem = os.path.splitext(filename)[0]
+    if not _TIMESTAMP_PREFIX_RE.match(stem):
+        return "Image file"
+    return stem[len("20250731_184455_"):].replace('_', ' ').strip()[:100] or "Image file"
+
+
+def image_dimensions(data: bytes) -> Optional[tuple]:
+    """(width, height) from the PNG/GIF/JPEG/WebP header, without decoding the image"""
+    try:
+        if data[:8] == b'\x89PNG\r\n\x1a\n':
+            return struct.unpack('>II', data[16:24])
+        if data[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', data[6:10])
+        if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+            chunk = data[12:16]
+            if chunk == b'VP8X':
+                return (int.from_bytes(data[24:27], 'little') + 1, int.from_bytes(data[27:30], 'little') + 1)
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', data[26:30])
+                return width & 0x3fff, height & 0x3fff
+            if chunk == b'VP8L':
+                bits = int.from_bytes(data[21:25], 'little')
+                return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+        if data[:2] == b'\xff\xd8':
+            offset = 2
+            while offset + 9 < len(data):
+                if data[offset] != 0xff:
+                    offset += 1
+                    continue
+                marker = data[offset + 1]
+                if marker in (0xd8, 0x01) or 0xd0 <= marker <= 0xd7:
+                    offset += 2
+                    continue
+                length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+                if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+                    height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+                    return width, height
+                offset += 2 + length
+        if data[:2] == b'BM':
+            width, height = struct.unpack('<ii', data[18:26])
+            return width, abs(height)
+    except struct.error:
+        pass
+    return None
+
+
+def is_within(path: str, root: str) -> bool:
+    """True if `path` is inside `root` once symlinks are resolved"""
+    real_root = os.path.realpath(root)
+    return os.path.commonpath([os.path.realpath(path), real_root]) == real_root
+
+
+class ImageCatalog:
+    """Image index backed by an SQLite file; thumbnails are cached next to it"""
+
+    def __init__(self, catalog_dir: str):
+        self.catalog_dir = catalog_dir
+        self.thumbnail_dir = os.path.join(catalog_dir, "thumbnails")
+        os.makedirs(self.thumbnail_dir, exist_ok=True)
+        self.db_path = os.path.join(catalog_dir, "images.db")
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS images (
+                    path TEXT PRIMARY KEY,
+                    folder TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    image_hash TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    width INTEGER,
+                    height INTEGER,
+                    format TEXT,
+                    prompt TEXT,
+                    provider TEXT,
+                    model TEXT,
+                    mtime_ns INTEGER NOT NULL,
+                    indexed_at TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_images_folder_mtime
+                ON images (folder, mtime_ns)
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_images_hash
+                ON images (image_hash)
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS image_tokens (
+                    token TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    PRIMARY KEY (token, path)
+                ) WITHOUT ROWID
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_image_tokens_path
+                ON image_tokens (path)
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Indexing ------------------------------------------------------
+
+    def _index_file(self, path: str, stat: os.stat_result, prompt: str = None,
+                    provider: str = None, model: str = None):
+        """Hash and (re)index one file; keeps a previously registered prompt/provider"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        dimensions = image_dimensions(data) or (None, None)
+        filename = os.path.basename(path)
+
+        existing = self._conn.execute(
+            "SELECT prompt, provider, model FROM images WHERE path = ?", (path,)
+        ).fetchone()
+        if existing:
+            prompt = prompt or existing["prompt"]
+            provider = provider or existing["provider"]
+            model = model or existing["model"]
+        if not prompt:
+            description = description_from_filename(filename)
+            prompt = description if description != "Image file" else None
+        if not provider and filename.startswith("gemini_"):
+            provider = "gemini"
+
+        self._conn.execute('''
+            INSERT OR REPLACE INTO images (path, folder, filename, image_hash, size_bytes, width, height,
+                                           format, prompt, provider, model, mtime_ns, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (path, os.path.dirname(path), filename, hashlib.sha256(data).hexdigest(), len(data),
+              dimensions[0], dimensions[1], os.path.splitext(filename)[1][1:].upper(),
+              prompt, provider, model, stat.st_mtime_ns, datetime.now().isoformat()))
+
+        self._conn.execute("DELETE FROM image_tokens WHERE path = ?", (path,))
+        tokens = set(tokenize(prompt)) | set(tokenize(os.path.splitext(filename)[0]))
+        self._conn.executemany("INSERT OR IGNORE INTO image_tokens (token, path) VALUES (?, ?)",
+                               [(token, path) for token in tokens])
+
+    def _remove_paths(self, paths: List[str]):
+        for path in paths:
+            self._conn.execute("DELETE FROM image_tokens WHERE path = ?", (path,))
+            self._conn.execute("DELETE FROM images WHERE path = ?", (path,))
+
+    def scan(self, folder: str, force: bool = False) -> Dict[str, int]:
+        """Bring the index for `folder` up to date; returns indexed/removed counts"""
+        folder = os.path.abspath(folder)
+        dir_mtime = os.stat(folder).st_mtime_ns
+        state_key = f"scan:{folder}"
+
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM metadata WHERE key = ?", (state_key,)).fetchone()
+            state = json.loads(row["value"]) if row else {}
+            if not force and state.get("dir_mtime") == dir_mtime:
+                return {"indexed": 0, "removed": 0}
+            watermark = 0 if force else state.get("watermark", 0)
+
+            known = {r["path"]: r["mtime_ns"] for r in self._conn.execute(
+                "SELECT path, mtime_ns FROM images WHERE folder = ?", (folder,))}
+            seen = set()
+            newest = watermark
+            indexed = 0
+            with self._conn:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in IMAGE_EXTENSIONS:
+                            continue
+                        stat = entry.stat()
+                        path = entry.path
+                        seen.add(path)
+                        newest = max(newest, stat.st_mtime_ns)
+                        if path in known and (stat.st_mtime_ns <= watermark or known[path] == stat.st_mtime_ns):
+                            continue  # Unchanged, or registered by the tool when it was written
+                        try:
+                            self._index_file(path, stat)
+                            indexed += 1
+                        except OSError as e:
+                            logger.warning(f"Could not index {path}: {e}")
+
+                removed = [path for path in known if path not in seen]
+                self._remove_paths(removed)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                    (state_key, json.dumps({"dir_mtime": dir_mtime, "watermark": newest}))
+                )
+
+        if indexed or removed:
+            logger.info(f"Image catalog scan {folder}: {indexed} indexed, {len(removed)} removed")
+        return {"indexed": indexed, "removed": len(removed)}
+
+    def register(self, path: str, prompt: str = None, provider: str = None, model: str = None) -> Optional[Dict]:
+        """Index a freshly written image with its real prompt; returns its record"""
+        path = os.path.abspath(path)
+        with self._lock, self._conn:
+            self._index_file(path, os.stat(path), prompt, provider, model)
+            row = self._conn.execute("SELECT * FROM images WHERE path = ?", (path,)).fetchone()
+        return self._to_record(row)
+
+    # --- Queries -------------------------------------------------------
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> Optional[Dict]:
+        if row is None:
+            return None
+        created_date = None
+        if _TIMESTAMP_PREFIX_RE.match(row["filename"]):
+            try:
+                created_date = datetime.strptime(row["filename"][:15], '%Y%m%d_%H%M%S').isoformat()
+            except ValueError:
+                pass
+        return {
+            "handle": row["image_hash"][:HANDLE_LENGTH],
+            "filepath": row["path"],
+            "filename": row["filename"],
+            "size_bytes": row["size_bytes"],
+            "size_mb": round(row["size_bytes"] / 1024 / 1024, 2),
+            "width": row["width"],
+            "height": row["height"],
+            "format": row["format"],
+            "modified": datetime.fromtimestamp(row["mtime_ns"] / 1e9).isoformat(),
+            "created_date": created_date,
+            "description": (row["prompt"] or "Image file")[:100],
+            "prompt": row["prompt"],
+            "provider": row["provider"],
+            "model": row["model"]
+        }
+
+    def list_images(self, folder: str, pattern: str = None, limit: int = 50) -> List[Dict]:
+        """Newest first; an extension-only pattern like '*.png' means 'all images' (legacy behaviour)"""
+        folder = os.path.abspath(folder)
+        self.scan(folder)
+        name_filter = pattern and not (pattern.startswith("*.") and pattern[1:].lower() in IMAGE_EXTENSIONS)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM images WHERE folder = ? ORDER BY mtime_ns DESC", (folder,)
+            )
+            records = []
+            for row in rows:
+                if name_filter and not fnmatch(row["filename"], pattern):
+                    continue
+                records.append(self._to_record(row))
+                if limit and len(records) >= limit:
+                    break
+        return records
+
+    def search(self, query: str, folder: str = None, limit: int = 50) -> List[Dict]:
+        """Token prefix search over prompts and filenames, best match then newest first"""
+        query_tokens = set(tokenize(query))
+        if not query_tokens:
+            return []
+        if folder:
+            folder = os.path.abspath(folder)
+            self.scan(folder)
+
+        scores = Counter()
+        with self._lock:
+            for token in query_tokens:
+                for row in self._conn.execute(
+                    "SELECT DISTINCT path FROM image_tokens WHERE token >= ? AND token < ?",
+                    (token, token + '\U0010ffff')
+                ):
+                    scores[row["path"]] += 1
+            if not scores:
+                return []
+            placeholders = ",".join("?" * len(scores))
+            sql = f"SELECT * FROM images WHERE path IN ({placeholders})"
+            params = list(scores)
+            if folder:
+                sql += " AND folder = ?"
+                params.append(folder)
+            rows = self._conn.execute(sql, params).fetchall()
+
+        rows.sort(key=lambda row: (scores[row["path"]], row["mtime_ns"]), reverse=True)
+        return [self._to_record(row) for row in rows[:limit]]
+
+    def latest(self, folder: str) -> Optional[Dict]:
+        folder = os.path.abspath(folder)
+        self.scan(folder)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM images WHERE folder = ? ORDER BY mtime_ns DESC LIMIT 1", (folder,)
+            ).fetchone()
+        return self._to_record(row)
+
+    def get(self, path: str) -> Optional[Dict]:
+        """Record for a file path, indexing it on the spot if the file is newer than its row"""
+        path = os.path.abspath(path)
+        if not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM images WHERE path = ?", (path,)).fetchone()
+            if row is None or row["mtime_ns"] != stat.st_mtime_ns:
+                with self._conn:
+                    self._index_file(path, stat)
+                row = self._conn.execute("SELECT * FROM images WHERE path = ?", (path,)).fetchone()
+        return self._to_record(row)
+
+    def resolve(self, handle: str, root: str = None) -> Optional[Dict]:
+        """Content handle -> newest existing file with that content (only files under `root` if given)"""
+        handle = (handle or "").lower()
+        if not re.fullmatch(r"[0-9a-f]{8,64}", handle):
+            return None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM images WHERE image_hash >= ? AND image_hash < ? ORDER BY mtime_ns DESC",
+                (handle, handle + 'g')
+            ).fetchall()
+        for row in rows:
+            if root and not is_within(row["path"], root):
+                continue  # Indexed by a folder_path scan elsewhere on disk
+            if os.path.isfile(row["path"]):
+                return self._to_record(row)
+        return None
+
+    def thumbnail(self, handle: str, size: int = THUMBNAIL_SIZE, root: str = None) -> Optional[str]:
+        """Path of a cached PNG thumbnail (longest side `size`); None if Pillow is not installed"""
+        record = self.resolve(handle, root)
+        if not record:
+            return None
+        thumbnail_path = os.path.join(self.thumbnail_dir, f"{record['handle']}_{size}.png")
+        if os.path.exists(thumbnail_path):
+            return thumbnail_path
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.warning("Pillow not available - thumbnails disabled")
+            return None
+        with Image.open(record["filepath"]) as img:
+            img.thumbnail((size, size))
+            tmp_path = thumbnail_path + ".tmp"
+            img.save(tmp_path, format="PNG")
+        os.replace(tmp_path, thumbnail_path)
+        return thumbnail_path
+
+    def count(self, folder: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM images WHERE folder = ?", (os.path.abspath(folder),)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT image_hash), COALESCE(SUM(size_bytes), 0) FROM images"
+            ).fetchone()
+        return {"images": row[0], "unique_images": row[1], "total_bytes": row[2]}
+
+
+_catalogs: Dict[str, ImageCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_image_catalog(catalog_dir: str) -> ImageCatalog:
+    """Shared catalog per directory (the tool and the image routes use the same index)"""
+    catalog_dir = os.path.abspath(catalog_dir)
+    with _catalogs_lock:
+        catalog = _catalogs.get(catalog_dir)
+        if catalog is None:
+            catalog = ImageCatalog(catalog_dir)
+            _catalogs[catalog_dir] = catalog
+        return catalog
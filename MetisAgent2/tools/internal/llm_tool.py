@@ -14,9 +14,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.mcp_core import MCPTool, MCPToolResult
 # Import user storage (SQLite-based)
 from .user_storage import get_user_storage
+from .conversation_log import ConversationLog, HotConversations
 
 logger = logging.getLogger(__name__)
 
+# Fully loaded conversations kept in memory; older ones are re-read from the log on demand
+HOT_CONVERSATIONS = int(os.getenv("LLM_HOT_CONVERSATIONS", "200"))
+
 class LLMTool(MCPTool):
     """Simplified LLM tool for chat interactions"""
     
@@ -59,7 +63,7 @@ class LLMTool(MCPTool):
             "get_conversation",
             self._get_conversation,
             required_params=["conversation_id"],
-            optional_params=[]
+            optional_params=["offset", "limit"]
         )
         
         self.register_action(
@@ -108,29 +112,24 @@ class LLMTool(MCPTool):
             }
         }
         
-        # Multi-user conversation storage - now with ChromaDB persistence
-        # Format: {conversation_id: [messages]}
-        self.conversations: Dict[str, List[Dict]] = {}
-        # Format: {user_id: {conversation_id: conversation_name}}
-        self.user_conversations: Dict[str, Dict[str, str]] = {}
-        
-        # Initialize database for conversation persistence  
-        try:
-            from app.database import db_manager
-            self.db = db_manager
-            # Skip ChromaDB conversation loading for SQLite compatibility
-            logger.info("Database manager loaded, using JSON fallback for conversations")
-        except Exception as e:
-            logger.warning(f"Could not load conversation database: {e}")
-            self.db = None
-        
-        # Initialize JSON file persistence as fallback
+        # Conversation persistence: append-only SQLite message log (one row per message)
         self.conversation_storage_dir = os.path.join(os.getcwd(), "conversation_storage")
         os.makedirs(self.conversation_storage_dir, exist_ok=True)
+        self.conversation_log = ConversationLog(os.path.join(self.conversation_storage_dir, "conversations.db"))
         
-        # Load conversations from JSON if database failed
-        if not self.db:
-            self._load_conversations_from_json()
+        # Messages of each conversation already in the log: {conversation_id: count}
+        self._persisted_counts: Dict[str, int] = {}
+        # Bounded LRU of hot conversations - Format: {conversation_id: [messages]}
+        self.conversations = HotConversations(
+            max_size=HOT_CONVERSATIONS,
+            loader=self._load_conversation,
+            on_evict=self._flush_evicted_conversation
+        )
+        # Format: {user_id: {conversation_id: conversation_name}}
+        self.user_conversations: Dict[str, Dict[str, str]] = {}
+        
+        # One-shot import of legacy JSON conversation files
+        self._migrate_json_conversations()
         
     def detect_user_intent(self, user_message: str) -> str:
         """Detect user intent from request"""
@@ -250,11 +249,12 @@ GENERAL REQUEST: Provide comprehensive email information.
             if not model:
                 model = provider_config["default_model"]
             
-            # Get or create conversation
-            if conversation_id not in self.conversations:
-                self.conversations[conversation_id] = []
-            
-            conversation = self.conversations[conversation_id]
+            # Get or create conversation (loaded from the message log if not hot)
+            conversation = self.conversations.get_or_load(conversation_id)
+            if conversation is None:
+                conversation = []
+                self.conversations[conversation_id] = conversation
+                self._persisted_counts[conversation_id] = 0
             
             # Add system prompt if provided and conversation is empty
             if system_prompt and len(conversation) == 0:
@@ -298,11 +298,8 @@ GENERAL REQUEST: Provide comprehensive email information.
                     "timestamp": datetime.utcnow().isoformat()
                 })
                 
-                # Save conversation to database after each interaction
-                if self.db:
-                    self._save_conversation_to_db(conversation_id, user_id)
-                else:
-                    self._save_conversation_to_json(conversation_id, user_id)
+                # Append the new messages of this interaction to the log
+                self._save_conversation(conversation_id, user_id, conversation)
                 
                 result_data = {
                     "response": response["content"],
@@ -532,10 +529,42 @@ GENERAL REQUEST: Provide comprehensive email information.
         except Exception as e:
             return MCPToolResult(success=False, error=str(e))
     
-    def _get_conversation(self, conversation_id: str, **kwargs) -> MCPToolResult:
-        """Get conversation history"""
+    def _get_conversation(self, conversation_id: str, offset: int = None, limit: int = None,
+                          **kwargs) -> MCPToolResult:
+        """Get conversation history; offset/limit page through the log without loading it all"""
         try:
-            if conversation_id not in self.conversations:
+            if limit is not None:
+                conversation = self.conversation_log.get_conversation(conversation_id)
+                hot = self.conversations.get(conversation_id)
+                if conversation is None and hot is None:
+                    return MCPToolResult(
+                        success=False,
+                        error=f"Conversation '{conversation_id}' not found"
+                    )
+                
+                # Flush unsaved hot messages so the page reflects them
+                if hot is not None and conversation is not None:
+                    self._save_conversation(conversation_id, conversation["user_id"])
+                total = len(hot) if hot is not None else conversation["message_count"]
+                offset = int(offset or 0)
+                if offset < 0:
+                    offset = max(total + offset, 0)
+                messages = (hot[offset:offset + int(limit)] if conversation is None
+                            else self.conversation_log.page(conversation_id, offset, int(limit)))
+                
+                return MCPToolResult(
+                    success=True,
+                    data={
+                        "conversation_id": conversation_id,
+                        "messages": messages,
+                        "message_count": total,
+                        "offset": offset,
+                        "has_more": offset + len(messages) < total
+                    }
+                )
+            
+            messages = self.conversations.get_or_load(conversation_id)
+            if messages is None:
                 return MCPToolResult(
                     success=False,
                     error=f"Conversation '{conversation_id}' not found"
@@ -545,8 +574,8 @@ GENERAL REQUEST: Provide comprehensive email information.
                 success=True,
                 data={
                     "conversation_id": conversation_id,
-                    "messages": self.conversations[conversation_id],
-                    "message_count": len(self.conversations[conversation_id])
+                    "messages": messages,
+                    "message_count": len(messages)
                 }
             )
         except Exception as e:
@@ -555,8 +584,11 @@ GENERAL REQUEST: Provide comprehensive email information.
     def _clear_conversation(self, conversation_id: str, **kwargs) -> MCPToolResult:
         """Clear conversation history"""
         try:
-            if conversation_id in self.conversations:
-                del self.conversations[conversation_id]
+            self.conversations.pop(conversation_id, None)
+            self._persisted_counts.pop(conversation_id, None)
+            self.conversation_log.delete(conversation_id)
+            for user_convs in self.user_conversations.values():
+                user_convs.pop(conversation_id, None)
             
             return MCPToolResult(
                 success=True,
@@ -565,18 +597,38 @@ GENERAL REQUEST: Provide comprehensive email information.
         except Exception as e:
             return MCPToolResult(success=False, error=str(e))
     
+    def clear_all_conversations(self):
+        """Drop every conversation from memory and from the message log"""
+        self.conversations.clear()
+        self._persisted_counts.clear()
+        self.user_conversations.clear()
+        self.conversation_log.delete_all()
+    
     def _get_user_conversations(self, user_id: str, **kwargs) -> MCPToolResult:
         """Get all conversations for a user"""
         try:
-            user_convs = self.user_conversations.get(user_id, {})
             conversations = []
+            seen = set()
+            
+            # Persisted conversations with counts/activity from the log index
+            for row in self.conversation_log.user_conversations(user_id):
+                conv_id = row["conversation_id"]
+                seen.add(conv_id)
+                hot = self.conversations.get(conv_id)
+                conversations.append({
+                    "conversation_id": conv_id,
+                    "name": self.user_conversations.get(user_id, {}).get(conv_id) or row["name"],
+                    "message_count": len(hot) if hot is not None else row["message_count"],
+                    "last_activity": self._get_last_activity(conv_id) if hot else row["last_activity"]
+                })
             
-            for conv_id, conv_name in user_convs.items():
-                message_count = len(self.conversations.get(conv_id, []))
+            for conv_id, conv_name in self.user_conversations.get(user_id, {}).items():
+                if conv_id in seen:
+                    continue
                 conversations.append({
                     "conversation_id": conv_id,
                     "name": conv_name,
-                    "message_count": message_count,
+                    "message_count": len(self.conversations.get(conv_id) or []),
                     "last_activity": self._get_last_activity(conv_id)
                 })
             
@@ -605,10 +657,12 @@ GENERAL REQUEST: Provide comprehensive email information.
             
             # Add conversation
             self.user_conversations[user_id][conversation_id] = conversation_name
+            self.conversation_log.ensure_conversation(conversation_id, user_id, conversation_name)
             
             # Initialize empty conversation
-            if conversation_id not in self.conversations:
+            if self.conversations.get_or_load(conversation_id) is None:
                 self.conversations[conversation_id] = []
+                self._persisted_counts[conversation_id] = 0
             
             return MCPToolResult(
                 success=True,
@@ -623,10 +677,11 @@ GENERAL REQUEST: Provide comprehensive email information.
     
     def _get_last_activity(self, conversation_id: str) -> Optional[str]:
         """Get last activity timestamp for a conversation"""
-        messages = self.conversations.get(conversation_id, [])
+        messages = self.conversations.get(conversation_id)
         if messages:
             return messages[-1].get('timestamp')
-        return None
+        conversation = self.conversation_log.get_conversation(conversation_id)
+        return conversation["last_activity"] if conversation else None
     
     def _store_memory(self, content: str, category: str = "general", 
                      tags: List[str] = None, user_id: str = "default", **kwargs) -> MCPToolResult:
@@ -989,178 +1044,65 @@ Response: {"response": "I'll show you the installed tools", "tool_calls": [{"too
         except Exception as e:
             return MCPToolResult(success=False, error=str(e))
     
-    def _get_conversation_collection(self):
-        """Get or create conversation collection - SQLite compatibility"""
-        try:
-            if not self.db:
-                return None
-            
-            # SQLite DatabaseManager doesn't have client attribute
-            # Return None to use JSON fallback storage
-            logger.info("No conversation database available - starting fresh")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get conversation collection: {e}")
-            return None
+    def _load_conversation(self, conversation_id: str) -> Optional[List[Dict]]:
+        """HotConversations loader: read a conversation back from the message log"""
+        messages = self.conversation_log.load(conversation_id)
+        if messages is not None:
+            self._persisted_counts[conversation_id] = len(messages)
+        return messages
     
-    def _save_conversation_to_db(self, conversation_id: str, user_id: str = "default"):
-        """Save conversation to ChromaDB"""
+    def _save_conversation(self, conversation_id: str, user_id: str = "default",
+                           messages: Optional[List[Dict]] = None):
+        """Append messages not yet in the log (one row per message)
+
+        `messages` is the caller's in-use list. If the conversation was evicted
+        from the hot LRU while it was in use, the list is put back and saving
+        continues from what the eviction flushed.
+        """
         try:
-            collection = self._get_conversation_collection()
-            if not collection or conversation_id not in self.conversations:
+            hot = self.conversations.get(conversation_id)
+            if messages is None:
+                messages = hot
+                if messages is None:
+                    return
+            if hot is not messages:
+                self._persisted_counts[conversation_id] = self.conversation_log.count(conversation_id)
+                self.conversations[conversation_id] = messages
+            persisted = self._persisted_counts.get(conversation_id, 0)
+            if persisted > len(messages):
+                # The in-memory list was truncated elsewhere; rewrite from scratch
+                self.conversation_log.delete(conversation_id)
+                persisted = 0
+            if persisted == len(messages):
                 return
             
-            conversation_data = {
-                "conversation_id": conversation_id,
-                "user_id": user_id,
-                "last_updated": datetime.now().isoformat(),
-                "message_count": len(self.conversations[conversation_id])
-            }
-            
-            # Try to get existing conversation first
-            try:
-                existing = collection.get(ids=[conversation_id])
-                if existing["ids"]:
-                    # Update existing
-                    collection.delete(ids=[conversation_id])
-            except:
-                pass
-            
-            # Add/Update conversation
-            collection.add(
-                ids=[conversation_id],
-                metadatas=[conversation_data],
-                documents=[json.dumps(self.conversations[conversation_id])]
+            self._persisted_counts[conversation_id] = self.conversation_log.append(
+                conversation_id, user_id, messages[persisted:], start_seq=persisted
             )
-            
-            logger.debug(f"Saved conversation {conversation_id} to database")
-            
-        except Exception as e:
-            logger.error(f"Error saving conversation to database: {e}")
-    
-    def _load_conversations_from_db(self, limit: int = 50):
-        """Load recent conversations from ChromaDB on startup"""
-        try:
-            collection = self._get_conversation_collection()
-            if not collection:
-                logger.info("No conversation database available - starting fresh")
-                return
-            
-            # Get all conversations
-            results = collection.get(limit=limit)
-            
-            if not results["ids"]:
-                logger.info("No previous conversations found in database")
-                return
-            
-            loaded_count = 0
-            for i, (conv_id, document, metadata) in enumerate(zip(
-                results["ids"], results["documents"], results["metadatas"]
-            )):
-                try:
-                    # Load conversation messages
-                    messages = json.loads(document)
-                    self.conversations[conv_id] = messages
-                    
-                    # Load user conversation mapping
-                    user_id = metadata.get("user_id", "default")
-                    if user_id not in self.user_conversations:
-                        self.user_conversations[user_id] = {}
-                    
-                    # Generate conversation name from first user message or use ID
-                    conv_name = f"Conversation {conv_id[:8]}"
-                    if messages:
-                        for msg in messages:
-                            if msg.get("role") == "user":
-                                # Use first 50 chars of first user message as name
-                                conv_name = msg.get("content", "")[:50]
-                                if len(conv_name) == 50:
-                                    conv_name += "..."
-                                break
-                    
-                    self.user_conversations[user_id][conv_id] = conv_name
-                    loaded_count += 1
-                    
-                except Exception as msg_error:
-                    logger.warning(f"Could not load conversation {conv_id}: {msg_error}")
-                    continue
-            
-            logger.info(f"Loaded {loaded_count} conversations from database")
+            logger.debug(f"Appended {len(messages) - persisted} messages to conversation {conversation_id}")
             
         except Exception as e:
-            logger.error(f"Error loading conversations from database: {e}")
+            logger.error(f"Error saving conversation to message log: {e}")
     
-    def _save_conversation_to_json(self, conversation_id: str, user_id: str = "default"):
-        """Save conversation to JSON file as fallback"""
-        try:
-            # Create user-specific file
-            json_file = os.path.join(self.conversation_storage_dir, f"conversations_{user_id}.json")
-            
-            # Load existing data
-            if os.path.exists(json_file):
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                data = {"conversations": {}, "user_conversations": {}}
-            
-            # Update conversation data
-            if conversation_id in self.conversations:
-                data["conversations"][conversation_id] = {
-                    "messages": self.conversations[conversation_id],
-                    "last_updated": datetime.now().isoformat(),
-                    "message_count": len(self.conversations[conversation_id])
-                }
-            
-            # Update user conversation mapping
-            if user_id in self.user_conversations:
-                data["user_conversations"] = self.user_conversations[user_id]
-            
-            # Save to file
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
-            logger.debug(f"Saved conversation {conversation_id} to JSON file")
-            
-        except Exception as e:
-            logger.error(f"Error saving conversation to JSON: {e}")
+    def _flush_evicted_conversation(self, conversation_id: str, messages: List[Dict]):
+        """HotConversations eviction hook: persist pending messages, then forget the count"""
+        persisted = self._persisted_counts.pop(conversation_id, 0)
+        if persisted < len(messages):
+            conversation = self.conversation_log.get_conversation(conversation_id)
+            user_id = conversation["user_id"] if conversation else "default"
+            try:
+                self.conversation_log.append(conversation_id, user_id, messages[persisted:], start_seq=persisted)
+            except Exception as e:
+                logger.error(f"Error flushing evicted conversation {conversation_id}: {e}")
     
-    def _load_conversations_from_json(self, limit: int = 50):
-        """Load conversations from JSON files"""
+    def _migrate_json_conversations(self):
+        """Import legacy conversations_<user>.json files into the message log (renamed to .migrated)"""
         try:
-            # Get all user conversation files
-            json_files = [f for f in os.listdir(self.conversation_storage_dir) if f.startswith("conversations_") and f.endswith(".json")]
-            
-            loaded_count = 0
-            for json_file in json_files:
-                try:
-                    # Extract user_id from filename
-                    user_id = json_file.replace("conversations_", "").replace(".json", "")
-                    
-                    file_path = os.path.join(self.conversation_storage_dir, json_file)
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    # Load conversations
-                    conversations = data.get("conversations", {})
-                    for conv_id, conv_data in list(conversations.items())[:limit]:
-                        self.conversations[conv_id] = conv_data.get("messages", [])
-                        loaded_count += 1
-                    
-                    # Load user conversation mapping
-                    user_convs = data.get("user_conversations", {})
-                    if user_convs:
-                        if user_id not in self.user_conversations:
-                            self.user_conversations[user_id] = {}
-                        self.user_conversations[user_id].update(user_convs)
-                    
-                except Exception as file_error:
-                    logger.warning(f"Could not load conversation file {json_file}: {file_error}")
-                    continue
-            
-            logger.info(f"Loaded {loaded_count} conversations from JSON files")
-            
+            counts = self.conversation_log.import_json_dir(self.conversation_storage_dir)
+            if counts:
+                logger.info(f"Migrated {sum(counts.values())} conversations from JSON files")
         except Exception as e:
-            logger.error(f"Error loading conversations from JSON: {e}")
+            logger.error(f"Error migrating conversations from JSON: {e}")
 
 def register_tool(registry):
     """Register the LLM tool with the registry"""
@@ -0,0 +1,424 @@
+"""
+OAuth Token Manager - Google OAuth2 access token'ları için önbellek ve proaktif yenileme
+
+- Kullanıcı başına çözülmüş credential önbelleği (mapping + token), her Gmail /
+  Calendar çağrısında storage'a gitmeden geçerlilik kontrolü
+- Single-flight yenileme: aynı Google hesabı için eşzamanlı çağrılar tek bir
+  token isteğini bekler
+- Son kullanma zamanına göre sıralı bir heap; zamanlayıcı iş parçacığı sadece
+  sıradaki token'ın yenileme anına kadar uyur (periyodik tam tarama yok)
+- Token endpoint'i değiştirilebilir; testlerde yerel bir sahte sunucu kullanılır
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .user_storage import UserStorage, get_user_storage
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+# Token'lar bitişten bu kadar saniye önce yenilenir
+REFRESH_MARGIN_SECONDS = 300
+# Başarısız arka plan yenilemesi için geri çekilme sınırları
+RETRY_MIN_SECONDS = 60
+RETRY_MAX_SECONDS = 900
+
+
+class TokenRefreshError(Exception):
+    """Token endpoint'inden yenileme alınamadı"""
+
+    def __init__(self, message: str, invalid_grant: bool = False, status_code: int = None):
+        super().__init__(message)
+        self.invalid_grant = invalid_grant
+        self.status_code = status_code
+
+
+class GoogleTokenEndpoint:
+    """refresh_token grant'ını bir OAuth2 token URL'ine gönderir"""
+
+    def __init__(self, url: str = None, timeout: float = 15):
+        self.url = url or os.environ.get('GOOGLE_TOKEN_URL', GOOGLE_TOKEN_URL)
+        self.timeout = timeout
+
+    def refresh(self, refresh_token: str, client_id: str, client_secret: str) -> Dict[str, Any]:
+        import requests
+
+        response = requests.post(self.url, data={
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'refresh_token': refresh_token,
+            'grant_type': 'refresh_token'
+        }, timeout=self.timeout)
+
+        if response.status_code != 200:
+            logger.error(f"Token refresh failed with status {response.status_code}: {response.text}")
+            try:
+                error = response.json().get('error')
+            except ValueError:
+                error = None
+            raise TokenRefreshError(
+                f"Token endpoint returned {response.status_code}: {error or response.text[:200]}",
+                invalid_grant=error == 'invalid_grant',
+                status_code=response.status_code
+            )
+
+        payload = response.json()
+        if 'access_token' not in payload:
+            raise TokenRefreshError("Token endpoint response has no access_token")
+        return payload
+
+
+def token_expiry(oauth_token: Dict[str, Any]) -> Optional[float]:
+    """Token'ın bitiş zamanı (epoch saniye); bilinmiyorsa None"""
+    expires_at = oauth_token.get('expires_at')
+    if isinstance(expires_at, (int, float)):
+        return float(expires_at)
+    if isinstance(expires_at, str):
+        try:
+            return datetime.fromisoformat(expires_at.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+
+    # Fallback: created_at + 1 saat (Google varsayılanı)
+    created_at = oauth_token.get('created_at')
+    if isinstance(created_at, str):
+        try:
+            return datetime.fromisoformat(created_at).timestamp() + 3600
+        except ValueError:
+            pass
+    return None
+
+
+class _CachedCredential:
+    __slots__ = ("google_email", "token", "expires_at", "loaded_at")
+
+    def __init__(self, google_email: str, token: Optional[Dict], loaded_at: float):
+        self.google_email = google_email
+        self.token = token
+        self.expires_at = token_expiry(token) if token else None
+        self.loaded_at = loaded_at
+
+
+class _Flight:
+    """Devam eden tek bir yenileme; bekleyenler sonucu paylaşır"""
+    __slots__ = ("done", "token", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.token: Optional[Dict] = None
+        self.error: Optional[Exception] = None
+
+
+class OAuthTokenManager:
+    """Google OAuth2 token önbelleği, single-flight yenileme ve heap tabanlı zamanlayıcı"""
+
+    def __init__(self, storage: UserStorage = None, endpoint: GoogleTokenEndpoint = None,
+                 client_credentials: Callable[[], Tuple[Optional[str], Optional[str]]] = None,
+                 refresh_margin: float = REFRESH_MARGIN_SECONDS, cache_ttl: float = 300,
+                 clock: Callable[[], float] = time.time):
+        self.storage = storage or get_user_storage()
+        self.endpoint = endpoint or GoogleTokenEndpoint()
+        self._client_credentials = client_credentials or self._stored_client_credentials
+        self.refresh_margin = refresh_margin
+        self.cache_ttl = cache_ttl
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._cache: Dict[str, _CachedCredential] = {}   # user_id / google email -> credential
+        self._flights: Dict[str, _Flight] = {}            # google email -> running refresh
+
+        # Refresh schedule: (refresh_at, google_email, version); stale versions are skipped
+        self._heap: List[Tuple[float, str, int]] = []
+        self._scheduled: Dict[str, int] = {}
+        self._versions = 0
+        self._retry_delays: Dict[str, float] = {}
+        self._wakeup = threading.Condition(self._lock)
+        self._scheduler: Optional[threading.Thread] = None
+        self._stopped = False
+        self.stats = {'cache_hits': 0, 'loads': 0, 'refreshes': 0, 'joined': 0, 'failures': 0}
+
+    # --- Credentials ---------------------------------------------------
+
+    def _stored_client_credentials(self) -> Tuple[Optional[str], Optional[str]]:
+        google_creds = self.storage.get_property('system', 'google_oauth_client', {}) or {}
+        client_id = google_creds.get('client_id') or os.environ.get('GOOGLE_CLIENT_ID')
+        client_secret = google_creds.get('client_secret') or os.environ.get('GOOGLE_CLIENT_SECRET')
+        return client_id, client_secret
+
+    def resolve_google_email(self, user_id: str) -> Optional[str]:
+        """Sistem kullanıcısını Google hesabına çevirir; e-posta zaten Google hesabıdır"""
+        mapping = self.storage.get_user_mapping(user_id, 'google')
+        if mapping:
+            return mapping
+        return user_id if '@' in user_id else None
+
+    def _load(self, user_id: str) -> Optional[_CachedCredential]:
+        google_email = self.resolve_google_email(user_id)
+        if not google_email:
+            return None
+        stored = self.storage.get_properties(google_email, ['oauth_google', 'oauth2_google'])
+        token = stored['oauth_google'] or stored['oauth2_google']
+        credential = _CachedCredential(google_email, token, self.clock())
+        with self._lock:
+            self.stats['loads'] += 1
+            self._cache[user_id] = credential
+            if google_email != user_id:
+                self._cache[google_email] = credential
+        if token:
+            self._schedule(google_email, credential.expires_at)
+        return credential
+
+    def _cached(self, user_id: str) -> Optional[_CachedCredential]:
+        with self._lock:
+            credential = self._cache.get(user_id)
+            if credential and self.clock() - credential.loaded_at < self.cache_ttl:
+                self.stats['cache_hits'] += 1
+                return credential
+        return self._load(user_id)
+
+    def _needs_refresh(self, credential: _CachedCredential) -> bool:
+        return credential.expires_at is None or credential.expires_at <= self.clock() + self.refresh_margin
+
+    def invalidate(self, user_id: str = None):
+        """Önbelleği (veya tek kullanıcının kaydını) düşürür; bir sonraki çağrı storage'dan okur"""
+        with self._lock:
+            if user_id is None:
+                self._cache.clear()
+                return
+            credential = self._cache.pop(user_id, None)
+            if credential:
+                for key in [key for key, value in self._cache.items() if value is credential]:
+                    del self._cache[key]
+
+    def get_valid_token(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Geçerli token'ı döndürür; gerekirse tek bir ortak yenileme yapılır, başarısızsa None"""
+        try:
+            return self.ensure_token(user_id)
+        except TokenRefreshError as e:
+            logger.error(f"Token refresh failed for user {user_id}: {e}")
+            return None
+
+    def ensure_token(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """get_valid_token gibi, ancak yenileme hatasını TokenRefreshError olarak yükseltir"""
+        credential = self._cached(user_id)
+        if not credential or not credential.token:
+            return None
+        if not self._needs_refresh(credential):
+            return credential.token
+        logger.info(f"Token expired for user {user_id}, attempting refresh...")
+        return self._refresh_single_flight(credential.google_email)
+
+    def refresh(self, user_id: str) -> Dict[str, Any]:
+        """Zorunlu yenileme (refresh_token action'ı); eşzamanlı istekler tek yenilemeye katılır"""
+        google_email = self.resolve_google_email(user_id)
+        if not google_email:
+            raise TokenRefreshError(f"No Google email mapping found for user {user_id}")
+        return self._refresh_single_flight(google_email, force=True)
+
+    # --- Single-flight refresh -----------------------------------------
+
+    def _refresh_single_flight(self, google_email: str, force: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            flight = self._flights.get(google_email)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[google_email] = flight
+            else:
+                self.stats['joined'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            return flight.token
+
+        try:
+            flight.token = self._do_refresh(google_email, force)
+            return flight.token
+        except Exception as e:
+            flight.error = e if isinstance(e, TokenRefreshError) else TokenRefreshError(str(e))
+            raise flight.error
+        finally:
+            with self._lock:
+                self._flights.pop(google_email, None)
+            flight.done.set()
+
+    def _do_refresh(self, google_email: str, force: bool = False) -> Dict[str, Any]:
+        stored = self.storage.get_properties(google_email, ['oauth_google', 'oauth2_google'])
+        oauth_token = stored['oauth_google'] or stored['oauth2_google']
+        if not oauth_token or not oauth_token.get('refresh_token'):
+            raise TokenRefreshError("No refresh token available")
+
+        # Storage'daki token hâlâ geçerliyse (başka bir süreç yenilemiş) istek atma
+        expires_at = token_expiry(oauth_token)
+        if not force and expires_at is not None and expires_at > self.clock() + self.refresh_margin:
+            self._store_refreshed(google_email, oauth_token)
+            return oauth_token
+
+        client_id, client_secret = self._client_credentials()
+        if not client_id or not client_secret:
+            raise TokenRefreshError("Google OAuth2 client credentials not configured")
+
+        logger.info(f"Token refresh request for {google_email}: client_id={client_id[:20]}...")
+        try:
+            token_response = self.endpoint.refresh(oauth_token['refresh_token'], client_id, client_secret)
+        except TokenRefreshError:
+            with self._lock:
+                self.stats['failures'] += 1
+            raise
+        except Exception as e:
+            with self._lock:
+                self.stats['failures'] += 1
+            raise TokenRefreshError(f"Token endpoint request failed: {e}")
+
+        # Update stored token with proper expiration
+        expires_in = token_response.get('expires_in', 3600)
+        updated_token = oauth_token.copy()
+        updated_token['access_token'] = token_response['access_token']
+        updated_token['expires_in'] = expires_in
+        updated_token['expires_at'] = self.clock() + expires_in
+        updated_token['refreshed_at'] = datetime.now().isoformat()
+        if token_response.get('refresh_token'):
+            updated_token['refresh_token'] = token_response['refresh_token']
+
+        # Update token in storage (use Google email as key)
+        if not self.storage.set_oauth_token(google_email, 'google', updated_token):
+            raise TokenRefreshError("Failed to save refreshed token")
+
+        with self._lock:
+            self.stats['refreshes'] += 1
+        self._store_refreshed(google_email, updated_token)
+        logger.info(f"Token refreshed for {google_email} (expires in {expires_in}s)")
+        return updated_token
+
+    def _store_refreshed(self, google_email: str, token: Dict[str, Any]):
+        credential = _CachedCredential(google_email, token, self.clock())
+        with self._lock:
+            for key, value in list(self._cache.items()):
+                if value.google_email == google_email:
+                    self._cache[key] = credential
+            self._cache[google_email] = credential
+            self._retry_delays.pop(google_email, None)
+        self._schedule(google_email, credential.expires_at)
+
+    # --- Expiry-ordered schedule ---------------------------------------
+
+    def _schedule(self, google_email: str, expires_at: Optional[float], delay: float = None):
+        """Hesabın bir sonraki yenilemesini heap'e koyar (önceki kaydı geçersiz kılar)"""
+        if delay is not None:
+            refresh_at = self.clock() + delay
+        elif expires_at is not None:
+            refresh_at = expires_at - self.refresh_margin
+        else:
+            refresh_at = self.clock()
+        with self._wakeup:
+            self._versions += 1
+            self._scheduled[google_email] = self._versions
+            heapq.heappush(self._heap, (refresh_at, google_email, self._versions))
+            self._wakeup.notify()
+
+    def unschedule(self, google_email: str):
+        with self._lock:
+            self._scheduled.pop(google_email, None)
+
+    def next_refresh(self) -> Optional[Tuple[float, str]]:
+        """Sıradaki geçerli (refresh_at, google_email) kaydı"""
+        with self._lock:
+            self._discard_stale_locked()
+            return (self._heap[0][0], self._heap[0][1]) if self._heap else None
+
+    def _discard_stale_locked(self):
+        while self._heap and self._scheduled.get(self._heap[0][1]) != self._heap[0][2]:
+            heapq.heappop(self._heap)
+
+    def load_schedule(self) -> int:
+        """Başlangıçta token'ı olan tüm Google hesaplarını heap'e ekler (tek sorgu + okuma)"""
+        count = 0
+        for google_email in self.storage.find_users_with_property('oauth_google'):
+            token = self.storage.get_oauth_token(google_email, 'google')
+            if token and token.get('refresh_token'):
+                self._schedule(google_email, token_expiry(token))
+                count += 1
+        logger.info(f"Token refresh schedule loaded: {count} accounts")
+        return count
+
+    def refresh_due(self) -> int:
+        """Zamanı gelen tüm yenilemeleri çalıştırır; yenilenen hesap sayısını döndürür"""
+        refreshed = 0
+        while True:
+            with self._lock:
+                self._discard_stale_locked()
+                if not self._heap or self._heap[0][0] > self.clock():
+                    return refreshed
+                _, google_email, _ = heapq.heappop(self._heap)
+                self._scheduled.pop(google_email, None)
+            refreshed += 1 if self._background_refresh(google_email) else 0
+
+    def _background_refresh(self, google_email: str) -> bool:
+        try:
+            self._refresh_single_flight(google_email)
+            return True
+        except TokenRefreshError as e:
+            if e.invalid_grant or str(e) == "No refresh token available":
+                logger.warning(f"Dropping {google_email} from refresh schedule: {e}")
+                self.invalidate(google_email)
+                return False
+            with self._lock:
+                delay = min(self._retry_delays.get(google_email, RETRY_MIN_SECONDS / 2) * 2, RETRY_MAX_SECONDS)
+                self._retry_delays[google_email] = delay
+            logger.error(f"Background refresh failed for {google_email}, retrying in {delay:.0f}s: {e}")
+            self._schedule(google_email, None, delay=delay)
+            return False
+
+    def start_scheduler(self) -> threading.Thread:
+        """Arka plan zamanlayıcısını başlatır (daemon)"""
+        with self._lock:
+            if self._scheduler and self._scheduler.is_alive():
+                return self._scheduler
+            self._stopped = False
+            self._scheduler = threading.Thread(target=self.run_scheduler, name="oauth-token-refresh", daemon=True)
+            self._scheduler.start()
+            return self._scheduler
+
+    def run_scheduler(self):
+        """Sıradaki token'ın yenileme anına kadar uyur, zamanı gelenleri yeniler (bloklar)"""
+        while True:
+            with self._wakeup:
+                while not self._stopped:
+                    self._discard_stale_locked()
+                    wait = self._heap[0][0] - self.clock() if self._heap else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._wakeup.wait(wait)
+                if self._stopped:
+                    return
+            try:
+                self.refresh_due()
+            except Exception as e:
+                logger.error(f"Token scheduler error: {e}")
+
+    def stop_scheduler(self):
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify_all()
+
+
+_token_manager: Optional[OAuthTokenManager] = None
+_token_manager_lock = threading.Lock()
+
+
+def get_token_manager() -> OAuthTokenManager:
+    """Global token manager instance"""
+    global _token_manager
+    with _token_manager_lock:
+        if _token_manager is None:
+            _token_manager = OAuthTokenManager()
+        return _token_manager
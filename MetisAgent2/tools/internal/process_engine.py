@@ -0,0 +1,35 @@
+"""
+Process Engine - shared with MetisAgent3
+
+The engine lives in MetisAgent3/core/services/process_engine.py and only uses
+the standard library. This module loads that file directly (without importing
+the MetisAgent3 core package) so both agents run the same implementation.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+_ENGINE_PATH = Path(__file__).resolve().parents[3] / "MetisAgent3" / "core" / "services" / "process_engine.py"
+_MODULE_NAME = "metis_process_engine"
+
+
+def _load_engine_module():
+    module = sys.modules.get(_MODULE_NAME)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(_MODULE_NAME, _ENGINE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[_MODULE_NAME] = module  # dataclasses look the module up while it executes
+        spec.loader.exec_module(module)
+    return module
+
+
+_engine = _load_engine_module()
+
+OutputChunk = _engine.OutputChunk
+ProcessResult = _engine.ProcessResult
+ProcessTimeout = _engine.ProcessTimeout
+ProcessEngine = _engine.ProcessEngine
+get_process_engine = _engine.get_process_engine
+
+__all__ = ["OutputChunk", "ProcessResult", "ProcessTimeout", "ProcessEngine", "get_process_engine"]
@@ -0,0 +1,74 @@
+"""
+SQLite bağlantı havuzu - tools/internal altındaki SQLite depoları için ortak yardımcı
+
+Bağlantılar WAL modunda açılır ve iş parçacıkları arasında paylaşılır; havuz
+dolduğunda yeni istekler boşa çıkan bağlantıyı bekler.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """WAL modunda, iş parçacıkları arasında paylaşılan sınırlı SQLite bağlantı havuzu"""
+    
+    def __init__(self, db_path: str, max_size: int = 8, timeout: float = 30.0):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+    
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get(timeout=self.timeout)
+    
+    @contextmanager
+    def connection(self):
+        """Havuzdan bağlantı kiralar; blok sonunda commit, hata durumunda rollback yapar"""
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+    
+    def close(self):
+        """Boştaki tüm bağlantıları kapatır"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
@@ -1,21 +1,22 @@
 """
 Internal Todo Manager Tool for MetisAgent2 (MCP Tool)
 Provides internal todo list management with workflow integration and WebSocket broadcasting.
+Todos are kept in an SQLite TodoStore; its change feed drives the WebSocket updates.
 """
 
-import json
 import uuid
 import logging
 import sys
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.mcp_core import MCPTool, MCPToolResult
+from tools.internal.todo_store import TodoStore, get_todo_store
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,8 @@ class TodoManagerTool(MCPTool):
         # Storage setup
         self.storage_dir = Path(__file__).parent.parent / "storage" / "todos"
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.store: TodoStore = get_todo_store(str(self.storage_dir / "todos.db"))
+        self._migrated_users = set()
         
         # Register capabilities
         self.add_capability("todo_management")
@@ -98,42 +101,24 @@ class TodoManagerTool(MCPTool):
         
         logger.info("Todo Manager MCP Tool initialized")
     
-    def _get_user_todos(self, user_id: str) -> Dict[str, TodoItem]:
-        """Load todos for a specific user"""
-        todo_file = self.storage_dir / f"{user_id}_todos.json"
-        todos = {}
-        
+    def _ensure_migrated(self, user_id: str):
+        """Import the legacy <user>_todos.json on first access"""
+        if user_id in self._migrated_users:
+            return
         try:
-            if todo_file.exists():
-                with open(todo_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for todo_data in data:
-                        todo = TodoItem(**todo_data)
-                        todos[todo.id] = todo
-                logger.debug(f"Loaded {len(todos)} todos for user {user_id}")
+            self.store.import_user_json(user_id, str(self.storage_dir / f"{user_id}_todos.json"))
         except Exception as e:
-            logger.error(f"Error loading todos for user {user_id}: {e}")
-            
-        return todos
+            logger.error(f"Error migrating todos for user {user_id}: {e}")
+        self._migrated_users.add(user_id)
     
-    def _save_user_todos(self, user_id: str, todos: Dict[str, TodoItem]) -> bool:
-        """Save todos for a specific user"""
-        todo_file = self.storage_dir / f"{user_id}_todos.json"
-        
-        try:
-            todos_data = [asdict(todo) for todo in todos.values()]
-            with open(todo_file, 'w', encoding='utf-8') as f:
-                json.dump(todos_data, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Saved {len(todos)} todos for user {user_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving todos for user {user_id}: {e}")
-            return False
+    def subscribe_changes(self, listener: Callable[[Dict], None]) -> Callable[[], None]:
+        """Subscribe to todo changes (created, status_updated, deleted, cleared); returns unsubscribe"""
+        return self.store.subscribe(listener)
     
     def _create_todos(self, user_id: str, todos_data: List[Dict], workflow_id: str = None) -> MCPToolResult:
         """Create multiple todos from list of todo data"""
         try:
-            todos = self._get_user_todos(user_id)
+            self._ensure_migrated(user_id)
             created_todos = []
             current_time = datetime.now().isoformat()
             
@@ -154,28 +139,21 @@ class TodoManagerTool(MCPTool):
                     step_id=todo_data.get('step_id')
                 )
                 
-                todos[todo_id] = todo
                 created_todos.append(asdict(todo))
                 
                 logger.info(f"Created todo '{todo.content}' with ID {todo_id}")
             
-            # Save todos
-            if self._save_user_todos(user_id, todos):
-                return MCPToolResult(
-                    success=True,
-                    data={
-                        'message': f'Created {len(created_todos)} todos',
-                        'todos': created_todos,
-                        'total_todos': len(todos)
-                    },
-                    metadata={"user_id": user_id, "workflow_id": workflow_id}
-                )
-            else:
-                return MCPToolResult(
-                    success=False,
-                    error="Failed to save todos",
-                    metadata={"user_id": user_id}
-                )
+            # Save todos in one transaction
+            self.store.upsert_many(created_todos)
+            return MCPToolResult(
+                success=True,
+                data={
+                    'message': f'Created {len(created_todos)} todos',
+                    'todos': created_todos,
+                    'total_todos': self.store.count(user_id)
+                },
+                metadata={"user_id": user_id, "workflow_id": workflow_id}
+            )
             
         except Exception as e:
             logger.error(f"Error creating todos for user {user_id}: {e}")
@@ -189,22 +167,10 @@ class TodoManagerTool(MCPTool):
                    priority: str = None) -> MCPToolResult:
         """Get todos with optional filtering"""
         try:
-            todos = self._get_user_todos(user_id)
-            filtered_todos = []
-            
-            for todo in todos.values():
-                # Apply filters
-                if workflow_id and todo.workflow_id != workflow_id:
-                    continue
-                if status and todo.status != status:
-                    continue
-                if priority and todo.priority != priority:
-                    continue
-                    
-                filtered_todos.append(asdict(todo))
+            self._ensure_migrated(user_id)
             
-            # Sort by created_at descending
-            filtered_todos.sort(key=lambda x: x['created_at'], reverse=True)
+            # Indexed filter, sorted by created_at descending
+            filtered_todos = self.store.query(user_id, workflow_id, status, priority)
             
             return MCPToolResult(
                 success=True,
@@ -233,41 +199,30 @@ class TodoManagerTool(MCPTool):
                            workflow_id: str = None) -> MCPToolResult:
         """Update todo status"""
         try:
-            todos = self._get_user_todos(user_id)
+            self._ensure_migrated(user_id)
             
-            if todo_id not in todos:
+            # Single-row update
+            updated = self.store.update_status(user_id, todo_id, status)
+            if updated is None:
                 return MCPToolResult(
                     success=False,
                     error=f"Todo {todo_id} not found",
                     metadata={"user_id": user_id, "todo_id": todo_id}
                 )
             
-            # Update todo
-            todo = todos[todo_id]
-            old_status = todo.status
-            todo.status = status
-            todo.updated_at = datetime.now().isoformat()
+            old_status = updated['old_status']
+            logger.info(f"Updated todo {todo_id} status: {old_status} -> {status}")
             
-            # Save todos
-            if self._save_user_todos(user_id, todos):
-                logger.info(f"Updated todo {todo_id} status: {old_status} -> {status}")
-                
-                return MCPToolResult(
-                    success=True,
-                    data={
-                        'todo_id': todo_id,
-                        'old_status': old_status,
-                        'new_status': status,
-                        'todo': asdict(todo)
-                    },
-                    metadata={"user_id": user_id, "workflow_id": workflow_id}
-                )
-            else:
-                return MCPToolResult(
-                    success=False,
-                    error="Failed to save todo update",
-                    metadata={"user_id": user_id, "todo_id": todo_id}
-                )
+            return MCPToolResult(
+                success=True,
+                data={
+                    'todo_id': todo_id,
+                    'old_status': old_status,
+                    'new_status': status,
+                    'todo': updated['todo']
+                },
+                metadata={"user_id": user_id, "workflow_id": workflow_id}
+            )
             
         except Exception as e:
             logger.error(f"Error updating todo {todo_id} for user {user_id}: {e}")
@@ -280,37 +235,28 @@ class TodoManagerTool(MCPTool):
     def _delete_todo(self, user_id: str, todo_id: str, workflow_id: str = None) -> MCPToolResult:
         """Delete a todo"""
         try:
-            todos = self._get_user_todos(user_id)
+            self._ensure_migrated(user_id)
             
-            if todo_id not in todos:
+            # Delete todo
+            deleted_todo = self.store.delete(user_id, todo_id)
+            if deleted_todo is None:
                 return MCPToolResult(
                     success=False,
                     error=f"Todo {todo_id} not found",
                     metadata={"user_id": user_id, "todo_id": todo_id}
                 )
             
-            # Delete todo
-            deleted_todo = todos.pop(todo_id)
+            logger.info(f"Deleted todo {todo_id}: '{deleted_todo['content']}'")
             
-            # Save todos
-            if self._save_user_todos(user_id, todos):
-                logger.info(f"Deleted todo {todo_id}: '{deleted_todo.content}'")
-                
-                return MCPToolResult(
-                    success=True,
-                    data={
-                        'todo_id': todo_id,
-                        'deleted_todo': asdict(deleted_todo),
-                        'remaining_todos': len(todos)
-                    },
-                    metadata={"user_id": user_id, "workflow_id": workflow_id}
-                )
-            else:
-                return MCPToolResult(
-                    success=False,
-                    error="Failed to save after deletion",
-                    metadata={"user_id": user_id, "todo_id": todo_id}
-                )
+            return MCPToolResult(
+                success=True,
+                data={
+                    'todo_id': todo_id,
+                    'deleted_todo': deleted_todo,
+                    'remaining_todos': self.store.count(user_id)
+                },
+                metadata={"user_id": user_id, "workflow_id": workflow_id}
+            )
             
         except Exception as e:
             logger.error(f"Error deleting todo {todo_id} for user {user_id}: {e}")
@@ -323,15 +269,10 @@ class TodoManagerTool(MCPTool):
     def _get_workflow_todos(self, user_id: str, workflow_id: str) -> MCPToolResult:
         """Get all todos for a specific workflow"""
         try:
-            todos = self._get_user_todos(user_id)
-            workflow_todos = []
+            self._ensure_migrated(user_id)
             
-            for todo in todos.values():
-                if todo.workflow_id == workflow_id:
-                    workflow_todos.append(asdict(todo))
-            
-            # Sort by created_at
-            workflow_todos.sort(key=lambda x: x['created_at'])
+            # Indexed lookup, sorted by created_at
+            workflow_todos = self.store.workflow_todos(user_id, workflow_id)
             
             # Calculate workflow progress
             total_todos = len(workflow_todos)
@@ -365,38 +306,21 @@ class TodoManagerTool(MCPTool):
     def _clear_completed_todos(self, user_id: str, workflow_id: str = None) -> MCPToolResult:
         """Clear completed todos"""
         try:
-            todos = self._get_user_todos(user_id)
-            completed_todos = []
-            remaining_todos = {}
+            self._ensure_migrated(user_id)
             
-            for todo_id, todo in todos.items():
-                if todo.status == 'completed':
-                    # Filter by workflow if specified
-                    if workflow_id is None or todo.workflow_id == workflow_id:
-                        completed_todos.append(asdict(todo))
-                        continue
-                
-                remaining_todos[todo_id] = todo
+            # Filter by workflow if specified
+            completed_todos = self.store.clear(user_id, workflow_id=workflow_id, status='completed')
+            logger.info(f"Cleared {len(completed_todos)} completed todos for user {user_id}")
             
-            # Save remaining todos
-            if self._save_user_todos(user_id, remaining_todos):
-                logger.info(f"Cleared {len(completed_todos)} completed todos for user {user_id}")
-                
-                return MCPToolResult(
-                    success=True,
-                    data={
-                        'cleared_count': len(completed_todos),
-                        'remaining_count': len(remaining_todos),
-                        'cleared_todos': completed_todos
-                    },
-                    metadata={"user_id": user_id, "workflow_id": workflow_id}
-                )
-            else:
-                return MCPToolResult(
-                    success=False,
-                    error="Failed to save after clearing todos",
-                    metadata={"user_id": user_id}
-                )
+            return MCPToolResult(
+                success=True,
+                data={
+                    'cleared_count': len(completed_todos),
+                    'remaining_count': self.store.count(user_id),
+                    'cleared_todos': completed_todos
+                },
+                metadata={"user_id": user_id, "workflow_id": workflow_id}
+            )
             
         except Exception as e:
             logger.error(f"Error clearing completed todos for user {user_id}: {e}")
@@ -424,6 +348,28 @@ class TodoManagerTool(MCPTool):
             'data': result.data,
             'error': result.error
         }
+    
+    def todo_get_all(self, user_id: str, workflow_id: str = None) -> Dict[str, Any]:
+        """Legacy compatibility method used by the dashboard API and WebSocket layer"""
+        result = self._get_todos(user_id, workflow_id)
+        todos = result.data['todos'] if result.success else []
+        return {
+            'success': result.success,
+            'todos': todos,
+            'total': len(todos),
+            'latest_seq': self.store.latest_seq(),
+            'error': result.error
+        }
+    
+    def todo_clear(self, user_id: str, workflow_id: str = None) -> Dict[str, Any]:
+        """Legacy compatibility method - removes all todos of the user (or workflow)"""
+        try:
+            self._ensure_migrated(user_id)
+            cleared = self.store.clear(user_id, workflow_id=workflow_id)
+            return {'success': True, 'cleared_count': len(cleared), 'error': None}
+        except Exception as e:
+            logger.error(f"Error clearing todos for user {user_id}: {e}")
+            return {'success': False, 'cleared_count': 0, 'error': str(e)}
 
 class TodoTool:
     """Legacy wrapper class for backward compatibility"""
@@ -0,0 +1,347 @@
+"""
+Todo Store - SQLite based todo repository for TodoManagerTool
+Todos live in one table indexed on (user_id, workflow_id, status), so status
+ticks are single-row updates and workflow/status filters are index lookups.
+Every committed change is appended to a change log and pushed to subscribers,
+which lets the websocket layer broadcast updates instead of re-polling.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TODO_COLUMNS = ["id", "content", "status", "priority", "created_at", "updated_at",
+                "user_id", "workflow_id", "step_id"]
+
+# Change log rows kept for reconnecting clients (changes_since)
+CHANGE_LOG_LIMIT = 5000
+
+
+class TodoStore:
+    """Multi-user todo repository backed by an SQLite file"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._changes_since_trim = 0
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS todos (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    workflow_id TEXT,
+                    step_id TEXT,
+                    content TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    UNIQUE (user_id, id)
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_todos_user_workflow_status
+                ON todos (user_id, workflow_id, status)
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_todos_user_status
+                ON todos (user_id, status)
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_todos_user_created
+                ON todos (user_id, created_at)
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS todo_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    workflow_id TEXT,
+                    todo_id TEXT,
+                    event TEXT NOT NULL,
+                    payload TEXT,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_todo_changes_user
+                ON todo_changes (user_id, seq)
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Row helpers ---------------------------------------------------
+
+    @staticmethod
+    def _todo_from_row(row) -> Dict:
+        return {column: row[column] for column in TODO_COLUMNS}
+
+    def _select(self, where: str, params: List, order: str = "created_at DESC, seq") -> List[Dict]:
+        rows = self._conn.execute(f"SELECT * FROM todos WHERE {where} ORDER BY {order}", params).fetchall()
+        return [self._todo_from_row(row) for row in rows]
+
+    def _fetch(self, user_id: str, todo_id: str) -> Optional[Dict]:
+        row = self._conn.execute(
+            "SELECT * FROM todos WHERE user_id = ? AND id = ?", (user_id, todo_id)
+        ).fetchone()
+        return self._todo_from_row(row) if row else None
+
+    # --- Change feed ---------------------------------------------------
+
+    def subscribe(self, listener: Callable[[Dict], None]) -> Callable[[], None]:
+        """Receive every committed change; returns an unsubscribe callable"""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
+
+    def _record_change(self, user_id: str, event: str, workflow_id: Optional[str] = None,
+                       todo_id: Optional[str] = None, payload: Any = None) -> Dict:
+        """Append to the change log inside the caller's transaction"""
+        created_at = datetime.now().isoformat()
+        seq = self._conn.execute(
+            "INSERT INTO todo_changes (user_id, workflow_id, todo_id, event, payload, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, workflow_id, todo_id, event,
+             json.dumps(payload, ensure_ascii=False) if payload is not None else None, created_at)
+        ).lastrowid
+        self._changes_since_trim += 1
+        if self._changes_since_trim >= CHANGE_LOG_LIMIT // 10:
+            self._changes_since_trim = 0
+            self._conn.execute("DELETE FROM todo_changes WHERE seq <= ?", (seq - CHANGE_LOG_LIMIT,))
+        return {
+            "seq": seq,
+            "event": event,
+            "user_id": user_id,
+            "workflow_id": workflow_id,
+            "todo_id": todo_id,
+            "data": payload,
+            "timestamp": created_at
+        }
+
+    def _publish(self, changes: List[Dict]):
+        """Notify subscribers after commit, outside the store lock"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for change in changes:
+            for listener in listeners:
+                try:
+                    listener(change)
+                except Exception as e:
+                    logger.warning(f"Todo change listener failed: {e}")
+
+    def changes_since(self, user_id: str, since_seq: int = 0, limit: int = 500) -> List[Dict]:
+        """Logged changes for `user_id` after `since_seq` (catch-up for reconnecting clients)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM todo_changes WHERE user_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (user_id, since_seq, limit)
+            ).fetchall()
+        return [{
+            "seq": row["seq"],
+            "event": row["event"],
+            "user_id": row["user_id"],
+            "workflow_id": row["workflow_id"],
+            "todo_id": row["todo_id"],
+            "data": json.loads(row["payload"]) if row["payload"] else None,
+            "timestamp": row["created_at"]
+        } for row in rows]
+
+    def latest_seq(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM todo_changes").fetchone()[0]
+
+    # --- Queries -------------------------------------------------------
+
+    def get(self, user_id: str, todo_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._fetch(user_id, todo_id)
+
+    def query(self, user_id: str, workflow_id: str = None, status: str = None,
+              priority: str = None) -> List[Dict]:
+        """Filtered todos, newest first"""
+        where = ["user_id = ?"]
+        params = [user_id]
+        for column, value in (("workflow_id", workflow_id), ("status", status), ("priority", priority)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        with self._lock:
+            return self._select(" AND ".join(where), params)
+
+    def workflow_todos(self, user_id: str, workflow_id: str) -> List[Dict]:
+        """Todos of one workflow, oldest first"""
+        with self._lock:
+            return self._select("user_id = ? AND workflow_id = ?", [user_id, workflow_id],
+                                order="created_at, seq")
+
+    def count(self, user_id: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM todos WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    # --- Writes --------------------------------------------------------
+
+    def upsert_many(self, todos: List[Dict]) -> List[Dict]:
+        """Insert todos in one transaction; an existing (user_id, id) is overwritten in place"""
+        changes = []
+        with self._lock:
+            with self._conn:
+                for todo in todos:
+                    self._conn.execute(
+                        "INSERT INTO todos (id, user_id, workflow_id, step_id, content, status, priority, "
+                        "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (user_id, id) DO UPDATE SET workflow_id = excluded.workflow_id, "
+                        "step_id = excluded.step_id, content = excluded.content, status = excluded.status, "
+                        "priority = excluded.priority, created_at = excluded.created_at, "
+                        "updated_at = excluded.updated_at",
+                        (todo["id"], todo["user_id"], todo.get("workflow_id"), todo.get("step_id"),
+                         todo["content"], todo["status"], todo["priority"], todo["created_at"], todo["updated_at"])
+                    )
+                    changes.append(self._record_change(todo["user_id"], "created", todo.get("workflow_id"),
+                                                       todo["id"], todo))
+        self._publish(changes)
+        return todos
+
+    def update_status(self, user_id: str, todo_id: str, status: str) -> Optional[Dict]:
+        """Single-row status update; returns {'old_status', 'todo'} or None if missing"""
+        with self._lock:
+            with self._conn:
+                current = self._conn.execute(
+                    "SELECT status FROM todos WHERE user_id = ? AND id = ?", (user_id, todo_id)
+                ).fetchone()
+                if not current:
+                    return None
+                self._conn.execute(
+                    "UPDATE todos SET status = ?, updated_at = ? WHERE user_id = ? AND id = ?",
+                    (status, datetime.now().isoformat(), user_id, todo_id)
+                )
+                todo = self._fetch(user_id, todo_id)
+                change = self._record_change(user_id, "status_updated", todo["workflow_id"], todo_id,
+                                             dict(todo, old_status=current["status"]))
+        self._publish([change])
+        return {"old_status": current["status"], "todo": todo}
+
+    def delete(self, user_id: str, todo_id: str) -> Optional[Dict]:
+        """Delete one todo; returns the deleted row or None if missing"""
+        with self._lock:
+            with self._conn:
+                todo = self._fetch(user_id, todo_id)
+                if not todo:
+                    return None
+                self._conn.execute("DELETE FROM todos WHERE user_id = ? AND id = ?", (user_id, todo_id))
+                change = self._record_change(user_id, "deleted", todo["workflow_id"], todo_id, todo)
+        self._publish([change])
+        return todo
+
+    def clear(self, user_id: str, workflow_id: str = None, status: str = None) -> List[Dict]:
+        """Delete todos matching the filters; returns the deleted rows"""
+        where = ["user_id = ?"]
+        params = [user_id]
+        if workflow_id is not None:
+            where.append("workflow_id = ?")
+            params.append(workflow_id)
+        if status is not None:
+            where.append("status = ?")
+            params.append(status)
+        where_sql = " AND ".join(where)
+        with self._lock:
+            with self._conn:
+                cleared = self._select(where_sql, params, order="seq")
+                if not cleared:
+                    return []
+                self._conn.execute(f"DELETE FROM todos WHERE {where_sql}", params)
+                change = self._record_change(user_id, "cleared", workflow_id, None, {
+                    "status": status,
+                    "todo_ids": [todo["id"] for todo in cleared]
+                })
+        self._publish([change])
+        return cleared
+
+    # --- Import --------------------------------------------------------
+
+    def import_user_json(self, user_id: str, json_path: str) -> Optional[int]:
+        """One-shot import of a legacy <user>_todos.json; the file is renamed to .migrated"""
+        if not os.path.exists(json_path):
+            return None
+        marker = f"imported_todos_json:{user_id}"
+        with self._lock:
+            done = self._conn.execute("SELECT value FROM metadata WHERE key = ?", (marker,)).fetchone()
+        if done:
+            return None
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        count = 0
+        with self._lock, self._conn:
+            for todo in data:
+                if not all(key in todo for key in ["id", "content"]):
+                    continue
+                now = datetime.now().isoformat()
+                # Existing rows win: the JSON file is only the legacy snapshot
+                count += self._conn.execute(
+                    "INSERT OR IGNORE INTO todos (id, user_id, workflow_id, step_id, content, status, priority, "
+                    "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (todo["id"], todo.get("user_id") or user_id, todo.get("workflow_id"), todo.get("step_id"),
+                     todo["content"], todo.get("status", "pending"), todo.get("priority", "medium"),
+                     todo.get("created_at") or now, todo.get("updated_at") or now)
+                ).rowcount
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                (marker, datetime.now().isoformat())
+            )
+        os.replace(json_path, json_path + ".migrated")
+        logger.info(f"Imported {count} todos for user {user_id} from {json_path}")
+        return count
+
+    def import_json_dir(self, storage_dir: str) -> Dict[str, int]:
+        """Import every <user>_todos.json under `storage_dir`"""
+        counts = {}
+        for filename in sorted(os.listdir(storage_dir)):
+            if not filename.endswith("_todos.json"):
+                continue
+            user_id = filename[:-len("_todos.json")]
+            count = self.import_user_json(user_id, os.path.join(storage_dir, filename))
+            if count is not None:
+                counts[user_id] = count
+        return counts
+
+
+_stores: Dict[str, TodoStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_todo_store(db_path: str) -> TodoStore:
+    """Shared store per database file, so every tool instance feeds the same subscribers"""
+    db_path = os.path.abspath(db_path)
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = TodoStore(db_path)
+            _stores[db_path] = store
+        return store
@@ -1,6 +1,9 @@
 """
 SQLite tabanlı esnek user storage sistemi
 EAV (Entity-Attribute-Value) modeli ile tüm user verileri
+
+Bağlantılar WAL modunda bir havuzdan alınır; şifreli değerlerin çözülmüş hali
+generation kolonuna bağlı, sınırlı bir bellek içi önbellekte tutulur.
 """
 
 import sqlite3
@@ -8,25 +11,42 @@ import json
 import logging
 import os
 import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Tuple
 from cryptography.fernet import Fernet
 import base64
 
+from .sqlite_pool import ConnectionPool
+
 logger = logging.getLogger(__name__)
 
+# Çözülmüş değer önbelleğinin en fazla kayıt sayısı
+DECRYPT_CACHE_SIZE = 2048
+
+
 class UserStorage:
     """SQLite tabanlı esnek kullanıcı veri depolama sistemi"""
     
-    def __init__(self, db_path: str = "users.db"):
+    def __init__(self, db_path: str = "users.db", pool_size: int = 8,
+                 cache_size: int = DECRYPT_CACHE_SIZE):
         """
         User Storage başlatır
         
         Args:
             db_path: SQLite veritabanı dosya yolu
+            pool_size: Havuzdaki en fazla bağlantı sayısı
+            cache_size: Çözülmüş değer önbelleğinin kapasitesi
         """
         self.db_path = db_path
         self.encryption_key = None
+        self._fernet = None
+        self._pool = ConnectionPool(db_path, max_size=pool_size)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[int, str]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {'hits': 0, 'misses': 0}
         self._init_encryption()
         self._init_database()
         
@@ -44,10 +64,12 @@ class UserStorage:
             with open(key_file, 'wb') as f:
                 f.write(self.encryption_key)
             os.chmod(key_file, 0o600)
+        
+        self._fernet = Fernet(self.encryption_key)
     
     def _init_database(self):
         """Database tabloları oluşturur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS users (
                     user_id TEXT PRIMARY KEY,
@@ -81,13 +103,25 @@ class UserStorage:
                 ON user_properties (property_name)
             ''')
             
-            conn.commit()
+            # Her yazma global sayacı artırır; önbellek kayıtları bu değerle doğrulanır
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(user_properties)')]
+            if 'generation' not in columns:
+                conn.execute('ALTER TABLE user_properties ADD COLUMN generation INTEGER DEFAULT 0')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS storage_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            ''')
+            conn.execute('''
+                INSERT OR IGNORE INTO storage_meta (key, value) VALUES ('generation', 0)
+            ''')
     
     def _encrypt_value(self, value: str) -> str:
         """Değeri şifreler"""
         try:
-            f = Fernet(self.encryption_key)
-            encrypted = f.encrypt(value.encode('utf-8'))
+            encrypted = self._fernet.encrypt(value.encode('utf-8'))
             return base64.b64encode(encrypted).decode('utf-8')
         except Exception as e:
             logger.error(f"Encryption error: {e}")
@@ -96,14 +130,64 @@ class UserStorage:
     def _decrypt_value(self, encrypted_value: str) -> str:
         """Şifreli değeri çözer"""
         try:
-            f = Fernet(self.encryption_key)
             decoded = base64.b64decode(encrypted_value.encode('utf-8'))
-            decrypted = f.decrypt(decoded)
+            decrypted = self._fernet.decrypt(decoded)
             return decrypted.decode('utf-8')
         except Exception as e:
             logger.error(f"Decryption error: {e}")
             return encrypted_value
     
+    def _cache_put(self, user_id: str, property_name: str, generation: int, plaintext: str):
+        with self._cache_lock:
+            key = (user_id, property_name)
+            self._cache[key] = (generation, plaintext)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+    
+    def _cache_drop(self, user_id: str, property_name: str = None):
+        with self._cache_lock:
+            if property_name is not None:
+                self._cache.pop((user_id, property_name), None)
+                return
+            for key in [key for key in self._cache if key[0] == user_id]:
+                del self._cache[key]
+    
+    def clear_cache(self):
+        """Çözülmüş değer önbelleğini boşaltır"""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def _plaintext(self, user_id: str, property_name: str, value_str: str,
+                   is_encrypted: int, generation: int) -> str:
+        """Şifreli değeri önbellekten ya da Fernet ile çözer"""
+        if not is_encrypted:
+            return value_str
+        key = (user_id, property_name)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == generation:
+                self._cache.move_to_end(key)
+                self.cache_stats['hits'] += 1
+                return cached[1]
+            self.cache_stats['misses'] += 1
+        plaintext = self._decrypt_value(value_str)
+        if plaintext is not value_str:
+            self._cache_put(user_id, property_name, generation, plaintext)
+        return plaintext
+    
+    @staticmethod
+    def _deserialize(value_str: str, property_type: str) -> Any:
+        """Saklanan metni tipine göre çözer"""
+        if property_type == 'json':
+            return json.loads(value_str)
+        elif property_type == 'bool':
+            return value_str.lower() in ('true', '1', 'yes')
+        elif property_type == 'int':
+            return int(value_str)
+        else:
+            return value_str
+    
     def create_user(self, user_id: str) -> bool:
         """
         Yeni kullanıcı oluşturur
@@ -117,14 +201,12 @@ class UserStorage:
         try:
             now = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 conn.execute('''
                     INSERT OR IGNORE INTO users (user_id, created_at, updated_at)
                     VALUES (?, ?, ?)
                 ''', (user_id, now, now))
                 
-                conn.commit()
-                
             logger.info(f"User created: {user_id}")
             return True
             
@@ -148,9 +230,6 @@ class UserStorage:
             bool: Başarı durumu
         """
         try:
-            # User'ı oluştur (yoksa)
-            self.create_user(user_id)
-            
             # Değeri serialize et
             if property_type == 'json':
                 value_str = json.dumps(property_value)
@@ -161,30 +240,49 @@ class UserStorage:
             else:
                 value_str = str(property_value)
             
+            plaintext = value_str
+            
             # Şifreleme
             if encrypt:
                 value_str = self._encrypt_value(value_str)
             
             now = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
+                # User'ı oluştur (yoksa)
+                conn.execute('''
+                    INSERT OR IGNORE INTO users (user_id, created_at, updated_at)
+                    VALUES (?, ?, ?)
+                ''', (user_id, now, now))
+                
+                conn.execute("UPDATE storage_meta SET value = value + 1 WHERE key = 'generation'")
+                generation = conn.execute(
+                    "SELECT value FROM storage_meta WHERE key = 'generation'"
+                ).fetchone()[0]
+                
                 conn.execute('''
-                    INSERT OR REPLACE INTO user_properties 
+                    INSERT INTO user_properties 
                     (user_id, property_name, property_value, is_encrypted, 
-                     property_type, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, 
-                           COALESCE((SELECT created_at FROM user_properties 
-                                   WHERE user_id = ? AND property_name = ?), ?), 
-                           ?)
+                     property_type, created_at, updated_at, generation)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (user_id, property_name) DO UPDATE SET
+                        property_value = excluded.property_value,
+                        is_encrypted = excluded.is_encrypted,
+                        property_type = excluded.property_type,
+                        updated_at = excluded.updated_at,
+                        generation = excluded.generation
                 ''', (user_id, property_name, value_str, int(encrypt), 
-                     property_type, user_id, property_name, now, now))
+                     property_type, now, now, generation))
                 
                 # User updated_at güncelle
                 conn.execute('''
                     UPDATE users SET updated_at = ? WHERE user_id = ?
                 ''', (now, user_id))
-                
-                conn.commit()
+            
+            if encrypt:
+                self._cache_put(user_id, property_name, generation, plaintext)
+            else:
+                self._cache_drop(user_id, property_name)
                 
             logger.info(f"Property set: {user_id}.{property_name} ({property_type})")
             return True
@@ -207,38 +305,67 @@ class UserStorage:
             Any: Özellik değeri
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT property_value, is_encrypted, property_type
+            with self._pool.connection() as conn:
+                row = conn.execute('''
+                    SELECT property_value, is_encrypted, property_type, generation
                     FROM user_properties
                     WHERE user_id = ? AND property_name = ?
-                ''', (user_id, property_name))
-                
-                row = cursor.fetchone()
-                
-                if not row:
-                    return default
-                
-                value_str, is_encrypted, property_type = row
-                
-                # Decrypt if needed
-                if is_encrypted:
-                    value_str = self._decrypt_value(value_str)
-                
-                # Deserialize
-                if property_type == 'json':
-                    return json.loads(value_str)
-                elif property_type == 'bool':
-                    return value_str.lower() in ('true', '1', 'yes')
-                elif property_type == 'int':
-                    return int(value_str)
-                else:
-                    return value_str
+                ''', (user_id, property_name)).fetchone()
+            
+            if not row:
+                return default
+            
+            value_str, is_encrypted, property_type, generation = row
+            
+            # Decrypt if needed (önbellekten)
+            value_str = self._plaintext(user_id, property_name, value_str, is_encrypted, generation)
+            
+            # Deserialize
+            return self._deserialize(value_str, property_type)
                     
         except Exception as e:
             logger.error(f"Error getting property {user_id}.{property_name}: {e}")
             return default
     
+    def get_properties(self, user_id: str, property_names: Iterable[str],
+                       default: Any = None) -> Dict[str, Any]:
+        """
+        Birden fazla kullanıcı özelliğini tek sorguda getirir
+        
+        Args:
+            user_id: Kullanıcı ID'si
+            property_names: Özellik adları
+            default: Bulunamayan özellikler için varsayılan değer
+            
+        Returns:
+            Dict: Özellik adı -> değer (bulunamayanlar default)
+        """
+        names = list(dict.fromkeys(property_names))
+        properties = {name: default for name in names}
+        if not names:
+            return properties
+        
+        try:
+            with self._pool.connection() as conn:
+                rows = conn.execute(f'''
+                    SELECT property_name, property_value, is_encrypted, property_type, generation
+                    FROM user_properties
+                    WHERE user_id = ? AND property_name IN ({','.join('?' * len(names))})
+                ''', [user_id, *names]).fetchall()
+            
+            for prop_name, value_str, is_encrypted, prop_type, generation in rows:
+                try:
+                    value_str = self._plaintext(user_id, prop_name, value_str, is_encrypted, generation)
+                    properties[prop_name] = self._deserialize(value_str, prop_type)
+                except Exception as e:
+                    logger.error(f"Error decoding property {user_id}.{prop_name}: {e}")
+            
+            return properties
+            
+        except Exception as e:
+            logger.error(f"Error getting properties for {user_id}: {e}")
+            return properties
+    
     def get_all_properties(self, user_id: str) -> Dict[str, Any]:
         """
         Kullanıcının tüm özelliklerini getirir
@@ -252,29 +379,19 @@ class UserStorage:
         try:
             properties = {}
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT property_name, property_value, is_encrypted, property_type
+            with self._pool.connection() as conn:
+                rows = conn.execute('''
+                    SELECT property_name, property_value, is_encrypted, property_type, generation
                     FROM user_properties
                     WHERE user_id = ?
-                ''', (user_id,))
+                ''', (user_id,)).fetchall()
+            
+            for prop_name, value_str, is_encrypted, prop_type, generation in rows:
+                # Decrypt if needed (önbellekten)
+                value_str = self._plaintext(user_id, prop_name, value_str, is_encrypted, generation)
                 
-                for row in cursor.fetchall():
-                    prop_name, value_str, is_encrypted, prop_type = row
-                    
-                    # Decrypt if needed
-                    if is_encrypted:
-                        value_str = self._decrypt_value(value_str)
-                    
-                    # Deserialize
-                    if prop_type == 'json':
-                        properties[prop_name] = json.loads(value_str)
-                    elif prop_type == 'bool':
-                        properties[prop_name] = value_str.lower() in ('true', '1', 'yes')
-                    elif prop_type == 'int':
-                        properties[prop_name] = int(value_str)
-                    else:
-                        properties[prop_name] = value_str
+                # Deserialize
+                properties[prop_name] = self._deserialize(value_str, prop_type)
                         
             return properties
             
@@ -282,6 +399,29 @@ class UserStorage:
             logger.error(f"Error getting all properties for {user_id}: {e}")
             return {}
     
+    def find_users_with_property(self, property_name: str) -> List[str]:
+        """
+        Belirli bir özelliğe sahip kullanıcıları tek sorguda listeler
+        
+        Args:
+            property_name: Özellik adı
+            
+        Returns:
+            List[str]: Kullanıcı ID'leri
+        """
+        try:
+            with self._pool.connection() as conn:
+                cursor = conn.execute('''
+                    SELECT user_id FROM user_properties
+                    WHERE property_name = ?
+                    ORDER BY user_id
+                ''', (property_name,))
+                return [row[0] for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"Error finding users with property {property_name}: {e}")
+            return []
+    
     def delete_property(self, user_id: str, property_name: str) -> bool:
         """
         Kullanıcı özelliğini siler
@@ -294,13 +434,13 @@ class UserStorage:
             bool: Başarı durumu
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 conn.execute('''
                     DELETE FROM user_properties
                     WHERE user_id = ? AND property_name = ?
                 ''', (user_id, property_name))
-                
-                conn.commit()
+            
+            self._cache_drop(user_id, property_name)
                 
             logger.info(f"Property deleted: {user_id}.{property_name}")
             return True
@@ -320,10 +460,11 @@ class UserStorage:
             bool: Başarı durumu
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 conn.execute('DELETE FROM user_properties WHERE user_id = ?', (user_id,))
                 conn.execute('DELETE FROM users WHERE user_id = ?', (user_id,))
-                conn.commit()
+            
+            self._cache_drop(user_id)
                 
             logger.info(f"User deleted: {user_id}")
             return True
@@ -340,7 +481,7 @@ class UserStorage:
             List[str]: Kullanıcı ID'leri
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.execute('SELECT user_id FROM users ORDER BY created_at')
                 return [row[0] for row in cursor.fetchall()]
                 
@@ -359,7 +500,7 @@ class UserStorage:
             bool: Kullanıcı var mı?
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.execute('SELECT 1 FROM users WHERE user_id = ?', (user_id,))
                 return cursor.fetchone() is not None
                 
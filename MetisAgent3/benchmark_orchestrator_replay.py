@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Load Benchmark - N concurrent chat sessions on recorded LLM responses
+
+Drives ApplicationOrchestrator.process_user_request in-process with the
+"replay" LLM provider, so runs are reproducible and need no provider API:
+  record  - run the sessions once against a live provider (--record --provider
+            anthropic) and store every LLM response in the cassette
+  replay  - run N concurrent sessions against the cassette with synthetic
+            latency / streaming cadence and report p50/p95/p99 per stage
+
+Stages come from the orchestrator's workflow callbacks:
+  planning   workflow started -> plan ready (TOOL) or answer ready (CHAT)
+  execution  plan ready -> workflow completed (TOOL mode only)
+  total      process_user_request call -> return
+  llm_ttft / llm_call   per replayed LLM call (time to first token / whole call)
+
+Usage:
+    python benchmark_orchestrator_replay.py --record --provider anthropic --user-id <id>
+    python benchmark_orchestrator_replay.py [--sessions 50] [--turns 3] [--latency-ms 400]
+                                            [--tokens-per-second 80] [--jitter 0.2]
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.contracts.base_types import ExecutionContext
+from core.orchestrator.application_orchestrator import get_orchestrator, initialize_application
+from core.services.llm_replay_service import DEFAULT_CASSETTE_PATH, ReplaySettings, configure_replay
+
+DEFAULT_PROMPTS = [
+    "Merhaba, bugün neler yapabilirsin?",
+    "What is the difference between OEE availability and performance?",
+    "List my unread emails from today",
+    "Show the open maintenance tasks for the boiler",
+    "Explain preventive maintenance in two sentences",
+]
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(p / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class LoadGenerator:
+    """Runs concurrent chat sessions through the orchestrator and collects stage timings"""
+
+    def __init__(self, orchestrator, provider: str, user_id: str, prompts: List[str]):
+        self.orchestrator = orchestrator
+        self.provider = provider
+        self.user_id = user_id
+        self.prompts = prompts
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors = 0
+
+    async def _request(self, session: int, turn: int):
+        marks = {}
+
+        def workflow_callback(event, data):
+            status = data.get("workflow", {}).get("status")
+            now = time.perf_counter()
+            if event == "workflow_started":
+                marks.setdefault("started", now)
+            elif event == "workflow_update" and status == "ready_to_execute":
+                marks.setdefault("planned", now)
+            elif event == "workflow_completed":
+                marks.setdefault("completed", now)
+
+        context = ExecutionContext(user_id=self.user_id, conversation_id=f"loadgen_{session}")
+        prompt = self.prompts[(session + turn) % len(self.prompts)]
+        start = time.perf_counter()
+        result = await self.orchestrator.process_user_request(
+            prompt, context, llm_provider=self.provider, workflow_callback=workflow_callback
+        )
+        end = time.perf_counter()
+
+        if not result.success:
+            self.errors += 1
+        self.timings["total"].append(end - start)
+        if "started" in marks:
+            planned = marks.get("planned", marks.get("completed", end))
+            self.timings["planning"].append(planned - marks["started"])
+            if "planned" in marks:
+                self.timings["execution"].append(marks.get("completed", end) - marks["planned"])
+
+    async def _session(self, session: int, turns: int):
+        for turn in range(turns):
+            await self._request(session, turn)
+
+    async def run(self, sessions: int, turns: int) -> float:
+        start = time.perf_counter()
+        await asyncio.gather(*(self._session(session, turns) for session in range(sessions)))
+        return time.perf_counter() - start
+
+
+def print_report(timings: Dict[str, List[float]]):
+    print(f"{'stage':<12} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage in ("planning", "execution", "total", "llm_ttft", "llm_call"):
+        values = sorted(timings.get(stage, []))
+        if not values:
+            continue
+        p50, p95, p99 = (percentile(values, p) * 1000 for p in (50, 95, 99))
+        print(f"{stage:<12} {len(values):>7} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {values[-1] * 1000:>9.1f}")
+
+
+async def run(args) -> int:
+    prompts = DEFAULT_PROMPTS
+    if args.prompts:
+        prompts = [line.strip() for line in open(args.prompts, encoding="utf-8") if line.strip()]
+
+    settings = ReplaySettings(first_token_ms=args.latency_ms, latency_scale=args.latency_scale,
+                              jitter=args.jitter, tokens_per_second=args.tokens_per_second, seed=args.seed)
+    replay = configure_replay(args.cassette, settings, recording=args.record)
+    provider = args.provider if args.record else "replay"
+
+    if not await initialize_application():
+        print("❌ Orchestrator initialization failed")
+        return 1
+    generator = LoadGenerator(get_orchestrator(), provider, args.user_id, prompts)
+
+    mode = f"recording with {provider}" if args.record else "replaying"
+    print("📊 Orchestrator load benchmark")
+    print(f"   {mode}, {args.sessions} sessions x {args.turns} turns, cassette {args.cassette}")
+    print("=" * 70)
+
+    seconds = await generator.run(args.sessions, args.turns)
+    generator.timings["llm_ttft"] = list(replay.first_token_latencies)
+    generator.timings["llm_call"] = list(replay.call_latencies)
+    requests = args.sessions * args.turns
+
+    print_report(generator.timings)
+    print("-" * 70)
+    print(f"{requests} requests in {seconds:.2f}s -> {requests / seconds:.1f} req/s, {generator.errors} failed")
+    stats = replay.get_statistics()
+    print(f"replay stats: {stats}")
+    return 0 if generator.errors == 0 and stats["misses"] == 0 else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orchestrator load benchmark on recorded LLM responses")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--cassette", default=DEFAULT_CASSETTE_PATH)
+    parser.add_argument("--record", action="store_true", help="Record responses of --provider into the cassette")
+    parser.add_argument("--provider", default="anthropic", help="Live provider used with --record")
+    parser.add_argument("--user-id", default="loadgen", help="User whose tools (and API keys when recording) are used")
+    parser.add_argument("--prompts", help="File with one prompt per line")
+    parser.add_argument("--latency-ms", type=float, help="Fixed time to first token (default: recorded time)")
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, help="Streaming cadence (default: no streaming delay)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
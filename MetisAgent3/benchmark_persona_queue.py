@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Persona Task Queue Benchmark - leased claim_next vs. legacy poll-and-update
+
+Runs against a throwaway database in a temp directory:
+  legacy  - get_persona_tasks(status='pending') + update_task('running') polling
+            (not atomic: concurrent workers can pick the same task)
+  claim   - claim_next / complete_task from N worker threads
+  async   - N claim_next_async workers blocked on the queue while a producer
+            enqueues tasks; reports wakeup latency (enqueue -> claim)
+
+Usage:
+    python benchmark_persona_queue.py [--tasks 5000] [--workers 16]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.services.persona_service import PersonaService
+
+PERSONA_ID = "assistant"
+
+
+def enqueue(service: PersonaService, count: int):
+    for i in range(count):
+        service.create_task(PERSONA_ID, "bench", "bench", {"n": i}, priority=i % 3)
+
+
+def run_threads(label: str, workers: int, work):
+    """Run work(worker_id, claimed) on N threads; returns (claimed ids, seconds)"""
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        mine = []
+        work(worker_id, mine)
+        with lock:
+            claimed.extend(mine)
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    duplicates = sum(count - 1 for count in Counter(claimed).values() if count > 1)
+    per_second = len(claimed) / seconds if seconds else float("inf")
+    marker = "✅" if duplicates == 0 else "❌"
+    print(f"{marker} {label:<8} {len(claimed):>6} claims in {seconds:6.2f}s -> "
+          f"{per_second:>8,.0f} claims/s, {duplicates} double claims")
+    return claimed, seconds
+
+
+def bench_legacy(service: PersonaService, workers: int):
+    def work(worker_id, mine):
+        while True:
+            pending = service.get_persona_tasks(PERSONA_ID, limit=1, status="pending")
+            if not pending:
+                return
+            task = pending[0]
+            service.update_task(task.id, "running")
+            mine.append(task.id)
+            service.update_task(task.id, "completed", result={"worker": worker_id})
+
+    return run_threads("legacy", workers, work)
+
+
+def bench_claim(service: PersonaService, workers: int):
+    def work(worker_id, mine):
+        while True:
+            task = service.claim_next(PERSONA_ID, worker_id, lease_seconds=60)
+            if not task:
+                return
+            mine.append(task.id)
+            service.complete_task(task.id, worker_id, {"worker": worker_id})
+
+    return run_threads("claim", workers, work)
+
+
+async def bench_async(service: PersonaService, workers: int, tasks: int):
+    latencies = []
+    enqueued_at = {}
+    done = asyncio.Event()
+
+    async def worker(worker_id):
+        while not done.is_set():
+            task = await service.claim_next_async(PERSONA_ID, worker_id, lease_seconds=60, timeout=0.5)
+            if not task:
+                continue
+            latencies.append(time.perf_counter() - enqueued_at[task.task_data["n"]])
+            service.complete_task(task.id, worker_id)
+            if len(latencies) >= tasks:
+                done.set()
+
+    async def producer():
+        for i in range(tasks):
+            enqueued_at[i] = time.perf_counter()
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda n=i: service.create_task(PERSONA_ID, "bench", "bench", {"n": n})
+            )
+            await asyncio.sleep(0.002)
+
+    start = time.perf_counter()
+    await asyncio.gather(producer(), *(worker(f"a{i}") for i in range(workers)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"✅ async    {len(latencies):>6} claims in {seconds:6.2f}s, wakeup latency p50 {p50:.1f}ms p99 {p99:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persona task queue benchmark")
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="persona_queue_bench_")
+    print("📊 Persona task queue benchmark")
+    print(f"   {args.tasks} tasks, {args.workers} workers, db in {workdir}")
+    print("=" * 70)
+
+    legacy = PersonaService(os.path.join(workdir, "legacy.db"), pool_size=args.workers)
+    enqueue(legacy, args.tasks)
+    bench_legacy(legacy, args.workers)
+    legacy.close()
+
+    service = PersonaService(os.path.join(workdir, "queue.db"), pool_size=args.workers)
+    enqueue(service, args.tasks)
+    claimed, _ = bench_claim(service, args.workers)
+    stats = service.get_queue_stats(PERSONA_ID)
+    ok = len(set(claimed)) == args.tasks and stats.get("completed") == args.tasks
+
+    asyncio.run(bench_async(service, args.workers, min(args.tasks, 500)))
+    service.close()
+
+    print("-" * 70)
+    print(f"queue stats: {stats}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
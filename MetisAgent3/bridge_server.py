@@ -37,7 +37,7 @@ from core.services.tool_execution_service import ToolExecutionService, ToolExecu
 from core.services.settings_card_service import SettingsCardService
 from core.services.tool_card_discovery_service import ToolCardDiscoveryService
 from core.services.persona_service import PersonaService
-from core.services import IdempotencyService, ToolEventsService, ToolEventType
+from core.services import IdempotencyService, ToolEventsService, ToolEventType, get_provider_registry
 from core.orchestrator.application_orchestrator import ApplicationOrchestrator
 from core.contracts.base_types import ExecutionContext
 from core.contracts import ToolMetadata, ToolConfiguration, ToolType, CapabilityType, ToolCapability
@@ -104,6 +104,26 @@ def handle_leave_tool_events(data):
     logger.info(f"🔧 Client left tool events room: {room}")
     emit('tool_events_left', {'room': room, 'user_id': user_id})
 
+@socketio.on('join_settings_cards')
+def handle_join_settings_cards(data):
+    """Join settings room to receive background-refreshed settings cards"""
+    user_id = data.get('user_id', 'anonymous')
+    room = f"settings_{user_id}"
+    from flask_socketio import join_room, emit
+    join_room(room)
+    logger.info(f"🃏 Client joined settings cards room: {room}")
+    emit('settings_cards_joined', {'room': room, 'user_id': user_id})
+
+@socketio.on('leave_settings_cards')
+def handle_leave_settings_cards(data):
+    """Leave settings cards room"""
+    user_id = data.get('user_id', 'anonymous')
+    room = f"settings_{user_id}"
+    from flask_socketio import leave_room, emit
+    leave_room(room)
+    logger.info(f"🃏 Client left settings cards room: {room}")
+    emit('settings_cards_left', {'room': room, 'user_id': user_id})
+
 class BridgeServer:
     """Pure bridge server between React frontend and MetisAgent3 backend"""
     
@@ -164,6 +184,15 @@ class BridgeServer:
             self.card_discovery_service = ToolCardDiscoveryService()
             self.settings_card_service.set_card_discovery_service(self.card_discovery_service)
 
+            # Push background-refreshed cards to the user's settings room
+            def push_settings_card(user_id, card):
+                try:
+                    socketio.emit('settings_card_updated', {'user_id': user_id, 'card': card},
+                                  room=f"settings_{user_id}")
+                except Exception as e:
+                    logger.error(f"Settings card push error: {e}")
+            self.settings_card_service.add_card_listener(push_settings_card)
+
             # Initialize MCP Server services (idempotency, events)
             self.idempotency_service = IdempotencyService(default_ttl_seconds=3600, max_records=10000)
 
@@ -193,6 +222,11 @@ class BridgeServer:
             # Re-index classifier after all plugins are loaded
             await self.orchestrator.reindex_classifier()
 
+            # Stream command output to tool events (tool_call_output)
+            command_tool = await self.tool_manager.get_tool("command_executor")
+            if command_tool and hasattr(command_tool, "set_tool_events_service"):
+                command_tool.set_tool_events_service(self.tool_events_service)
+
             logger.info("✅ Bridge server initialized successfully")
             
         except Exception as e:
@@ -296,105 +330,78 @@ class BridgeServer:
             }
 
 # Model listing functions
-async def get_openai_models(api_key: str) -> List[str]:
-    """Get available OpenAI models for the API key"""
-    try:
-        import requests
-        
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.get(
-            "https://api.openai.com/v1/models",
-            headers=headers,
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            models_data = response.json()
-            # Filter for chat models and sort by preference
-            chat_models = []
-            model_priority = [
-                "gpt-4o-mini", "gpt-4o", "gpt-4-turbo", "gpt-4", 
-                "gpt-3.5-turbo", "gpt-3.5-turbo-16k"
-            ]
-            
-            available_models = [model["id"] for model in models_data.get("data", [])]
-            
-            # Add models in priority order if available
-            for model in model_priority:
-                if model in available_models:
-                    chat_models.append(model)
-            
-            # Add any other gpt models not in priority list
-            for model in available_models:
-                if model.startswith("gpt-") and model not in chat_models:
-                    chat_models.append(model)
-            
-            return chat_models[:10]  # Limit to 10 models
-        else:
-            logger.warning(f"OpenAI models API error: {response.status_code}")
-            return ["gpt-4o-mini"]  # Fallback
-            
-    except Exception as e:
+OPENAI_MODEL_PRIORITY = [
+    "gpt-4o-mini", "gpt-4o", "gpt-4-turbo", "gpt-4",
+    "gpt-3.5-turbo", "gpt-3.5-turbo-16k"
+]
+ANTHROPIC_FALLBACK_MODEL = "claude-3-5-sonnet-20241022"
+
+
+def _fetch_openai_models(api_key: str) -> List[str]:
+    """Chat models listed by GET /v1/models (blocking, run it in a worker thread)"""
+    import requests
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    response = requests.get("https://api.openai.com/v1/models", headers=headers, timeout=10)
+    if response.status_code != 200:
+        raise RuntimeError(f"OpenAI models API error: {response.status_code}")
+
+    available_models = [model["id"] for model in response.json().get("data", [])]
+    # Models in priority order if available, then any other gpt models
+    chat_models = [model for model in OPENAI_MODEL_PRIORITY if model in available_models]
+    chat_models += [model for model in available_models if model.startswith("gpt-") and model not in chat_models]
+    return chat_models[:10]  # Limit to 10 models
+
+
+def _fetch_anthropic_models(api_key: str) -> List[str]:
+    """Models listed by GET /v1/models, newest first (blocking, run it in a worker thread)"""
+    import requests
+
+    headers = {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01"
+    }
+    params = {"limit": 100}
+    models = []
+    while True:
+        response = requests.get("https://api.anthropic.com/v1/models", headers=headers, params=params, timeout=10)
+        if response.status_code != 200:
+            raise RuntimeError(f"Anthropic models API error: {response.status_code}")
+        page = response.json()
+        models += [model["id"] for model in page.get("data", []) if model.get("id", "").startswith("claude")]
+        if not page.get("has_more") or not page.get("last_id"):
+            break
+        params["after_id"] = page["last_id"]
+    return models[:10]  # Limit to 10 models
+
+
+async def get_openai_models(api_key: str, strict: bool = False) -> List[str]:
+    """Get available OpenAI models for the API key (strict: raise instead of falling back)"""
+    try:
+        return await asyncio.to_thread(_fetch_openai_models, api_key)
+    except Exception as e:
+        if strict:
+            raise
         logger.warning(f"Failed to get OpenAI models: {e}")
         return ["gpt-4o-mini"]  # Fallback
 
 
-async def get_anthropic_models(api_key: str) -> List[str]:
-    """Get available Anthropic models for the API key"""
+async def get_anthropic_models(api_key: str, strict: bool = False) -> List[str]:
+    """Get available Anthropic models for the API key (strict: raise instead of falling back)"""
     try:
-        # Anthropic doesn't have a models API endpoint like OpenAI
-        # We need to test with a small request to see which models work
-        import requests
-        
-        # Test models in order of preference
-        test_models = [
-            "claude-3-5-sonnet-20241022",
-            "claude-3-5-haiku-20241022", 
-            "claude-3-sonnet-20240229",
-            "claude-3-haiku-20240307",
-            "claude-3-opus-20240229"
-        ]
-        
-        available_models = []
-        
-        for model in test_models:
-            try:
-                headers = {
-                    "x-api-key": api_key,
-                    "content-type": "application/json",
-                    "anthropic-version": "2023-06-01"
-                }
-                
-                payload = {
-                    "model": model,
-                    "max_tokens": 1,
-                    "messages": [{"role": "user", "content": "test"}]
-                }
-                
-                response = requests.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=5
-                )
-                
-                if response.status_code in [200, 400]:  # 400 might be rate limit but model exists
-                    available_models.append(model)
-                    if len(available_models) >= 3:  # Don't test all models, save API calls
-                        break
-                        
-            except Exception:
-                continue
-        
-        return available_models if available_models else ["claude-3-5-sonnet-20241022"]
-        
+        # Listing models is free; no chat requests are sent to probe them
+        models = await asyncio.to_thread(_fetch_anthropic_models, api_key)
+        if not models:
+            raise RuntimeError("Anthropic models API returned no Claude models")
+        return models
     except Exception as e:
+        if strict:
+            raise
         logger.warning(f"Failed to get Anthropic models: {e}")
-        return ["claude-3-5-sonnet-20241022"]  # Fallback
+        return [ANTHROPIC_FALLBACK_MODEL]  # Fallback
 
 
 async def check_lmstudio_available() -> bool:
@@ -424,6 +431,28 @@ async def check_lmstudio_available() -> bool:
         return False
 
 
+async def get_lmstudio_models(api_key: Optional[str] = None) -> List[str]:
+    """Configured LMStudio models, if the LMStudio server is reachable"""
+    if not await check_lmstudio_available():
+        raise ConnectionError("LMStudio server not reachable")
+    from core.tools.llm_tool import LLMTool
+    return LLMTool().providers.get("lmstudio", {}).get("models", [])
+
+
+# Model discovery runs in the provider registry's background loop;
+# /api/providers only reads the discovered snapshots
+provider_registry = get_provider_registry()
+provider_registry.register_fetcher("openai", lambda api_key: get_openai_models(api_key, strict=True))
+provider_registry.register_fetcher("anthropic", lambda api_key: get_anthropic_models(api_key, strict=True))
+provider_registry.register_fetcher("lmstudio", get_lmstudio_models)
+
+PROVIDER_DISPLAY = [
+    ("openai", "OpenAI", "gpt-4o-mini"),
+    ("anthropic", "Anthropic", "claude-3-5-sonnet-20241022"),
+    ("lmstudio", "LMStudio (Local)", "google/gemma-3n-e4b"),
+]
+
+
 # Global bridge server instance
 bridge = BridgeServer()
 
@@ -493,57 +522,33 @@ def get_providers():
                 
                 providers = []
                 
-                # Check OpenAI
-                openai_key = await llm_tool._get_api_key(actual_user_id, "openai")
-                if openai_key:
-                    openai_models = await get_openai_models(openai_key)
-                    providers.append({
-                        "id": "openai",
-                        "name": "OpenAI", 
-                        "available": len(openai_models) > 0,
-                        "models": openai_models,
-                        "default_model": openai_models[0] if openai_models else "gpt-4o-mini"
-                    })
-                else:
-                    providers.append({
-                        "id": "openai",
-                        "name": "OpenAI",
-                        "available": False,
-                        "models": [],
-                        "default_model": "gpt-4o-mini"
-                    })
-                
-                # Check Anthropic
-                anthropic_key = await llm_tool._get_api_key(actual_user_id, "anthropic")
-                if anthropic_key:
-                    anthropic_models = await get_anthropic_models(anthropic_key)
-                    providers.append({
-                        "id": "anthropic",
-                        "name": "Anthropic",
-                        "available": len(anthropic_models) > 0,
-                        "models": anthropic_models,
-                        "default_model": anthropic_models[0] if anthropic_models else "claude-3-5-sonnet-20241022"
-                    })
-                else:
+                # Models come from the provider registry (memory read); only a
+                # key seen for the first time waits for model discovery
+                for provider_id, name, fallback_model in PROVIDER_DISPLAY:
+                    api_key = await llm_tool._get_api_key(actual_user_id, provider_id)
+                    if not api_key and llm_tool.providers[provider_id]['api_key_name'] is not None:
+                        providers.append({
+                            "id": provider_id,
+                            "name": name,
+                            "available": False,
+                            "models": [],
+                            "default_model": fallback_model
+                        })
+                        continue
+
+                    snapshot = await provider_registry.get_snapshot(provider_id, api_key)
+                    models = snapshot.model_ids if snapshot.available else []
                     providers.append({
-                        "id": "anthropic",
-                        "name": "Anthropic",
-                        "available": False,
-                        "models": [],
-                        "default_model": "claude-3-5-sonnet-20241022"
+                        "id": provider_id,
+                        "name": name,
+                        "available": snapshot.available,
+                        "models": models,
+                        "default_model": fallback_model if provider_id == "lmstudio" or not models else models[0],
+                        "model_info": [model.to_dict() for model in snapshot.models],
+                        "refreshed_at": snapshot.refreshed_at,
+                        "error": snapshot.error
                     })
 
-                # Check LMStudio (local, no API key needed)
-                lmstudio_available = await check_lmstudio_available()
-                lmstudio_models = llm_tool.providers.get("lmstudio", {}).get("models", [])
-                providers.append({
-                    "id": "lmstudio",
-                    "name": "LMStudio (Local)",
-                    "available": lmstudio_available,
-                    "models": lmstudio_models if lmstudio_available else [],
-                    "default_model": "google/gemma-3n-e4b"
-                })
-
                 return {
                     "success": True,
                     "data": providers
@@ -1788,6 +1793,9 @@ def google_oauth2_callback():
             success, message = loop.run_until_complete(store_token())
             loop.close()
             
+            # Stored token bypasses the execution service, drop cached OAuth status
+            bridge.tool_execution_service.invalidate_cached_results('google_tool', user_id=actual_user_id)
+            
             if success:
                 logger.info(f"✅ OAuth2 tokens stored successfully for user {actual_user_id}")
                 status_class = "success"
@@ -1953,7 +1961,10 @@ def install_plugin(plugin_name):
                         input_schema=cap_data.get("input_schema", {}),
                         output_schema=cap_data.get("output_schema", {}),
                         required_permissions=cap_data.get("required_permissions", []),
-                        examples=cap_data.get("examples", [])
+                        examples=cap_data.get("examples", []),
+                        cache_ttl_seconds=cap_data.get("cache_ttl_seconds"),
+                        cache_actions=cap_data.get("cache_actions", []),
+                        cache_scope=cap_data.get("cache_scope", "user")
                     )
                     capabilities.append(capability)
                 
@@ -2610,6 +2621,8 @@ def save_api_key(provider):
             
         async def save_key():
             try:
+                from core.tools.llm_tool import LLMTool
+
                 # Map provider to storage key name
                 provider_key_map = {
                     'openai': 'api_key_openai',
@@ -2620,7 +2633,11 @@ def save_api_key(provider):
                     return {"success": False, "error": f"Provider '{provider}' not supported"}
                 
                 key_name = provider_key_map[provider]
+                old_key = await LLMTool(storage=bridge.storage)._get_api_key(actual_user_id, provider)
                 await bridge.storage.set_user_attribute(actual_user_id, key_name, api_key)
+                if old_key and old_key != api_key:
+                    # Stop background discovery for the replaced key
+                    provider_registry.forget(provider, old_key)
                 
                 return {"success": True, "message": f"{provider.title()} API key saved"}
                 
@@ -2658,6 +2675,8 @@ def delete_api_key(provider):
             
         async def delete_key():
             try:
+                from core.tools.llm_tool import LLMTool
+
                 # Map provider to storage key name
                 provider_key_map = {
                     'openai': 'api_key_openai',
@@ -2668,7 +2687,11 @@ def delete_api_key(provider):
                     return {"success": False, "error": f"Provider '{provider}' not supported"}
                 
                 key_name = provider_key_map[provider]
+                old_key = await LLMTool(storage=bridge.storage)._get_api_key(actual_user_id, provider)
                 await bridge.storage.delete_user_attribute(actual_user_id, key_name)
+                if old_key:
+                    # Stop background discovery for the deleted key
+                    provider_registry.forget(provider, old_key)
                 
                 return {"success": True, "message": f"{provider.title()} API key deleted"}
                 
@@ -2714,13 +2737,11 @@ def test_api_key(provider):
                 if not api_key:
                     return {"success": False, "error": f"No API key found for {provider}"}
                 
-                # Test the key by getting models
-                if provider == 'openai':
-                    models = await get_openai_models(api_key)
-                elif provider == 'anthropic':
-                    models = await get_anthropic_models(api_key)
-                else:
+                # Test the key by rediscovering its models (also refreshes /api/providers)
+                if provider not in ('openai', 'anthropic'):
                     return {"success": False, "error": f"Provider '{provider}' not supported"}
+                snapshot = await provider_registry.refresh(provider, api_key)
+                models = snapshot.model_ids if snapshot.available else []
                 
                 if len(models) > 0:
                     return {
@@ -3078,6 +3099,8 @@ def google_oauth_logout():
         result = loop.run_until_complete(revoke_oauth())
         loop.close()
         
+        bridge.tool_execution_service.invalidate_cached_results('google_tool', user_id=actual_user_id)
+        
         return jsonify(result)
         
     except Exception as e:
@@ -3406,6 +3429,39 @@ def get_idempotency_stats():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/api/services/tool-cache/stats', methods=['GET'])
+def get_tool_cache_stats():
+    """Get read-only tool result cache statistics"""
+    try:
+        if not bridge.is_ready():
+            return jsonify({"success": False, "error": "Bridge server not ready"}), 503
+
+        stats = bridge.tool_execution_service.result_cache.get_statistics()
+
+        return jsonify({
+            "success": True,
+            "statistics": stats
+        })
+
+    except Exception as e:
+        logger.error(f"Get tool cache stats error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/services/providers/stats', methods=['GET'])
+def get_provider_registry_stats():
+    """Get provider registry statistics"""
+    try:
+        return jsonify({
+            "success": True,
+            "statistics": provider_registry.get_statistics()
+        })
+
+    except Exception as e:
+        logger.error(f"Get provider registry stats error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 # Settings Cards Endpoints
 @app.route('/api/settings/cards', methods=['GET'])
 def get_settings_cards():
@@ -3425,6 +3481,8 @@ def get_settings_cards():
         
         # Get category filter from query params
         category = request.args.get('category', 'all')
+        # refresh=true waits for expired cards instead of serving them stale
+        wait_for_fresh = request.args.get('refresh', 'false').lower() in ('1', 'true', 'yes')
         
         async def get_cards():
             """Get settings cards asynchronously"""
@@ -3435,7 +3493,7 @@ def get_settings_cards():
                 )
                 bridge._cards_discovered = True
             
-            return await bridge.settings_card_service.get_user_cards(actual_user_id, category)
+            return await bridge.settings_card_service.get_user_cards(actual_user_id, category, wait_for_fresh)
         
         # Execute card retrieval
         loop = asyncio.new_event_loop()
@@ -3693,7 +3751,10 @@ async def load_single_plugin(plugin_name):
                 input_schema=cap_data.get("input_schema", {}),
                 output_schema=cap_data.get("output_schema", {}),
                 required_permissions=cap_data.get("required_permissions", []),
-                examples=cap_data.get("examples", [])
+                examples=cap_data.get("examples", []),
+                cache_ttl_seconds=cap_data.get("cache_ttl_seconds"),
+                cache_actions=cap_data.get("cache_actions", []),
+                cache_scope=cap_data.get("cache_scope", "user")
             )
             capabilities.append(capability)
 
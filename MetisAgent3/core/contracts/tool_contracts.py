@@ -54,6 +54,9 @@ class ToolCapability(BaseModel):
     requires_confirmation: bool = False
     is_idempotent: bool = False  # Safe to retry without side effects
     side_effects: List[str] = Field(default_factory=list)  # What this capability modifies
+    cache_ttl_seconds: Optional[int] = None  # Read-only result cache TTL, None = never cached
+    cache_actions: List[str] = Field(default_factory=list)  # Actions the TTL applies to, empty = all
+    cache_scope: str = "user"  # Who shares a cached result: user, app or company
 
     class Config:
         frozen = True
@@ -11,7 +11,7 @@ CLAUDE.md COMPLIANT:
 import asyncio
 import json
 import subprocess
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 from datetime import datetime
 from pathlib import Path
 import logging
@@ -149,6 +149,9 @@ class GraphMemoryService(IMemoryService, IGraphService, IConversationService):
         self._user_tools_cache: Dict[str, List[Dict[str, Any]]] = {}
         self._cache_timestamps: Dict[str, datetime] = {}
         self._cache_ttl_seconds = 300  # 5 minutes cache TTL
+
+        # Called with the tool name whenever a tool's capabilities are (re)synced
+        self._tool_listeners: List[Callable[[str], None]] = []
         
         # Initialize MCP client if server command provided
         if mcp_server_command:
@@ -178,6 +181,16 @@ class GraphMemoryService(IMemoryService, IGraphService, IConversationService):
             self._user_tools_cache.pop(key, None)
             self._cache_timestamps.pop(key, None)
     
+    def add_tool_listener(self, callback: Callable[[str], None]):
+        """Register a callback invoked with the tool name after each capability sync"""
+        if callback not in self._tool_listeners:
+            self._tool_listeners.append(callback)
+
+    def remove_tool_listener(self, callback: Callable[[str], None]):
+        """Unregister a tool sync callback"""
+        if callback in self._tool_listeners:
+            self._tool_listeners.remove(callback)
+
     async def initialize(self):
         """Initialize the memory service"""
         if self.mcp_client:
@@ -250,6 +263,11 @@ class GraphMemoryService(IMemoryService, IGraphService, IConversationService):
             
             # Invalidate cache since tools changed
             self._invalidate_user_cache(user_id)
+            for listener in list(self._tool_listeners):
+                try:
+                    listener(metadata.name)
+                except Exception as e:
+                    logger.warning(f"Tool sync listener failed for {metadata.name}: {e}")
             
             logger.info(f"Synced tool {metadata.name} capabilities to memory")
             return True
@@ -45,6 +45,9 @@ from ..interfaces import (
 
 logger = logging.getLogger(__name__)
 
+# Anthropic accepts at most 4 cache_control breakpoints per request
+ANTHROPIC_MAX_CACHE_BREAKPOINTS = 4
+
 
 class LLMService(ILLMService):
     """Production LLM service with real API integration"""
@@ -60,7 +63,8 @@ class LLMService(ILLMService):
         self._provider_defaults = {
             'openai': 'gpt-4o-mini',
             'anthropic': 'claude-3-7-sonnet-latest',
-            'lmstudio': 'google/gemma-3n-e4b'
+            'lmstudio': 'google/gemma-3n-e4b',
+            'replay': 'replay'  # Recorded responses (load tests), see llm_replay_service
         }
 
         # Import LLM tool for real API calls with storage injection
@@ -70,6 +74,12 @@ class LLMService(ILLMService):
         # Conversation service for history (lazy init)
         self._conversation_service = None
 
+        # Prompt strategy for segmented prompts and cache accounting (lazy init)
+        self._prompt_strategy = None
+
+        # Provider capability registry for model routing (lazy init)
+        self._provider_registry = None
+
         # Express Mode cache for performance
         self._express_cache: Dict[str, bool] = {}
         self._express_cache_timestamps: Dict[str, datetime] = {}
@@ -82,6 +92,120 @@ class LLMService(ILLMService):
             self._conversation_service = ConversationService()
         return self._conversation_service
 
+    @property
+    def prompt_strategy(self):
+        """PromptStrategyService used for segmented prompts and cache statistics"""
+        if self._prompt_strategy is None:
+            from ..services.prompt_strategy_service import PromptStrategyService
+            self._prompt_strategy = PromptStrategyService()
+        return self._prompt_strategy
+
+    @prompt_strategy.setter
+    def prompt_strategy(self, service):
+        self._prompt_strategy = service
+
+    @property
+    def provider_registry(self):
+        """ProviderRegistryService with the discovered models of each provider key"""
+        if self._provider_registry is None:
+            from ..services.provider_registry_service import get_provider_registry
+            self._provider_registry = get_provider_registry()
+        return self._provider_registry
+
+    @provider_registry.setter
+    def provider_registry(self, registry):
+        self._provider_registry = registry
+
+    async def pick_model(self, task_class: str, budget: Optional[float] = None, context: Optional[ExecutionContext] = None, providers: Optional[List[str]] = None):
+        """
+        Route a task class to a model among the user's providers.
+
+        Only models already in the provider registry are considered; keys
+        not discovered yet are scheduled for background discovery, so this
+        never waits on a provider API. Returns a ModelChoice or None.
+        """
+        user_id = context.user_id if context else "system"
+        snapshots = []
+        for provider in providers or ([self.current_provider] if self.current_provider else []):
+            if provider not in self.llm_tool.providers:
+                continue
+            api_key = await self.llm_tool._get_api_key(user_id, provider)
+            if not api_key and self.llm_tool.providers[provider]['api_key_name'] is not None:
+                continue
+            snapshot = await self.provider_registry.get_snapshot(provider, api_key, wait=False)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        return self.provider_registry.pick_model(task_class, budget=budget, snapshots=snapshots)
+
+    def _segments_to_anthropic_system(self, prompt) -> List[Dict[str, Any]]:
+        """
+        Map the stable prefix of a SegmentedPrompt to Anthropic system blocks.
+
+        One text block per segment; cache_control breakpoints go on the last
+        cacheable blocks (at most ANTHROPIC_MAX_CACHE_BREAKPOINTS), so each
+        breakpoint caches everything up to and including its segment.
+        """
+        segments = prompt.cacheable_segments
+        separator = prompt.SEPARATOR
+        blocks = [
+            {"type": "text", "text": segment.content + separator}
+            for segment in segments
+        ]
+        for block in blocks[-ANTHROPIC_MAX_CACHE_BREAKPOINTS:]:
+            block["cache_control"] = {"type": "ephemeral"}
+        return blocks
+
+    def _segments_to_chat_input(self, prompt, provider: str) -> Dict[str, Any]:
+        """
+        Build llm_tool chat input from a SegmentedPrompt.
+
+        Stable segments become the system prompt and volatile segments the
+        user message. OpenAI-compatible providers cache byte-identical
+        prefixes automatically, so keeping the stable part first is enough;
+        Anthropic needs explicit cache_control breakpoints.
+        """
+        chat_input = {"message": prompt.volatile_text or prompt.text}
+        if not prompt.cacheable_segments or not prompt.volatile_segments:
+            return chat_input
+        if provider == "anthropic":
+            chat_input["system_blocks"] = self._segments_to_anthropic_system(prompt)
+        else:
+            chat_input["system_prompt"] = prompt.prefix_text
+        return chat_input
+
+    async def generate_from_segments(self, prompt, max_tokens: int = 1000, context: Optional[ExecutionContext] = None, provider: str = None, model: str = None) -> str:
+        """
+        Generate text from a SegmentedPrompt with provider prompt caching.
+
+        Cache read/write token counts from the response are recorded in
+        prompt_strategy.get_prompt_statistics().
+        """
+        try:
+            selected_provider = provider or self.current_provider
+            if not selected_provider:
+                raise ValueError("No LLM provider selected. User must choose a provider.")
+            selected_model = model or self._provider_defaults.get(selected_provider, self.default_model)
+
+            llm_context = context or ExecutionContext(user_id="system", session_id="reasoning")
+            chat_input = self._segments_to_chat_input(prompt, selected_provider)
+            chat_input.update({
+                "provider": selected_provider,
+                "model": selected_model,
+                "conversation_id": f"internal_{uuid4()}"
+            })
+            result = await self.llm_tool.execute("chat", chat_input, llm_context)
+
+            if result.success:
+                self.prompt_strategy.record_usage(selected_provider, result.data.get("usage", {}))
+                return result.data["response"]
+
+            logger.error(f"LLM segmented generation failed: {result.error}")
+            return f"I apologize, but I'm experiencing technical difficulties. Please try again later."
+
+        except Exception as e:
+            logger.error(f"LLM segmented generation failed: {e}")
+            return f"Error generating response: {str(e)}"
+
     async def _get_conversation_history(self, context: ExecutionContext, limit: int = 5) -> str:
         """Get formatted conversation history for context"""
         if not context or not context.user_id or not context.conversation_id:
@@ -384,7 +508,8 @@ JSON format:
             # ALWAYS use unique conversation_id for internal LLM calls
             # Using real conversation_id causes context_length_exceeded from accumulated history
             unique_express_cid = f"express_{uuid4()}"
-            quick_model = self._provider_defaults.get(selected_provider, self.current_model)
+            choice = await self.pick_model("classify", context=llm_context, providers=[selected_provider])
+            quick_model = choice.model if choice else self._provider_defaults.get(selected_provider, self.current_model)
             result = await self.llm_tool.execute("chat", {
                 "message": quick_prompt,
                 "provider": selected_provider,
@@ -541,6 +541,7 @@ class ToolManager(IToolManager, IToolExecutor, IToolHealth):
         self.circuit_breakers: Dict[str, CircuitBreaker] = {}
         self.metrics: Dict[str, Dict[str, Any]] = {}
         self.health_status: Dict[str, HealthStatus] = {}
+        self.last_passive_success: Dict[str, datetime] = {}  # Last real call that reached the tool
         self.graph_memory = graph_memory_service
         self.startup_time = datetime.now()  # Track system startup time
         self._lock = asyncio.Lock()
@@ -938,6 +939,9 @@ class ToolManager(IToolManager, IToolExecutor, IToolHealth):
             
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
             
+            # Tool answered: passive health evidence, lets the next sweep skip it
+            self.last_passive_success[request.tool_name] = datetime.now()
+            
             # Update metrics and circuit breaker
             await self._update_metrics(request.tool_name, execution_time, result.success)
             
@@ -1049,12 +1053,39 @@ class ToolManager(IToolManager, IToolExecutor, IToolHealth):
             self.health_status[tool_name] = error_health
             return error_health
     
-    async def check_all_tools_health(self) -> Dict[str, HealthStatus]:
-        """Check health of all loaded tools"""
-        health_results = {}
-        for tool_name in self.tools:
-            health_results[tool_name] = await self.check_tool_health(tool_name)
-        return health_results
+    async def check_all_tools_health(self, max_concurrency: int = 8, probe_timeout: float = 10.0,
+                                     passive_window_seconds: float = 60.0) -> Dict[str, HealthStatus]:
+        """Check health of all loaded tools concurrently
+        
+        Probes run under a concurrency cap with a per-probe timeout, so a few dead
+        tools no longer serialize the sweep. Tools that served a real call within
+        ``passive_window_seconds`` keep their current status without a probe.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        now = datetime.now()
+        
+        async def probe(tool_name: str) -> HealthStatus:
+            last_ok = self.last_passive_success.get(tool_name)
+            current = self.health_status.get(tool_name)
+            if last_ok and current and current.healthy and \
+                    (now - last_ok).total_seconds() < passive_window_seconds:
+                return current
+            
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self.check_tool_health(tool_name), timeout=probe_timeout)
+                except asyncio.TimeoutError:
+                    timeout_health = HealthStatus(
+                        healthy=False,
+                        component=tool_name,
+                        message=f"Health check timeout after {probe_timeout}s"
+                    )
+                    self.health_status[tool_name] = timeout_health
+                    return timeout_health
+        
+        tool_names = list(self.tools)
+        results = await asyncio.gather(*(probe(name) for name in tool_names))
+        return dict(zip(tool_names, results))
     
     async def get_tool_metrics(self, tool_name: str) -> Dict[str, Any]:
         """Get performance metrics for tool"""
@@ -24,14 +24,56 @@ from .tool_events_service import (
     ToolEventsService
 )
 
+from .connection_pool import ConnectionPool
+
+from .process_engine import (
+    OutputChunk,
+    ProcessResult,
+    ProcessTimeout,
+    ProcessEngine,
+    get_process_engine
+)
+
+from .plugin_security_scanner import (
+    SecurityFinding,
+    PluginSecurityScanner,
+    scan_source
+)
+
+from .tool_result_cache import (
+    ToolResultCache,
+    cache_tenant,
+    classify_operation,
+    tenant_scopes
+)
+
 from .prompt_strategy_service import (
     PromptSection,
+    PromptSegment,
+    SegmentedPrompt,
     PolicyPrompt,
     DomainPrompt,
     TaskPrompt,
     PromptStrategyService
 )
 
+from .provider_registry_service import (
+    ModelInfo,
+    ModelChoice,
+    ProviderSnapshot,
+    ProviderRegistryService,
+    get_provider_registry
+)
+
+from .llm_replay_service import (
+    CassetteRecord,
+    LLMCassette,
+    ReplaySettings,
+    LLMReplayService,
+    configure_replay,
+    get_replay_service
+)
+
 __all__ = [
     # Idempotency
     "IdempotencyService",
@@ -50,10 +92,48 @@ __all__ = [
     "ToolEvent",
     "ToolEventsService",
 
+    # SQLite Connection Pool
+    "ConnectionPool",
+
+    # Process Engine
+    "OutputChunk",
+    "ProcessResult",
+    "ProcessTimeout",
+    "ProcessEngine",
+    "get_process_engine",
+
+    # Plugin Security Scanner
+    "SecurityFinding",
+    "PluginSecurityScanner",
+    "scan_source",
+
+    # Tool Result Cache
+    "ToolResultCache",
+    "cache_tenant",
+    "classify_operation",
+    "tenant_scopes",
+
     # Prompt Strategy
     "PromptSection",
+    "PromptSegment",
+    "SegmentedPrompt",
     "PolicyPrompt",
     "DomainPrompt",
     "TaskPrompt",
-    "PromptStrategyService"
+    "PromptStrategyService",
+
+    # Provider Registry
+    "ModelInfo",
+    "ModelChoice",
+    "ProviderSnapshot",
+    "ProviderRegistryService",
+    "get_provider_registry",
+
+    # LLM Record/Replay
+    "CassetteRecord",
+    "LLMCassette",
+    "ReplaySettings",
+    "LLMReplayService",
+    "configure_replay",
+    "get_replay_service"
 ]
@@ -16,8 +16,10 @@ Security Layers:
 import os
 import re
 import logging
+import threading
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -25,6 +27,9 @@ from ..contracts.tool_envelope import RiskLevel, ConfirmationPolicy
 
 logger = logging.getLogger(__name__)
 
+# Max (mode, operation, resolved path) decisions kept in the LRU cache
+DECISION_CACHE_SIZE = 4096
+
 
 class ComputerMode(str, Enum):
     """Security mode for computer tools"""
@@ -120,6 +125,97 @@ class RestrictedModeConfig:
     })
 
 
+class CompiledPatternList:
+    """
+    Ordered pattern list compiled into one combined regex gate.
+
+    The combined regex answers "does anything match?" in a single pass; only
+    on a hit are the individual patterns scanned in their original order, so
+    the reported pattern is the same one a linear scan would have found.
+    Patterns that cannot be merged safely (capturing groups / backreferences)
+    or that fail to compile as regexes are checked on their own; invalid
+    regexes fall back to substring matching when ``substring_fallback`` is set.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]], anchored: bool, substring_fallback: bool = False):
+        self.anchored = anchored
+        self._entries: List[Tuple[str, Union[re.Pattern, str]]] = []
+        self._standalone: List[Union[re.Pattern, str]] = []
+        mergeable: List[str] = []
+
+        for source, regex in patterns:
+            try:
+                compiled = re.compile(regex)
+            except re.error:
+                if not substring_fallback:
+                    raise
+                self._entries.append((source, regex))
+                self._standalone.append(regex)
+                continue
+            self._entries.append((source, compiled))
+            if compiled.groups:
+                self._standalone.append(compiled)
+            else:
+                mergeable.append(regex)
+
+        self._gate: Optional[re.Pattern] = None
+        if mergeable:
+            combined = "|".join(f"(?:{regex})" for regex in mergeable)
+            try:
+                self._gate = re.compile(rf"\A(?:{combined})" if anchored else combined)
+            except re.error:
+                # e.g. inline global flags that are only legal at the start of a pattern
+                self._standalone = [compiled for _, compiled in self._entries]
+
+    def _hit(self, matcher: Union[re.Pattern, str], text: str) -> bool:
+        if isinstance(matcher, str):
+            return matcher in text
+        return bool(matcher.match(text) if self.anchored else matcher.search(text))
+
+    def first_match(self, text: str) -> Optional[str]:
+        """Return the first pattern (in list order) matching ``text``, or None"""
+        gate_hit = self._gate is not None and self._hit(self._gate, text)
+        if not gate_hit and not any(self._hit(m, text) for m in self._standalone):
+            return None
+        for source, matcher in self._entries:
+            if self._hit(matcher, text):
+                return source
+        return None
+
+
+class CompiledPolicy:
+    """
+    RestrictedModeConfig compiled for fast checks.
+
+    Path patterns keep their historic glob semantics: ``~`` is expanded,
+    ``*`` becomes ``.*`` and the result is matched as a regex anchored at
+    the start of the resolved path (substring match if it is not a valid
+    regex). URL patterns are searched anywhere in the URL.
+    """
+
+    def __init__(self, config: RestrictedModeConfig):
+        self.denied_paths = CompiledPatternList(
+            ((p, self.glob_to_regex(p)) for p in config.denied_paths),
+            anchored=True, substring_fallback=True
+        )
+        self.allowed_paths = CompiledPatternList(
+            ((p, self.glob_to_regex(p)) for p in config.allowed_paths),
+            anchored=True, substring_fallback=True
+        )
+        self.denied_urls = CompiledPatternList(
+            ((p, p) for p in config.denied_url_patterns), anchored=False
+        )
+        self.allowed_urls = CompiledPatternList(
+            ((p, p) for p in config.allowed_url_patterns), anchored=False
+        )
+        self.denied_extensions = frozenset(config.denied_extensions)
+
+    @staticmethod
+    def glob_to_regex(pattern: str) -> str:
+        """Convert a path pattern to the regex source used for matching"""
+        return os.path.expanduser(pattern).replace("*", ".*")
+
+
 class ComputerSecurityService:
     """
     Service for enforcing security modes on computer tools.
@@ -138,16 +234,25 @@ class ComputerSecurityService:
     ):
         self.mode = mode
         self.config = config or RestrictedModeConfig()
+        self._decision_cache: "OrderedDict[Tuple[str, str, str], Tuple[OperationResult, Optional[str]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
         self._compile_patterns()
 
     def _compile_patterns(self):
-        """Compile regex patterns for URL matching"""
-        self._allowed_url_patterns = [
-            re.compile(p) for p in self.config.allowed_url_patterns
-        ]
-        self._denied_url_patterns = [
-            re.compile(p) for p in self.config.denied_url_patterns
-        ]
+        """Compile path and URL rules of the config into a policy"""
+        self._policy = CompiledPolicy(self.config)
+        with self._cache_lock:
+            self._decision_cache.clear()
+
+    def update_config(self, config: RestrictedModeConfig):
+        """Replace restricted mode config and recompile the policy"""
+        self.config = config
+        self._compile_patterns()
+
+    def reload_policy(self):
+        """Recompile after the config object was mutated in place"""
+        self._compile_patterns()
 
     def set_mode(self, mode: ComputerMode):
         """Set security mode"""
@@ -191,6 +296,32 @@ class ComputerSecurityService:
         # Mode: RESTRICTED - apply rules
         return self._check_restricted_file_operation(operation, file_path, file_size)
 
+    def check_file_operations(
+        self,
+        operation: str,
+        file_paths: Iterable[str],
+        file_sizes: Optional[Dict[str, int]] = None
+    ) -> Dict[str, SecurityCheckResult]:
+        """
+        Check one operation against many files (e.g. directory listings, bulk edits).
+
+        Args:
+            operation: Operation type applied to every path
+            file_paths: Paths to check
+            file_sizes: Optional {path: size} for write operations
+
+        Returns:
+            {file_path: SecurityCheckResult} in input order
+        """
+        file_sizes = file_sizes or {}
+        results: Dict[str, SecurityCheckResult] = {}
+        for file_path in file_paths:
+            if file_path not in results:
+                results[file_path] = self.check_file_operation(
+                    operation, file_path, file_sizes.get(file_path)
+                )
+        return results
+
     def _check_restricted_file_operation(
         self,
         operation: str,
@@ -198,39 +329,13 @@ class ComputerSecurityService:
         file_size: Optional[int]
     ) -> SecurityCheckResult:
         """Check file operation in restricted mode"""
-        path = Path(file_path).resolve()
-        path_str = str(path)
+        # Resolved on every call on purpose: caching symlink resolution would let
+        # a swapped link slip past the denied list. Decisions are keyed on the result.
+        path_str = str(Path(file_path).resolve())
+        result, reason = self._path_decision(operation, path_str)
 
-        # Check denied paths first (blacklist)
-        for denied in self.config.denied_paths:
-            if self._path_matches(path_str, denied):
-                return SecurityCheckResult(
-                    allowed=False,
-                    result=OperationResult.DENIED,
-                    reason=f"Path is in denied list: {denied}"
-                )
-
-        # Check denied extensions
-        if path.suffix.lower() in self.config.denied_extensions:
-            return SecurityCheckResult(
-                allowed=False,
-                result=OperationResult.DENIED,
-                reason=f"File extension not allowed: {path.suffix}"
-            )
-
-        # Check allowed paths (whitelist)
-        path_allowed = False
-        for allowed in self.config.allowed_paths:
-            if self._path_matches(path_str, allowed):
-                path_allowed = True
-                break
-
-        if not path_allowed:
-            return SecurityCheckResult(
-                allowed=False,
-                result=OperationResult.DENIED,
-                reason="Path not in allowed list"
-            )
+        if result is OperationResult.DENIED:
+            return SecurityCheckResult(allowed=False, result=result, reason=reason)
 
         # Check file size for write operations
         if operation in ("write", "write_file") and file_size:
@@ -242,7 +347,7 @@ class ComputerSecurityService:
                 )
 
         # Check if operation requires confirmation
-        if operation in self.config.confirmation_operations:
+        if result is OperationResult.REQUIRES_CONFIRMATION:
             return SecurityCheckResult(
                 allowed=True,
                 result=OperationResult.REQUIRES_CONFIRMATION,
@@ -258,17 +363,46 @@ class ComputerSecurityService:
             risk_level=RiskLevel.LOW
         )
 
-    def _path_matches(self, path: str, pattern: str) -> bool:
-        """Check if path matches a pattern (supports * wildcards)"""
-        # Expand ~ to home directory
-        pattern = os.path.expanduser(pattern)
+    def _path_decision(self, operation: str, path_str: str) -> Tuple[OperationResult, Optional[str]]:
+        """Size-independent decision for a resolved path, memoized in an LRU"""
+        key = (self.mode.value, operation, path_str)
+        with self._cache_lock:
+            cached = self._decision_cache.get(key)
+            if cached is not None:
+                self._decision_cache.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                return cached
+            self.cache_stats["misses"] += 1
+
+        decision = self._evaluate_path(operation, path_str)
+
+        with self._cache_lock:
+            self._decision_cache[key] = decision
+            if len(self._decision_cache) > DECISION_CACHE_SIZE:
+                self._decision_cache.popitem(last=False)
+        return decision
+
+    def _evaluate_path(self, operation: str, path_str: str) -> Tuple[OperationResult, Optional[str]]:
+        """Apply denied paths, denied extensions and allowed paths to a resolved path"""
+        policy = self._policy
 
-        # Convert glob-style to regex
-        regex_pattern = pattern.replace("*", ".*")
-        try:
-            return bool(re.match(regex_pattern, path))
-        except re.error:
-            return pattern in path
+        # Check denied paths first (blacklist)
+        denied = policy.denied_paths.first_match(path_str)
+        if denied is not None:
+            return OperationResult.DENIED, f"Path is in denied list: {denied}"
+
+        # Check denied extensions
+        suffix = Path(path_str).suffix
+        if suffix.lower() in policy.denied_extensions:
+            return OperationResult.DENIED, f"File extension not allowed: {suffix}"
+
+        # Check allowed paths (whitelist)
+        if policy.allowed_paths.first_match(path_str) is None:
+            return OperationResult.DENIED, "Path not in allowed list"
+
+        if operation in self.config.confirmation_operations:
+            return OperationResult.REQUIRES_CONFIRMATION, None
+        return OperationResult.ALLOWED, None
 
     def check_browser_operation(
         self,
@@ -312,22 +446,16 @@ class ComputerSecurityService:
     ) -> SecurityCheckResult:
         """Check browser operation in restricted mode"""
         # Check denied patterns first
-        for pattern in self._denied_url_patterns:
-            if pattern.search(url):
-                return SecurityCheckResult(
-                    allowed=False,
-                    result=OperationResult.DENIED,
-                    reason=f"URL matches denied pattern: {pattern.pattern}"
-                )
+        denied = self._policy.denied_urls.first_match(url)
+        if denied is not None:
+            return SecurityCheckResult(
+                allowed=False,
+                result=OperationResult.DENIED,
+                reason=f"URL matches denied pattern: {denied}"
+            )
 
         # Check allowed patterns
-        url_allowed = False
-        for pattern in self._allowed_url_patterns:
-            if pattern.search(url):
-                url_allowed = True
-                break
-
-        if not url_allowed:
+        if self._policy.allowed_urls.first_match(url) is None:
             return SecurityCheckResult(
                 allowed=False,
                 result=OperationResult.DENIED,
@@ -421,7 +549,8 @@ class ComputerSecurityService:
             "allowed_extensions": list(self.config.allowed_extensions),
             "denied_extensions": list(self.config.denied_extensions),
             "max_file_size": self.config.max_file_size,
-            "confirmation_operations": list(self.config.confirmation_operations)
+            "confirmation_operations": list(self.config.confirmation_operations),
+            "decision_cache": {"size": len(self._decision_cache), **self.cache_stats}
         }
 
 
@@ -0,0 +1,342 @@
+"""
+LLM Replay Service - Record/Replay LLM Provider for Deterministic Load Tests
+
+Records real provider responses into a local cassette and serves them back
+through the "replay" provider of LLMTool, so orchestrator benchmarks run
+without OpenAI/Anthropic/LM Studio and give reproducible latency numbers.
+
+Features:
+- Requests identified by a fingerprint of the conversation (roles and
+  content; UUIDs and timestamps normalized, provider/model excluded), so a
+  cassette recorded with any provider replays for any model
+- Cassettes are JSON lines files; repeated identical requests replay their
+  recorded responses in order
+- Synthetic latency: fixed or recorded time to first token, scaled and
+  jittered with a seeded RNG (same seed, same timings)
+- Streaming cadence: responses are emitted in chunks at a configured
+  tokens/second rate
+- Process-wide service configured from the environment (LLM_CASSETTE_PATH,
+  LLM_CASSETTE_RECORD, LLM_REPLAY_LATENCY_MS, LLM_REPLAY_TOKENS_PER_SECOND)
+  or with configure_replay()
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CASSETTE_PATH = "data/llm_cassettes/default.jsonl"
+CHARS_PER_TOKEN = 4  # Estimate when a provider reports no usage
+MAX_LATENCY_SAMPLES = 100000
+
+_VOLATILE_PATTERNS = [
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?\b"), "<timestamp>"),
+]
+
+
+def normalize_content(content: Any) -> str:
+    """Message content with volatile values (UUIDs, timestamps) replaced"""
+    if isinstance(content, list):  # Anthropic content blocks
+        content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    text = str(content or "")
+    for pattern, placeholder in _VOLATILE_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    return text
+
+
+def fingerprint_request(conversation: List[Dict[str, Any]]) -> str:
+    """Stable fingerprint of an LLM request"""
+    canonical = json.dumps(
+        [[message.get("role", ""), normalize_content(message.get("content"))] for message in conversation],
+        ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def count_tokens(usage: Dict[str, Any], conversation: List[Dict[str, Any]], content: str) -> Dict[str, int]:
+    """Prompt/completion tokens from OpenAI or Anthropic usage, estimated if missing"""
+    usage = usage or {}
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens"))
+    completion = usage.get("completion_tokens", usage.get("output_tokens"))
+    if prompt is None:
+        prompt = sum(estimate_tokens(normalize_content(m.get("content"))) for m in conversation)
+    if completion is None:
+        completion = estimate_tokens(content)
+    return {"prompt_tokens": int(prompt), "completion_tokens": int(completion)}
+
+
+@dataclass
+class CassetteRecord:
+    """One recorded LLM response"""
+    fingerprint: str
+    provider: str
+    model: str
+    content: str
+    usage: Dict[str, Any]
+    prompt_tokens: int
+    completion_tokens: int
+    response_time: float  # seconds, as measured while recording
+    recorded_at: float = field(default_factory=time.time)
+    prompt_preview: str = ""
+
+
+class LLMCassette:
+    """
+    JSON lines store of recorded responses.
+
+    Thread-safe. Records with the same fingerprint replay in recording
+    order and wrap around, so repeated runs see the same sequence.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._records: Dict[str, List[CassetteRecord]] = defaultdict(list)
+        self._cursors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = CassetteRecord(**json.loads(line))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Skipping invalid cassette line {self.path}:{line_number}: {e}")
+                    continue
+                self._records[record.fingerprint].append(record)
+        logger.info(f"Loaded LLM cassette {self.path} ({len(self)} responses)")
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+
+    def record(self, record: CassetteRecord):
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+            self._records[record.fingerprint].append(record)
+
+    def lookup(self, fingerprint: str) -> Optional[CassetteRecord]:
+        """Next recorded response for a fingerprint, None if never recorded"""
+        with self._lock:
+            records = self._records.get(fingerprint)
+            if not records:
+                return None
+            index = self._cursors[fingerprint]
+            self._cursors[fingerprint] = index + 1
+            return records[index % len(records)]
+
+    def rewind(self):
+        """Restart every fingerprint's sequence (start of a new benchmark run)"""
+        with self._lock:
+            self._cursors.clear()
+
+
+@dataclass
+class ReplaySettings:
+    """Synthetic timing of replayed responses"""
+    first_token_ms: Optional[float] = None   # None: recorded response time
+    latency_scale: float = 1.0               # Applied to the time to first token
+    jitter: float = 0.0                      # +/- ratio on the time to first token
+    tokens_per_second: Optional[float] = None  # None: whole response at once
+    chunk_tokens: int = 8                    # Streaming chunk size
+    seed: int = 0
+
+    @classmethod
+    def from_env(cls) -> "ReplaySettings":
+        def number(name):
+            value = os.getenv(name)
+            return float(value) if value else None
+
+        return cls(
+            first_token_ms=number("LLM_REPLAY_LATENCY_MS"),
+            latency_scale=number("LLM_REPLAY_LATENCY_SCALE") or 1.0,
+            jitter=number("LLM_REPLAY_JITTER") or 0.0,
+            tokens_per_second=number("LLM_REPLAY_TOKENS_PER_SECOND"),
+            seed=int(os.getenv("LLM_REPLAY_SEED", "0"))
+        )
+
+
+class LLMReplayService:
+    """Records real LLM responses and replays them with synthetic timing"""
+
+    def __init__(self, cassette: LLMCassette, settings: Optional[ReplaySettings] = None, recording: bool = False):
+        """
+        Initialize replay service.
+
+        Args:
+            cassette: Store of recorded responses
+            settings: Synthetic latency and streaming cadence for replay
+            recording: Record responses of real providers into the cassette
+        """
+        self.cassette = cassette
+        self.settings = settings or ReplaySettings()
+        self.recording = recording
+
+        self._occurrences: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.call_latencies: Deque[float] = deque(maxlen=MAX_LATENCY_SAMPLES)
+        self.first_token_latencies: Deque[float] = deque(maxlen=MAX_LATENCY_SAMPLES)
+
+        self._stats = {
+            "recorded": 0,
+            "replayed": 0,
+            "misses": 0,
+            "replayed_tokens": 0
+        }
+
+    # ==================== RECORD ====================
+
+    def record(self, provider: str, model: str, conversation: List[Dict[str, Any]], response: Dict[str, Any]):
+        """Store a successful provider response (called by LLMTool while recording)"""
+        content = response.get("content", "")
+        tokens = count_tokens(response.get("usage", {}), conversation, content)
+        last_user = next((m for m in reversed(conversation) if m.get("role") == "user"), {})
+        self.cassette.record(CassetteRecord(
+            fingerprint=fingerprint_request(conversation),
+            provider=provider,
+            model=model,
+            content=content,
+            usage=response.get("usage", {}),
+            response_time=response.get("response_time", 0) or 0,
+            prompt_preview=normalize_content(last_user.get("content"))[:200],
+            **tokens
+        ))
+        self._stats["recorded"] += 1
+
+    # ==================== REPLAY ====================
+
+    def _first_token_delay(self, record: CassetteRecord, occurrence: int) -> float:
+        settings = self.settings
+        base = settings.first_token_ms / 1000 if settings.first_token_ms is not None else record.response_time
+        delay = base * settings.latency_scale
+        if settings.jitter:
+            rng = random.Random(f"{settings.seed}:{record.fingerprint}:{occurrence}")
+            delay *= rng.uniform(1 - settings.jitter, 1 + settings.jitter)
+        return max(delay, 0.0)
+
+    def _next_record(self, conversation: List[Dict[str, Any]]):
+        fingerprint = fingerprint_request(conversation)
+        record = self.cassette.lookup(fingerprint)
+        if record is None:
+            self._stats["misses"] += 1
+            raise LookupError(f"No recorded response for request {fingerprint[:12]}")
+        with self._lock:
+            occurrence = self._occurrences[fingerprint]
+            self._occurrences[fingerprint] += 1
+        return record, occurrence
+
+    async def _emit(self, record: CassetteRecord, occurrence: int) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        await asyncio.sleep(self._first_token_delay(record, occurrence))
+        self.first_token_latencies.append(time.perf_counter() - started)
+
+        settings = self.settings
+        chunk_chars = max(settings.chunk_tokens, 1) * CHARS_PER_TOKEN
+        chunks = [record.content[i:i + chunk_chars] for i in range(0, len(record.content), chunk_chars)] or [""]
+        interval = settings.chunk_tokens / settings.tokens_per_second if settings.tokens_per_second else 0
+        for index, chunk in enumerate(chunks):
+            if index and interval:
+                await asyncio.sleep(interval)
+            yield chunk
+
+        self.call_latencies.append(time.perf_counter() - started)
+        self._stats["replayed"] += 1
+        self._stats["replayed_tokens"] += record.completion_tokens
+
+    async def stream(self, conversation: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        """
+        Replay a response as chunks at the configured cadence.
+
+        Raises:
+            LookupError: The request was never recorded
+        """
+        record, occurrence = self._next_record(conversation)
+        async for chunk in self._emit(record, occurrence):
+            yield chunk
+
+    async def complete(self, conversation: List[Dict[str, Any]], model: str) -> Dict[str, Any]:
+        """Replay a whole response in LLMTool's provider result format"""
+        started = time.perf_counter()
+        try:
+            record, occurrence = self._next_record(conversation)
+        except LookupError as e:
+            logger.warning(f"Replay miss: {e}")
+            return {"success": False, "error": str(e)}
+        content = "".join([chunk async for chunk in self._emit(record, occurrence)])
+        return {
+            "success": True,
+            "content": content,
+            "usage": dict(record.usage),
+            "response_time": time.perf_counter() - started
+        }
+
+    def reset_statistics(self):
+        """Clear latency samples and counters, rewind the cassette"""
+        self.cassette.rewind()
+        with self._lock:
+            self._occurrences.clear()
+        self.call_latencies.clear()
+        self.first_token_latencies.clear()
+        for key in self._stats:
+            self._stats[key] = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get replay statistics."""
+        return {
+            **self._stats,
+            "recording": self.recording,
+            "cassette": str(self.cassette.path),
+            "cassette_responses": len(self.cassette)
+        }
+
+
+_replay_service: Optional[LLMReplayService] = None
+_replay_service_lock = threading.Lock()
+
+
+def configure_replay(
+    cassette_path: Optional[str] = None,
+    settings: Optional[ReplaySettings] = None,
+    recording: bool = False
+) -> LLMReplayService:
+    """Replace the process-wide replay service (benchmarks, tests)"""
+    global _replay_service
+    with _replay_service_lock:
+        _replay_service = LLMReplayService(
+            LLMCassette(cassette_path or DEFAULT_CASSETTE_PATH), settings or ReplaySettings(), recording
+        )
+        return _replay_service
+
+
+def get_replay_service() -> LLMReplayService:
+    """Process-wide replay service, configured from the environment on first use"""
+    global _replay_service
+    with _replay_service_lock:
+        if _replay_service is None:
+            _replay_service = LLMReplayService(
+                LLMCassette(os.getenv("LLM_CASSETTE_PATH", DEFAULT_CASSETTE_PATH)),
+                ReplaySettings.from_env(),
+                recording=os.getenv("LLM_CASSETTE_RECORD", "").lower() in ("1", "true", "yes")
+            )
+        return _replay_service
@@ -6,19 +6,52 @@ Provides persistent persona management with:
 - Persona status tracking
 - Task execution history
 - Persona configuration management
+- Leased task queue (priority, lease expiry, retries, dead-lettering)
+
+All access goes through a small pool of WAL-mode connections.
 """
 
+import asyncio
 import sqlite3
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, asdict
 import uuid
 
+from .connection_pool import ConnectionPool
+
 logger = logging.getLogger(__name__)
 
+# Task queue defaults
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 2.0
+# Expired leases are swept at most this often (seconds)
+LEASE_REAP_INTERVAL_SECONDS = 1.0
+# Blocked workers re-check the queue this often even without a wakeup,
+# covering tasks enqueued by other processes sharing the database
+QUEUE_POLL_FALLBACK_SECONDS = 5.0
+
+TASK_COLUMNS = (
+    "id, persona_id, user_id, task_type, task_data, status, result, created_at, completed_at, error, "
+    "priority, attempts, max_attempts, lease_owner, lease_expires_at"
+)
+
+# Columns added to persona_tasks after the first schema version
+QUEUE_COLUMNS = {
+    "priority": "INTEGER DEFAULT 0",
+    "attempts": "INTEGER DEFAULT 0",
+    "max_attempts": f"INTEGER DEFAULT {DEFAULT_MAX_ATTEMPTS}",
+    "lease_owner": "TEXT",
+    "lease_expires_at": "REAL",
+    "available_at": "REAL DEFAULT 0",
+}
+
 
 @dataclass
 class Persona:
@@ -67,6 +100,32 @@ class PersonaTask:
     created_at: datetime
     completed_at: Optional[datetime] = None
     error: Optional[str] = None
+    priority: int = 0
+    attempts: int = 0
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> "PersonaTask":
+        """Build from a row selected with TASK_COLUMNS"""
+        return cls(
+            id=row[0],
+            persona_id=row[1],
+            user_id=row[2],
+            task_type=row[3],
+            task_data=json.loads(row[4]) if row[4] else {},
+            status=row[5],
+            result=json.loads(row[6]) if row[6] else None,
+            created_at=datetime.fromisoformat(row[7]) if row[7] else datetime.now(),
+            completed_at=datetime.fromisoformat(row[8]) if row[8] else None,
+            error=row[9],
+            priority=row[10] or 0,
+            attempts=row[11] or 0,
+            max_attempts=row[12] if row[12] is not None else DEFAULT_MAX_ATTEMPTS,
+            lease_owner=row[13],
+            lease_expires_at=datetime.fromtimestamp(row[14]) if row[14] else None
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -80,23 +139,35 @@ class PersonaTask:
             "result": self.result,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "error": self.error
+            "error": self.error,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "lease_owner": self.lease_owner,
+            "lease_expires_at": self.lease_expires_at.isoformat() if self.lease_expires_at else None
         }
 
 
 class PersonaService:
     """SQLite-based persona management service"""
 
-    def __init__(self, db_path: str = "metis_agent3.db"):
+    def __init__(self, db_path: str = "metis_agent3.db", pool_size: int = 8):
         self.db_path = Path(db_path)
+        self._pool = ConnectionPool(str(self.db_path), max_size=pool_size)
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._woken: set = set()
+        self._waiters_lock = threading.Lock()
+        self._next_reap = 0.0
         self._init_database()
         self._ensure_default_personas()
         logger.info(f"Persona service initialized: {self.db_path}")
 
     def _init_database(self):
         """Initialize persona database schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            self._create_schema(conn.cursor())
+
+    def _create_schema(self, cursor: sqlite3.Cursor):
 
         # Create personas table
         cursor.execute("""
@@ -139,8 +210,22 @@ class PersonaService:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_persona_tasks_persona_id ON persona_tasks(persona_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_persona_tasks_user_id ON persona_tasks(user_id)")
 
-        conn.commit()
-        conn.close()
+        # Queue columns for databases created before the leased queue
+        cursor.execute("PRAGMA table_info(persona_tasks)")
+        existing = {row[1] for row in cursor.fetchall()}
+        for column, definition in QUEUE_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE persona_tasks ADD COLUMN {column} {definition}")
+
+        # Claim order (priority DESC, then insertion order) and lease sweeping
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_persona_tasks_queue
+            ON persona_tasks(persona_id, status, priority DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_persona_tasks_lease
+            ON persona_tasks(status, lease_expires_at)
+        """)
 
     def _ensure_default_personas(self):
         """Create default system personas if they don't exist"""
@@ -198,10 +283,9 @@ class PersonaService:
         config: Optional[Dict[str, Any]] = None
     ) -> Persona:
         """Create a new persona"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             pid = persona_id or str(uuid.uuid4())[:8]
             now = datetime.now()
 
@@ -240,15 +324,11 @@ class PersonaService:
             logger.info(f"Created persona: {pid} ({name})")
             return persona
 
-        finally:
-            conn.close()
-
     def get_persona(self, persona_id: str) -> Optional[Persona]:
         """Get a persona by ID"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute("""
                 SELECT id, name, description, avatar, status, capabilities, config,
                        user_id, created_at, updated_at, last_active_at, task_count
@@ -273,15 +353,11 @@ class PersonaService:
                 )
             return None
 
-        finally:
-            conn.close()
-
     def get_all_personas(self, user_id: Optional[str] = None) -> List[Persona]:
         """Get all personas, optionally filtered by user_id"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             if user_id:
                 # Get user's personas + system personas
                 cursor.execute("""
@@ -317,9 +393,6 @@ class PersonaService:
 
             return personas
 
-        finally:
-            conn.close()
-
     def update_persona(
         self,
         persona_id: str,
@@ -330,10 +403,9 @@ class PersonaService:
         config: Optional[Dict[str, Any]] = None
     ) -> Optional[Persona]:
         """Update persona fields"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             # Build update query dynamically
             updates = []
             params = []
@@ -363,20 +435,15 @@ class PersonaService:
 
             query = f"UPDATE personas SET {', '.join(updates)} WHERE id = ?"
             cursor.execute(query, params)
-            conn.commit()
-
-            logger.info(f"Updated persona: {persona_id}")
-            return self.get_persona(persona_id)
 
-        finally:
-            conn.close()
+        logger.info(f"Updated persona: {persona_id}")
+        return self.get_persona(persona_id)
 
     def delete_persona(self, persona_id: str) -> bool:
         """Delete a persona"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             # Don't allow deleting system personas
             cursor.execute("SELECT user_id FROM personas WHERE id = ?", (persona_id,))
             row = cursor.fetchone()
@@ -393,32 +460,24 @@ class PersonaService:
                 logger.info(f"Deleted persona: {persona_id}")
             return deleted
 
-        finally:
-            conn.close()
-
     def set_persona_status(self, persona_id: str, status: str) -> Optional[Persona]:
         """Set persona status (active, inactive, busy)"""
         if status not in ["active", "inactive", "busy"]:
             logger.error(f"Invalid status: {status}")
             return None
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             now = datetime.now()
             cursor.execute("""
                 UPDATE personas
                 SET status = ?, updated_at = ?, last_active_at = ?
                 WHERE id = ?
             """, (status, now, now if status == "active" else None, persona_id))
-            conn.commit()
-
-            logger.info(f"Set persona {persona_id} status to {status}")
-            return self.get_persona(persona_id)
 
-        finally:
-            conn.close()
+        logger.info(f"Set persona {persona_id} status to {status}")
+        return self.get_persona(persona_id)
 
     def get_persona_status(self, persona_id: str) -> Optional[Dict[str, Any]]:
         """Get persona status info"""
@@ -438,20 +497,23 @@ class PersonaService:
         persona_id: str,
         user_id: str,
         task_type: str,
-        task_data: Dict[str, Any]
+        task_data: Dict[str, Any],
+        priority: int = 0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
     ) -> PersonaTask:
-        """Create a new task for a persona"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Create a new task for a persona (higher priority is claimed first)"""
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             task_id = str(uuid.uuid4())[:12]
             now = datetime.now()
 
             cursor.execute("""
-                INSERT INTO persona_tasks (id, persona_id, user_id, task_type, task_data, status, created_at)
-                VALUES (?, ?, ?, ?, ?, 'pending', ?)
-            """, (task_id, persona_id, user_id, task_type, json.dumps(task_data), now))
+                INSERT INTO persona_tasks (id, persona_id, user_id, task_type, task_data, status, created_at,
+                                           priority, max_attempts, available_at)
+                VALUES (?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?)
+            """, (task_id, persona_id, user_id, task_type, json.dumps(task_data), now,
+                  priority, max_attempts, time.time()))
 
             # Update persona task count and last active
             cursor.execute("""
@@ -460,8 +522,6 @@ class PersonaService:
                 WHERE id = ?
             """, (now, now, persona_id))
 
-            conn.commit()
-
             task = PersonaTask(
                 id=task_id,
                 persona_id=persona_id,
@@ -472,14 +532,14 @@ class PersonaService:
                 result=None,
                 created_at=now,
                 completed_at=None,
-                error=None
+                error=None,
+                priority=priority,
+                max_attempts=max_attempts
             )
 
-            logger.info(f"Created task {task_id} for persona {persona_id}")
-            return task
-
-        finally:
-            conn.close()
+        self._notify_task_available(persona_id)
+        logger.info(f"Created task {task_id} for persona {persona_id}")
+        return task
 
     def update_task(
         self,
@@ -489,45 +549,21 @@ class PersonaService:
         error: Optional[str] = None
     ) -> Optional[PersonaTask]:
         """Update task status and result"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             now = datetime.now()
             completed_at = now if status in ["completed", "failed"] else None
 
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE persona_tasks
                 SET status = ?, result = ?, error = ?, completed_at = ?
                 WHERE id = ?
+                RETURNING {TASK_COLUMNS}
             """, (status, json.dumps(result) if result else None, error, completed_at, task_id))
 
-            conn.commit()
-
-            # Fetch and return the updated task
-            cursor.execute("""
-                SELECT id, persona_id, user_id, task_type, task_data, status, result, created_at, completed_at, error
-                FROM persona_tasks WHERE id = ?
-            """, (task_id,))
-
             row = cursor.fetchone()
-            if row:
-                return PersonaTask(
-                    id=row[0],
-                    persona_id=row[1],
-                    user_id=row[2],
-                    task_type=row[3],
-                    task_data=json.loads(row[4]) if row[4] else {},
-                    status=row[5],
-                    result=json.loads(row[6]) if row[6] else None,
-                    created_at=datetime.fromisoformat(row[7]) if row[7] else datetime.now(),
-                    completed_at=datetime.fromisoformat(row[8]) if row[8] else None,
-                    error=row[9]
-                )
-            return None
-
-        finally:
-            conn.close()
+            return PersonaTask.from_row(row) if row else None
 
     def get_persona_tasks(
         self,
@@ -536,43 +572,287 @@ class PersonaService:
         status: Optional[str] = None
     ) -> List[PersonaTask]:
         """Get tasks for a persona"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
 
-        try:
             if status:
-                cursor.execute("""
-                    SELECT id, persona_id, user_id, task_type, task_data, status, result, created_at, completed_at, error
+                cursor.execute(f"""
+                    SELECT {TASK_COLUMNS}
                     FROM persona_tasks
                     WHERE persona_id = ? AND status = ?
                     ORDER BY created_at DESC
                     LIMIT ?
                 """, (persona_id, status, limit))
             else:
-                cursor.execute("""
-                    SELECT id, persona_id, user_id, task_type, task_data, status, result, created_at, completed_at, error
+                cursor.execute(f"""
+                    SELECT {TASK_COLUMNS}
                     FROM persona_tasks
                     WHERE persona_id = ?
                     ORDER BY created_at DESC
                     LIMIT ?
                 """, (persona_id, limit))
 
-            tasks = []
-            for row in cursor.fetchall():
-                tasks.append(PersonaTask(
-                    id=row[0],
-                    persona_id=row[1],
-                    user_id=row[2],
-                    task_type=row[3],
-                    task_data=json.loads(row[4]) if row[4] else {},
-                    status=row[5],
-                    result=json.loads(row[6]) if row[6] else None,
-                    created_at=datetime.fromisoformat(row[7]) if row[7] else datetime.now(),
-                    completed_at=datetime.fromisoformat(row[8]) if row[8] else None,
-                    error=row[9]
-                ))
+            return [PersonaTask.from_row(row) for row in cursor.fetchall()]
+
+    # ------------------------------------------------------------------
+    # Leased task queue
+    # ------------------------------------------------------------------
+
+    def claim_next(
+        self,
+        persona_id: str,
+        worker_id: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> Optional[PersonaTask]:
+        """
+        Atomically lease the next pending task of a persona.
+
+        Highest priority first, then oldest. The claim is a single
+        UPDATE ... RETURNING, so concurrent workers never get the same task.
+        The lease must be renewed with extend_lease() for long work and
+        released with complete_task() or fail_task(); an expired lease puts
+        the task back in the queue (or dead-letters it after max_attempts).
+
+        Returns:
+            Claimed task or None if nothing is available
+        """
+        now = time.time()
+        if now >= self._next_reap:
+            self.reap_expired_leases(now)
+
+        with self._pool.connection() as conn:
+            row = conn.execute(f"""
+                UPDATE persona_tasks
+                SET status = 'running', lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1
+                WHERE id = (
+                    SELECT id FROM persona_tasks
+                    WHERE persona_id = ? AND status = 'pending' AND available_at <= ?
+                    ORDER BY priority DESC, rowid
+                    LIMIT 1
+                )
+                RETURNING {TASK_COLUMNS}
+            """, (worker_id, now + lease_seconds, persona_id, now)).fetchone()
+
+        return PersonaTask.from_row(row) if row else None
+
+    async def claim_next_async(
+        self,
+        persona_id: str,
+        worker_id: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        timeout: Optional[float] = None
+    ) -> Optional[PersonaTask]:
+        """
+        Wait until a task can be claimed instead of polling.
+
+        Workers are woken by create_task() and by retries becoming due; a
+        slow fallback re-check covers writers in other processes.
+
+        Returns:
+            Claimed task, or None if timeout elapsed first
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+
+        while True:
+            # Register before claiming so a task created in between is not missed
+            waiter = loop.create_future()
+            self._add_waiter(persona_id, loop, waiter)
+            try:
+                task = await loop.run_in_executor(None, self.claim_next, persona_id, worker_id, lease_seconds)
+                if not task:
+                    wait = QUEUE_POLL_FALLBACK_SECONDS
+                    if deadline is not None:
+                        wait = min(wait, deadline - loop.time())
+                    if wait > 0:
+                        try:
+                            await asyncio.wait_for(waiter, wait)
+                        except asyncio.TimeoutError:
+                            pass
+            finally:
+                woken = self._remove_waiter(persona_id, waiter)
+
+            if task:
+                if woken:
+                    # The wakeup was meant for another task; hand it on
+                    self._notify_task_available(persona_id)
+                return task
+            if deadline is not None and loop.time() >= deadline:
+                if woken:
+                    self._notify_task_available(persona_id)
+                return None
+
+    def extend_lease(self, task_id: str, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Renew a lease held by worker_id; False if the lease was lost"""
+        with self._pool.connection() as conn:
+            cursor = conn.execute("""
+                UPDATE persona_tasks SET lease_expires_at = ?
+                WHERE id = ? AND status = 'running' AND lease_owner = ?
+            """, (time.time() + lease_seconds, task_id, worker_id))
+            return cursor.rowcount > 0
+
+    def complete_task(
+        self,
+        task_id: str,
+        worker_id: str,
+        result: Optional[Dict[str, Any]] = None
+    ) -> Optional[PersonaTask]:
+        """Finish a leased task; None if worker_id no longer holds the lease"""
+        with self._pool.connection() as conn:
+            row = conn.execute(f"""
+                UPDATE persona_tasks
+                SET status = 'completed', result = ?, error = NULL, completed_at = ?,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE id = ? AND status = 'running' AND lease_owner = ?
+                RETURNING {TASK_COLUMNS}
+            """, (json.dumps(result) if result else None, datetime.now(), task_id, worker_id)).fetchone()
+
+        return PersonaTask.from_row(row) if row else None
+
+    def fail_task(
+        self,
+        task_id: str,
+        worker_id: str,
+        error: str,
+        retry_delay: Optional[float] = None
+    ) -> Optional[PersonaTask]:
+        """
+        Release a leased task after a failed attempt.
+
+        The task is retried after retry_delay (default: exponential backoff
+        from RETRY_BACKOFF_SECONDS) until max_attempts is reached, then
+        dead-lettered with status 'dead'.
+
+        Returns:
+            Updated task, or None if worker_id no longer holds the lease
+        """
+        now = time.time()
+        with self._pool.connection() as conn:
+            current = conn.execute("""
+                SELECT attempts FROM persona_tasks
+                WHERE id = ? AND status = 'running' AND lease_owner = ?
+            """, (task_id, worker_id)).fetchone()
+            if not current:
+                return None
+
+            delay = retry_delay if retry_delay is not None else RETRY_BACKOFF_SECONDS * 2 ** max(current[0] - 1, 0)
+            row = conn.execute(f"""
+                UPDATE persona_tasks
+                SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'pending' END,
+                    completed_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END,
+                    error = ?, available_at = ?, lease_owner = NULL, lease_expires_at = NULL
+                WHERE id = ? AND status = 'running' AND lease_owner = ?
+                RETURNING {TASK_COLUMNS}
+            """, (datetime.now(), error, now + delay, task_id, worker_id)).fetchone()
+
+        if not row:
+            return None
+        task = PersonaTask.from_row(row)
+        if task.status == "dead":
+            logger.warning(f"Task {task_id} dead-lettered after {task.attempts} attempts: {error}")
+        else:
+            self._notify_task_available(task.persona_id, delay)
+        return task
+
+    def reap_expired_leases(self, now: Optional[float] = None) -> int:
+        """
+        Return tasks whose lease expired to the queue, or dead-letter them
+        once max_attempts is used up. Called from claim_next() periodically.
+
+        Returns:
+            Number of expired leases handled
+        """
+        now = now or time.time()
+        self._next_reap = now + LEASE_REAP_INTERVAL_SECONDS
+        with self._pool.connection() as conn:
+            rows = conn.execute("""
+                UPDATE persona_tasks
+                SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'pending' END,
+                    completed_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END,
+                    error = 'Lease expired (worker ' || COALESCE(lease_owner, '?') || ')',
+                    available_at = ?, lease_owner = NULL, lease_expires_at = NULL
+                WHERE status = 'running' AND lease_expires_at IS NOT NULL AND lease_expires_at <= ?
+                RETURNING id, persona_id, status
+            """, (datetime.now(), now, now)).fetchall()
+
+        for task_id, persona_id, status in rows:
+            if status == "dead":
+                logger.warning(f"Task {task_id} dead-lettered: lease expired on final attempt")
+            else:
+                self._notify_task_available(persona_id)
+        return len(rows)
+
+    def requeue_dead_task(self, task_id: str, max_attempts: Optional[int] = None) -> Optional[PersonaTask]:
+        """Move a dead-lettered task back to the queue with a fresh attempt budget"""
+        with self._pool.connection() as conn:
+            row = conn.execute(f"""
+                UPDATE persona_tasks
+                SET status = 'pending', attempts = 0, max_attempts = COALESCE(?, max_attempts),
+                    available_at = ?, completed_at = NULL
+                WHERE id = ? AND status = 'dead'
+                RETURNING {TASK_COLUMNS}
+            """, (max_attempts, time.time(), task_id)).fetchone()
+
+        if not row:
+            return None
+        task = PersonaTask.from_row(row)
+        self._notify_task_available(task.persona_id)
+        return task
+
+    def get_queue_stats(self, persona_id: Optional[str] = None) -> Dict[str, int]:
+        """Task counts per status (pending, running, completed, failed, dead)"""
+        with self._pool.connection() as conn:
+            if persona_id:
+                rows = conn.execute("""
+                    SELECT status, COUNT(*) FROM persona_tasks WHERE persona_id = ? GROUP BY status
+                """, (persona_id,)).fetchall()
+            else:
+                rows = conn.execute("SELECT status, COUNT(*) FROM persona_tasks GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def _add_waiter(self, persona_id: str, loop: asyncio.AbstractEventLoop, waiter: asyncio.Future):
+        with self._waiters_lock:
+            self._waiters.setdefault(persona_id, []).append((loop, waiter))
+
+    def _remove_waiter(self, persona_id: str, waiter: asyncio.Future) -> bool:
+        """Unregister a waiter; True if it had been picked for a wakeup"""
+        with self._waiters_lock:
+            waiters = self._waiters.get(persona_id)
+            if waiters:
+                self._waiters[persona_id] = [entry for entry in waiters if entry[1] is not waiter]
+                if not self._waiters[persona_id]:
+                    del self._waiters[persona_id]
+            if waiter in self._woken:
+                self._woken.discard(waiter)
+                return True
+            return False
+
+    def _notify_task_available(self, persona_id: str, delay: float = 0):
+        """Wake one blocked claim_next_async() caller (after delay seconds)"""
+        if delay > 0:
+            timer = threading.Timer(delay, self._notify_task_available, (persona_id,))
+            timer.daemon = True
+            timer.start()
+            return
+
+        with self._waiters_lock:
+            for loop, waiter in self._waiters.get(persona_id, []):
+                if waiter not in self._woken:
+                    self._woken.add(waiter)
+                    break
+            else:
+                return
+        try:
+            loop.call_soon_threadsafe(_wake_waiter, waiter)
+        except RuntimeError:
+            # Waiter's event loop already closed
+            pass
+
+    def close(self):
+        """Close pooled connections"""
+        self._pool.close()
 
-            return tasks
 
-        finally:
-            conn.close()
+def _wake_waiter(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(True)
@@ -13,7 +13,6 @@ import hashlib
 import logging
 import os
 import zipfile
-import ast
 import tempfile
 import shutil
 from typing import Dict, Any, List, Optional, Tuple
@@ -25,6 +24,7 @@ from azure.identity import DefaultAzureCredential
 
 from ..config.azure_config import get_azure_config, is_azure_environment
 from ..storage.azure_sql_storage import AzureSQLPluginStorage
+from .plugin_security_scanner import PluginSecurityScanner
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,12 @@ class PluginRegistryService:
         self.storage = storage or AzureSQLPluginStorage()
         self._blob_client: Optional[BlobServiceClient] = None
         self._local_plugin_dir = Path(__file__).parent.parent.parent / "plugins"
+        # Per-file verdict cache lives next to the local plugin registry
+        self.security_scanner = PluginSecurityScanner(
+            cache_path=self._local_plugin_dir / ".security_scan_cache.db",
+            blocked_imports=self.BLOCKED_IMPORTS,
+            blocked_calls=self.BLOCKED_CALLS
+        )
 
     @property
     def blob_client(self) -> BlobServiceClient:
@@ -193,42 +199,9 @@ class PluginRegistryService:
         Validate plugin code for security issues
 
         Uses AST analysis to detect potentially dangerous patterns.
+        Unchanged files are answered from the content-hash verdict cache.
         """
-        for py_file in plugin_dir.rglob("*.py"):
-            try:
-                with open(py_file) as f:
-                    code = f.read()
-
-                tree = ast.parse(code)
-
-                for node in ast.walk(tree):
-                    # Check imports
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            if alias.name in self.BLOCKED_IMPORTS:
-                                return False, f"Blocked import: {alias.name} in {py_file.name}"
-
-                    elif isinstance(node, ast.ImportFrom):
-                        if node.module and node.module in self.BLOCKED_IMPORTS:
-                            return False, f"Blocked import: {node.module} in {py_file.name}"
-
-                    # Check function calls
-                    elif isinstance(node, ast.Call):
-                        if isinstance(node.func, ast.Name):
-                            if node.func.id in self.BLOCKED_CALLS:
-                                # Allow certain patterns
-                                if node.func.id == "open":
-                                    # Check if mode is read-only
-                                    pass  # Allow for now, can add more checks
-                                else:
-                                    return False, f"Blocked call: {node.func.id} in {py_file.name}"
-
-            except SyntaxError as e:
-                return False, f"Syntax error in {py_file.name}: {e}"
-            except Exception as e:
-                logger.warning(f"Could not analyze {py_file}: {e}")
-
-        return True, "OK"
+        return self.security_scanner.scan_plugin(plugin_dir)
 
     # Plugin listing and retrieval
     def list_plugins(self, status: Optional[str] = None,
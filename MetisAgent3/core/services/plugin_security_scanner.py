@@ -0,0 +1,329 @@
+"""
+Plugin Security Scanner - AST security analysis with a content-hash verdict cache
+
+Scans plugin Python files for blocked imports and calls:
+- import aliases (import os as o; from os import system as run), attribute
+  chains (o.path.join) and assignment aliases (run = os.system) are resolved
+  to dotted names before matching against the blocked sets
+- dynamic access is resolved too: getattr(os, "system"),
+  importlib.import_module("subprocess"), __builtins__.eval, builtins.exec
+- verdicts are cached per file SHA-256 (and ruleset) in SQLite next to the
+  plugin registry, so re-validating a plugin after a one-file edit parses one
+  file instead of all of them
+- cache misses of large plugins are parsed in a process pool
+"""
+
+import ast
+import hashlib
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when visitor semantics change; cached verdicts of older scanners are ignored
+SCANNER_VERSION = 2
+
+# Cache misses totalling more than this many bytes are parsed in the process pool
+PARALLEL_THRESHOLD_BYTES = 256 * 1024
+
+# Calls that are listed as blocked but currently allowed (kept for a future policy)
+ALLOWED_CALLS = frozenset({"open"})
+
+# Functions that import a module named by their first argument
+DYNAMIC_IMPORT_CALLS = frozenset({"importlib.import_module", "__import__", "importlib.__import__"})
+
+# Builtins can be reached through these module names as well
+BUILTIN_MODULES = ("builtins", "__builtins__", "__builtin__")
+
+
+@dataclass
+class SecurityFinding:
+    """First blocked construct found in a file"""
+    kind: str       # import, call, syntax
+    name: str
+    line: int = 0
+
+    def message(self, filename: str) -> str:
+        if self.kind == "syntax":
+            return f"Syntax error in {filename}: {self.name}"
+        return f"Blocked {self.kind}: {self.name} in {filename}"
+
+
+class _BlockedFound(Exception):
+    def __init__(self, finding: SecurityFinding):
+        self.finding = finding
+
+
+class SecurityVisitor(ast.NodeVisitor):
+    """Resolves names to dotted paths and stops at the first blocked import or call"""
+
+    def __init__(self, blocked_imports: FrozenSet[str], blocked_calls: FrozenSet[str]):
+        self.blocked_imports = blocked_imports
+        self.blocked_calls = blocked_calls - ALLOWED_CALLS
+        # local name -> dotted path it refers to
+        self.aliases: Dict[str, str] = {}
+
+    # --- Name resolution ---------------------------------------------
+
+    def resolve(self, node: ast.AST) -> Optional[str]:
+        """Dotted path of a Name/Attribute/getattr() chain, with aliases applied"""
+        if isinstance(node, ast.Name):
+            return self.aliases.get(node.id, node.id)
+        if isinstance(node, ast.Attribute):
+            base = self.resolve(node.value)
+            return f"{base}.{node.attr}" if base else None
+        if isinstance(node, ast.Call) and self._is_getattr(node):
+            base = self.resolve(node.args[0])
+            attr = node.args[1]
+            if base and isinstance(attr, ast.Constant) and isinstance(attr.value, str):
+                return f"{base}.{attr.value}"
+        if isinstance(node, ast.Subscript):
+            # __builtins__["eval"], vars(os)["system"] style lookups
+            base = self.resolve(node.value)
+            key = node.slice
+            if base and isinstance(key, ast.Constant) and isinstance(key.value, str):
+                return f"{base}.{key.value}"
+        return None
+
+    def _is_getattr(self, node: ast.Call) -> bool:
+        return (isinstance(node.func, ast.Name) and self.aliases.get(node.func.id, node.func.id) == "getattr"
+                and len(node.args) >= 2)
+
+    @staticmethod
+    def _strip_builtins(name: str) -> str:
+        for prefix in BUILTIN_MODULES:
+            if name.startswith(prefix + "."):
+                return name[len(prefix) + 1:]
+        return name
+
+    # --- Matching ----------------------------------------------------
+
+    def _check_module(self, module: str, line: int):
+        """A module is blocked if it or any parent package is in BLOCKED_IMPORTS"""
+        parts = module.split(".")
+        for i in range(1, len(parts) + 1):
+            if ".".join(parts[:i]) in self.blocked_imports:
+                raise _BlockedFound(SecurityFinding("import", module, line))
+
+    def _check_reference(self, name: str, line: int):
+        """Blocked call names (eval, os.system, shutil.rmtree, ...) reached by any path"""
+        name = self._strip_builtins(name)
+        if name in self.blocked_calls:
+            raise _BlockedFound(SecurityFinding("call", name, line))
+        parts = name.split(".")
+        for i in range(1, len(parts) + 1):
+            prefix = ".".join(parts[:i])
+            if prefix in self.blocked_imports and (i > 1 or prefix in self.aliases.values()):
+                raise _BlockedFound(SecurityFinding("call", name, line))
+
+    # --- Visitors ----------------------------------------------------
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self._check_module(alias.name, node.lineno)
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+            else:
+                top = alias.name.split(".")[0]
+                self.aliases[top] = top
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.level == 0 and node.module:
+            self._check_module(node.module, node.lineno)
+            for alias in node.names:
+                target = f"{node.module}.{alias.name}"
+                self._check_module(target, node.lineno)
+                self._check_reference(target, node.lineno)
+                self.aliases[alias.asname or alias.name] = target
+
+    def visit_Assign(self, node: ast.Assign):
+        # run = os.system; sh = getattr(os, "system") -> later run()/sh() resolve to os.system
+        resolved = self.resolve(node.value)
+        if resolved:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.aliases[target.id] = resolved
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        # Blocked builtins passed around without a call: map(eval, items)
+        if isinstance(node.ctx, ast.Load):
+            name = self._strip_builtins(self.aliases.get(node.id, node.id))
+            if name in self.blocked_calls:
+                raise _BlockedFound(SecurityFinding("call", name, node.lineno))
+
+    def visit_Call(self, node: ast.Call):
+        name = self.resolve(node.func)
+        if name:
+            self._check_reference(name, node.lineno)
+            bare = self._strip_builtins(name)
+            if bare in DYNAMIC_IMPORT_CALLS and node.args:
+                target = node.args[0]
+                if isinstance(target, ast.Constant) and isinstance(target.value, str):
+                    self._check_module(target.value, node.lineno)
+                else:
+                    raise _BlockedFound(SecurityFinding("import", f"{bare}(<dynamic>)", node.lineno))
+        if self._is_getattr(node):
+            resolved = self.resolve(node)
+            if resolved:
+                self._check_reference(resolved, node.lineno)
+            else:
+                # getattr(os, name) with a computed name on a module that has blocked members
+                base = self.resolve(node.args[0])
+                if base and (base in BUILTIN_MODULES or base in self._sensitive_modules()):
+                    raise _BlockedFound(SecurityFinding("call", f"getattr({base}, <dynamic>)", node.lineno))
+        self.generic_visit(node)
+
+    def _sensitive_modules(self) -> FrozenSet[str]:
+        """Modules with a blocked member (os for os.system, shutil for shutil.rmtree)"""
+        return frozenset(name.rsplit(".", 1)[0] for name in self.blocked_imports | self.blocked_calls if "." in name)
+
+
+def scan_source(source: bytes, blocked_imports: FrozenSet[str],
+                blocked_calls: FrozenSet[str]) -> Optional[SecurityFinding]:
+    """Scan one file's source; None if clean (module-level so the process pool can run it)"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        return SecurityFinding("syntax", str(e), e.lineno or 0)
+    try:
+        SecurityVisitor(blocked_imports, blocked_calls).visit(tree)
+    except _BlockedFound as found:
+        return found.finding
+    return None
+
+
+def _scan_source_task(args: Tuple[bytes, FrozenSet[str], FrozenSet[str]]) -> Optional[SecurityFinding]:
+    return scan_source(*args)
+
+
+class PluginSecurityScanner:
+    """Cached, optionally parallel AST scanner for plugin directories"""
+
+    def __init__(self, cache_path: Path, blocked_imports: Iterable[str], blocked_calls: Iterable[str],
+                 max_workers: Optional[int] = None, parallel_threshold_bytes: int = PARALLEL_THRESHOLD_BYTES):
+        self.blocked_imports = frozenset(blocked_imports)
+        self.blocked_calls = frozenset(blocked_calls)
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.parallel_threshold_bytes = parallel_threshold_bytes
+        ruleset = "|".join([str(SCANNER_VERSION)] + sorted(self.blocked_imports) + ["#"] + sorted(self.blocked_calls))
+        self.ruleset = hashlib.sha256(ruleset.encode()).hexdigest()[:16]
+        self.stats = {"files": 0, "cache_hits": 0, "parsed": 0, "parallel_batches": 0}
+
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(cache_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS verdicts (
+                    sha256 TEXT NOT NULL,
+                    ruleset TEXT NOT NULL,
+                    kind TEXT,
+                    name TEXT,
+                    line INTEGER,
+                    scanned_at TEXT NOT NULL,
+                    PRIMARY KEY (sha256, ruleset)
+                ) WITHOUT ROWID
+            ''')
+
+    def scan_plugin(self, plugin_dir: Path) -> Tuple[bool, str]:
+        """(is_safe, message) for every .py file under plugin_dir"""
+        files: List[Tuple[Path, bytes, str]] = []
+        for py_file in sorted(plugin_dir.rglob("*.py")):
+            try:
+                source = py_file.read_bytes()
+            except OSError as e:
+                logger.warning(f"Could not analyze {py_file}: {e}")
+                continue
+            files.append((py_file, source, hashlib.sha256(source).hexdigest()))
+
+        verdicts = self._cached_verdicts([digest for _, _, digest in files])
+        misses = [(py_file, source, digest) for py_file, source, digest in files if digest not in verdicts]
+        if misses:
+            verdicts.update(self._scan_misses(misses))
+
+        with self._lock:
+            self.stats["files"] += len(files)
+            self.stats["cache_hits"] += len(files) - len(misses)
+            self.stats["parsed"] += len(misses)
+
+        for py_file, _, digest in files:
+            finding = verdicts.get(digest)
+            if finding:
+                return False, finding.message(py_file.name)
+        return True, "OK"
+
+    def _cached_verdicts(self, digests: List[str]) -> Dict[str, Optional[SecurityFinding]]:
+        verdicts: Dict[str, Optional[SecurityFinding]] = {}
+        unique = list(set(digests))
+        with self._lock:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT sha256, kind, name, line FROM verdicts WHERE ruleset = ? "
+                    f"AND sha256 IN ({','.join('?' * len(chunk))})",
+                    [self.ruleset] + chunk
+                )
+                for digest, kind, name, line in rows:
+                    verdicts[digest] = SecurityFinding(kind, name, line) if kind else None
+        return verdicts
+
+    def _scan_misses(self, misses: List[Tuple[Path, bytes, str]]) -> Dict[str, Optional[SecurityFinding]]:
+        unique = {digest: source for _, source, digest in misses}
+        digests = list(unique)
+        tasks = [(unique[digest], self.blocked_imports, self.blocked_calls) for digest in digests]
+
+        if len(tasks) > 1 and sum(len(source) for source in unique.values()) >= self.parallel_threshold_bytes:
+            try:
+                findings = list(self._process_pool().map(_scan_source_task, tasks, chunksize=4))
+                with self._lock:
+                    self.stats["parallel_batches"] += 1
+            except Exception as e:
+                logger.warning(f"Parallel plugin scan failed, scanning inline: {e}")
+                self._reset_pool()
+                findings = [_scan_source_task(task) for task in tasks]
+        else:
+            findings = [_scan_source_task(task) for task in tasks]
+
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO verdicts (sha256, ruleset, kind, name, line, scanned_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(digest, self.ruleset, finding.kind if finding else None, finding.name if finding else None,
+                  finding.line if finding else None, now) for digest, finding in zip(digests, findings)]
+            )
+        return dict(zip(digests, findings))
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a threaded server process can deadlock in the child
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def clear_cache(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM verdicts")
+
+    def close(self):
+        self._reset_pool()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,393 @@
+"""
+Process Engine - Async streaming subprocess execution
+
+Runs commands with asyncio.create_subprocess_exec instead of blocking
+subprocess.run:
+- stdout/stderr are read incrementally and handed to an on_output callback
+  as they arrive (tool events, websocket, caller-side streaming)
+- output kept in memory is capped per stream; anything beyond the cap is
+  spilled to a temp file whose path is returned with the result
+- commands run in their own process group, and the whole group is killed
+  on timeout or cancellation (no orphaned grandchildren)
+- a per-user concurrency limit keeps one user from occupying every slot
+
+Synchronous callers use run_sync(): the process runs on a shared background
+loop (output still streams to on_output) while the calling thread waits for
+the result. The per-user limit is process-wide, so it also holds when every
+request runs on its own event loop.
+"""
+
+import asyncio
+import codecs
+import inspect
+import logging
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+IS_WINDOWS = os.name == "nt"
+
+
+@dataclass
+class OutputChunk:
+    """A piece of process output, decoded as it arrived"""
+    stream: str          # "stdout" or "stderr"
+    text: str
+    offset: int          # Bytes of this stream received before this chunk
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of a finished (or killed) process"""
+    command: Union[str, List[str]]
+    return_code: Optional[int]
+    stdout: str
+    stderr: str
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    stdout_truncated: bool = False
+    stderr_truncated: bool = False
+    stdout_file: Optional[str] = None
+    stderr_file: Optional[str] = None
+    timed_out: bool = False
+    duration_seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.return_code == 0 and not self.timed_out
+
+    def output_info(self) -> Dict[str, Any]:
+        """Size/spill details for tool responses (only when output was capped)"""
+        info: Dict[str, Any] = {}
+        for name in ("stdout", "stderr"):
+            if getattr(self, f"{name}_truncated"):
+                info[f"{name}_truncated"] = True
+                info[f"{name}_bytes"] = getattr(self, f"{name}_bytes")
+                info[f"{name}_file"] = getattr(self, f"{name}_file")
+        return info
+
+
+class ProcessTimeout(Exception):
+    """Raised by run(..., raise_on_timeout=True) after the process group was killed"""
+
+    def __init__(self, result: ProcessResult, timeout: float):
+        super().__init__(f"Command timed out after {timeout} seconds")
+        self.result = result
+
+
+class _StreamCapture:
+    """Keeps the first `limit` bytes in memory and spills the rest to a file"""
+
+    def __init__(self, name: str, limit: int, spill_dir: Optional[str], max_spill_bytes: int):
+        self.name = name
+        self.limit = limit
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self.head = bytearray()
+        self.total = 0
+        self.spill_path: Optional[str] = None
+        self._spill = None
+        self._spilled = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def feed(self, data: bytes) -> str:
+        """Store a chunk; returns its decoded text for streaming"""
+        self.total += len(data)
+        room = self.limit - len(self.head)
+        if self._spill is None and len(data) <= room:
+            self.head += data
+        else:
+            if self._spill is None:
+                fd, self.spill_path = tempfile.mkstemp(prefix=f"cmd_{self.name}_", suffix=".log", dir=self.spill_dir)
+                self._spill = os.fdopen(fd, "wb")
+                self._write_spill(bytes(self.head))
+            if room > 0:
+                self.head += data[:room]
+            self._write_spill(data)
+        return self._decoder.decode(data)
+
+    def _write_spill(self, data: bytes):
+        if self._spilled >= self.max_spill_bytes:
+            return
+        data = data[:self.max_spill_bytes - self._spilled]
+        self._spill.write(data)
+        self._spilled += len(data)
+
+    def close(self) -> str:
+        """Flush the spill file; returns any text held back by the decoder"""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        return self._decoder.decode(b"", final=True)
+
+    @property
+    def truncated(self) -> bool:
+        return self.spill_path is not None
+
+    def text(self) -> str:
+        return bytes(self.head).decode("utf-8", errors="replace")
+
+
+class ProcessEngine:
+    """
+    Shared async subprocess runner.
+
+    Args:
+        max_output_bytes: Per-stream bytes kept in memory (and returned)
+        max_spill_bytes: Per-stream bytes written to the spill file
+        per_user_limit: Concurrent processes allowed per user
+        spill_dir: Directory for spill files (system temp dir by default)
+        read_size: Pipe read size
+        kill_grace_seconds: Time between SIGTERM and SIGKILL for the process group
+    """
+
+    def __init__(self, max_output_bytes: int = 1024 * 1024, max_spill_bytes: int = 256 * 1024 * 1024,
+                 per_user_limit: int = 2, spill_dir: Optional[str] = None, read_size: int = 64 * 1024,
+                 kill_grace_seconds: float = 2.0):
+        self.max_output_bytes = max_output_bytes
+        self.max_spill_bytes = max_spill_bytes
+        self.per_user_limit = per_user_limit
+        self.spill_dir = spill_dir
+        self.read_size = read_size
+        self.kill_grace_seconds = kill_grace_seconds
+
+        # Running processes per user; guarded by the condition's lock since
+        # callers come from several threads and event loops
+        self._running: Dict[str, int] = {}
+        self._slots_changed = threading.Condition()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    # --- Public API ----------------------------------------------------
+
+    async def run(self, command: Union[str, Sequence[str]], *, timeout: Optional[float] = 30,
+                  cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None,
+                  user_id: str = "system", on_output: Optional[Callable[[OutputChunk], Any]] = None,
+                  raise_on_timeout: bool = False) -> ProcessResult:
+        """
+        Run a command and stream its output.
+
+        Args:
+            command: argv list (create_subprocess_exec) or a shell string
+            timeout: Seconds before the process group is killed (None = no limit)
+            cwd: Working directory
+            env: Environment (inherits the current one when None)
+            user_id: Key for the per-user concurrency limit
+            on_output: Called with each OutputChunk; may be sync or async
+            raise_on_timeout: Raise ProcessTimeout instead of returning a timed-out result
+
+        Raises:
+            FileNotFoundError: The executable does not exist
+            asyncio.CancelledError: The caller was cancelled (the process group is killed first)
+        """
+        async with self._user_slot(user_id):
+            started = time.monotonic()
+            process = await self._spawn(command, cwd, env)
+            stdout = _StreamCapture("stdout", self.max_output_bytes, self.spill_dir, self.max_spill_bytes)
+            stderr = _StreamCapture("stderr", self.max_output_bytes, self.spill_dir, self.max_spill_bytes)
+            readers = [
+                asyncio.ensure_future(self._pump(process.stdout, stdout, on_output)),
+                asyncio.ensure_future(self._pump(process.stderr, stderr, on_output)),
+            ]
+            finished = asyncio.gather(*readers, process.wait())
+            # Timeout/cancel leave the gather with a CancelledError nobody awaits
+            finished.add_done_callback(lambda future: future.cancelled() or future.exception())
+            timed_out = False
+            try:
+                await asyncio.wait_for(finished, timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                await self._kill_group(process)
+            except asyncio.CancelledError:
+                await self._kill_group(process)
+                raise
+            finally:
+                for reader in readers:
+                    reader.cancel()
+                for capture in (stdout, stderr):
+                    tail = capture.close()
+                    if tail and on_output:
+                        await self._notify(on_output, OutputChunk(capture.name, tail, capture.total))
+
+            result = ProcessResult(
+                command=command if isinstance(command, str) else list(command),
+                return_code=process.returncode,
+                stdout=stdout.text(),
+                stderr=stderr.text(),
+                stdout_bytes=stdout.total,
+                stderr_bytes=stderr.total,
+                stdout_truncated=stdout.truncated,
+                stderr_truncated=stderr.truncated,
+                stdout_file=stdout.spill_path,
+                stderr_file=stderr.spill_path,
+                timed_out=timed_out,
+                duration_seconds=time.monotonic() - started
+            )
+            if timed_out and raise_on_timeout:
+                raise ProcessTimeout(result, timeout)
+            return result
+
+    def run_sync(self, command: Union[str, Sequence[str]], **kwargs) -> ProcessResult:
+        """
+        Blocking wrapper for synchronous callers.
+
+        The process runs on the engine's background loop; the calling thread
+        blocks until it finishes (or times out).
+        """
+        loop = self._background_loop()
+        if threading.current_thread() is self._loop_thread:
+            raise RuntimeError("run_sync() called from the process engine loop; await run() instead")
+        future = asyncio.run_coroutine_threadsafe(self.run(command, **kwargs), loop)
+        return future.result()
+
+    def running(self, user_id: Optional[str] = None) -> Union[int, Dict[str, int]]:
+        """Number of running processes for a user (or all users)"""
+        with self._slots_changed:
+            if user_id is not None:
+                return self._running.get(user_id, 0)
+            return dict(self._running)
+
+    # --- Internals -----------------------------------------------------
+
+    def _try_acquire(self, user_id: str) -> bool:
+        """Take a slot if the user is under the limit; caller holds _slots_changed"""
+        if self._running.get(user_id, 0) >= self.per_user_limit:
+            return False
+        self._running[user_id] = self._running.get(user_id, 0) + 1
+        return True
+
+    def _release(self, user_id: str):
+        with self._slots_changed:
+            self._running[user_id] -= 1
+            if not self._running[user_id]:
+                del self._running[user_id]
+            self._slots_changed.notify_all()
+
+    @asynccontextmanager
+    async def _user_slot(self, user_id: str):
+        with self._slots_changed:
+            acquired = self._try_acquire(user_id)
+        if not acquired:
+            # Wait in a worker thread: slots are freed from other threads' loops
+            state = {"acquired": False, "cancelled": False}
+
+            def wait_for_slot():
+                with self._slots_changed:
+                    while not state["cancelled"]:
+                        if self._try_acquire(user_id):
+                            state["acquired"] = True
+                            return
+                        self._slots_changed.wait()
+
+            try:
+                await asyncio.to_thread(wait_for_slot)
+            except asyncio.CancelledError:
+                with self._slots_changed:
+                    state["cancelled"] = True
+                    self._slots_changed.notify_all()
+                    taken = state["acquired"]
+                if taken:
+                    self._release(user_id)  # Slot was granted just as the caller gave up
+                raise
+        try:
+            yield
+        finally:
+            self._release(user_id)
+
+    async def _spawn(self, command, cwd, env):
+        kwargs: Dict[str, Any] = dict(
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=env
+        )
+        if IS_WINDOWS:
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True  # own process group for group kill
+
+        if isinstance(command, str):
+            return await asyncio.create_subprocess_shell(command, **kwargs)
+        return await asyncio.create_subprocess_exec(*command, **kwargs)
+
+    async def _pump(self, pipe, capture: _StreamCapture, on_output):
+        while True:
+            data = await pipe.read(self.read_size)
+            if not data:
+                return
+            offset = capture.total
+            text = capture.feed(data)
+            if on_output and text:
+                await self._notify(on_output, OutputChunk(capture.name, text, offset))
+
+    @staticmethod
+    async def _notify(on_output, chunk: OutputChunk):
+        try:
+            outcome = on_output(chunk)
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception as e:
+            logger.warning(f"Output callback failed: {e}")
+
+    async def _kill_group(self, process):
+        """Terminate the process group, escalating to SIGKILL after the grace period"""
+        if process.returncode is not None:
+            return
+        try:
+            if IS_WINDOWS:
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        try:
+            await asyncio.wait_for(process.wait(), self.kill_grace_seconds)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            if IS_WINDOWS:
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        await process.wait()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="process-engine", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+
+_default_engine: Optional[ProcessEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_process_engine() -> ProcessEngine:
+    """Process-wide engine shared by tools"""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = ProcessEngine(
+                max_output_bytes=int(os.getenv("PROCESS_MAX_OUTPUT_BYTES", str(1024 * 1024))),
+                per_user_limit=int(os.getenv("PROCESS_PER_USER_LIMIT", "2"))
+            )
+        return _default_engine
@@ -10,15 +10,23 @@ This separation allows:
 - Consistent policy enforcement across all interactions
 - Domain experts to define their own context
 - Clear task focus without policy/domain confusion
+- Provider prompt caching: stable parts (policy, domain, tools) form a
+  byte-identical prefix, the per-request task comes last
 """
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Max distinct cacheable prefix hashes tracked for statistics (LRU)
+PREFIX_TRACKING_SIZE = 1024
+
 
 class PromptSection(str, Enum):
     """Prompt section types"""
@@ -203,6 +211,64 @@ class TaskPrompt:
         return "\n".join(lines)
 
 
+@dataclass
+class PromptSegment:
+    """One section of a composed prompt"""
+    section: PromptSection
+    content: str
+    cacheable: bool
+    content_hash: str = ""
+
+    def __post_init__(self):
+        if not self.content_hash:
+            self.content_hash = hashlib.sha256(self.content.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class SegmentedPrompt:
+    """
+    Ordered prompt segments, stable (cacheable) segments first.
+
+    text is identical to compose_prompt(); providers that support prompt
+    caching get segment boundaries to place cache breakpoints on.
+    """
+    segments: List[PromptSegment] = field(default_factory=list)
+
+    SEPARATOR = "\n\n"
+
+    @property
+    def text(self) -> str:
+        return self.SEPARATOR.join(segment.content for segment in self.segments)
+
+    @property
+    def cacheable_segments(self) -> List[PromptSegment]:
+        """Leading run of cacheable segments (the stable prefix)"""
+        prefix = []
+        for segment in self.segments:
+            if not segment.cacheable:
+                break
+            prefix.append(segment)
+        return prefix
+
+    @property
+    def volatile_segments(self) -> List[PromptSegment]:
+        return self.segments[len(self.cacheable_segments):]
+
+    @property
+    def prefix_hash(self) -> str:
+        """Hash identifying the stable prefix; equal hashes can share a provider cache entry"""
+        joined = ":".join(segment.content_hash for segment in self.cacheable_segments)
+        return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def prefix_text(self) -> str:
+        return self.SEPARATOR.join(segment.content for segment in self.cacheable_segments)
+
+    @property
+    def volatile_text(self) -> str:
+        return self.SEPARATOR.join(segment.content for segment in self.volatile_segments)
+
+
 class PromptStrategyService:
     """
     Service for composing 3-part prompts.
@@ -215,6 +281,12 @@ class PromptStrategyService:
         self._domain_templates: Dict[str, DomainPrompt] = {}
         self._initialize_default_domains()
 
+        # Prompt cache accounting (fed by LLMService.record_usage)
+        self._stats_lock = threading.Lock()
+        self._prefix_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._composed_prompts = 0
+        self._cache_usage: Dict[str, Dict[str, int]] = {}
+
     def _initialize_default_domains(self):
         """Initialize default domain templates"""
 
@@ -327,25 +399,78 @@ class PromptStrategyService:
         Returns:
             Complete system prompt string
         """
-        sections = []
+        return self.compose_segmented_prompt(policy, domain, task, tools_context).text
+
+    def compose_segmented_prompt(
+        self,
+        policy: PolicyPrompt,
+        domain: Optional[DomainPrompt],
+        task: TaskPrompt,
+        tools_context: Optional[str] = None
+    ) -> SegmentedPrompt:
+        """
+        Compose the prompt as ordered segments for provider prompt caching.
 
-        # 1. Policy Section
-        sections.append(policy.to_prompt())
+        Policy, domain and tools segments are cacheable and come first so
+        they form a stable prefix; the task segment changes every request.
+
+        Returns:
+            SegmentedPrompt (its text equals compose_prompt())
+        """
+        segments = [PromptSegment(PromptSection.POLICY, policy.to_prompt(), cacheable=True)]
 
-        # 2. Domain Section (if applicable)
         if domain:
-            sections.append(domain.to_prompt())
+            segments.append(PromptSegment(PromptSection.DOMAIN, domain.to_prompt(), cacheable=True))
 
-        # 3. Tools Context (if provided)
         if tools_context:
-            sections.append("## Available Tools\n")
-            sections.append(tools_context)
-            sections.append("")
-
-        # 4. Task Section
-        sections.append(task.to_prompt())
+            segments.append(PromptSegment(
+                PromptSection.TOOLS,
+                SegmentedPrompt.SEPARATOR.join(["## Available Tools\n", tools_context, ""]),
+                cacheable=True
+            ))
+
+        segments.append(PromptSegment(PromptSection.TASK, task.to_prompt(), cacheable=False))
+
+        prompt = SegmentedPrompt(segments)
+        with self._stats_lock:
+            prefix = prompt.prefix_hash
+            self._composed_prompts += 1
+            self._prefix_counts[prefix] = self._prefix_counts.get(prefix, 0) + 1
+            self._prefix_counts.move_to_end(prefix)
+            if len(self._prefix_counts) > PREFIX_TRACKING_SIZE:
+                self._prefix_counts.popitem(last=False)
+        return prompt
+
+    def record_usage(self, provider: str, usage: Dict[str, Any]):
+        """
+        Record prompt cache token counts from a provider response.
 
-        return "\n\n".join(sections)
+        Understands Anthropic (input_tokens, cache_read_input_tokens,
+        cache_creation_input_tokens) and OpenAI-compatible
+        (prompt_tokens, prompt_tokens_details.cached_tokens) usage blocks.
+        """
+        if not usage:
+            return
+
+        cache_read = usage.get("cache_read_input_tokens")
+        if cache_read is not None or "cache_creation_input_tokens" in usage:
+            cache_read = cache_read or 0
+            cache_write = usage.get("cache_creation_input_tokens") or 0
+            prompt_tokens = (usage.get("input_tokens") or 0) + cache_read + cache_write
+        else:
+            details = usage.get("prompt_tokens_details") or {}
+            cache_read = details.get("cached_tokens") or 0
+            cache_write = 0
+            prompt_tokens = usage.get("prompt_tokens") or usage.get("input_tokens") or 0
+
+        with self._stats_lock:
+            totals = self._cache_usage.setdefault(provider, {
+                "requests": 0, "prompt_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0
+            })
+            totals["requests"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["cache_read_tokens"] += cache_read
+            totals["cache_write_tokens"] += cache_write
 
     def get_domain_template(self, domain_name: str) -> Optional[DomainPrompt]:
         """Get a domain template by name"""
@@ -446,8 +571,21 @@ class PromptStrategyService:
 
     def get_prompt_statistics(self) -> Dict[str, Any]:
         """Get service statistics"""
+        with self._stats_lock:
+            cache_usage = {provider: dict(totals) for provider, totals in self._cache_usage.items()}
+            composed = self._composed_prompts
+            distinct_prefixes = len(self._prefix_counts)
+
+        for totals in cache_usage.values():
+            totals["cache_hit_ratio"] = (
+                round(totals["cache_read_tokens"] / totals["prompt_tokens"], 3) if totals["prompt_tokens"] else 0.0
+            )
+
         return {
             "registered_domains": len(self._domain_templates),
             "domain_names": list(self._domain_templates.keys()),
-            "policy_templates": len(self._policy_templates)
+            "policy_templates": len(self._policy_templates),
+            "composed_prompts": composed,
+            "distinct_cacheable_prefixes": distinct_prefixes,
+            "cache_usage": cache_usage
         }
@@ -0,0 +1,463 @@
+"""
+Provider Registry Service - LLM Provider Capability Registry
+
+Keeps the models, context windows and pricing available to each provider
+key in memory, so provider pages and model routing no longer call the
+provider APIs on every request.
+
+Features:
+- One snapshot per (provider, API key fingerprint); keys are kept in
+  memory only and never appear in snapshots or statistics
+- Model discovery through registered fetchers (the bridge registers its
+  OpenAI / Anthropic / LM Studio discovery functions)
+- Background refresh on a dedicated loop with jittered intervals and
+  jittered exponential backoff after failures; idle keys are dropped
+- Static context window and pricing metadata per model family
+- Routing API: pick_model(task_class, budget) picks the best model for a
+  task class within a per-call cost budget
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL_SECONDS = 3600
+REFRESH_JITTER = 0.2  # +/- 20% on every scheduled refresh
+FAILURE_BACKOFF_SECONDS = 60
+DEFAULT_IDLE_SECONDS = 24 * 3600
+LOCAL_KEY_FINGERPRINT = "local"
+
+ModelFetcher = Callable[[Optional[str]], Awaitable[List[str]]]
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Context window, pricing (USD per million tokens) and quality tier of a model family"""
+    context_window: int
+    max_output_tokens: int
+    input_cost_per_mtok: float
+    output_cost_per_mtok: float
+    tier: int  # 1 = small/fast, 2 = balanced, 3 = most capable
+
+
+# Longest matching prefix wins
+MODEL_PROFILES: Dict[str, ModelProfile] = {
+    "gpt-4o-mini": ModelProfile(128000, 16384, 0.15, 0.60, 1),
+    "gpt-4o": ModelProfile(128000, 16384, 2.50, 10.00, 3),
+    "gpt-4-turbo": ModelProfile(128000, 4096, 10.00, 30.00, 3),
+    "gpt-4": ModelProfile(8192, 8192, 30.00, 60.00, 3),
+    "gpt-3.5-turbo": ModelProfile(16385, 4096, 0.50, 1.50, 1),
+    "claude-opus-4": ModelProfile(200000, 32000, 15.00, 75.00, 3),
+    "claude-opus-4-5": ModelProfile(200000, 64000, 5.00, 25.00, 3),
+    "claude-sonnet-4": ModelProfile(200000, 64000, 3.00, 15.00, 3),
+    "claude-haiku-4": ModelProfile(200000, 64000, 1.00, 5.00, 2),
+    "claude-3-7-sonnet": ModelProfile(200000, 8192, 3.00, 15.00, 3),
+    "claude-3-5-sonnet": ModelProfile(200000, 8192, 3.00, 15.00, 3),
+    "claude-3-5-haiku": ModelProfile(200000, 8192, 0.80, 4.00, 2),
+    "claude-3-opus": ModelProfile(200000, 4096, 15.00, 75.00, 3),
+    "claude-3-sonnet": ModelProfile(200000, 4096, 3.00, 15.00, 2),
+    "claude-3-haiku": ModelProfile(200000, 4096, 0.25, 1.25, 1),
+}
+# Unknown hosted models and local (LM Studio) models
+UNKNOWN_MODEL_PROFILE = ModelProfile(8192, 2048, 0.0, 0.0, 1)
+LOCAL_PROVIDERS = {"lmstudio"}
+
+
+@dataclass(frozen=True)
+class TaskClass:
+    """Routing requirements of a kind of LLM call"""
+    min_tier: int
+    preferred_tier: int
+    min_context: int
+    input_tokens: int   # Typical prompt size, used for cost estimates
+    output_tokens: int
+
+
+TASK_CLASSES: Dict[str, TaskClass] = {
+    "classify": TaskClass(min_tier=1, preferred_tier=1, min_context=8000, input_tokens=1000, output_tokens=200),
+    "chat": TaskClass(min_tier=1, preferred_tier=2, min_context=16000, input_tokens=4000, output_tokens=1000),
+    "structured": TaskClass(min_tier=2, preferred_tier=2, min_context=16000, input_tokens=4000, output_tokens=1500),
+    "plan": TaskClass(min_tier=2, preferred_tier=3, min_context=32000, input_tokens=12000, output_tokens=2000),
+    "long_context": TaskClass(min_tier=1, preferred_tier=2, min_context=100000, input_tokens=80000, output_tokens=2000),
+}
+
+
+def key_fingerprint(provider: str, api_key: Optional[str]) -> str:
+    """Stable, non-reversible identifier of a provider key"""
+    if not api_key:
+        return LOCAL_KEY_FINGERPRINT
+    return hashlib.sha256(f"{provider}:{api_key}".encode("utf-8")).hexdigest()[:16]
+
+
+def profile_for(provider: str, model_id: str) -> ModelProfile:
+    if provider in LOCAL_PROVIDERS:
+        return UNKNOWN_MODEL_PROFILE
+    matches = [prefix for prefix in MODEL_PROFILES if model_id.startswith(prefix)]
+    return MODEL_PROFILES[max(matches, key=len)] if matches else UNKNOWN_MODEL_PROFILE
+
+
+@dataclass
+class ModelInfo:
+    """A discovered model with its routing metadata"""
+    provider: str
+    model_id: str
+    context_window: int
+    max_output_tokens: int
+    input_cost_per_mtok: float
+    output_cost_per_mtok: float
+    tier: int
+
+    @classmethod
+    def discovered(cls, provider: str, model_id: str) -> "ModelInfo":
+        profile = profile_for(provider, model_id)
+        return cls(provider, model_id, profile.context_window, profile.max_output_tokens,
+                   profile.input_cost_per_mtok, profile.output_cost_per_mtok, profile.tier)
+
+    def estimate_cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_cost_per_mtok + output_tokens * self.output_cost_per_mtok) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_id,
+            "context_window": self.context_window,
+            "max_output_tokens": self.max_output_tokens,
+            "input_cost_per_mtok": self.input_cost_per_mtok,
+            "output_cost_per_mtok": self.output_cost_per_mtok,
+            "tier": self.tier
+        }
+
+
+@dataclass
+class ProviderSnapshot:
+    """Discovered models of one provider key"""
+    provider: str
+    key_fingerprint: str
+    models: List[ModelInfo] = field(default_factory=list)
+    available: bool = False
+    refreshed_at: Optional[float] = None  # wall clock, for display
+    error: Optional[str] = None
+
+    @property
+    def model_ids(self) -> List[str]:
+        return [model.model_id for model in self.models]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "key_fingerprint": self.key_fingerprint,
+            "available": self.available,
+            "models": [model.to_dict() for model in self.models],
+            "refreshed_at": self.refreshed_at,
+            "error": self.error
+        }
+
+
+@dataclass
+class ModelChoice:
+    """Result of pick_model"""
+    provider: str
+    model: str
+    task_class: str
+    estimated_cost_usd: float
+    context_window: int
+    tier: int
+
+
+@dataclass
+class _RegistryEntry:
+    provider: str
+    api_key: Optional[str]
+    snapshot: Optional[ProviderSnapshot] = None
+    failures: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    next_refresh_at: float = 0.0
+    refreshing: Optional["asyncio.Future"] = None
+    task: Optional["asyncio.Task"] = None
+
+
+class ProviderRegistryService:
+    """
+    In-memory registry of provider models, refreshed in the background.
+
+    get_snapshot() is a memory read once a key has been discovered; only the
+    first lookup of a new key waits for discovery (shared by concurrent callers).
+    """
+
+    def __init__(
+        self,
+        fetchers: Optional[Dict[str, ModelFetcher]] = None,
+        refresh_interval_seconds: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        jitter: float = REFRESH_JITTER
+    ):
+        """
+        Initialize provider registry.
+
+        Args:
+            fetchers: provider -> async fetcher(api_key) returning model ids
+            refresh_interval_seconds: Mean time between background refreshes
+            idle_seconds: Keys not looked up for this long stop refreshing and are dropped
+            jitter: Relative +/- spread applied to every refresh delay
+        """
+        self._fetchers: Dict[str, ModelFetcher] = dict(fetchers or {})
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.idle_seconds = idle_seconds
+        self.jitter = jitter
+
+        self._entries: Dict[Tuple[str, str], _RegistryEntry] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+        self._stats = {
+            "lookups": 0,
+            "memory_hits": 0,
+            "cold_discoveries": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "evictions": 0
+        }
+
+    def register_fetcher(self, provider: str, fetcher: ModelFetcher):
+        """Register the model discovery function of a provider"""
+        self._fetchers[provider] = fetcher
+
+    # ==================== LOOKUP ====================
+
+    async def get_snapshot(self, provider: str, api_key: Optional[str], wait: bool = True) -> Optional[ProviderSnapshot]:
+        """
+        Models of a provider key.
+
+        Args:
+            provider: Provider id (openai, anthropic, lmstudio)
+            api_key: The caller's key, None for local providers
+            wait: Wait for discovery of a key seen for the first time;
+                with wait=False discovery is only scheduled and None returned
+
+        Returns:
+            ProviderSnapshot, or None when not discovered yet (wait=False)
+        """
+        key = (provider, key_fingerprint(provider, api_key))
+        with self._lock:
+            self._stats["lookups"] += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _RegistryEntry(provider, api_key)
+            entry.last_used = time.monotonic()
+            if entry.snapshot is not None:
+                self._stats["memory_hits"] += 1
+                return entry.snapshot
+
+        future = self._ensure_discovery(key)
+        if not wait:
+            return None
+        return await asyncio.wrap_future(future)
+
+    def peek(self, provider: str, api_key: Optional[str]) -> Optional[ProviderSnapshot]:
+        """Snapshot if already discovered, without scheduling anything"""
+        entry = self._entries.get((provider, key_fingerprint(provider, api_key)))
+        return entry.snapshot if entry else None
+
+    async def refresh(self, provider: str, api_key: Optional[str]) -> ProviderSnapshot:
+        """Rediscover a key now (e.g. after the user tests or changes it)"""
+        key = (provider, key_fingerprint(provider, api_key))
+        with self._lock:
+            entry = self._entries.setdefault(key, _RegistryEntry(provider, api_key))
+            entry.last_used = time.monotonic()
+        future = asyncio.run_coroutine_threadsafe(self._refresh(key), self._background_loop())
+        return await asyncio.wrap_future(future)
+
+    def forget(self, provider: str, api_key: Optional[str] = None):
+        """Drop a provider key (or every key of the provider when api_key is None)"""
+        with self._lock:
+            if api_key is not None:
+                keys = [(provider, key_fingerprint(provider, api_key))]
+            else:
+                keys = [key for key in self._entries if key[0] == provider]
+            entries = [self._entries.pop(key) for key in keys if key in self._entries]
+        for entry in entries:
+            if entry.task is not None:
+                self._background_loop().call_soon_threadsafe(entry.task.cancel)
+
+    def snapshots(self, providers: Optional[Iterable[str]] = None) -> List[ProviderSnapshot]:
+        """All discovered snapshots, optionally limited to some providers"""
+        wanted = set(providers) if providers is not None else None
+        with self._lock:
+            return [
+                entry.snapshot for (provider, _), entry in self._entries.items()
+                if entry.snapshot is not None and (wanted is None or provider in wanted)
+            ]
+
+    # ==================== ROUTING ====================
+
+    def pick_model(
+        self,
+        task_class: str,
+        budget: Optional[float] = None,
+        snapshots: Optional[Iterable[ProviderSnapshot]] = None,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None
+    ) -> Optional[ModelChoice]:
+        """
+        Pick the model for a task class.
+
+        Candidates are the available models of the given snapshots (all
+        discovered snapshots by default) that reach the task's tier and
+        context window and whose estimated cost stays within budget. The
+        one closest to the preferred tier wins, then the cheapest.
+
+        Args:
+            task_class: One of TASK_CLASSES (classify, chat, structured, plan, long_context)
+            budget: Maximum estimated cost per call in USD, None for no limit
+            snapshots: Provider snapshots to choose from
+            input_tokens, output_tokens: Override the task class' typical call size
+
+        Returns:
+            ModelChoice, or None if no model qualifies
+        """
+        spec = TASK_CLASSES.get(task_class)
+        if spec is None:
+            raise ValueError(f"Unknown task class '{task_class}', expected one of {sorted(TASK_CLASSES)}")
+        input_tokens = input_tokens or spec.input_tokens
+        output_tokens = output_tokens or spec.output_tokens
+        needed_context = max(spec.min_context, input_tokens + output_tokens)
+
+        candidates = []
+        for snapshot in (snapshots if snapshots is not None else self.snapshots()):
+            if not snapshot or not snapshot.available:
+                continue
+            for model in snapshot.models:
+                if model.tier < spec.min_tier or model.context_window < needed_context:
+                    continue
+                cost = model.estimate_cost(input_tokens, output_tokens)
+                if budget is not None and cost > budget:
+                    continue
+                candidates.append((abs(model.tier - spec.preferred_tier), cost, model))
+
+        if not candidates:
+            return None
+        _, cost, model = min(candidates, key=lambda candidate: (candidate[0], candidate[1]))
+        return ModelChoice(model.provider, model.model_id, task_class, cost, model.context_window, model.tier)
+
+    # ==================== DISCOVERY ====================
+
+    def _ensure_discovery(self, key: Tuple[str, str]):
+        """Start (or join) discovery of a key; returns a concurrent future"""
+        loop = self._background_loop()
+        with self._lock:
+            entry = self._entries[key]
+            if entry.refreshing is None:
+                entry.refreshing = asyncio.run_coroutine_threadsafe(self._discover(key), loop)
+                self._stats["cold_discoveries"] += 1
+            return entry.refreshing
+
+    async def _discover(self, key: Tuple[str, str]) -> ProviderSnapshot:
+        try:
+            return await self._refresh(key)
+        finally:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = None
+
+    async def _refresh(self, key: Tuple[str, str]) -> ProviderSnapshot:
+        provider, fingerprint = key
+        with self._lock:
+            entry = self._entries.get(key)
+        api_key = entry.api_key if entry else None
+        fetcher = self._fetchers.get(provider)
+
+        snapshot = ProviderSnapshot(provider, fingerprint)
+        try:
+            if fetcher is None:
+                raise LookupError(f"No model discovery registered for provider '{provider}'")
+            model_ids = await fetcher(api_key)
+            snapshot.models = [ModelInfo.discovered(provider, model_id) for model_id in model_ids]
+            snapshot.available = bool(snapshot.models)
+            self._stats["refreshes"] += 1
+            failed = False
+        except Exception as e:
+            logger.warning(f"Model discovery failed for {provider}: {e}")
+            snapshot.error = str(e)
+            self._stats["refresh_failures"] += 1
+            failed = True
+        snapshot.refreshed_at = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Keep serving the last good model list when a refresh fails
+                if not failed or entry.snapshot is None or not entry.snapshot.available:
+                    entry.snapshot = snapshot
+                entry.failures = entry.failures + 1 if failed else 0
+                entry.next_refresh_at = time.monotonic() + self._next_delay(entry.failures)
+                if entry.task is None:
+                    entry.task = asyncio.get_running_loop().create_task(self._refresh_forever(key))
+            current = entry.snapshot if entry is not None else snapshot
+        return current
+
+    def _next_delay(self, failures: int) -> float:
+        """Jittered refresh interval; after failures a jittered exponential backoff"""
+        if failures:
+            base = min(FAILURE_BACKOFF_SECONDS * (2 ** (failures - 1)), self.refresh_interval_seconds)
+        else:
+            base = self.refresh_interval_seconds
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _refresh_forever(self, key: Tuple[str, str]):
+        """Background refresh of one key until it goes idle or is forgotten"""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return
+                if time.monotonic() - entry.last_used > self.idle_seconds:
+                    del self._entries[key]
+                    self._stats["evictions"] += 1
+                    return
+                delay = max(entry.next_refresh_at - time.monotonic(), 0)
+            await asyncio.sleep(delay)
+            with self._lock:
+                entry = self._entries.get(key)
+                due = entry is not None and time.monotonic() >= entry.next_refresh_at
+            if due:
+                await self._refresh(key)
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="provider-registry", daemon=True
+                ).start()
+            return self._loop
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get provider registry statistics."""
+        with self._lock:
+            return {
+                **self._stats,
+                "keys": len(self._entries),
+                "providers": sorted({provider for provider, _ in self._entries}),
+                "models": sum(len(e.snapshot.models) for e in self._entries.values() if e.snapshot)
+            }
+
+
+_default_registry: Optional[ProviderRegistryService] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_provider_registry() -> ProviderRegistryService:
+    """Process-wide provider registry shared by the bridge and LLMService"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ProviderRegistryService()
+        return _default_registry
@@ -8,12 +8,15 @@ CLAUDE.md COMPLIANT:
 - Action and value card support
 - Consistent user experience
 - Enhanced with tool card discovery and dynamic generation
+- Stale-while-revalidate card data cache per (user_id, card_id)
 """
 
 import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Optional, Union
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import Enum
@@ -23,6 +26,13 @@ from ..contracts.base_types import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+# Card data TTL when the card metadata does not set cache_ttl
+DEFAULT_CARD_TTL_SECONDS = 60
+# Failed refreshes are retried sooner than successful ones expire
+FAILED_REFRESH_TTL_SECONDS = 10
+# Upper bound on concurrent data source calls per refresh batch
+MAX_CONCURRENT_REFRESHES = 8
+
 
 class CardType(str, Enum):
     """Settings card types"""
@@ -109,6 +119,18 @@ class SettingsCard:
         return asdict(self)
 
 
+@dataclass
+class CachedCardData:
+    """Refreshed card data for one (user_id, card_id)"""
+    card: SettingsCard
+    refreshed_at: float      # time.time() of the refresh
+    ttl: float
+    success: bool = True
+    
+    def is_fresh(self, now: float) -> bool:
+        return now - self.refreshed_at < self.ttl
+
+
 class SettingsCardService:
     """Service for managing adaptive settings cards with tool discovery"""
     
@@ -125,6 +147,18 @@ class SettingsCardService:
             "general": 6,
             "system": 7
         }
+        
+        # Stale-while-revalidate card data cache
+        self.max_concurrent_refreshes = MAX_CONCURRENT_REFRESHES
+        self._card_cache: Dict[Tuple[str, str], CachedCardData] = {}
+        self._card_generations: Dict[Tuple[str, str], int] = {}
+        self._refreshing: set = set()
+        self._cache_lock = threading.Lock()
+        self._card_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        
+        # Background refreshes outlive the per-request event loops of the bridge
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
         logger.info("🃏 Settings Card Service initialized")
     
     def register_card(self, card: SettingsCard) -> None:
@@ -169,15 +203,32 @@ class SettingsCardService:
     def clear_registry(self) -> None:
         """Clear all registered cards (useful for testing)"""
         self.card_registry.clear()
+        with self._cache_lock:
+            self._card_cache.clear()
         logger.info("🗑️ Card registry cleared")
     
-    async def get_user_cards(self, user_id: str, category: Optional[str] = None) -> List[Dict[str, Any]]:
+    def add_card_listener(self, listener: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Register a push channel: listener(user_id, card_dict) for every background refresh"""
+        self._card_listeners.append(listener)
+    
+    def remove_card_listener(self, listener: Callable[[str, Dict[str, Any]], None]) -> None:
+        if listener in self._card_listeners:
+            self._card_listeners.remove(listener)
+    
+    async def get_user_cards(self, user_id: str, category: Optional[str] = None,
+                             wait_for_fresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get all available settings cards for user
         
+        Cached card data is returned immediately; expired entries are served
+        stale and refreshed in the background (pushed to card listeners when
+        done). Only cards never loaded for this user are refreshed inline, all
+        of them concurrently.
+        
         Args:
             user_id: User ID
             category: Optional category filter
+            wait_for_fresh: Refresh expired cards inline instead of serving stale
             
         Returns:
             List of card dictionaries with refreshed data
@@ -191,18 +242,42 @@ class SettingsCardService:
             # Filter by permissions (future implementation)
             # cards = [card for card in cards if self._check_user_permission(user_id, card)]
             
-            # Refresh card data
-            refreshed_cards = []
+            now = time.time()
+            card_dicts = {}
+            cold_cards = []
+            stale_cards = []
             for card in cards:
-                try:
-                    refreshed_card = await self._refresh_card_data(card, user_id)
-                    refreshed_cards.append(refreshed_card.to_dict())
-                except Exception as e:
-                    logger.warning(f"Failed to refresh card {card.card_id}: {e}")
-                    # Include card with original data
-                    refreshed_cards.append(card.to_dict())
+                if not self._get_data_source(card):
+                    card_dicts[card.card_id] = self._card_payload(card, None, "static")
+                    continue
+                
+                with self._cache_lock:
+                    entry = self._card_cache.get((user_id, card.card_id))
+                if entry is None or (wait_for_fresh and not entry.is_fresh(now)):
+                    cold_cards.append(card)
+                elif entry.is_fresh(now):
+                    card_dicts[card.card_id] = self._card_payload(entry.card, entry, "fresh")
+                else:
+                    card_dicts[card.card_id] = self._card_payload(entry.card, entry, "stale")
+                    stale_cards.append(card)
+            
+            # First load for this user: refresh concurrently, bounded
+            if cold_cards:
+                entries = await self._refresh_cards(cold_cards, user_id)
+                for card, entry in zip(cold_cards, entries):
+                    if entry is None:
+                        # Include card with original data
+                        card_dicts[card.card_id] = self._card_payload(card, None, "error")
+                    else:
+                        card_dicts[card.card_id] = self._card_payload(
+                            entry.card, entry, "fresh" if entry.success else "error"
+                        )
+            
+            if stale_cards:
+                self._schedule_background_refresh(stale_cards, user_id)
             
             # Sort by category and order
+            refreshed_cards = list(card_dicts.values())
             refreshed_cards.sort(key=lambda c: (
                 self.category_order.get(c['category'], 999),
                 c.get('order', 0)
@@ -214,6 +289,42 @@ class SettingsCardService:
             logger.error(f"Failed to get user cards: {e}")
             return []
     
+    def invalidate_user_cards(self, user_id: str, card_ids: Optional[List[str]] = None,
+                              refresh: bool = True) -> int:
+        """
+        Drop cached card data for a user (all cards, or the given card ids)
+        
+        Refreshes already in flight for these cards will not store their
+        (now outdated) result. With refresh=True the cards are reloaded in the
+        background and pushed to card listeners.
+        """
+        with self._cache_lock:
+            keys = [key for key in list(self._card_cache) + list(self._refreshing)
+                    if key[0] == user_id and (card_ids is None or key[1] in card_ids)]
+            if card_ids is not None:
+                keys += [(user_id, card_id) for card_id in card_ids]
+            keys = set(keys)
+            for key in keys:
+                self._card_cache.pop(key, None)
+                self._card_generations[key] = self._card_generations.get(key, 0) + 1
+        
+        if refresh:
+            cards = [self.card_registry[key[1]] for key in keys
+                     if key[1] in self.card_registry and self._get_data_source(self.card_registry[key[1]])]
+            if cards:
+                self._schedule_background_refresh(cards, user_id, force=True)
+        
+        logger.debug(f"🃏 Invalidated {len(keys)} cached cards for {user_id}")
+        return len(keys)
+    
+    def _related_card_ids(self, card: SettingsCard) -> List[str]:
+        """Cards backed by the same tool (an OAuth action also changes mapping/status cards)"""
+        tool_name = card.metadata.get('tool_name') if card.metadata else None
+        if not tool_name:
+            return [card.card_id]
+        return [other.card_id for other in self.card_registry.values()
+                if other.card_id == card.card_id or (other.metadata and other.metadata.get('tool_name') == tool_name)]
+    
     async def execute_card_action(self, 
                                   card_id: str, 
                                   action_id: str, 
@@ -281,6 +392,9 @@ class SettingsCardService:
             
             logger.info(f"🎬 Executed card action {card_id}.{action_id}: {result.success}")
             
+            if result.success:
+                self.invalidate_user_cards(user_id, self._related_card_ids(card))
+            
             return result.to_dict()
             
         except Exception as e:
@@ -339,15 +453,110 @@ class SettingsCardService:
             
             logger.info(f"💾 Saved card values {card_id}: {result.success}")
             
+            if result.success:
+                self.invalidate_user_cards(user_id, self._related_card_ids(card))
+            
             return result.to_dict()
             
         except Exception as e:
             logger.error(f"Card values save failed: {e}")
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def _get_data_source(card: SettingsCard) -> Optional[Dict[str, Any]]:
+        return card.metadata.get('data_source') if card.metadata else None
+    
+    def _card_ttl(self, card: SettingsCard) -> float:
+        """cache_ttl from card metadata or its data source, else the default"""
+        metadata = card.metadata or {}
+        ttl = metadata.get('cache_ttl')
+        if ttl is None:
+            ttl = (self._get_data_source(card) or {}).get('cache_ttl')
+        return float(ttl) if ttl is not None else DEFAULT_CARD_TTL_SECONDS
+    
+    @staticmethod
+    def _card_payload(card: SettingsCard, entry: Optional[CachedCardData], data_state: str) -> Dict[str, Any]:
+        payload = card.to_dict()
+        payload['data_state'] = data_state  # static, fresh, stale, error
+        payload['refreshed_at'] = datetime.fromtimestamp(entry.refreshed_at).isoformat() if entry else None
+        return payload
+    
+    async def _refresh_cards(self, cards: List[SettingsCard], user_id: str,
+                             notify: bool = False) -> List[Optional[CachedCardData]]:
+        """Refresh cards concurrently (bounded) and store the results in the cache"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_refreshes)
+        
+        async def refresh_one(card: SettingsCard) -> Optional[CachedCardData]:
+            key = (user_id, card.card_id)
+            with self._cache_lock:
+                generation = self._card_generations.get(key, 0)
+            try:
+                async with semaphore:
+                    refreshed = await self._refresh_card_data(card, user_id)
+            except Exception as e:
+                logger.warning(f"Failed to refresh card {card.card_id}: {e}")
+                return None
+            
+            # _refresh_card_data hands back the original card when the data source failed
+            success = refreshed is not card
+            entry = CachedCardData(
+                card=refreshed,
+                refreshed_at=time.time(),
+                ttl=self._card_ttl(card) if success else FAILED_REFRESH_TTL_SECONDS,
+                success=success
+            )
+            with self._cache_lock:
+                if self._card_generations.get(key, 0) != generation:
+                    return entry  # Invalidated meanwhile; a newer refresh owns the slot
+                self._card_cache[key] = entry
+            
+            if notify:
+                self._notify_card_listeners(user_id, self._card_payload(
+                    entry.card, entry, "fresh" if success else "error"
+                ))
+            return entry
+        
+        return list(await asyncio.gather(*(refresh_one(card) for card in cards)))
+    
+    def _schedule_background_refresh(self, cards: List[SettingsCard], user_id: str, force: bool = False) -> None:
+        """Refresh cards on the background loop; cards already being refreshed are skipped"""
+        with self._cache_lock:
+            keys = {(user_id, card.card_id) for card in cards}
+            if not force:
+                keys -= self._refreshing
+            self._refreshing |= keys
+        pending = [card for card in cards if (user_id, card.card_id) in keys]
+        if not pending:
+            return
+        
+        async def run():
+            try:
+                await self._refresh_cards(pending, user_id, notify=True)
+            finally:
+                with self._cache_lock:
+                    self._refreshing -= keys
+        
+        asyncio.run_coroutine_threadsafe(run(), self._background_loop())
+    
+    def _notify_card_listeners(self, user_id: str, card_dict: Dict[str, Any]) -> None:
+        for listener in list(self._card_listeners):
+            try:
+                listener(user_id, card_dict)
+            except Exception as e:
+                logger.error(f"Card listener error: {e}")
+    
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="settings-card-refresh", daemon=True
+                ).start()
+            return self._loop
+    
     async def _refresh_card_data(self, card: SettingsCard, user_id: str) -> SettingsCard:
         """Refresh card data from data source"""
-        data_source = card.metadata.get('data_source') if card.metadata else None
+        data_source = self._get_data_source(card)
         if not data_source:
             return card
         
@@ -256,7 +256,8 @@ class ToolCardDiscoveryService:
                     'save_action': self._add_tool_name_to_action(card_data.get('save_action'), tool_name),
                     'metrics': card_data.get('metrics'),
                     'status_display': card_data.get('status_display'),
-                    'actions': actions if actions else None
+                    'actions': actions if actions else None,
+                    'cache_ttl': card_data.get('cache_ttl')
                 }
             )
             
@@ -6,6 +6,7 @@ Implements real-time event emission for tool execution lifecycle:
 - tool_call_completed: When a tool execution completes successfully
 - tool_call_failed: When a tool execution fails
 - tool_call_progress: For long-running operations (optional)
+- tool_call_output: Incremental stdout/stderr of running commands
 
 Events include trace_id for correlation and observability.
 """
@@ -26,6 +27,7 @@ class ToolEventType(str, Enum):
     COMPLETED = "tool_call_completed"
     FAILED = "tool_call_failed"
     PROGRESS = "tool_call_progress"
+    OUTPUT = "tool_call_output"
     CONFIRMATION_REQUIRED = "tool_call_confirmation_required"
     CONFIRMATION_RECEIVED = "tool_call_confirmation_received"
     CANCELLED = "tool_call_cancelled"
@@ -286,6 +288,44 @@ class ToolEventsService:
         )
         self._emit_event(event)
 
+    def emit_output(
+        self,
+        trace_id: str,
+        request_id: str,
+        tool_name: str,
+        capability_name: str,
+        user_id: str,
+        company_id: str,
+        stream: str,
+        text: str,
+        offset: int = 0
+    ):
+        """
+        Emit tool_call_output event.
+
+        Args:
+            trace_id: Trace ID for correlation
+            request_id: Request ID
+            tool_name: Name of the tool
+            capability_name: Name of the capability
+            user_id: User ID
+            company_id: Company ID
+            stream: "stdout" or "stderr"
+            text: Output chunk
+            offset: Bytes of the stream emitted before this chunk
+        """
+        event = ToolEvent(
+            event_type=ToolEventType.OUTPUT,
+            trace_id=trace_id,
+            request_id=request_id,
+            tool_name=tool_name,
+            capability_name=capability_name,
+            user_id=user_id,
+            company_id=company_id,
+            metadata={"stream": stream, "text": text, "offset": offset}
+        )
+        self._emit_event(event)
+
     def emit_confirmation_required(
         self,
         trace_id: str,
@@ -328,10 +368,11 @@ class ToolEventsService:
 
     def _emit_event(self, event: ToolEvent):
         """Emit an event via Socket.IO and call handlers"""
-        # Store in history
-        self._event_history.append(event)
-        if len(self._event_history) > self._max_history:
-            self._event_history = self._event_history[-self._max_history:]
+        # Store in history (output chunks are streamed only; they would crowd out lifecycle events)
+        if event.event_type != ToolEventType.OUTPUT:
+            self._event_history.append(event)
+            if len(self._event_history) > self._max_history:
+                self._event_history = self._event_history[-self._max_history:]
 
         # Emit via Socket.IO
         if self.socketio:
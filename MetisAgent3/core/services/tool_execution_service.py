@@ -12,13 +12,15 @@ CLAUDE.md COMPLIANT:
 import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
 from ..contracts.base_types import ExecutionContext
+from ..contracts.tool_envelope import OperationType
 from ..managers.tool_manager import ToolManager
 from ..managers.user_manager import UserManager
+from .tool_result_cache import REFRESH_PARAMETER, ToolResultCache, cache_tenant, classify_operation, tenant_scopes
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,7 @@ class ToolExecutionResponse:
     error: Optional[str] = None
     execution_time_ms: Optional[int] = None
     timestamp: Optional[str] = None
+    cache_status: Optional[str] = None  # "hit", "coalesced", "miss" or "bypass" (forced refresh) for cacheable reads
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -56,16 +59,19 @@ class ToolExecutionResponse:
             "data": self.data,
             "error": self.error,
             "execution_time_ms": self.execution_time_ms,
-            "timestamp": self.timestamp
+            "timestamp": self.timestamp,
+            "cache_status": self.cache_status
         }
 
 
 class ToolExecutionService:
     """Generic service for executing tool capabilities"""
     
-    def __init__(self, tool_manager: ToolManager, user_manager: UserManager = None):
+    def __init__(self, tool_manager: ToolManager, user_manager: UserManager = None,
+                 result_cache: Optional[ToolResultCache] = None):
         self.tool_manager = tool_manager
         self.user_manager = user_manager
+        self.result_cache = result_cache or ToolResultCache()
         logger.info("🔧 Tool Execution Service initialized")
     
     async def execute_tool_capability(self, request: ToolExecutionRequest) -> ToolExecutionResponse:
@@ -113,29 +119,47 @@ class ToolExecutionService:
                 **request.parameters
             }
             
-            # 5. Execute tool capability
+            # 5. Execute tool capability - read-only capabilities with a declared
+            #    TTL go through the single-flight result cache
+            get_capability_info = getattr(tool_instance, 'get_capability_info', None)
+            capability_info = get_capability_info(request.capability) if get_capability_info else None
+            operation = classify_operation(capability_info, request.capability, request.action)
+            scopes = tenant_scopes(request.user_id, request.parameters, request.context.application_id)
+            ttl = self.result_cache.ttl_for(capability_info, request.action) if operation == OperationType.READ else None
+
             logger.info(f"🔄 Executing {request.tool_name}.{request.capability}.{request.action} for user {request.user_id}")
-            
-            result = await tool_instance.execute(request.capability, input_data, request.context)
-            
-            execution_time = int((time.time() - start_time) * 1000)
-            
-            # 6. Handle result - support both dict and AgentResult formats
-            if isinstance(result, dict):
-                success = result.get('success', False)
-                data = result if success else {}
-                error = result.get('error') if not success else None
-            elif hasattr(result, 'success') and hasattr(result, 'data'):  # AgentResult object
-                success = result.success
-                data = result.data or {}
-                error = result.error if hasattr(result, 'error') else None
-            else:
-                logger.error(f"❌ Tool returned invalid response format: {type(result)}")
-                return self._error_response(
-                    request, f"Tool returned invalid response format: {type(result)}",
-                    execution_time=execution_time
+
+            async def run_tool():
+                result = await tool_instance.execute(request.capability, input_data, request.context)
+                return self._normalize_result(result)
+
+            cache_status = None
+            if ttl and request.parameters.get(REFRESH_PARAMETER):
+                # Forced revalidation: run the tool, and drop the results it supersedes
+                tenant = cache_tenant(scopes, capability_info.cache_scope)
+                try:
+                    outcome = await run_tool()
+                finally:
+                    self.result_cache.invalidate(request.tool_name, [tenant])
+                cache_status = "bypass"
+            elif ttl:
+                tenant = cache_tenant(scopes, capability_info.cache_scope)
+                outcome, cache_status = await self.result_cache.get_or_execute(
+                    request.tool_name, request.capability, request.action, request.parameters, (tenant,), ttl,
+                    run_tool, should_cache=lambda outcome: outcome[0]
                 )
-            
+            else:
+                try:
+                    outcome = await run_tool()
+                finally:
+                    if operation != OperationType.READ:
+                        self.result_cache.invalidate(request.tool_name, scopes)
+
+            execution_time = int((time.time() - start_time) * 1000)
+
+            # 6. Handle result
+            success, data, error = outcome
+
             if success:
                 logger.info(f"✅ Tool execution successful: {request.tool_name}.{request.capability}.{request.action} ({execution_time}ms)")
             else:
@@ -149,7 +173,8 @@ class ToolExecutionService:
                 data=data,
                 error=error,
                 execution_time_ms=execution_time,
-                timestamp=datetime.now().isoformat()
+                timestamp=datetime.now().isoformat(),
+                cache_status=cache_status
             )
             
         except Exception as e:
@@ -160,6 +185,30 @@ class ToolExecutionService:
                 execution_time=execution_time
             )
     
+    def _normalize_result(self, result: Any) -> Tuple[bool, Dict[str, Any], Optional[str]]:
+        """
+        Normalize a tool result - supports both dict and AgentResult formats
+        
+        Returns:
+            Tuple of (success, data, error)
+        """
+        if isinstance(result, dict):
+            success = result.get('success', False)
+            data = result if success else {}
+            error = result.get('error') if not success else None
+        elif hasattr(result, 'success') and hasattr(result, 'data'):  # AgentResult object
+            success = result.success
+            data = result.data or {}
+            error = result.error if hasattr(result, 'error') else None
+        else:
+            logger.error(f"❌ Tool returned invalid response format: {type(result)}")
+            return False, {}, f"Tool returned invalid response format: {type(result)}"
+        return success, data, error
+    
+    def invalidate_cached_results(self, tool_name: str, user_id: Optional[str] = None) -> int:
+        """Drop cached read results of a tool, for one user or for everyone"""
+        return self.result_cache.invalidate(tool_name, [f"user:{user_id}"] if user_id else None)
+    
     def _validate_request(self, request: ToolExecutionRequest) -> Optional[str]:
         """
         Validate tool execution request
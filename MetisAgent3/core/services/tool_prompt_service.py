@@ -9,9 +9,11 @@ CLAUDE.md COMPLIANT:
 - Context-aware tool prompting
 """
 
+import hashlib
 import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -20,6 +22,16 @@ from ..managers.memory_manager import GraphMemoryService
 
 logger = logging.getLogger(__name__)
 
+# JSON Schema type -> Python type(s) accepted for a parameter
+JSON_TYPE_MAP = {
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool,
+    'array': list,
+    'object': dict
+}
+
 
 @dataclass
 class ToolPromptContext:
@@ -37,11 +49,138 @@ class ToolPromptContext:
             self.recent_tool_usage = []
 
 
+@dataclass
+class CompiledCapability:
+    """Prompt artifacts and argument validator precompiled from one capability"""
+    name: str
+    capability: Dict[str, Any]               # Source capability definition
+    function_name: str
+    function_def: Optional[Dict[str, Any]]   # OpenAI function calling entry
+    xml: Optional[str]                       # Anthropic XML <tool> snippet
+    parameters: Dict[str, Any]               # Input schema as JSON Schema object
+    validate: Callable[[Dict[str, Any]], List[str]]  # arguments -> error messages
+
+
+def compile_argument_validator(input_schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], List[str]]:
+    """
+    Build a validator closure for a capability input schema.
+
+    Required parameters and expected types are resolved once; the returned
+    function only walks the arguments. Errors match validate_tool_call().
+    """
+    if not isinstance(input_schema, dict):
+        input_schema = {}
+
+    required = tuple(
+        name for name, config in input_schema.items()
+        if isinstance(config, dict) and config.get('required', False)
+    )
+    type_checks: Dict[str, Tuple[Any, str]] = {}
+    for name, config in input_schema.items():
+        if isinstance(config, dict):
+            expected_type = config.get('type', 'string')
+            python_type = JSON_TYPE_MAP.get(expected_type.lower()) if isinstance(expected_type, str) else None
+            if python_type:
+                type_checks[name] = (python_type, expected_type)
+
+    def validate(arguments: Dict[str, Any]) -> List[str]:
+        errors = []
+        for name in required:
+            if name not in arguments:
+                errors.append(f"Required parameter '{name}' missing")
+            elif arguments[name] is None:
+                errors.append(f"Required parameter '{name}' cannot be null")
+        for name, value in arguments.items():
+            check = type_checks.get(name)
+            # null is allowed unless the parameter is required
+            if check and value is not None and not isinstance(value, check[0]):
+                errors.append(f"Parameter '{name}' should be of type '{check[1]}'")
+        return errors
+
+    return validate
+
+
 class ToolPromptService:
     """MCP-Compatible tool prompting service for LLMs"""
     
     def __init__(self, graph_memory_service: Optional[GraphMemoryService] = None):
         self.graph_memory = graph_memory_service
+
+        # Compiled capabilities per (tool_name, version, schema hash)
+        self._compiled: Dict[Tuple[str, str, str], Dict[str, CompiledCapability]] = {}
+        # tool_name -> (last seen tool dict, its cache key); skips rehashing unchanged tools
+        self._tool_keys: Dict[str, Tuple[Dict[str, Any], Tuple[str, str, str]]] = {}
+        self._compile_lock = threading.Lock()
+        self.compile_stats = {"hits": 0, "compiles": 0}
+
+        if graph_memory_service is not None and hasattr(graph_memory_service, 'add_tool_listener'):
+            graph_memory_service.add_tool_listener(self.invalidate_tool_cache)
+
+    def invalidate_tool_cache(self, tool_name: Optional[str] = None):
+        """Drop compiled capabilities of a tool (all tools if tool_name is None)"""
+        with self._compile_lock:
+            if tool_name is None:
+                self._compiled.clear()
+                self._tool_keys.clear()
+                return
+            self._tool_keys.pop(tool_name, None)
+            for key in [key for key in self._compiled if key[0] == tool_name]:
+                del self._compiled[key]
+
+    def _tool_cache_key(self, tool: Dict[str, Any]) -> Tuple[str, str, str]:
+        """(tool_name, version, hash of everything the compiled artifacts depend on)"""
+        tool_name = tool.get('name', 'unknown')
+        seen = self._tool_keys.get(tool_name)
+        if seen is not None and seen[0] is tool:
+            return seen[1]
+
+        schema = json.dumps(
+            {"tool_type": tool.get('tool_type'), "capabilities": tool.get('capabilities', [])},
+            sort_keys=True, default=str
+        )
+        key = (tool_name, str(tool.get('version', '')), hashlib.sha256(schema.encode()).hexdigest())
+        self._tool_keys[tool_name] = (tool, key)
+        return key
+
+    def compile_tool(self, tool: Dict[str, Any]) -> Dict[str, CompiledCapability]:
+        """
+        Compiled capabilities of a tool by capability name (cached)
+
+        Unnamed capabilities are skipped; for duplicate names the first
+        declaration wins, as in validate_tool_call().
+        """
+        with self._compile_lock:
+            key = self._tool_cache_key(tool)
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self.compile_stats["hits"] += 1
+                return compiled
+
+            compiled = {}
+            for capability in tool.get('capabilities', []):
+                name = capability.get('name')
+                if not name:
+                    logger.warning(f"Skipping unnamed capability of tool {key[0]}")
+                    continue
+                if name in compiled:
+                    logger.warning(f"Duplicate capability '{name}' in tool {key[0]}, keeping the first")
+                    continue
+                compiled[name] = CompiledCapability(
+                    name=name,
+                    capability=capability,
+                    function_name=f"{str(tool.get('name', 'unknown')).lower()}_{name}",
+                    function_def=self._capability_to_function_def(tool, capability),
+                    xml=self._capability_to_xml_tool(tool, capability),
+                    parameters=self._convert_input_schema(capability.get('input_schema', {})),
+                    validate=compile_argument_validator(capability.get('input_schema', {}))
+                )
+
+            # Keep only the latest version of each tool
+            for stale in [k for k in self._compiled if k[0] == key[0]]:
+                del self._compiled[stale]
+            self._compiled[key] = compiled
+            self.compile_stats["compiles"] += 1
+            return compiled
         
     async def generate_function_calling_tools(self, user_id: str, context: Optional[ToolPromptContext] = None) -> List[Dict[str, Any]]:
         """Generate OpenAI/Anthropic function calling format tools"""
@@ -56,10 +195,10 @@ class ToolPromptService:
             function_tools = []
             
             for tool in user_tools:
-                for capability in tool.get('capabilities', []):
-                    function_def = self._capability_to_function_def(tool, capability)
-                    if function_def:
-                        function_tools.append(function_def)
+                for compiled in self.compile_tool(tool).values():
+                    if compiled.function_def:
+                        # Shallow copy: the nested "function" block is shared with the cache
+                        function_tools.append(dict(compiled.function_def))
             
             # Sort by recent usage and importance
             if context and context.recent_tool_usage:
@@ -196,10 +335,9 @@ class ToolPromptService:
             xml_parts = ["<tools>"]
             
             for tool in user_tools:
-                for capability in tool.get('capabilities', []):
-                    xml_tool = self._capability_to_xml_tool(tool, capability)
-                    if xml_tool:
-                        xml_parts.append(xml_tool)
+                for compiled in self.compile_tool(tool).values():
+                    if compiled.xml:
+                        xml_parts.append(compiled.xml)
             
             xml_parts.append("</tools>")
             
@@ -344,7 +482,7 @@ class ToolPromptService:
                 if tool['name'].lower() == tool_name.split('_')[0]:  # Handle tool_name_capability format
                     target_tool = tool
                     for cap in tool.get('capabilities', []):
-                        if cap['name'] == capability:
+                        if cap.get('name') == capability:
                             target_capability = cap
                             break
                     break
@@ -352,26 +490,8 @@ class ToolPromptService:
             if not target_tool or not target_capability:
                 return False, [f"Tool '{tool_name}' with capability '{capability}' not found or not accessible"]
             
-            # Validate input schema
-            input_schema = target_capability.get('input_schema', {})
-            errors = []
-            
-            # Check required parameters
-            for param_name, param_config in input_schema.items():
-                if isinstance(param_config, dict) and param_config.get('required', False):
-                    if param_name not in arguments:
-                        errors.append(f"Required parameter '{param_name}' missing")
-                    elif arguments[param_name] is None:
-                        errors.append(f"Required parameter '{param_name}' cannot be null")
-            
-            # Check parameter types
-            for param_name, param_value in arguments.items():
-                if param_name in input_schema:
-                    param_config = input_schema[param_name]
-                    if isinstance(param_config, dict):
-                        expected_type = param_config.get('type', 'string')
-                        if not self._validate_parameter_type(param_value, expected_type):
-                            errors.append(f"Parameter '{param_name}' should be of type '{expected_type}'")
+            # Validate against the precompiled schema validator
+            errors = self.compile_tool(target_tool)[capability].validate(arguments)
             
             return len(errors) == 0, errors
             
@@ -384,16 +504,7 @@ class ToolPromptService:
         if value is None:
             return True  # Allow null unless explicitly required
         
-        type_mapping = {
-            'string': str,
-            'integer': int,
-            'number': (int, float),
-            'boolean': bool,
-            'array': list,
-            'object': dict
-        }
-        
-        expected_python_type = type_mapping.get(expected_type.lower())
+        expected_python_type = JSON_TYPE_MAP.get(expected_type.lower())
         if expected_python_type:
             return isinstance(value, expected_python_type)
         
@@ -442,14 +553,13 @@ class ToolPromptService:
         
         for tool in tools:
             tool_name = tool.get("name", "unknown")
-            for capability in tool.get("capabilities", []):
-                cap_name = capability.get("name", "unknown")
-                function_name = f"{tool_name}_{cap_name}"
+            for compiled in self.compile_tool(tool).values():
+                function_name = f"{tool_name}_{compiled.name}"
                 
                 function_def = {
                     "name": function_name,
-                    "description": f"{capability.get('description', '')} (via {tool_name})",
-                    "parameters": self._convert_input_schema(capability.get("input_schema", {}))
+                    "description": f"{compiled.capability.get('description', '')} (via {tool_name})",
+                    "parameters": compiled.parameters
                 }
                 functions.append(function_def)
         
@@ -543,13 +653,11 @@ class MCPToolPromptingService:
             
             mcp_tools = []
             for tool in user_tools:
-                for capability in tool.get('capabilities', []):
+                for compiled in self.tool_prompt_service.compile_tool(tool).values():
                     mcp_tool = {
-                        "name": f"{tool['name'].lower()}_{capability['name']}",
-                        "description": capability.get('description', ''),
-                        "inputSchema": self.tool_prompt_service._convert_input_schema(
-                            capability.get('input_schema', {})
-                        )
+                        "name": compiled.function_name,
+                        "description": compiled.capability.get('description', ''),
+                        "inputSchema": compiled.parameters
                     }
                     mcp_tools.append(mcp_tool)
             
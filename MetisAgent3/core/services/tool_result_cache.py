@@ -0,0 +1,324 @@
+"""
+Tool Result Cache - Single-flight Caching for Read-only Tool Capabilities
+
+Identical read-only calls (OAuth status, tag lists, OEE snapshots) issued by
+several cards, workflow steps or users at the same moment run the tool once.
+
+Features:
+- Results keyed by (tool, capability, action, canonicalized params, tenant);
+  the tenant is the user unless the capability declares a wider cache_scope
+- Single-flight coalescing of concurrent identical calls, also across threads
+  and event loops (the bridge runs every request in its own loop)
+- TTLs declared per capability in tool_config.json (cache_ttl_seconds,
+  optionally limited to cache_actions); capabilities without a TTL are never cached.
+  cache_scope ("user" by default, "app" or "company") says who may share a
+  result; only widen it where the result does not depend on the caller
+- Any write/delete/execute call on a tool invalidates that tool's cached
+  results for the caller's tenant, including reads still in flight
+- A read called with refresh=true (e.g. RMMS list_tags) skips the cache and
+  drops the tenant's cached results of that tool
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..contracts.tool_contracts import CapabilityType, ToolCapability
+from ..contracts.tool_envelope import OperationType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2048
+# Call parameter that forces a read past the cache
+REFRESH_PARAMETER = "refresh"
+
+# Action verbs decide the operation type before the declared capability_type:
+# a "read" capability such as gmail_operations also has a "send" action.
+READ_VERBS = {"get", "list", "check", "read", "search", "find", "fetch", "status", "describe", "show", "query", "count"}
+DELETE_VERBS = {"delete", "remove", "revoke", "clear", "purge", "unregister"}
+WRITE_VERBS = {
+    "create", "update", "set", "save", "store", "send", "add", "assign", "write", "edit", "upload",
+    "move", "rename", "start", "stop", "authorize", "connect", "disconnect", "enable", "disable",
+    "reset", "record", "import", "sync",
+}
+GENERIC_ACTIONS = {"", "execute", "run", "default"}
+
+CAPABILITY_OPERATIONS = {
+    CapabilityType.READ: OperationType.READ,
+    CapabilityType.ANALYZE: OperationType.READ,
+    CapabilityType.WRITE: OperationType.WRITE,
+    CapabilityType.EXECUTE: OperationType.EXECUTE,
+    CapabilityType.TRANSFORM: OperationType.EXECUTE,
+}
+
+
+def classify_operation(capability: Optional[ToolCapability], capability_name: str, action: str) -> OperationType:
+    """
+    Classify a tool call as read, write, delete or execute.
+
+    The leading verb of the action (or of the capability name for generic
+    actions) wins; otherwise the declared capability_type is used. Unknown
+    capabilities are treated as EXECUTE, so they are never cached and always
+    invalidate.
+    """
+    name = capability_name if (action or "").lower() in GENERIC_ACTIONS else action
+    verb = (name or "").lower().split("_", 1)[0]
+    if verb in READ_VERBS:
+        return OperationType.READ
+    if verb in DELETE_VERBS:
+        return OperationType.DELETE
+    if verb in WRITE_VERBS:
+        return OperationType.WRITE
+    if capability is None:
+        return OperationType.EXECUTE
+    return CAPABILITY_OPERATIONS.get(capability.capability_type, OperationType.EXECUTE)
+
+
+def canonicalize_params(params: Dict[str, Any]) -> str:
+    """Stable text form of call parameters (key order and whitespace independent)"""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def tenant_scopes(user_id: str, parameters: Dict[str, Any], application_id: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Tenant scopes of a call: company, application, user (the user is always last).
+
+    Writes invalidate all of their scopes; reads are keyed by the scope
+    cache_tenant() picks for the capability.
+    """
+    scopes = []
+    company_id = parameters.get("company_id")
+    if company_id not in (None, ""):
+        scopes.append(f"company:{company_id}")
+    if application_id:
+        scopes.append(f"app:{application_id}")
+    scopes.append(f"user:{user_id}")
+    return tuple(scopes)
+
+
+def cache_tenant(scopes: Tuple[str, ...], cache_scope: Optional[str] = "user") -> str:
+    """
+    Scope a cached read is keyed by.
+
+    The capability's declared cache_scope ("company", "app") when the call
+    carries it, otherwise the user: a company-scoped read without company_id
+    or an unknown scope name is never shared between users.
+    """
+    prefix = f"{cache_scope or 'user'}:"
+    for scope in scopes:
+        if scope.startswith(prefix):
+            return scope
+    return scopes[-1]
+
+
+@dataclass
+class CacheEntry:
+    """Cached result of one read-only call"""
+    value: Any
+    tool_name: str
+    scopes: Tuple[str, ...]
+    expires_at: float
+
+
+@dataclass
+class _Flight:
+    """A call in progress; later identical calls wait on it"""
+    tool_name: str
+    scopes: Tuple[str, ...]
+    generations: Tuple[int, ...]
+    waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = field(default_factory=list)
+
+
+def _resolve(future: asyncio.Future, value: Any, error: Optional[BaseException]):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(copy.deepcopy(value))
+
+
+class ToolResultCache:
+    """
+    Single-flight TTL cache for read-only tool results.
+
+    Thread-safe: the entry table is guarded by a threading.Lock and waiters
+    in other event loops are woken with call_soon_threadsafe. Results are
+    copied on store and on every hit, so callers never share mutable data.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize tool result cache.
+
+        Args:
+            max_entries: Maximum cached results, least recently used are evicted
+        """
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[Tuple[str, ...], CacheEntry]" = OrderedDict()
+        self._flights: Dict[Tuple[str, ...], _Flight] = {}
+        self._generations: Dict[Tuple[str, str], int] = {}  # (scope, tool) -> write counter
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._stats = {
+            "total_requests": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "coalesced": 0,
+            "stored": 0,
+            "invalidations": 0,
+            "evictions": 0
+        }
+
+    @staticmethod
+    def ttl_for(capability: Optional[ToolCapability], action: str) -> Optional[int]:
+        """TTL declared for a capability/action in tool_config.json, None if not cacheable"""
+        if capability is None or not capability.cache_ttl_seconds:
+            return None
+        if capability.cache_actions and action not in capability.cache_actions:
+            return None
+        return capability.cache_ttl_seconds
+
+    @staticmethod
+    def make_key(tool_name: str, capability: str, action: str,
+                 params: Dict[str, Any], tenant: str) -> Tuple[str, ...]:
+        return tool_name, capability, action, canonicalize_params(params), tenant
+
+    def _generation_snapshot(self, tool_name: str, scopes: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._generations.get((scope, tool_name), 0) for scope in ("*", *scopes))
+
+    async def get_or_execute(
+        self,
+        tool_name: str,
+        capability: str,
+        action: str,
+        params: Dict[str, Any],
+        scopes: Tuple[str, ...],
+        ttl_seconds: float,
+        executor: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True
+    ) -> Tuple[Any, str]:
+        """
+        Return a cached result, join an identical call in flight, or run executor.
+
+        Args:
+            tool_name, capability, action, params: Identify the call
+            scopes: Scopes of the entry, a write to any of them drops it; the
+                first one (see cache_tenant) is part of the key
+            ttl_seconds: How long a result stays valid
+            executor: Coroutine function running the tool
+            should_cache: Results for which it returns False are shared with
+                current waiters but not stored (e.g. failures)
+
+        Returns:
+            Tuple of (result, "hit" | "coalesced" | "miss")
+        """
+        key = self.make_key(tool_name, capability, action, params, scopes[0])
+        waiter = None
+
+        with self._lock:
+            self._stats["total_requests"] += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats["cache_hits"] += 1
+                    return copy.deepcopy(entry.value), "hit"
+                del self._entries[key]
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                flight.waiters.append((loop, waiter))
+                self._stats["coalesced"] += 1
+            else:
+                flight = _Flight(tool_name, scopes, self._generation_snapshot(tool_name, scopes))
+                self._flights[key] = flight
+                self._stats["cache_misses"] += 1
+
+        if waiter is not None:
+            return await waiter, "coalesced"
+
+        try:
+            value = await executor()
+        except BaseException as e:
+            self._finish(key, flight, None, e)
+            raise
+
+        with self._lock:
+            # A write that landed while the tool ran makes this result unsafe to keep
+            if should_cache(value) and flight.generations == self._generation_snapshot(tool_name, scopes):
+                self._entries[key] = CacheEntry(copy.deepcopy(value), tool_name, scopes, time.monotonic() + ttl_seconds)
+                self._entries.move_to_end(key)
+                self._stats["stored"] += 1
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        self._finish(key, flight, value, None)
+        return value, "miss"
+
+    def _finish(self, key: Tuple[str, ...], flight: _Flight, value: Any, error: Optional[BaseException]):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            waiters, flight.waiters = flight.waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future, value, error)
+            except RuntimeError:
+                pass  # Waiter's loop already closed
+
+    def invalidate(self, tool_name: str, scopes: Optional[Iterable[str]] = None) -> int:
+        """
+        Drop cached results of a tool for the given tenant scopes (all tenants if None).
+
+        Reads already in flight finish for their current waiters but are
+        neither stored nor joined by later calls.
+
+        Returns:
+            Number of cached results removed
+        """
+        scopes = set(scopes) if scopes is not None else None
+        with self._lock:
+            for scope in (scopes if scopes is not None else {"*"}):
+                self._generations[(scope, tool_name)] = self._generations.get((scope, tool_name), 0) + 1
+
+            def affected(item) -> bool:
+                return item.tool_name == tool_name and (scopes is None or not scopes.isdisjoint(item.scopes))
+
+            stale = [key for key, entry in self._entries.items() if affected(entry)]
+            for key in stale:
+                del self._entries[key]
+            for key in [key for key, flight in self._flights.items() if affected(flight)]:
+                del self._flights[key]
+            self._stats["invalidations"] += 1
+
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached results of {tool_name}")
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get result cache statistics."""
+        with self._lock:
+            total = self._stats["total_requests"]
+            return {
+                **self._stats,
+                "current_entries": len(self._entries),
+                "in_flight": len(self._flights),
+                "cache_hit_rate": (
+                    (self._stats["cache_hits"] + self._stats["coalesced"]) / total if total > 0 else 0
+                )
+            }
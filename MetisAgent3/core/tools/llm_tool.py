@@ -3,6 +3,7 @@ LLM Tool - Production-Ready Multi-Provider LLM Integration
 
 CLAUDE.md COMPLIANT:
 - Multi-provider LLM support (OpenAI, Anthropic)
+- Record/replay provider for deterministic load tests
 - Encrypted API key management from SQLite storage
 - Conversation management with persistence
 - Structured response generation
@@ -22,6 +23,7 @@ from ..contracts.base_types import AgentResult, ExecutionContext, HealthStatus
 from ..contracts.tool_contracts import BaseTool, ToolMetadata, ToolConfiguration, ToolType
 from ..storage.sqlite_storage import SQLiteUserStorage
 from ..services.conversation_service import ConversationService, LLMConversationIntegration
+from ..services.llm_replay_service import get_replay_service
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +83,13 @@ class LLMTool(BaseTool):
                 "base_url": "http://192.168.1.104:1234/v1",
                 "models": ["google/gemma-3n-e4b", "microsoft/phi-4", "microsoft/phi-4-mini-reasoning", "nvidia/nemotron-3-nano", "llama4-dolphin-8b"],
                 "default_model": "google/gemma-3n-e4b"
+            },
+            "replay": {
+                "name": "Replay (Recorded)",
+                "api_key_name": None,  # Serves recorded responses from the local cassette
+                "base_url": None,
+                "models": ["replay"],
+                "default_model": "replay"
             }
         }
         
@@ -140,6 +149,10 @@ class LLMTool(BaseTool):
             provider = input_data.get("provider", "openai")
             model = input_data.get("model")
             system_prompt = input_data.get("system_prompt")
+            # Pre-segmented system prompt (Anthropic content blocks, may carry cache_control)
+            system_blocks = input_data.get("system_blocks")
+            if system_blocks and not system_prompt:
+                system_prompt = "".join(block.get("text", "") for block in system_blocks)
             conversation_id = input_data.get("conversation_id", "default")
             user_id = context.user_id or "default"
             
@@ -168,9 +181,9 @@ class LLMTool(BaseTool):
             
             provider_config = self.providers[provider]
 
-            # Get API key from encrypted storage (skip for lmstudio - no API key needed)
+            # Get API key from encrypted storage (skip for lmstudio/replay - no API key needed)
             api_key = None
-            if provider != "lmstudio":
+            if provider_config["api_key_name"] is not None:
                 api_key = await self._get_api_key(user_id, provider)
                 if not api_key:
                     return AgentResult(
@@ -210,11 +223,17 @@ class LLMTool(BaseTool):
             # Add system prompt if provided (even when conversation has history) to reinforce context
             if system_prompt:
                 enhanced_prompt = self._enhance_system_prompt_with_intent(system_prompt, message)
-                conversation = ([{
+                system_entry = {
                     "role": "system",
                     "content": enhanced_prompt,
                     "timestamp": datetime.utcnow().isoformat()
-                }] + conversation)
+                }
+                if system_blocks:
+                    # Intent instruction goes after the cached blocks so the prefix stays stable
+                    system_entry["blocks"] = list(system_blocks) + [
+                        {"type": "text", "text": enhanced_prompt[len(system_prompt):]}
+                    ]
+                conversation = [system_entry] + conversation
             elif len(conversation) == 0:
                 # Default system prompt
                 default_prompt = self._get_default_system_prompt()
@@ -240,8 +259,15 @@ class LLMTool(BaseTool):
             elif provider == "lmstudio":
                 # LMStudio uses OpenAI-compatible API, no API key needed
                 response = await self._call_lmstudio(provider_config, model, conversation)
+            elif provider == "replay":
+                response = await get_replay_service().complete(conversation, model)
             else:
                 return AgentResult(success=False, error=f"Provider '{provider}' not implemented")
+
+            # Record real provider responses for later replay (LLM_CASSETTE_RECORD)
+            replay_service = get_replay_service()
+            if response["success"] and provider != "replay" and replay_service.recording:
+                replay_service.record(provider, model, conversation, response)
             
             if response["success"]:
                 # Save to SQLite persistent storage
@@ -463,7 +489,7 @@ class LLMTool(BaseTool):
             
             for msg in conversation:
                 if msg["role"] == "system":
-                    system_message = msg["content"]
+                    system_message = msg.get("blocks") or msg["content"]
                 else:
                     messages.append({
                         "role": msg["role"],
@@ -46,7 +46,10 @@ async def register_google_tool():
                 input_schema=cap_data["input_schema"],
                 output_schema=cap_data["output_schema"],
                 required_permissions=cap_data.get("required_permissions", []),
-                examples=cap_data.get("examples", [])
+                examples=cap_data.get("examples", []),
+                cache_ttl_seconds=cap_data.get("cache_ttl_seconds"),
+                cache_actions=cap_data.get("cache_actions", []),
+                cache_scope=cap_data.get("cache_scope", "user")
             )
             capabilities.append(capability)
         
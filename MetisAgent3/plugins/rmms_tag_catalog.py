@@ -0,0 +1,414 @@
+"""
+RMMS Tag Catalog - locally mirrored, searchable MetisEngine tag list
+
+Shared by the RMMS tools so that tag listing and search no longer download
+/Tags/all/{companyId} on every call:
+- One catalog per (Tags API, company), held in a process-wide registry
+- Conditional refresh: nothing is fetched within the TTL, afterwards the
+  list is revalidated with If-None-Match / If-Modified-Since (304 keeps the
+  snapshot) and a changed list is applied as a diff by tagID
+- In-memory trigram index over tagName / tagName2
+- Ranked search: exact > prefix > word prefix > substring > fuzzy
+- Stable keyset paging cursors that survive catalog refreshes
+- Thread-safe: the bridge runs every request in its own event loop, so the
+  index is guarded by a threading lock and concurrent refreshes from any
+  loop share one concurrent.futures.Future
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_TTL_SECONDS = 60.0
+DEFAULT_PAGE_SIZE = 50
+NGRAM_SIZE = 3
+FUZZY_MIN_SIMILARITY = 0.5
+SIMILARITY_SCALE = 10000  # similarity is stored as an int so sort keys compare exactly
+
+# Match tiers, best first
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_WORD_PREFIX = 2
+MATCH_SUBSTRING = 3
+MATCH_FUZZY = 4
+MATCH_TYPES = {
+    MATCH_EXACT: "exact",
+    MATCH_PREFIX: "prefix",
+    MATCH_WORD_PREFIX: "word_prefix",
+    MATCH_SUBSTRING: "substring",
+    MATCH_FUZZY: "fuzzy",
+}
+
+_WORD_BOUNDARY = re.compile(r"[\s_.\-/:]+")
+
+SortKey = Tuple[int, int, int]
+
+
+class TagCatalogError(Exception):
+    """Raised when the catalog cannot be loaded or a cursor is invalid"""
+
+
+def _ngrams(text: str) -> Set[str]:
+    """Character trigrams of a lowercased name; short names are their own gram"""
+    if len(text) < NGRAM_SIZE:
+        return {text} if text else set()
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _extract_tags(result: Any) -> List[Dict[str, Any]]:
+    if isinstance(result, dict):
+        return result.get("tags", result.get("Tags", [])) or []
+    return result or []
+
+
+@dataclass
+class TagPage:
+    """One page of catalog search results"""
+    tags: List[Dict[str, Any]]
+    matched: int
+    total: int
+    next_cursor: Optional[str]
+    match_types: List[str] = field(default_factory=list)
+    version: int = 0
+
+
+class TagCatalog:
+    """Mirror of one company's tags with a trigram search index"""
+
+    def __init__(self, tags_api: str, company_id: Any, ttl_seconds: float = DEFAULT_CATALOG_TTL_SECONDS):
+        self.tags_api = tags_api.rstrip("/")
+        self.company_id = str(company_id)
+        self.ttl_seconds = ttl_seconds
+
+        self._tags: Dict[int, Dict[str, Any]] = {}
+        self._names: Dict[int, Tuple[str, str]] = {}
+        self._index: Dict[str, Set[int]] = {}
+
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.version = 0
+        self.loaded = False
+        self._fetched_at = 0.0
+        self._lock = threading.RLock()  # Guards tags, index, validators and the refresh in flight
+        self._refresh_future: Optional[Future] = None
+
+        self.stats = {
+            "fetches": 0,
+            "not_modified": 0,
+            "fetch_errors": 0,
+            "tags_added": 0,
+            "tags_updated": 0,
+            "tags_removed": 0,
+            "searches": 0,
+        }
+
+    @property
+    def url(self) -> str:
+        return f"{self.tags_api}/all/{self.company_id}"
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.loaded and (time.monotonic() - self._fetched_at) < self.ttl_seconds
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tags)
+
+    # ==================== REFRESH ====================
+
+    async def ensure_fresh(self, timeout: float = 30, force: bool = False) -> bool:
+        """Revalidate the snapshot when it is older than the TTL (or forced).
+
+        Concurrent callers share one request, also across threads and event
+        loops. Returns True when the catalog changed. A failed refresh keeps
+        serving the previous snapshot and only raises TagCatalogError when
+        there is nothing to serve yet.
+        """
+        with self._lock:
+            if not force and self.is_fresh:
+                return False
+            future = self._refresh_future
+            leader = future is None
+            if leader:
+                future = self._refresh_future = Future()
+
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            changed = await self._refresh(timeout)
+        except BaseException as e:
+            with self._lock:
+                self._refresh_future = None
+            if isinstance(e, Exception):
+                future.set_exception(e)
+            else:
+                future.set_exception(TagCatalogError("Tag catalog refresh was cancelled"))
+            raise
+        with self._lock:
+            self._refresh_future = None
+        future.set_result(changed)
+        return changed
+
+    async def _refresh(self, timeout: float) -> bool:
+        headers = {}
+        with self._lock:
+            if self.loaded and self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.loaded and self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+
+        try:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.get(self.url, headers=headers)
+        except httpx.HTTPError as e:
+            return self._refresh_failed(str(e) or type(e).__name__)
+
+        if response.status_code == 304 and self.loaded:
+            with self._lock:
+                self.stats["not_modified"] += 1
+                self._fetched_at = time.monotonic()
+            return False
+        if response.status_code != 200:
+            return self._refresh_failed(response.text)
+
+        tags = _extract_tags(response.json())
+        with self._lock:
+            self.stats["fetches"] += 1
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+            changed = self.apply_snapshot(tags)
+            self._fetched_at = time.monotonic()
+        return changed
+
+    def _refresh_failed(self, error: str) -> bool:
+        with self._lock:
+            self.stats["fetch_errors"] += 1
+        if not self.loaded:
+            raise TagCatalogError(error)
+        logger.warning(f"Tag catalog refresh failed for company {self.company_id}, serving cached snapshot: {error}")
+        return False
+
+    def apply_snapshot(self, tags: Iterable[Dict[str, Any]]) -> bool:
+        """Apply a full tag list as a diff by tagID; only changed tags are reindexed"""
+        incoming: Dict[int, Dict[str, Any]] = {}
+        for tag in tags:
+            tag_id = tag.get("tagID")
+            if tag_id is None:
+                continue
+            incoming[int(tag_id)] = tag
+
+        with self._lock:
+            removed = [tag_id for tag_id in self._tags if tag_id not in incoming]
+            for tag_id in removed:
+                self._unindex(tag_id)
+                del self._tags[tag_id]
+
+            added = updated = 0
+            for tag_id, tag in incoming.items():
+                current = self._tags.get(tag_id)
+                if current == tag:
+                    continue
+                if current is None:
+                    added += 1
+                else:
+                    updated += 1
+                    self._unindex(tag_id)
+                self._tags[tag_id] = tag
+                self._index_tag(tag_id, tag)
+
+            self.stats["tags_added"] += added
+            self.stats["tags_updated"] += updated
+            self.stats["tags_removed"] += len(removed)
+            changed = bool(added or updated or removed) or not self.loaded
+            if changed:
+                self.version += 1
+            self.loaded = True
+            return changed
+
+    def _index_tag(self, tag_id: int, tag: Dict[str, Any]):
+        names = ((tag.get("tagName") or "").lower(), (tag.get("tagName2") or "").lower())
+        self._names[tag_id] = names
+        for gram in _ngrams(names[0]) | _ngrams(names[1]):
+            self._index.setdefault(gram, set()).add(tag_id)
+
+    def _unindex(self, tag_id: int):
+        names = self._names.pop(tag_id, ("", ""))
+        for gram in _ngrams(names[0]) | _ngrams(names[1]):
+            postings = self._index.get(gram)
+            if postings is not None:
+                postings.discard(tag_id)
+                if not postings:
+                    del self._index[gram]
+
+    # ==================== LOOKUP & SEARCH ====================
+
+    def get(self, tag_id: Any) -> Optional[Dict[str, Any]]:
+        try:
+            tag_id = int(tag_id)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            return self._tags.get(tag_id)
+
+    def _score(self, tag_id: int, query: str, query_grams: Set[str]) -> Optional[Tuple[int, int]]:
+        """(match tier, similarity) of the best matching name, None if no match"""
+        best: Optional[Tuple[int, int]] = None
+        for name in self._names[tag_id]:
+            if not name:
+                continue
+            if name == query:
+                tier = MATCH_EXACT
+            elif name.startswith(query):
+                tier = MATCH_PREFIX
+            elif any(word.startswith(query) for word in _WORD_BOUNDARY.split(name)):
+                tier = MATCH_WORD_PREFIX
+            elif query in name:
+                tier = MATCH_SUBSTRING
+            else:
+                tier = MATCH_FUZZY
+            name_grams = _ngrams(name)
+            similarity = int(SIMILARITY_SCALE * 2 * len(query_grams & name_grams)
+                             / (len(query_grams) + len(name_grams)))
+            if tier == MATCH_FUZZY and similarity < FUZZY_MIN_SIMILARITY * SIMILARITY_SCALE:
+                continue
+            if best is None or (tier, -similarity) < (best[0], -best[1]):
+                best = (tier, similarity)
+        return best
+
+    def _candidates(self, query: str, query_grams: Set[str], fuzzy: bool) -> Iterable[int]:
+        if len(query) < NGRAM_SIZE:
+            return self._tags.keys()
+        postings = [self._index.get(gram, set()) for gram in query_grams]
+        if fuzzy:
+            return set().union(*postings)
+        return set.intersection(*postings) if postings else set()
+
+    def rank(self, search: str = "", fuzzy: bool = True) -> List[Tuple[SortKey, int]]:
+        """All matching tags as (sort key, tagID), best first.
+
+        Sort keys are (tier, -similarity, tagID) so the order is total and
+        does not depend on the order the API returned the tags in.
+        """
+        query = (search or "").strip().lower()
+        with self._lock:
+            if not query:
+                return sorted(((MATCH_EXACT, 0, tag_id), tag_id) for tag_id in self._tags)
+
+            query_grams = _ngrams(query)
+            ranked = []
+            for tag_id in self._candidates(query, query_grams, fuzzy):
+                score = self._score(tag_id, query, query_grams)
+                if score is None or (score[0] == MATCH_FUZZY and not fuzzy):
+                    continue
+                ranked.append(((score[0], -score[1], tag_id), tag_id))
+        ranked.sort()
+        return ranked
+
+    def search(self, search: str = "", limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+               fuzzy: bool = True) -> TagPage:
+        """Ranked page of tags matching search, continuing after cursor"""
+        after = self._decode_cursor(cursor, search, fuzzy) if cursor else None
+        with self._lock:
+            # Ranking and page read the same snapshot, a refresh waits
+            self.stats["searches"] += 1
+            ranked = self.rank(search, fuzzy)
+            start = bisect_right(ranked, (after, float("inf"))) if after is not None else 0
+
+            limit = max(int(limit), 1)
+            page = ranked[start:start + limit]
+            next_cursor = None
+            if start + limit < len(ranked):
+                next_cursor = self._encode_cursor(page[-1][0], search, fuzzy)
+            return TagPage(
+                tags=[self._tags[tag_id] for _, tag_id in page],
+                matched=len(ranked),
+                total=len(self._tags),
+                next_cursor=next_cursor,
+                match_types=[MATCH_TYPES[key[0]] for key, _ in page] if (search or "").strip() else [],
+                version=self.version,
+            )
+
+    # ==================== CURSORS ====================
+
+    def _search_fingerprint(self, search: str, fuzzy: bool) -> str:
+        raw = f"{self.company_id}\0{(search or '').strip().lower()}\0{int(fuzzy)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+    def _encode_cursor(self, key: SortKey, search: str, fuzzy: bool) -> str:
+        payload = json.dumps([self._search_fingerprint(search, fuzzy), *key], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def _decode_cursor(self, cursor: str, search: str, fuzzy: bool) -> SortKey:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            fingerprint, tier, similarity, tag_id = json.loads(base64.urlsafe_b64decode(padded))
+            key = (int(tier), int(similarity), int(tag_id))
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+            raise TagCatalogError("Invalid cursor")
+        if fingerprint != self._search_fingerprint(search, fuzzy):
+            raise TagCatalogError("Cursor belongs to a different company or search")
+        return key
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "company_id": self.company_id,
+                "tags": len(self._tags),
+                "ngrams": len(self._index),
+                "version": self.version,
+                "etag": self.etag,
+                "fresh": self.is_fresh,
+                **self.stats,
+            }
+
+
+# ==================== SHARED REGISTRY ====================
+
+_catalogs: Dict[Tuple[str, str], TagCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_tag_catalog(tags_api: str, company_id: Any,
+                    ttl_seconds: float = DEFAULT_CATALOG_TTL_SECONDS) -> TagCatalog:
+    """Process-wide catalog for a company, shared by all RMMS tools"""
+    key = (tags_api.rstrip("/"), str(company_id))
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _catalogs[key] = TagCatalog(tags_api, company_id, ttl_seconds)
+        else:
+            catalog.ttl_seconds = min(catalog.ttl_seconds, ttl_seconds)
+    return catalog
+
+
+def find_cached_tag(tags_api: str, tag_id: Any) -> Optional[Dict[str, Any]]:
+    """Look a tag up in any loaded catalog of this Tags API, without network access"""
+    tags_api = tags_api.rstrip("/")
+    with _catalogs_lock:
+        catalogs = list(_catalogs.items())
+    for (api, _), catalog in catalogs:
+        if api == tags_api and catalog.is_fresh:
+            tag = catalog.get(tag_id)
+            if tag is not None:
+                return tag
+    return None
+
+
+def clear_tag_catalogs():
+    with _catalogs_lock:
+        _catalogs.clear()
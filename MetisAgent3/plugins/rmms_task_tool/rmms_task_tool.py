@@ -24,6 +24,9 @@ from core.contracts import (
     BaseTool, ToolMetadata, ToolConfiguration,
     AgentResult, ExecutionContext, HealthStatus
 )
+from plugins.rmms_tag_catalog import (
+    DEFAULT_CATALOG_TTL_SECONDS, TagCatalogError, find_cached_tag, get_tag_catalog
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,9 @@ class RMMSTaskTool(BaseTool):
         super().__init__(metadata, config)
         self.api_base_url = config.config.get("api_base_url", "https://app-metis-task-container.azurewebsites.net/api")
         self.timeout = config.config.get("timeout", 30)
+        # Tags API is on MetisEngine: /api/Tags
+        self.tags_api = self.api_base_url.replace("/Task", "/Tags")
+        self.tag_catalog_ttl = config.config.get("tag_catalog_ttl_seconds", DEFAULT_CATALOG_TTL_SECONDS)
 
         self.statuses = {
             "pending": {"description": "Task created but not started", "color": "#FFA500"},
@@ -624,49 +630,46 @@ class RMMSTaskTool(BaseTool):
     # ==================== TAG OPERATIONS ====================
 
     async def _list_tags(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List tags for a company with optional search and limit"""
+        """List tags for a company with optional ranked search, limit and paging cursor"""
         company_id = params.get("company_id")
         if not company_id:
             return {"success": False, "error": "company_id is required"}
         limit = params.get("limit", 50)  # Default limit to prevent context overflow
-        search = params.get("search", "").lower()
+        search = params.get("search", "")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            # Tags API is on MetisEngine: /api/Tags/all/{companyId}
-            tags_api = self.api_base_url.replace("/Task", "/Tags")
-            response = await client.get(f"{tags_api}/all/{company_id}")
-            if response.status_code == 200:
-                result = response.json()
-                all_tags = result.get("tags", result.get("Tags", [])) if isinstance(result, dict) else result
-                total_count = len(all_tags)
-
-                # Filter by search term if provided
-                if search:
-                    all_tags = [t for t in all_tags if search in t.get("tagName", "").lower() or search in t.get("tagName2", "").lower()]
-
-                # Return summarized info to reduce response size
-                tags_summary = []
-                for tag in all_tags[:limit]:
-                    tags_summary.append({
-                        "tagID": tag.get("tagID"),
-                        "tagName": tag.get("tagName"),
-                        "tagName2": tag.get("tagName2"),
-                        "type": tag.get("type"),
-                        "unit": tag.get("unit", "")
-                    })
-
-                filtered_count = len(all_tags)
-                return {
-                    "success": True,
-                    "data": {
-                        "tags": tags_summary,
-                        "returned": len(tags_summary),
-                        "filtered": filtered_count,
-                        "total": total_count
-                    },
-                    "message": f"Showing {len(tags_summary)} of {filtered_count} tags (total: {total_count}). Use 'search' param to filter or increase 'limit'."
-                }
-            return {"success": False, "error": f"Failed to list tags: {response.text}"}
+        # Served from the shared tag catalog; /Tags/all/{companyId} is only revalidated after the TTL
+        catalog = get_tag_catalog(self.tags_api, company_id, self.tag_catalog_ttl)
+        try:
+            await catalog.ensure_fresh(self.timeout, force=bool(params.get("refresh")))
+            page = catalog.search(search, limit=limit, cursor=params.get("cursor"))
+        except TagCatalogError as e:
+            return {"success": False, "error": f"Failed to list tags: {e}"}
+
+        # Return summarized info to reduce response size
+        tags_summary = []
+        for tag in page.tags:
+            tags_summary.append({
+                "tagID": tag.get("tagID"),
+                "tagName": tag.get("tagName"),
+                "tagName2": tag.get("tagName2"),
+                "type": tag.get("type"),
+                "unit": tag.get("unit", "")
+            })
+
+        message = f"Showing {len(tags_summary)} of {page.matched} tags (total: {page.total})."
+        if page.next_cursor:
+            message += " Pass 'cursor' to get the next page, or use 'search' to narrow down."
+        return {
+            "success": True,
+            "data": {
+                "tags": tags_summary,
+                "returned": len(tags_summary),
+                "filtered": page.matched,
+                "total": page.total,
+                "next_cursor": page.next_cursor
+            },
+            "message": message
+        }
 
     async def _get_tag(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Get a specific tag by ID"""
@@ -674,9 +677,12 @@ class RMMSTaskTool(BaseTool):
         if not tag_id:
             return {"success": False, "error": "tag_id is required"}
 
+        tag = find_cached_tag(self.tags_api, tag_id)
+        if tag is not None:
+            return {"success": True, "data": tag, "message": f"Retrieved tag {tag_id}"}
+
         async with httpx.AsyncClient(timeout=self.timeout) as client:
-            tags_api = self.api_base_url.replace("/Task", "/Tags")
-            response = await client.get(f"{tags_api}/{tag_id}")
+            response = await client.get(f"{self.tags_api}/{tag_id}")
             if response.status_code == 200:
                 result = response.json()
                 tag = result.get("Tag", result) if isinstance(result, dict) else result
@@ -690,8 +696,7 @@ class RMMSTaskTool(BaseTool):
             return {"success": False, "error": "tag_id is required"}
 
         async with httpx.AsyncClient(timeout=self.timeout) as client:
-            tags_api = self.api_base_url.replace("/Task", "/Tags")
-            response = await client.get(f"{tags_api}/value/{tag_id}")
+            response = await client.get(f"{self.tags_api}/value/{tag_id}")
             if response.status_code == 200:
                 value_data = response.json()
                 return {"success": True, "data": value_data, "message": f"Tag {tag_id} value: {value_data.get('Value', 'N/A')}"}
@@ -707,8 +712,7 @@ class RMMSTaskTool(BaseTool):
             tag_ids = [int(x.strip()) for x in tag_ids.split(",")]
 
         async with httpx.AsyncClient(timeout=self.timeout) as client:
-            tags_api = self.api_base_url.replace("/Task", "/Tags")
-            response = await client.post(f"{tags_api}/values", json=tag_ids)
+            response = await client.post(f"{self.tags_api}/values", json=tag_ids)
             if response.status_code == 200:
                 result = response.json()
                 values = result.get("Values", result) if isinstance(result, dict) else result
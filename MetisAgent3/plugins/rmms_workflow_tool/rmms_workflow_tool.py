@@ -30,6 +30,7 @@ from plugins.rmms_workflow_tool.node_definitions import (
     NODE_TYPES, EDGE_SCHEMA, WORKFLOW_STRUCTURE,
     get_node_type_description, get_all_node_types, get_node_types_for_llm
 )
+from plugins.rmms_tag_catalog import DEFAULT_CATALOG_TTL_SECONDS, TagCatalogError, get_tag_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,7 @@ class RMMSWorkflowTool(BaseTool):
         super().__init__(metadata, config)
         self.api_base_url = config.config.get("api_base_url", "https://rmms-metis-engine.azurewebsites.net/api")
         self.timeout = config.config.get("timeout", 30)
+        self.tag_catalog_ttl = config.config.get("tag_catalog_ttl_seconds", DEFAULT_CATALOG_TTL_SECONDS)
 
         # Use proper RMMS node types from node_definitions.py
         self.node_types = NODE_TYPES
@@ -756,43 +758,39 @@ class RMMSWorkflowTool(BaseTool):
     async def _list_tags(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """List available tags for a company. Use this to show user available tags before creating workflow."""
         company_id = params.get("company_id")
-        search = params.get("search", "").lower()
+        search = params.get("search", "")
 
         if not company_id:
             return {"success": False, "error": "company_id is required. Please ask user which company to use."}
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            # Tags API endpoint
-            url = f"https://rmms-metis-engine.azurewebsites.net/api/Tags/all/{company_id}"
-            response = await client.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                tags = data.get("tags", [])
-
-                # Filter by search term if provided
-                if search:
-                    tags = [t for t in tags if search in t.get("tagName", "").lower() or search in t.get("tagName2", "").lower()]
-
-                # Format for easy reading
-                tag_list = []
-                for t in tags[:50]:  # Limit to 50 tags
-                    tag_list.append({
-                        "id": f"tag_{t['tagID']}",
-                        "name": t.get("tagName2") or t.get("tagName"),
-                        "full_name": t.get("tagName")
-                    })
+        # Shared tag catalog (Tags API: /api/Tags/all/{companyId}), revalidated only after the TTL
+        catalog = get_tag_catalog(f"{self.api_base_url}/Tags", company_id, self.tag_catalog_ttl)
+        try:
+            await catalog.ensure_fresh(self.timeout)
+            page = catalog.search(search, limit=50, cursor=params.get("cursor"))  # Limit to 50 tags
+        except TagCatalogError as e:
+            return {"success": False, "error": f"Failed to get tags: {e}"}
+
+        # Format for easy reading
+        tag_list = []
+        for t in page.tags:
+            tag_list.append({
+                "id": f"tag_{t['tagID']}",
+                "name": t.get("tagName2") or t.get("tagName"),
+                "full_name": t.get("tagName")
+            })
 
-                return {
-                    "success": True,
-                    "data": {
-                        "company_id": company_id,
-                        "total_tags": len(data.get("tags", [])),
-                        "showing": len(tag_list),
-                        "tags": tag_list
-                    },
-                    "message": f"Found {len(data.get('tags', []))} tags for company {company_id}. Use tag_XXXX format in workflows."
-                }
-            return {"success": False, "error": f"Failed to get tags: {response.text}"}
+        return {
+            "success": True,
+            "data": {
+                "company_id": company_id,
+                "total_tags": page.total,
+                "showing": len(tag_list),
+                "tags": tag_list,
+                "next_cursor": page.next_cursor
+            },
+            "message": f"Found {page.total} tags for company {company_id}. Use tag_XXXX format in workflows."
+        }
 
     async def _create_complete_workflow(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
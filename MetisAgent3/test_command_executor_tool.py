@@ -21,7 +21,7 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from tools.command_executor_tool import CommandExecutorTool
+from tools.command_executor_tool import CommandExecutorTool, stream_extract_zip
 from core.contracts.tool_contracts import ToolCapability, CapabilityType
 from core.contracts.base_types import ExecutionContext
 from core.services.conversation_service import ConversationService
@@ -196,6 +196,22 @@ async def test_command_executor():
                 print(f"   Extract ZIP: ❌ Failed - {extract_result.error}")
         except Exception as e:
             print(f"   ❌ Extract ZIP Error: {e}")
+        
+        # A member failing its CRC check must not leave a .part file behind
+        corrupt_path = temp_path / "corrupt.zip"
+        with zipfile.ZipFile(corrupt_path, 'w', compression=zipfile.ZIP_STORED) as zip_ref:
+            zip_ref.writestr("payload.txt", "original payload " * 64)
+        data = bytearray(corrupt_path.read_bytes())
+        data[data.index(b"original payload")] ^= 0xFF
+        corrupt_path.write_bytes(bytes(data))
+        corrupt_dir = temp_path / "corrupt"
+        corrupt_dir.mkdir()
+        corrupt_result = stream_extract_zip(corrupt_path, corrupt_dir)
+        leftovers = [f.name for f in corrupt_dir.rglob("*")]
+        if not corrupt_result.get("extracted_files") and not leftovers:
+            print("   Corrupt ZIP: ✅ Member skipped, no partial files left")
+        else:
+            print(f"   Corrupt ZIP: ❌ Left behind {leftovers}")
     
     # Test 8: Error Handling
     print("\n8. 🛠️  Error Handling:")
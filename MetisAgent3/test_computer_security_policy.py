@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Computer Security Policy Test - compiled policy vs. the original linear checks
+
+The previous implementation (per-call glob -> regex conversion, linear scans
+over denied/allowed lists) is kept below as a reference oracle. Every path,
+operation, size and URL in the matrix must produce an identical
+SecurityCheckResult from the compiled policy, cold and from the decision cache.
+
+Usage:
+    python test_computer_security_policy.py
+    python -m pytest test_computer_security_policy.py
+"""
+
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.contracts.tool_envelope import RiskLevel
+from core.services.computer_security_service import (
+    ComputerMode,
+    ComputerSecurityService,
+    OperationResult,
+    RestrictedModeConfig,
+    SecurityCheckResult,
+)
+
+
+class LegacySecurityChecks:
+    """Restricted-mode checks exactly as they were before the policy compiler"""
+
+    def __init__(self, config: RestrictedModeConfig):
+        self.config = config
+        self._allowed_url_patterns = [re.compile(p) for p in config.allowed_url_patterns]
+        self._denied_url_patterns = [re.compile(p) for p in config.denied_url_patterns]
+
+    def _path_matches(self, path: str, pattern: str) -> bool:
+        pattern = os.path.expanduser(pattern)
+        regex_pattern = pattern.replace("*", ".*")
+        try:
+            return bool(re.match(regex_pattern, path))
+        except re.error:
+            return pattern in path
+
+    def file_operation(self, operation, file_path, file_size):
+        path = Path(file_path).resolve()
+        path_str = str(path)
+        for denied in self.config.denied_paths:
+            if self._path_matches(path_str, denied):
+                return SecurityCheckResult(allowed=False, result=OperationResult.DENIED,
+                                           reason=f"Path is in denied list: {denied}")
+        if path.suffix.lower() in self.config.denied_extensions:
+            return SecurityCheckResult(allowed=False, result=OperationResult.DENIED,
+                                       reason=f"File extension not allowed: {path.suffix}")
+        path_allowed = False
+        for allowed in self.config.allowed_paths:
+            if self._path_matches(path_str, allowed):
+                path_allowed = True
+                break
+        if not path_allowed:
+            return SecurityCheckResult(allowed=False, result=OperationResult.DENIED,
+                                       reason="Path not in allowed list")
+        if operation in ("write", "write_file") and file_size:
+            if file_size > self.config.max_file_size:
+                return SecurityCheckResult(
+                    allowed=False, result=OperationResult.DENIED,
+                    reason=f"File size exceeds limit: {file_size} > {self.config.max_file_size}")
+        if operation in self.config.confirmation_operations:
+            return SecurityCheckResult(allowed=True, result=OperationResult.REQUIRES_CONFIRMATION,
+                                       requires_confirmation=True,
+                                       confirmation_message=f"Confirm {operation} on {file_path}?",
+                                       risk_level=RiskLevel.MEDIUM)
+        return SecurityCheckResult(allowed=True, result=OperationResult.ALLOWED, risk_level=RiskLevel.LOW)
+
+    def browser_operation(self, operation, url):
+        for pattern in self._denied_url_patterns:
+            if pattern.search(url):
+                return SecurityCheckResult(allowed=False, result=OperationResult.DENIED,
+                                           reason=f"URL matches denied pattern: {pattern.pattern}")
+        if not any(pattern.search(url) for pattern in self._allowed_url_patterns):
+            return SecurityCheckResult(allowed=False, result=OperationResult.DENIED,
+                                       reason="URL not in allowed list")
+        return SecurityCheckResult(allowed=True, result=OperationResult.ALLOWED, risk_level=RiskLevel.LOW)
+
+
+OPERATIONS = ["read", "read_file", "write", "write_file", "delete_file", "move_file", "list_directory"]
+SIZES = [None, 0, 1024, 10 * 1024 * 1024, 10 * 1024 * 1024 + 1]
+
+
+def _sample_paths(root: Path):
+    """Existing files, missing files, symlinks, relative and ~ paths"""
+    home = os.path.expanduser("~")
+    paths = [
+        "/tmp", "/tmp/", "/tmp/a.txt", "/tmp/sub/dir/report.csv", "/tmp/run.sh", "/tmp/RUN.SH",
+        "/tmp/id_rsa.pem", "/tmp/server.KEY", "/tmp/my_credentials.json", "/tmp/app_secrets.yaml",
+        "/tmpfoo/x.txt", "/tmp/notes", "/tmp/archive.tar.gz", "/tmp/.hidden", "/tmp/a.txt.exe",
+        "/etc/passwd", "/etc/passwd-", "/etc/shadow", "/etc/hosts", "/var/log/syslog",
+        "/var/logs/app.log", "/var/log/../../etc/hosts", "/home/alice/projects/app/main.py",
+        "/home/alice/projects", "/home/projects/x.py", "/home/alice/work/projects/x.md",
+        "/home/alice/projectsX/x.md", "/usr/bin/python", "/", "relative/file.txt", "./x.json",
+        "../../tmp/y.json", f"{home}/.ssh/id_rsa", f"{home}/.sshfoo", f"{home}/.aws/config",
+        f"{home}/.config/gcloud/creds.json", "~/.ssh/config", "~/notes.md", "/tmp/apem",
+        "/tmp/xkey", "/tmp/ünïcode.md", "/tmp/space name.txt", "/tmp/dotless",
+    ]
+    # Symlinks must be judged by their target, as before
+    (root / "real").mkdir()
+    (root / "real" / "data.json").write_text("{}")
+    (root / "to_etc").symlink_to("/etc")
+    (root / "to_real").symlink_to(root / "real")
+    (root / "shadow_link").symlink_to("/etc/shadow")
+    paths += [
+        str(root / "real" / "data.json"), str(root / "to_etc" / "passwd"),
+        str(root / "to_etc" / "hosts"), str(root / "to_real" / "data.json"),
+        str(root / "shadow_link"), str(root / "missing" / "file.md"),
+    ]
+    return paths
+
+
+def _configs():
+    """Default config plus configs exercising invalid regexes, groups and inline flags"""
+    yield "default", RestrictedModeConfig()
+    yield "edge", RestrictedModeConfig(
+        allowed_paths={"/tmp", "/home/*/projects", "/var/log", "/srv/[", "(/opt)/(app)\\2"},
+        denied_paths={"/etc/passwd", "*.pem", "/tmp/sub(", "*credentials*", "/tmp/+bad", "(?i)/tmp/upper"},
+        allowed_url_patterns=[r"^https://docs\.", r"(https)://\1-mirror", r"(?i)^https://API\."],
+        denied_url_patterns=[r"localhost", r"^javascript:", r"(evil)\.\1", r"127\.0\.0\.1"],
+        max_file_size=2048,
+    )
+
+
+URLS = [
+    "https://docs.python.org/3/", "https://api.github.com/repos", "https://github.com/x/y",
+    "https://stackoverflow.com/q/1", "http://docs.python.org", "file:///etc/passwd",
+    "javascript:alert(1)", "http://localhost:5000", "https://docs.localhost.dev",
+    "https://127.0.0.1/", "http://192.168.1.1", "https://10.0.0.1/admin", "https://example.com",
+    "https://https-mirror.org", "https://evil.evil.com", "HTTPS://API.EXAMPLE.COM", "",
+]
+
+
+def _compare(label, config, paths):
+    legacy = LegacySecurityChecks(config)
+    service = ComputerSecurityService(mode=ComputerMode.RESTRICTED, config=config)
+    mismatches = []
+    for _ in range(2):  # cold, then served from the decision cache
+        for operation in OPERATIONS:
+            for path in paths:
+                for size in SIZES:
+                    expected = legacy.file_operation(operation, path, size)
+                    actual = service.check_file_operation(operation, path, size)
+                    if expected != actual:
+                        mismatches.append((label, operation, path, size, expected, actual))
+        for url in URLS:
+            expected = legacy.browser_operation("navigate", url)
+            actual = service.check_browser_operation("navigate", url)
+            if expected != actual:
+                mismatches.append((label, "navigate", url, None, expected, actual))
+    return service, mismatches
+
+
+def test_compiled_policy_matches_legacy_checks():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _sample_paths(Path(tmp))
+        for label, config in _configs():
+            service, mismatches = _compare(label, config, paths)
+            assert not mismatches, mismatches[:5]
+            assert service.cache_stats["hits"] > 0
+
+
+def test_batch_check_matches_single_checks():
+    service = ComputerSecurityService(mode=ComputerMode.RESTRICTED)
+    paths = ["/tmp/a.txt", "/etc/shadow", "/tmp/run.sh", "/tmp/a.txt", "/usr/bin/python"]
+    results = service.check_file_operations("write_file", paths, file_sizes={"/tmp/a.txt": 100})
+    assert list(results) == ["/tmp/a.txt", "/etc/shadow", "/tmp/run.sh", "/usr/bin/python"]
+    for path, result in results.items():
+        size = 100 if path == "/tmp/a.txt" else None
+        assert result == service.check_file_operation("write_file", path, size)
+
+    for mode in (ComputerMode.OFF, ComputerMode.DEV):
+        service.set_mode(mode)
+        batch = service.check_file_operations("read", paths)
+        assert all(r == service.check_file_operation("read", p) for p, r in batch.items())
+
+
+def test_reload_policy_picks_up_config_changes():
+    service = ComputerSecurityService(mode=ComputerMode.RESTRICTED)
+    assert service.check_file_operation("read", "/srv/data.txt").result is OperationResult.DENIED
+
+    service.config.allowed_paths.add("/srv")
+    service.reload_policy()
+    assert service.check_file_operation("read", "/srv/data.txt").allowed
+
+    service.update_config(RestrictedModeConfig(allowed_paths={"/opt"}))
+    assert not service.check_file_operation("read", "/srv/data.txt").allowed
+    assert service.check_file_operation("read", "/opt/data.txt").allowed
+
+
+def test_results_are_not_shared_between_calls():
+    service = ComputerSecurityService(mode=ComputerMode.RESTRICTED)
+    first = service.check_file_operation("read", "/tmp/a.txt")
+    first.allowed = False
+    assert service.check_file_operation("read", "/tmp/a.txt").allowed
+
+
+def main():
+    tests = [
+        test_compiled_policy_matches_legacy_checks,
+        test_batch_check_matches_single_checks,
+        test_reload_policy_picks_up_config_changes,
+        test_results_are_not_shared_between_calls,
+    ]
+    print("🔒 Testing compiled computer security policy")
+    print("=" * 50)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+LLM Replay Test - cassette recording and deterministic replay
+
+Records fake provider responses into a temporary cassette and replays them:
+  1. Fingerprints ignore UUIDs/timestamps but not content or roles
+  2. Recorded responses and token counts survive a reload of the cassette
+  3. Repeated identical requests replay their recordings in order
+  4. Synthetic latency is fixed or recorded, scaled, and jitter is seeded
+  5. Streaming emits chunks at the configured tokens/second cadence
+  6. Unrecorded requests are reported as misses
+
+Usage:
+    python test_llm_replay.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.services.llm_replay_service import (
+    LLMCassette, LLMReplayService, ReplaySettings, fingerprint_request
+)
+
+
+def conversation(question, request_id="3f1c2a4e-8b7d-4c1e-9a2f-5d6e7f8a9b0c", at="2026-10-18T09:15:02"):
+    return [
+        {"role": "system", "content": f"You are Metis. Request {request_id} received at {at}.", "timestamp": at},
+        {"role": "user", "content": question, "timestamp": at},
+    ]
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+async def run_checks(cassette_path: str) -> list:
+    results = []
+
+    # 1. Fingerprints
+    base = fingerprint_request(conversation("What is OEE?"))
+    results.append(check("UUIDs and timestamps do not change the fingerprint",
+                         base == fingerprint_request(conversation(
+                             "What is OEE?", "0b9a8f7e-6d5c-4b3a-2f1e-0d9c8b7a6f5e", "2026-10-19 17:40"))))
+    results.append(check("content and roles do",
+                         base != fingerprint_request(conversation("What is MTBF?"))
+                         and base != fingerprint_request(conversation("What is OEE?")[::-1])))
+
+    # 2. Recording
+    recorder = LLMReplayService(LLMCassette(cassette_path), recording=True)
+    recorder.record("anthropic", "claude-3-5-sonnet-20241022", conversation("What is OEE?"), {
+        "success": True, "content": "OEE is availability x performance x quality.",
+        "usage": {"input_tokens": 42, "output_tokens": 12}, "response_time": 0.8})
+    recorder.record("openai", "gpt-4o-mini", conversation("What is OEE?"), {
+        "success": True, "content": "Overall Equipment Effectiveness.", "usage": {}, "response_time": 0.4})
+    long_answer = "Preventive maintenance schedules inspections before failures occur. " * 10
+    recorder.record("openai", "gpt-4o-mini", conversation("Explain preventive maintenance"), {
+        "success": True, "content": long_answer,
+        "usage": {"prompt_tokens": 30, "completion_tokens": 160}, "response_time": 0.2})
+
+    replay = LLMReplayService(LLMCassette(cassette_path), ReplaySettings(first_token_ms=0))
+    records = replay.cassette._records[base]
+    results.append(check("cassette reloads 3 responses with token counts",
+                         len(replay.cassette) == 3 and records[0].prompt_tokens == 42
+                         and records[0].completion_tokens == 12 and records[1].completion_tokens > 0))
+
+    # 3. Replay order, any model
+    first = await replay.complete(conversation("What is OEE?", at="2026-11-01T00:00:00"), "replay")
+    second = await replay.complete(conversation("What is OEE?"), "claude-3-haiku-20240307")
+    third = await replay.complete(conversation("What is OEE?"), "replay")
+    results.append(check("identical requests replay recordings in order, then wrap",
+                         [first["content"], second["content"], third["content"]] == [
+                             "OEE is availability x performance x quality.",
+                             "Overall Equipment Effectiveness.",
+                             "OEE is availability x performance x quality."]
+                         and first["usage"] == {"input_tokens": 42, "output_tokens": 12}))
+
+    # 4. Synthetic latency
+    replay.reset_statistics()
+    replay.settings = ReplaySettings(first_token_ms=100)
+    start = time.perf_counter()
+    await asyncio.gather(*(replay.complete(conversation("What is OEE?"), "replay") for _ in range(20)))
+    elapsed = time.perf_counter() - start
+    results.append(check(f"20 concurrent calls with 100ms latency take {elapsed * 1000:.0f}ms, not 2s",
+                         0.1 <= elapsed < 0.5 and min(replay.first_token_latencies) >= 0.095))
+
+    replay.settings = ReplaySettings(latency_scale=0.25)
+    start = time.perf_counter()
+    await replay.complete(conversation("What is OEE?"), "replay")
+    results.append(check("recorded latency is scaled (0.8s x 0.25)", 0.18 <= time.perf_counter() - start < 0.35))
+
+    delays = []
+    for _ in range(2):
+        jittered = LLMReplayService(replay.cassette, ReplaySettings(first_token_ms=50, jitter=0.5, seed=7))
+        jittered.cassette.rewind()
+        delays.append([jittered._first_token_delay(records[0], occurrence) for occurrence in range(10)])
+    results.append(check("seeded jitter gives the same timings on every run",
+                         delays[0] == delays[1] and len(set(delays[0])) == 10
+                         and all(0.025 <= d <= 0.075 for d in delays[0])))
+
+    # 5. Streaming cadence
+    replay.settings = ReplaySettings(first_token_ms=20, tokens_per_second=800, chunk_tokens=20)
+    arrivals, start = [], time.perf_counter()
+    chunks = []
+    async for chunk in replay.stream(conversation("Explain preventive maintenance")):
+        arrivals.append(time.perf_counter() - start)
+        chunks.append(chunk)
+    results.append(check(f"{len(chunks)} chunks of 20 tokens every 25ms, first after 20ms",
+                         "".join(chunks) == long_answer and len(chunks) == 9
+                         and arrivals[0] >= 0.019 and arrivals[-1] >= 0.02 + 8 * 0.025 * 0.95))
+
+    # 6. Misses
+    miss = await replay.complete(conversation("Unrecorded question"), "replay")
+    results.append(check("unrecorded request fails with a miss",
+                         not miss["success"] and "No recorded response" in miss["error"]
+                         and replay.get_statistics()["misses"] == 1))
+
+    print(f"   statistics: {replay.get_statistics()}")
+    return results
+
+
+def main():
+    print("📼 Testing LLM record/replay")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory(prefix="llm_replay_test_") as workdir:
+        results = asyncio.run(run_checks(os.path.join(workdir, "cassette.jsonl")))
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
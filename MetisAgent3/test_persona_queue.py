@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Persona Queue Test - leased task queue of PersonaService
+
+Runs a PersonaService on a throwaway database:
+  1. Concurrent workers never claim the same task
+  2. Higher priority is claimed first, then insertion order
+  3. An expired lease puts the task back; after max_attempts it is dead-lettered
+  4. fail_task retries with exponential backoff, then dead-letters
+  5. A blocked claim_next_async wakes on create_task (also from another
+     thread's event loop) and when a failed task's retry becomes due
+
+Usage:
+    python test_persona_queue.py
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.services.persona_service import RETRY_BACKOFF_SECONDS, PersonaService
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def available_in(service: PersonaService, task_id: str) -> float:
+    """Seconds until a pending task may be claimed again"""
+    with service._pool.connection() as conn:
+        available_at = conn.execute("SELECT available_at FROM persona_tasks WHERE id = ?", (task_id,)).fetchone()[0]
+    return available_at - time.time()
+
+
+def make_due(service: PersonaService, task_id: str):
+    """Skip the retry backoff of a pending task"""
+    with service._pool.connection() as conn:
+        conn.execute("UPDATE persona_tasks SET available_at = 0 WHERE id = ?", (task_id,))
+
+
+def sync_checks(service: PersonaService) -> list:
+    results = []
+
+    # 1. Concurrent claims
+    for i in range(60):
+        service.create_task("crowd", "alice", "job", {"n": i})
+    claimed = []
+    claimed_lock = threading.Lock()
+
+    def worker(worker_id):
+        while True:
+            task = service.claim_next("crowd", worker_id)
+            if task is None:
+                return
+            with claimed_lock:
+                claimed.append((task.id, worker_id))
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ids = [task_id for task_id, _ in claimed]
+    results.append(check("6 workers claimed 60 tasks, none twice",
+                         len(ids) == 60 and len(set(ids)) == 60
+                         and service.get_queue_stats("crowd") == {"running": 60}))
+
+    # 2. Priority order
+    low = service.create_task("ranked", "alice", "job", {"name": "low"}, priority=0)
+    first_high = service.create_task("ranked", "alice", "job", {"name": "high-1"}, priority=5)
+    medium = service.create_task("ranked", "alice", "job", {"name": "medium"}, priority=1)
+    second_high = service.create_task("ranked", "alice", "job", {"name": "high-2"}, priority=5)
+    order = [service.claim_next("ranked", "w1").id for _ in range(4)]
+    results.append(check("claims follow priority, ties in insertion order",
+                         order == [first_high.id, second_high.id, medium.id, low.id]
+                         and service.claim_next("ranked", "w1") is None))
+
+    # 3. Lease expiry
+    task = service.create_task("lease", "alice", "job", {}, max_attempts=2)
+    first = service.claim_next("lease", "w1", lease_seconds=0.1)
+    reaped_early = service.reap_expired_leases()
+    time.sleep(0.15)
+    reaped = service.reap_expired_leases()
+    again = service.claim_next("lease", "w2", lease_seconds=0.1)
+    results.append(check("expired lease puts the task back in the queue for another worker",
+                         first.id == task.id and reaped_early == 0 and reaped == 1
+                         and again.id == task.id and again.lease_owner == "w2" and again.attempts == 2))
+    results.append(check("the old worker lost the lease",
+                         service.complete_task(task.id, "w1") is None and not service.extend_lease(task.id, "w1")))
+    time.sleep(0.15)
+    service.reap_expired_leases()
+    dead = service.get_persona_tasks("lease", status="dead")
+    results.append(check("lease expiring on the last attempt dead-letters the task",
+                         [t.id for t in dead] == [task.id] and "Lease expired (worker w2)" in dead[0].error
+                         and service.claim_next("lease", "w3") is None))
+    revived = service.requeue_dead_task(task.id)
+    results.append(check("a dead task can be requeued with a fresh attempt budget",
+                         revived.status == "pending" and revived.attempts == 0
+                         and service.complete_task(service.claim_next("lease", "w3").id, "w3").status == "completed"))
+
+    # 4. fail_task backoff
+    task = service.create_task("retry", "alice", "job", {}, max_attempts=3)
+    service.claim_next("retry", "w1")
+    failed = service.fail_task(task.id, "w1", "timeout")
+    first_delay = available_in(service, task.id)
+    results.append(check(f"first failure retries after ~{RETRY_BACKOFF_SECONDS:.0f}s, not claimable before",
+                         failed.status == "pending" and failed.error == "timeout"
+                         and RETRY_BACKOFF_SECONDS - 0.5 < first_delay <= RETRY_BACKOFF_SECONDS
+                         and service.claim_next("retry", "w1") is None))
+    make_due(service, task.id)
+    service.claim_next("retry", "w1")
+    service.fail_task(task.id, "w1", "timeout")
+    second_delay = available_in(service, task.id)
+    results.append(check(f"second failure backs off twice as long ({second_delay:.1f}s)",
+                         2 * RETRY_BACKOFF_SECONDS - 0.5 < second_delay <= 2 * RETRY_BACKOFF_SECONDS))
+    make_due(service, task.id)
+    service.claim_next("retry", "w1")
+    last = service.fail_task(task.id, "w1", "still failing")
+    results.append(check("failure on the last attempt dead-letters the task",
+                         last.status == "dead" and last.attempts == 3 and last.completed_at is not None
+                         and service.fail_task(task.id, "w1", "again") is None))
+    return results
+
+
+async def async_checks(service: PersonaService) -> list:
+    results = []
+
+    # 5. Wakeups
+    started = time.perf_counter()
+    waiting = asyncio.ensure_future(service.claim_next_async("async", "w1", timeout=4))
+    await asyncio.sleep(0.2)
+    created = service.create_task("async", "alice", "job", {})
+    task = await waiting
+    elapsed = time.perf_counter() - started
+    results.append(check(f"blocked claim_next_async woken by create_task ({elapsed:.2f}s)",
+                         task is not None and task.id == created.id and elapsed < 1))
+
+    outcome = {}
+
+    def other_loop():
+        outcome["started"] = time.perf_counter()
+        outcome["task"] = asyncio.run(service.claim_next_async("async", "w2", timeout=4))
+        outcome["elapsed"] = time.perf_counter() - outcome["started"]
+
+    worker = threading.Thread(target=other_loop)
+    worker.start()
+    await asyncio.sleep(0.2)
+    created = await asyncio.to_thread(service.create_task, "async", "bob", "job", {})
+    await asyncio.to_thread(worker.join)
+    results.append(check(f"waiter in another thread's loop woken by create_task ({outcome['elapsed']:.2f}s)",
+                         outcome["task"] is not None and outcome["task"].id == created.id and outcome["elapsed"] < 1))
+
+    service.fail_task(task.id, "w1", "flaky", retry_delay=0.3)
+    started = time.perf_counter()
+    retried = await service.claim_next_async("async", "w3", timeout=4)
+    elapsed = time.perf_counter() - started
+    results.append(check(f"waiter woken when the retry becomes due ({elapsed:.2f}s)",
+                         retried is not None and retried.id == task.id and 0.2 < elapsed < 1))
+
+    started = time.perf_counter()
+    nothing = await service.claim_next_async("async", "w3", timeout=0.3)
+    results.append(check("empty queue returns None after the timeout",
+                         nothing is None and 0.25 < time.perf_counter() - started < 1))
+    return results
+
+
+def main():
+    print("📬 Testing persona task queue")
+    print("=" * 50)
+    workdir = Path(tempfile.mkdtemp(prefix="persona_queue_test_"))
+    service = PersonaService(str(workdir / "personas.db"))
+    try:
+        results = sync_checks(service)
+        results += asyncio.run(async_checks(service))
+    finally:
+        service.close()
+
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Plugin Security Scanner Test - AST checks and the content-hash verdict cache
+
+Scans throwaway plugin directories with the PluginRegistryService rulesets:
+  1. Blocked imports/calls are found through aliases, getattr and builtins lookups
+  2. Unchanged files are answered from the cache, also by a new scanner instance
+  3. Editing one file parses only that file; a new ruleset ignores old verdicts
+  4. Parallel parsing of large batches gives the same verdicts as inline parsing
+
+Usage:
+    python test_plugin_security_scanner.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.services.plugin_security_scanner import PluginSecurityScanner, scan_source
+
+# Same sets as PluginRegistryService.BLOCKED_IMPORTS / BLOCKED_CALLS
+BLOCKED_IMPORTS = {"subprocess", "os.system", "shutil.rmtree", "eval", "exec", "__import__"}
+BLOCKED_CALLS = {"eval", "exec", "compile", "__import__", "open"}
+
+CLEAN = "import json\nimport os\n\ndef load(path):\n    with open(path) as f:\n        return json.load(f)\n"
+
+BLOCKED_SOURCES = {
+    "plain import": "import subprocess\n",
+    "from import": "from subprocess import run\n",
+    "import alias": "import os as o\no.system('ls')\n",
+    "from-import alias": "from os import system as run\nrun('ls')\n",
+    "assignment alias": "import os\nrun = os.system\nrun('ls')\n",
+    "getattr literal": "import os\ngetattr(os, 'system')('ls')\n",
+    "getattr computed": "import os\nname = 'sys' + 'tem'\ngetattr(os, name)('ls')\n",
+    "import_module": "import importlib\nimportlib.import_module('subprocess')\n",
+    "dynamic __import__": "mod = __import__(input())\n",
+    "builtins subscript": "__builtins__['eval']('1')\n",
+    "builtins attribute": "import builtins\nbuiltins.exec('x = 1')\n",
+    "builtin as value": "list(map(eval, ['1', '2']))\n",
+    "compile": "code = compile('1', '<x>', 'eval')\n",
+}
+
+
+def scanner(cache_path: Path, **kwargs) -> PluginSecurityScanner:
+    return PluginSecurityScanner(cache_path, BLOCKED_IMPORTS, BLOCKED_CALLS, **kwargs)
+
+
+def write_plugin(plugin_dir: Path, files: dict):
+    plugin_dir.mkdir(parents=True, exist_ok=True)
+    for name, source in files.items():
+        (plugin_dir / name).write_text(source)
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    print("🛡️ Testing plugin security scanner")
+    print("=" * 50)
+    workdir = Path(tempfile.mkdtemp(prefix="plugin_scan_test_"))
+    cache_path = workdir / ".security_scan_cache.db"
+    results = []
+
+    # 1. Detection
+    frozen_imports, frozen_calls = frozenset(BLOCKED_IMPORTS), frozenset(BLOCKED_CALLS)
+    missed = [label for label, source in BLOCKED_SOURCES.items()
+              if scan_source(source.encode(), frozen_imports, frozen_calls) is None]
+    results.append(check(f"{len(BLOCKED_SOURCES) - len(missed)}/{len(BLOCKED_SOURCES)} blocked patterns found"
+                         + (f" (missed: {', '.join(missed)})" if missed else ""), not missed))
+    results.append(check("clean code with os.path and open() passes",
+                         scan_source(CLEAN.encode(), frozen_imports, frozen_calls) is None))
+    syntax = scan_source(b"def broken(:\n", frozen_imports, frozen_calls)
+    results.append(check("syntax errors are reported", syntax is not None and syntax.kind == "syntax"))
+
+    # 2. Cache hits
+    plugin = workdir / "plant_tool"
+    write_plugin(plugin, {f"module_{i}.py": CLEAN + f"\nVERSION = {i}\n" for i in range(6)})
+    first = scanner(cache_path)
+    verdict = first.scan_plugin(plugin)
+    again = first.scan_plugin(plugin)
+    results.append(check("second scan of unchanged files parses nothing",
+                         verdict == again == (True, "OK")
+                         and first.stats == {"files": 12, "cache_hits": 6, "parsed": 6, "parallel_batches": 0}))
+    first.close()
+    reopened = scanner(cache_path)
+    results.append(check("verdicts persist for a new scanner on the same cache file",
+                         reopened.scan_plugin(plugin) == (True, "OK") and reopened.stats["parsed"] == 0))
+
+    # 3. One-file edit, cached findings, ruleset change
+    (plugin / "module_3.py").write_text(BLOCKED_SOURCES["assignment alias"])
+    edited = reopened.scan_plugin(plugin)
+    cached = reopened.scan_plugin(plugin)
+    results.append(check("one edited file is the only one parsed, its cached finding has the same message",
+                         edited == cached == (False, "Blocked call: os.system in module_3.py")
+                         and reopened.stats["parsed"] == 1))
+    reopened.close()
+    stricter = PluginSecurityScanner(cache_path, BLOCKED_IMPORTS | {"json"}, BLOCKED_CALLS)
+    results.append(check("a different ruleset does not reuse old verdicts",
+                         stricter.scan_plugin(plugin)[0] is False and stricter.stats["parsed"] == 6))
+    stricter.close()
+
+    # 4. Parallel batch
+    big = workdir / "big_tool"
+    files = {f"clean_{i}.py": CLEAN + f"\nVERSION = {i}\n" for i in range(8)}
+    files["zz_blocked.py"] = BLOCKED_SOURCES["import_module"]
+    write_plugin(big, files)
+    inline = scanner(workdir / "inline.db", parallel_threshold_bytes=10 ** 9)
+    parallel = scanner(workdir / "parallel.db", parallel_threshold_bytes=0, max_workers=2)
+    inline_verdict = inline.scan_plugin(big)
+    parallel_verdict = parallel.scan_plugin(big)
+    results.append(check("process pool batch gives the same verdict as inline parsing",
+                         parallel_verdict == inline_verdict
+                         and inline_verdict == (False, "Blocked import: subprocess in zz_blocked.py")
+                         and parallel.stats["parallel_batches"] == 1 and inline.stats["parallel_batches"] == 0))
+    inline.close()
+    parallel.close()
+
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Process Engine Test - per-user limit, streaming and timeouts
+
+Runs short shell commands through ProcessEngine:
+  1. The per-user limit holds across threads that each run their own event loop
+  2. Other users are not blocked by a busy user
+  3. A cancelled waiter does not leak a slot
+  4. Output streams to on_output; timeouts kill the process group
+  5. run_sync works from a plain thread
+
+Usage:
+    python test_process_engine.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.services.process_engine import ProcessEngine
+
+SLEEP = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def run_in_threads(engine: ProcessEngine, user_ids, command=SLEEP):
+    """One thread per call, each with its own event loop (as the bridge does)"""
+    peak = {}
+    stop = threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            for user_id, count in engine.running().items():
+                peak[user_id] = max(peak.get(user_id, 0), count)
+            time.sleep(0.01)
+
+    def request(user_id):
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(engine.run(command, user_id=user_id))
+        loop.close()
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=request, args=(user_id,)) for user_id in user_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+    return peak, elapsed
+
+
+async def async_checks(engine: ProcessEngine) -> list:
+    results = []
+
+    # 3. Cancelled waiter
+    holder = asyncio.ensure_future(engine.run(SLEEP, user_id="carol"))
+    await asyncio.sleep(0.05)
+    waiter = asyncio.ensure_future(engine.run(SLEEP, user_id="carol"))
+    await asyncio.sleep(0.05)
+    waiter.cancel()
+    try:
+        await waiter
+    except asyncio.CancelledError:
+        pass
+    await holder
+    await asyncio.sleep(0.05)
+    results.append(check("cancelled waiter leaves no slot behind", engine.running("carol") == 0))
+
+    # 4. Streaming and timeout
+    chunks = []
+    echo = [sys.executable, "-c", "import sys; print('first'); sys.stdout.flush(); print('second', file=sys.stderr)"]
+    result = await engine.run(echo, user_id="dave", on_output=chunks.append)
+    streamed = {name: "".join(c.text for c in chunks if c.stream == name) for name in ("stdout", "stderr")}
+    results.append(check("output streamed per stream and returned",
+                         result.success and result.stdout.strip() == "first"
+                         and streamed == {"stdout": "first\n", "stderr": "second\n"}))
+    started = time.perf_counter()
+    slow = await engine.run([sys.executable, "-c", "import time; time.sleep(10)"], user_id="dave", timeout=0.3)
+    results.append(check("timeout kills the process group quickly",
+                         slow.timed_out and not slow.success and time.perf_counter() - started < 5))
+    return results
+
+
+def main():
+    print("⚙️ Testing process engine")
+    print("=" * 50)
+    results = []
+
+    # 1. Limit across loops
+    engine = ProcessEngine(per_user_limit=1, kill_grace_seconds=0.5)
+    peak, elapsed = run_in_threads(engine, ["alice"] * 3)
+    results.append(check(f"limit 1, 3 request loops -> one at a time ({elapsed:.2f}s)",
+                         peak.get("alice") == 1 and elapsed >= 0.85 and engine.running() == {}))
+
+    # 2. Users are independent
+    peak, elapsed = run_in_threads(engine, ["alice", "bob"])
+    results.append(check(f"two users run side by side ({elapsed:.2f}s)",
+                         peak.get("alice") == 1 and peak.get("bob") == 1 and elapsed < 0.55))
+
+    results += asyncio.run(async_checks(engine))
+
+    # 5. run_sync
+    outcome = {}
+    worker = threading.Thread(target=lambda: outcome.update(
+        result=engine.run_sync([sys.executable, "-c", "print('sync')"], user_id="erin")))
+    worker.start()
+    worker.join()
+    results.append(check("run_sync returns the result to a plain thread",
+                         outcome["result"].stdout.strip() == "sync" and engine.running() == {}))
+
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
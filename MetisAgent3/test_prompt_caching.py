@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Prompt Caching Test - segmented prompts against a local fake provider
+
+No real API calls: an http.server stands in for both the Anthropic
+/messages and the OpenAI /chat/completions endpoints, records every
+payload and simulates prefix caching in its usage blocks.
+  1. compose_prompt text is unchanged; segments carry hashes and cache flags
+  2. Anthropic: one system block per stable segment, cache_control on each,
+     task text in the user message, intent block last and uncached
+  3. OpenAI: system message is the byte-identical stable prefix across tasks
+  4. Cache read/write tokens show up in get_prompt_statistics()
+  5. Prefix tracking stays bounded when tool contexts keep changing
+"""
+
+import asyncio
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+os.chdir(tempfile.mkdtemp(prefix="prompt_caching_test_"))  # conversations.db is created here
+
+from core.contracts.base_types import ExecutionContext
+from core.managers.reasoning_manager import LLMService
+from core.services.prompt_strategy_service import PREFIX_TRACKING_SIZE, PromptSection, PromptStrategyService
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4
+
+
+class FakeProviderServer:
+    """Anthropic + OpenAI compatible endpoint with simulated prefix caching"""
+
+    def __init__(self):
+        self.payloads = []
+        self.cached_prefixes = set()   # Anthropic: text up to each cache breakpoint
+        self.seen_prompts = []         # OpenAI: full prompts served so far
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                server.payloads.append((self.path, payload))
+                if self.path.endswith("/messages"):
+                    body = {"content": [{"type": "text", "text": "ok"}], "usage": server.anthropic_usage(payload)}
+                else:
+                    body = {"choices": [{"message": {"content": "ok"}}], "usage": server.openai_usage(payload)}
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def anthropic_usage(self, payload):
+        system = payload.get("system", [])
+        blocks = system if isinstance(system, list) else [{"type": "text", "text": system}]
+        breakpoints, text = [], ""
+        for block in blocks:
+            text += block["text"]
+            if "cache_control" in block:
+                breakpoints.append(text)
+        hit = max((p for p in breakpoints if p in self.cached_prefixes), key=len, default="")
+        written = breakpoints[-1] if breakpoints and breakpoints[-1] not in self.cached_prefixes else ""
+        self.cached_prefixes.update(breakpoints)
+        total = estimate_tokens(text + json.dumps(payload["messages"]))
+        cache_read, cache_write = estimate_tokens(hit), estimate_tokens(written[len(hit):]) if written else 0
+        return {"input_tokens": total - cache_read - cache_write, "cache_read_input_tokens": cache_read,
+                "cache_creation_input_tokens": cache_write, "output_tokens": 1}
+
+    def openai_usage(self, payload):
+        prompt = "".join(message["content"] for message in payload["messages"])
+        common = max((len(os.path.commonprefix([prompt, seen])) for seen in self.seen_prompts), default=0)
+        self.seen_prompts.append(prompt)
+        return {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": 1,
+                "prompt_tokens_details": {"cached_tokens": estimate_tokens(prompt[:common])}}
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+async def run_checks(server: FakeProviderServer) -> list:
+    results = []
+    strategy = PromptStrategyService()
+    policy = strategy.create_policy_prompt("acme", "ACME", "operator", ["read_tags"])
+    domain = strategy.get_domain_template("scada")
+    tools_context = "\n".join(f"- tool_{i}: reads and writes things" for i in range(200))
+    tasks = [strategy.create_task_prompt(f"Read tag TT-{i} and report its value") for i in range(3)]
+
+    # 1. Segments
+    prompt = strategy.compose_segmented_prompt(policy, domain, tasks[0], tools_context)
+    results.append(check("segmented text equals compose_prompt",
+                         prompt.text == strategy.compose_prompt(policy, domain, tasks[0], tools_context)))
+    results.append(check("stable segments first, task last and uncached",
+                         [s.section for s in prompt.segments] == [PromptSection.POLICY, PromptSection.DOMAIN,
+                                                                  PromptSection.TOOLS, PromptSection.TASK]
+                         and [s.cacheable for s in prompt.segments] == [True, True, True, False]))
+    other = strategy.compose_segmented_prompt(policy, domain, tasks[1], tools_context)
+    results.append(check("prefix hash stable across tasks, task hash differs",
+                         prompt.prefix_hash == other.prefix_hash
+                         and prompt.segments[-1].content_hash != other.segments[-1].content_hash))
+
+    llm = LLMService(storage=object())
+    llm.prompt_strategy = strategy
+    for provider in ("anthropic", "openai"):
+        llm.llm_tool.providers[provider]["base_url"] = server.url
+
+    async def fake_api_key(user_id, provider):
+        return "test-key"
+    llm.llm_tool._get_api_key = fake_api_key
+    context = ExecutionContext(user_id="tester", session_id="prompt-caching")
+
+    # 2. Anthropic cache_control breakpoints
+    for task in tasks:
+        segmented = strategy.compose_segmented_prompt(policy, domain, task, tools_context)
+        await llm.generate_from_segments(segmented, context=context, provider="anthropic")
+    anthropic = [payload for path, payload in server.payloads if path.endswith("/messages")]
+    system = anthropic[0]["system"]
+    stable = prompt.cacheable_segments
+    results.append(check(f"{len(anthropic)} Anthropic requests, {len(system)} system blocks (3 segments + intent)",
+                         len(anthropic) == 3 and len(system) == 4))
+    results.append(check("system block boundaries match segment boundaries",
+                         all(block["text"] == segment.content + prompt.SEPARATOR
+                             for block, segment in zip(system, stable))))
+    results.append(check("cache_control on stable blocks only",
+                         [("cache_control" in block) for block in system] == [True, True, True, False]))
+    results.append(check("task text sent as the user message",
+                         anthropic[0]["messages"][-1]["content"] == tasks[0].to_prompt()))
+    results.append(check("stable blocks byte-identical across requests",
+                         all(p["system"][:3] == system[:3] for p in anthropic)))
+
+    # 3. OpenAI stable prefix
+    for task in tasks:
+        segmented = strategy.compose_segmented_prompt(policy, domain, task, tools_context)
+        await llm.generate_from_segments(segmented, context=context, provider="openai")
+    openai = [payload for path, payload in server.payloads if path.endswith("/chat/completions")]
+    systems = [p["messages"][0]["content"] for p in openai]
+    results.append(check("OpenAI system message starts with the stable prefix",
+                         all(text.startswith(prompt.prefix_text) for text in systems)))
+
+    # 4. Statistics
+    stats = strategy.get_prompt_statistics()
+    usage = stats["cache_usage"]
+    print(f"   cache usage: {json.dumps(usage)}")
+    results.append(check("Anthropic: first request writes, later requests read the cache",
+                         usage["anthropic"]["cache_write_tokens"] > 0
+                         and usage["anthropic"]["cache_read_tokens"] == 2 * usage["anthropic"]["cache_write_tokens"]))
+    results.append(check("OpenAI cached tokens recorded", usage["openai"]["cache_read_tokens"] > 0))
+    results.append(check("one distinct cacheable prefix", stats["distinct_cacheable_prefixes"] == 1))
+
+    # 5. Bounded prefix tracking
+    churn = PromptStrategyService()
+    for i in range(PREFIX_TRACKING_SIZE + 50):
+        churn.compose_segmented_prompt(policy, domain, tasks[0], f"- tool_{i}: generated per request")
+    churn_stats = churn.get_prompt_statistics()
+    results.append(check("distinct prefixes capped, composed prompts still counted",
+                         churn_stats["distinct_cacheable_prefixes"] == PREFIX_TRACKING_SIZE
+                         and churn_stats["composed_prompts"] == PREFIX_TRACKING_SIZE + 50))
+    return results
+
+
+def main():
+    server = FakeProviderServer()
+    try:
+        results = asyncio.run(run_checks(server))
+    finally:
+        server.httpd.shutdown()
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
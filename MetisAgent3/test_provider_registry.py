@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Provider Registry Test - model discovery, background refresh and routing
+
+Runs ProviderRegistryService with counting fake fetchers:
+  1. Concurrent first lookups of a key share one discovery (also across threads)
+  2. Later lookups are memory reads; keys are stored by fingerprint only
+  3. Background refresh picks up model changes; failures keep the last good list
+  4. Refresh delays are jittered, failures back off exponentially
+  5. pick_model routes task classes by tier, context window and budget
+  6. Idle keys stop refreshing and are dropped
+
+Usage:
+    python test_provider_registry.py
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.services.provider_registry_service import (
+    FAILURE_BACKOFF_SECONDS, ProviderRegistryService, key_fingerprint
+)
+
+OPENAI_KEY = "sk-test-openai-secret"
+ANTHROPIC_KEY = "sk-ant-test-secret"
+
+
+class FakeProviders:
+    """Provider APIs returning configurable model lists, counting every call"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.models = {
+            "openai": ["gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo"],
+            "anthropic": ["claude-3-5-sonnet-20241022", "claude-3-5-haiku-20241022", "claude-3-haiku-20240307"],
+        }
+        self.fail = set()
+        self.delay = 0.1
+
+    def fetcher(self, provider):
+        async def fetch(api_key):
+            self.calls[provider] += 1
+            await asyncio.sleep(self.delay)
+            if provider in self.fail:
+                raise RuntimeError(f"{provider} unavailable")
+            return list(self.models[provider])
+        return fetch
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+async def run_checks() -> list:
+    results = []
+    fake = FakeProviders()
+    registry = ProviderRegistryService(
+        fetchers={provider: fake.fetcher(provider) for provider in fake.models},
+        refresh_interval_seconds=0.5, idle_seconds=60)
+
+    # 1. Single-flight cold discovery
+    snapshots = await asyncio.gather(*(registry.get_snapshot("openai", OPENAI_KEY) for _ in range(10)))
+    results.append(check("10 concurrent first lookups -> 1 discovery",
+                         fake.calls["openai"] == 1 and all(s.available for s in snapshots)))
+
+    thread_snapshots = []
+
+    def bridge_request():
+        loop = asyncio.new_event_loop()
+        thread_snapshots.append(loop.run_until_complete(registry.get_snapshot("anthropic", ANTHROPIC_KEY)))
+        loop.close()
+
+    threads = [threading.Thread(target=bridge_request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(check("6 request threads with separate loops -> 1 discovery",
+                         fake.calls["anthropic"] == 1 and len(thread_snapshots) == 6
+                         and all(s.model_ids == fake.models["anthropic"] for s in thread_snapshots)))
+
+    # 2. Memory reads, metadata, no raw keys
+    start = time.perf_counter()
+    for _ in range(1000):
+        await registry.get_snapshot("openai", OPENAI_KEY)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    results.append(check(f"1000 warm lookups in {elapsed_ms:.1f}ms without provider calls", fake.calls["openai"] == 1))
+    mini = next(m for m in snapshots[0].models if m.model_id == "gpt-4o-mini")
+    results.append(check("context window and pricing attached",
+                         mini.context_window == 128000 and mini.input_cost_per_mtok == 0.15 and mini.tier == 1))
+    dumped = json.dumps([s.to_dict() for s in registry.snapshots()]) + json.dumps(registry.get_statistics())
+    results.append(check("snapshots and statistics carry fingerprints, never keys",
+                         OPENAI_KEY not in dumped and ANTHROPIC_KEY not in dumped
+                         and key_fingerprint("openai", OPENAI_KEY) in dumped))
+    other = await registry.get_snapshot("openai", "sk-other-user", wait=False)
+    results.append(check("wait=False schedules discovery of a new key without waiting", other is None))
+    await asyncio.sleep(fake.delay * 2)
+    results.append(check("...and the key is discovered in the background",
+                         registry.peek("openai", "sk-other-user") is not None and fake.calls["openai"] == 2))
+
+    # 3. Background refresh and failures
+    fake.models["openai"].append("gpt-4-turbo")
+    await asyncio.sleep(1.0)
+    results.append(check("background refresh picks up new models",
+                         "gpt-4-turbo" in registry.peek("openai", OPENAI_KEY).model_ids))
+    fake.fail.add("anthropic")
+    await asyncio.sleep(1.0)
+    stale = registry.peek("anthropic", ANTHROPIC_KEY)
+    results.append(check("failed refresh keeps the last good model list",
+                         registry.get_statistics()["refresh_failures"] >= 1
+                         and stale.available and stale.model_ids == fake.models["anthropic"]))
+    forced = await registry.refresh("anthropic", "sk-ant-invalid")
+    results.append(check("failed first discovery is reported as unavailable",
+                         not forced.available and "unavailable" in forced.error))
+    fake.fail.clear()
+
+    # 4. Jitter and backoff
+    delays = [registry._next_delay(0) for _ in range(200)]
+    results.append(check("refresh delays are jittered within +/-20%",
+                         min(delays) >= 0.4 and max(delays) <= 0.6 and len(set(delays)) > 100))
+    slow = ProviderRegistryService(refresh_interval_seconds=3600)
+    backoff = [slow._next_delay(failures) for failures in (1, 2, 3)]
+    results.append(check("failures back off exponentially",
+                         FAILURE_BACKOFF_SECONDS * 0.8 <= backoff[0] <= FAILURE_BACKOFF_SECONDS * 1.2
+                         and backoff[0] < backoff[1] < backoff[2]))
+
+    # 5. Routing
+    openai = registry.peek("openai", OPENAI_KEY)
+    anthropic = registry.peek("anthropic", ANTHROPIC_KEY)
+    both = [openai, anthropic]
+    classify = registry.pick_model("classify", snapshots=both)
+    results.append(check("classify -> cheapest small model",
+                         classify.model == "gpt-4o-mini" and classify.estimated_cost_usd < 0.001))
+    plan = registry.pick_model("plan", snapshots=[anthropic])
+    results.append(check("plan -> most capable model", plan.model == "claude-3-5-sonnet-20241022" and plan.tier == 3))
+    budget_plan = registry.pick_model("plan", budget=0.02, snapshots=both)
+    results.append(check("plan within a budget -> a cheaper tier",
+                         budget_plan.model == "claude-3-5-haiku-20241022" and budget_plan.estimated_cost_usd <= 0.02))
+    long_context = registry.pick_model("long_context", snapshots=[openai])
+    results.append(check("long_context skips small context windows",
+                         long_context.context_window >= 100000 and long_context.model != "gpt-3.5-turbo"))
+    results.append(check("nothing fits a tiny budget -> None",
+                         registry.pick_model("plan", budget=0.0001, snapshots=both) is None))
+
+    # 6. Idle eviction
+    registry.idle_seconds = 0.2
+    await asyncio.sleep(1.5)
+    calls = Counter(fake.calls)
+    await asyncio.sleep(1.0)
+    results.append(check("idle keys are dropped and no longer refreshed",
+                         registry.get_statistics()["keys"] == 0 and fake.calls == calls))
+
+    print(f"   statistics: {registry.get_statistics()}")
+    return results
+
+
+def main():
+    print("🧭 Testing provider registry")
+    print("=" * 50)
+    results = asyncio.run(run_checks())
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+RMMS Tag Catalog Test - shared tag mirror against a local fake MetisEngine
+
+An http.server stands in for MetisEngine's /api/Tags endpoints, serves
+ETag / Last-Modified headers, answers conditional requests with 304 and
+counts every request.
+  1. list_tags keeps its response shape and returns the old substring matches
+  2. Calls within the TTL (from either RMMS tool) make no request at all
+  3. After the TTL the list is revalidated (304), changes are applied as a diff
+  4. Ranked prefix/fuzzy search, paging cursors stable across refreshes
+  5. get_tag is served from the catalog, concurrent cold calls share one fetch
+  6. Refreshes from several event loops share one download; searches in
+     other threads stay consistent while a refresh is applied
+
+Usage:
+    python test_rmms_tag_catalog.py
+"""
+
+import asyncio
+import hashlib
+import http.server
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.contracts import ToolConfiguration, ToolMetadata, ToolType
+from plugins.rmms_tag_catalog import clear_tag_catalogs, get_tag_catalog
+from plugins.rmms_task_tool.rmms_task_tool import RMMSTaskTool
+from plugins.rmms_workflow_tool.rmms_workflow_tool import RMMSWorkflowTool
+
+COMPANY_ID = 3
+AREAS = ["Boiler", "Chiller", "Compressor", "Pump", "Furnace", "Dryer"]
+SIGNALS = ["Temperature", "Pressure", "Flow", "Level", "Current", "Status"]
+
+
+def make_tags():
+    tags = []
+    for i in range(600):
+        area, signal = AREAS[i % len(AREAS)], SIGNALS[(i // len(AREAS)) % len(SIGNALS)]
+        tags.append({"tagID": 1000 + i, "tagName": f"Plant1.{area}_{i // 36 + 1}.{signal}",
+                     "tagName2": f"{area} {i // 36 + 1} {signal}", "type": i % 3, "unit": "C"})
+    tags.append({"tagID": 5, "tagName": "Pump", "tagName2": "Main pump", "type": 0, "unit": ""})
+    return tags
+
+
+class FakeMetisEngine:
+    """/api/Tags/all/{companyId} and /api/Tags/{tagId} with conditional GET support"""
+
+    def __init__(self):
+        self.tags = {str(COMPANY_ID): make_tags()}
+        self.requests = Counter()
+        self.fail = False
+        self.delay = 0
+        engine = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if engine.fail:
+                    return self.reply(500, b"engine unavailable")
+                if parts[:3] == ["api", "Tags", "all"]:
+                    engine.requests["all"] += 1
+                    time.sleep(engine.delay)
+                    body = json.dumps({"tags": engine.tags.get(parts[3], [])}).encode()
+                    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        engine.requests["not_modified"] += 1
+                        return self.reply(304, b"", etag)
+                    return self.reply(200, body, etag)
+                if parts[:2] == ["api", "Tags"] and len(parts) == 3:
+                    engine.requests["tag"] += 1
+                    for tags in engine.tags.values():
+                        for tag in tags:
+                            if str(tag["tagID"]) == parts[2]:
+                                return self.reply(200, json.dumps({"Tag": tag}).encode())
+                    return self.reply(404, b"tag not found")
+                self.reply(404, b"not found")
+
+            def reply(self, status, body, etag=None):
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", "Mon, 05 Oct 2026 08:00:00 GMT")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+
+def make_tool(tool_class, name, api_base_url):
+    metadata = ToolMetadata(name=name, description=name, version="1.0.0",
+                            tool_type=ToolType.PLUGIN, capabilities=[])
+    config = ToolConfiguration(tool_name=name, config={"api_base_url": api_base_url, "timeout": 5})
+    return tool_class(metadata, config)
+
+
+def legacy_filter(tags, search):
+    search = search.lower()
+    return [t for t in tags if search in t.get("tagName", "").lower() or search in t.get("tagName2", "").lower()]
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+async def run_checks(engine: FakeMetisEngine) -> list:
+    results = []
+    task_tool = make_tool(RMMSTaskTool, "rmms_task_tool", f"{engine.url}/api/Task")
+    workflow_tool = make_tool(RMMSWorkflowTool, "rmms_workflow_tool", f"{engine.url}/api")
+    all_tags = engine.tags[str(COMPANY_ID)]
+
+    # 1. Response shape and legacy matches, concurrent cold calls share one fetch
+    responses = await asyncio.gather(*(task_tool._list_tags({"company_id": COMPANY_ID, "search": "pump"})
+                                       for _ in range(10)))
+    results.append(check("10 concurrent cold list_tags -> 1 download", engine.requests["all"] == 1))
+    data = responses[0]["data"]
+    results.append(check("response keeps tags/returned/filtered/total",
+                         responses[0]["success"] and data["returned"] == 50 and data["total"] == len(all_tags)
+                         and set(data["tags"][0]) == {"tagID", "tagName", "tagName2", "type", "unit"}))
+    catalog = get_tag_catalog(task_tool.tags_api, COMPANY_ID)
+    for search in ("pump", "PRESSURE", "er_1", "boiler 3", "x"):
+        ranked = {tag_id for key, tag_id in catalog.rank(search, fuzzy=False)}
+        results.append(check(f"substring matches for {search!r} equal the old filter",
+                             ranked == {t["tagID"] for t in legacy_filter(all_tags, search)}))
+
+    # 2. Within the TTL nothing is downloaded, from either tool
+    await task_tool._list_tags({"company_id": COMPANY_ID})
+    workflow = await workflow_tool._list_tags({"company_id": COMPANY_ID, "search": "chiller"})
+    results.append(check("calls within the TTL make no request", engine.requests["all"] == 1))
+    results.append(check("workflow tool shares the catalog and keeps its shape",
+                         workflow["success"] and workflow["data"]["total_tags"] == len(all_tags)
+                         and workflow["data"]["tags"][0]["id"].startswith("tag_")))
+
+    # 3. Conditional refresh after the TTL, changes applied as a diff
+    catalog.ttl_seconds = 0
+    await task_tool._list_tags({"company_id": COMPANY_ID})
+    results.append(check("expired catalog revalidated with a 304", engine.requests["not_modified"] == 1
+                         and catalog.stats["fetches"] == 1))
+    version = catalog.version
+    engine.tags[str(COMPANY_ID)] = all_tags = [dict(t) for t in all_tags if t["tagID"] != 1001]
+    all_tags[0]["tagName2"] = "Boiler 1 Steam Temperature"
+    all_tags.append({"tagID": 9000, "tagName": "Plant1.Turbine_1.Speed", "tagName2": "Turbine speed",
+                     "type": 0, "unit": "rpm"})
+    stats_before = dict(catalog.stats)
+    await task_tool._list_tags({"company_id": COMPANY_ID})
+    results.append(check("changed list applied as 1 added / 1 updated / 1 removed",
+                         catalog.stats["tags_added"] - stats_before["tags_added"] == 1
+                         and catalog.stats["tags_updated"] - stats_before["tags_updated"] == 1
+                         and catalog.stats["tags_removed"] - stats_before["tags_removed"] == 1
+                         and catalog.version == version + 1))
+    steam = await task_tool._list_tags({"company_id": COMPANY_ID, "search": "steam"})
+    removed = await task_tool._list_tags({"company_id": COMPANY_ID, "search": "Compressor_1.Temperature"})
+    results.append(check("index reflects renamed and removed tags",
+                         [t["tagID"] for t in steam["data"]["tags"]] == [1000]
+                         and not any(t["tagID"] == 1001 for t in removed["data"]["tags"])))
+    catalog.ttl_seconds = 60
+
+    # 4. Ranking and fuzzy search
+    page = catalog.search("pump", limit=3)
+    results.append(check("exact name ranks first, then prefix matches",
+                         page.tags[0]["tagID"] == 5 and page.match_types[:2] == ["exact", "prefix"]))
+    page = catalog.search("turbnie speed", limit=5)
+    results.append(check("fuzzy search finds a misspelled tag",
+                         page.tags and page.tags[0]["tagID"] == 9000 and page.match_types[0] == "fuzzy"))
+
+    # 5. Paging cursors
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = await task_tool._list_tags({"company_id": COMPANY_ID, "search": "temperature",
+                                               "limit": 40, "cursor": cursor})
+        seen += [t["tagID"] for t in response["data"]["tags"]]
+        cursor, pages = response["data"]["next_cursor"], pages + 1
+        if pages == 2:
+            # Catalog changes between pages: tags inserted ahead of the cursor are not repeated
+            engine.tags[str(COMPANY_ID)] = all_tags + [
+                {"tagID": 1 + i, "tagName": f"Plant0.Temperature_{i}", "tagName2": "", "type": 0}
+                for i in range(3)]
+            await catalog.ensure_fresh(force=True)
+        if not cursor:
+            break
+    expected = {t["tagID"] for t in legacy_filter(all_tags, "temperature")}
+    results.append(check(f"{pages} pages, no duplicates, every match visited",
+                         len(seen) == len(set(seen)) and expected <= set(seen)))
+    other = await task_tool._list_tags({"company_id": COMPANY_ID, "search": "pressure",
+                                        "cursor": catalog.search("temperature", limit=5).next_cursor})
+    results.append(check("cursor from another search is rejected", not other["success"]))
+
+    # 6. get_tag served from the catalog, unknown tags fall back to the API
+    tag = await task_tool._get_tag({"tag_id": 9000})
+    results.append(check("get_tag served from the catalog",
+                         tag["success"] and tag["data"]["tagName2"] == "Turbine speed" and engine.requests["tag"] == 0))
+    missing = await task_tool._get_tag({"tag_id": 424242})
+    results.append(check("unknown tag falls back to the API", not missing["success"] and engine.requests["tag"] == 1))
+
+    # 7. Engine failures
+    engine.fail = True
+    catalog.ttl_seconds = 0
+    stale = await task_tool._list_tags({"company_id": COMPANY_ID, "search": "turbine"})
+    cold = await task_tool._list_tags({"company_id": 99})
+    results.append(check("failed refresh serves the cached snapshot", stale["success"] and stale["data"]["returned"] == 1))
+    results.append(check("failed cold load reports the error", not cold["success"] and "engine unavailable" in cold["error"]))
+    print(f"   catalog: {json.dumps(catalog.get_status())}")
+    return results
+
+
+def cross_loop_checks(engine: FakeMetisEngine) -> list:
+    """Each thread runs its own event loop, as the bridge does per request"""
+    results = []
+    company_id = "7"
+    engine.tags[company_id] = make_tags()
+    engine.delay = 0.3
+    engine.fail = False
+    downloads = engine.requests["all"]
+    catalog = get_tag_catalog(f"{engine.url}/api/Tags", company_id)
+    outcomes, errors = [], []
+
+    def request(force):
+        try:
+            outcomes.append(asyncio.run(catalog.ensure_fresh(5, force=force)))
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=request, args=(i % 2 == 1,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(check("4 request loops refreshing at once -> 1 download",
+                         not errors and engine.requests["all"] - downloads == 1
+                         and outcomes == [True] * 4 and len(catalog) == len(engine.tags[company_id])))
+
+    # Searches from other threads while snapshots that add/remove many tags are applied
+    engine.delay = 0
+    variants = [make_tags(), make_tags()[::2] + [{"tagID": 20000 + i, "tagName": f"Plant9.Pump_{i}.Flow",
+                                                  "tagName2": f"Pump {i} flow"} for i in range(300)]]
+    stop = threading.Event()
+
+    def searcher():
+        try:
+            while not stop.is_set():
+                page = catalog.search("pump", limit=20)
+                catalog.rank("flow")
+                if page.matched < len(page.tags):
+                    errors.append("inconsistent page")
+        except Exception as e:
+            errors.append(repr(e))
+
+    searchers = [threading.Thread(target=searcher) for _ in range(3)]
+    for thread in searchers:
+        thread.start()
+    for i in range(40):
+        catalog.apply_snapshot(variants[i % 2])
+    stop.set()
+    for thread in searchers:
+        thread.join()
+    results.append(check("searches in 3 threads during 40 snapshot swaps -> no errors", not errors))
+    return results
+
+
+def main():
+    engine = FakeMetisEngine()
+    clear_tag_catalogs()
+    try:
+        results = asyncio.run(run_checks(engine))
+        results += cross_loop_checks(engine)
+    finally:
+        engine.httpd.shutdown()
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Settings Card Cache Test - stale-while-revalidate card data in SettingsCardService
+
+Runs cards backed by a counting fake tool execution service:
+  1. First load refreshes all cards concurrently; static cards are not executed
+  2. Fresh entries are served from cache, separately per user
+  3. Expired entries are served stale and refreshed in the background (pushed to listeners)
+  4. wait_for_fresh refreshes inline; failed refreshes retry sooner
+  5. Saves/actions invalidate the card and its tool's other cards, also refreshes in flight
+
+Usage:
+    python test_settings_card_cache.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.services import settings_card_service
+from core.services.settings_card_service import CardType, SettingsCard, SettingsCardService
+
+
+class FakeResult:
+    def __init__(self, success, data=None, error=None):
+        self.success = success
+        self.data = data or {}
+        self.error = error
+
+    def to_dict(self):
+        return {"success": self.success, "data": self.data, "error": self.error}
+
+
+class FakeExecutionService:
+    """Counts data source calls; status reports how many times the tool has run"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.delay = 0.2
+        self.failing = set()
+
+    async def execute_tool_capability(self, request):
+        key = (request.user_id, request.capability, request.action)
+        self.calls[key] += 1
+        await asyncio.sleep(self.delay)
+        if request.capability in self.failing:
+            return FakeResult(False, error="tool offline")
+        return FakeResult(True, {"status": f"v{self.calls[key]}"})
+
+
+def card(card_id, tool_name, capability=None, cache_ttl=None):
+    metadata = {"tool_name": tool_name}
+    if capability:
+        metadata["data_source"] = {"capability": capability, "action": "check_status"}
+        metadata["save_action"] = {"capability": "save_" + capability, "action": "save"}
+    if cache_ttl is not None:
+        metadata["cache_ttl"] = cache_ttl
+    return SettingsCard(card_id=card_id, type=CardType.STATUS, category="authentication", title=card_id,
+                        description=card_id, icon="🔑", metadata=metadata)
+
+
+def by_id(cards):
+    return {c["card_id"]: c for c in cards}
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+async def run_checks() -> list:
+    results = []
+    executor = FakeExecutionService()
+    service = SettingsCardService(executor)
+    service.register_card(card("google_oauth", "google_tool", "oauth_status", cache_ttl=0.5))
+    service.register_card(card("google_mapping", "google_tool", "mapping_status", cache_ttl=30))
+    service.register_card(card("rmms_login", "rmms_tool", "rmms_status", cache_ttl=30))
+    service.register_card(card("about", "system"))
+
+    pushed = []
+    pushed_event = threading.Event()
+
+    def listener(user_id, card_dict):
+        pushed.append((user_id, card_dict["card_id"], card_dict["status"], card_dict["data_state"]))
+        pushed_event.set()
+
+    service.add_card_listener(listener)
+    calls = lambda user_id, capability: executor.calls[(user_id, capability, "check_status")]
+
+    # 1. Cold load
+    started = time.perf_counter()
+    cards = by_id(await service.get_user_cards("alice"))
+    elapsed = time.perf_counter() - started
+    results.append(check(f"3 data source cards loaded concurrently in {elapsed * 1000:.0f}ms",
+                         elapsed < 0.4 and sum(executor.calls.values()) == 3
+                         and all(cards[c]["data_state"] == "fresh" and cards[c]["status"] == "v1"
+                                 for c in ("google_oauth", "google_mapping", "rmms_login"))))
+    results.append(check("card without a data source is static", cards["about"]["data_state"] == "static"
+                         and cards["about"]["refreshed_at"] is None))
+
+    # 2. Fresh hits, per user
+    started = time.perf_counter()
+    again = by_id(await service.get_user_cards("alice"))
+    results.append(check("fresh cards come from cache without executing",
+                         time.perf_counter() - started < 0.1 and sum(executor.calls.values()) == 3
+                         and again["rmms_login"]["refreshed_at"] == cards["rmms_login"]["refreshed_at"]))
+    await service.get_user_cards("bob")
+    results.append(check("another user gets its own entries",
+                         calls("bob", "oauth_status") == 1 and calls("alice", "oauth_status") == 1))
+
+    # 3. Stale while revalidate
+    await asyncio.sleep(0.6)
+    pushed_event.clear()
+    started = time.perf_counter()
+    stale = by_id(await service.get_user_cards("alice"))
+    results.append(check("expired card served stale immediately, others fresh",
+                         time.perf_counter() - started < 0.1
+                         and stale["google_oauth"]["data_state"] == "stale" and stale["google_oauth"]["status"] == "v1"
+                         and stale["rmms_login"]["data_state"] == "fresh"))
+    await service.get_user_cards("alice")  # Second stale read while the refresh runs
+    pushed_event.wait(2)
+    refreshed = by_id(await service.get_user_cards("alice"))
+    results.append(check("one background refresh, pushed to listeners, then served fresh",
+                         calls("alice", "oauth_status") == 2
+                         and ("alice", "google_oauth", "v2", "fresh") in pushed
+                         and refreshed["google_oauth"]["data_state"] == "fresh"
+                         and refreshed["google_oauth"]["status"] == "v2"))
+
+    # 4. wait_for_fresh and failures
+    await asyncio.sleep(0.6)
+    inline = by_id(await service.get_user_cards("alice", wait_for_fresh=True))
+    results.append(check("wait_for_fresh refreshes expired cards inline",
+                         inline["google_oauth"]["data_state"] == "fresh" and inline["google_oauth"]["status"] == "v3"))
+
+    executor.failing.add("oauth_status")
+    failed = by_id(await service.get_user_cards("carol"))
+    entry = service._card_cache[("carol", "google_oauth")]
+    results.append(check("failed refresh reports error and retries after the short TTL",
+                         failed["google_oauth"]["data_state"] == "error" and not entry.success
+                         and entry.ttl == settings_card_service.FAILED_REFRESH_TTL_SECONDS))
+    executor.failing.clear()
+
+    # 5. Invalidation
+    pushed.clear()
+    pushed_event.clear()
+    before_mapping = calls("alice", "mapping_status")
+    saved = await service.save_card_values("google_oauth", {"client_id": "abc"}, "alice")
+    deadline = time.time() + 2
+    while len({p[1] for p in pushed}) < 2 and time.time() < deadline:
+        await asyncio.sleep(0.05)
+    after_save = by_id(await service.get_user_cards("alice"))
+    results.append(check("save invalidates the card and its tool's other cards, not other tools",
+                         saved["success"] and calls("alice", "mapping_status") == before_mapping + 1
+                         and {p[1] for p in pushed} == {"google_oauth", "google_mapping"}
+                         and after_save["rmms_login"]["status"] == "v1"))
+    results.append(check("other users' cached cards are untouched",
+                         ("bob", "google_oauth") in service._card_cache and all(p[0] == "alice" for p in pushed)))
+
+    in_flight = asyncio.ensure_future(service.get_user_cards("dave"))
+    await asyncio.sleep(0.05)
+    service.invalidate_user_cards("dave", ["rmms_login"], refresh=False)
+    await in_flight
+    results.append(check("refresh in flight during invalidation is not cached",
+                         ("dave", "rmms_login") not in service._card_cache
+                         and ("dave", "google_mapping") in service._card_cache))
+
+    return results
+
+
+def main():
+    print("🃏 Testing settings card cache")
+    print("=" * 50)
+    results = asyncio.run(run_checks())
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
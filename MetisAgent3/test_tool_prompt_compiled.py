@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Compiled Capability Map Test - ToolPromptService.compile_tool and its consumers
+
+Uses a fake graph memory that hands out tool dicts:
+  1. One compiled entry per named capability; duplicates keep the first, unnamed are skipped
+  2. Function calling, XML, OpenAI and MCP outputs list each capability exactly once
+  3. validate_tool_call checks against the same (first) declaration
+  4. Unchanged tools hit the cache; schema changes and tool listeners recompile
+
+Usage:
+    python test_tool_prompt_compiled.py
+"""
+
+import asyncio
+import copy
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.services.tool_prompt_service import MCPToolPromptingService, ToolPromptService
+
+
+def capability(name, description, **input_schema):
+    entry = {"description": description, "input_schema": input_schema}
+    if name is not None:
+        entry["name"] = name
+    return entry
+
+
+PLANT_TOOL = {
+    "name": "plant",
+    "version": "1.0.0",
+    "tool_type": "plugin",
+    "capabilities": [
+        capability("list_tags", "List plant tags", search={"type": "string"}, limit={"type": "integer"}),
+        capability("get_snapshot", "Read tag values", tag_id={"type": "integer", "required": True}),
+        capability("get_snapshot", "Shadowed duplicate", tag_id={"type": "string"}),
+        capability(None, "Capability without a name", anything={"type": "string"}),
+    ],
+}
+
+
+class FakeGraphMemory:
+    def __init__(self, tools):
+        self.tools = tools
+        self.listeners = []
+
+    async def get_user_tools(self, user_id):
+        return self.tools
+
+    def add_tool_listener(self, listener):
+        self.listeners.append(listener)
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+async def run_checks() -> list:
+    results = []
+    memory = FakeGraphMemory([PLANT_TOOL])
+    service = ToolPromptService(memory)
+    mcp = MCPToolPromptingService(service)
+    expected = ["plant_list_tags", "plant_get_snapshot"]
+
+    # 1. Compiled map
+    compiled = service.compile_tool(PLANT_TOOL)
+    results.append(check("one entry per named capability, in declaration order",
+                         list(compiled) == ["list_tags", "get_snapshot"]
+                         and [c.function_name for c in compiled.values()] == expected))
+    results.append(check("duplicate name keeps the first declaration",
+                         compiled["get_snapshot"].capability["description"] == "Read tag values"
+                         and compiled["get_snapshot"].parameters["properties"]["tag_id"]["type"] == "integer"))
+
+    # 2. Every output lists each capability once
+    functions = await service.generate_function_calling_tools("alice")
+    xml = await service.generate_xml_tools_prompt("alice")
+    openai = await service.generate_tool_prompt([PLANT_TOOL], "openai")
+    tools_list = await mcp.generate_mcp_tools_list_response("alice")
+    results.append(check("function calling tools: no duplicates, no unnamed entries",
+                         [f["function"]["name"] for f in functions] == expected))
+    results.append(check("XML prompt: one <tool> per capability",
+                         [xml.count(f'<tool name="{name}">') for name in expected] == [1, 1]
+                         and "Shadowed duplicate" not in xml and "without a name" not in xml))
+    results.append(check("OpenAI format and MCP tools/list match the compiled map",
+                         [f["name"] for f in openai["functions"]] == expected
+                         and openai["total_functions"] == 2
+                         and [t["name"] for t in tools_list["result"]["tools"]] == expected
+                         and tools_list["result"]["tools"][1]["description"] == "Read tag values"))
+
+    # 3. Validation
+    valid, _ = await service.validate_tool_call("plant_get_snapshot", "get_snapshot", {"tag_id": 7}, "alice")
+    invalid, errors = await service.validate_tool_call("plant_get_snapshot", "get_snapshot", {"tag_id": "7"}, "alice")
+    missing, missing_errors = await service.validate_tool_call("plant_get_snapshot", "get_snapshot", {}, "alice")
+    results.append(check("validation uses the first get_snapshot schema",
+                         valid and not invalid and errors == ["Parameter 'tag_id' should be of type 'integer'"]
+                         and not missing and missing_errors == ["Required parameter 'tag_id' missing"]))
+    unknown, unknown_errors = await service.validate_tool_call("plant_reset", "reset", {}, "alice")
+    results.append(check("unknown capability is reported, not raised",
+                         not unknown and "not found" in unknown_errors[0]))
+
+    # 4. Cache
+    service.compile_stats.update(hits=0, compiles=0)
+    same = service.compile_tool(PLANT_TOOL)
+    equal = service.compile_tool(copy.deepcopy(PLANT_TOOL))
+    results.append(check("same or equal tool dict -> cache hit",
+                         same is compiled and equal is compiled and service.compile_stats["compiles"] == 0))
+    changed = copy.deepcopy(PLANT_TOOL)
+    changed["capabilities"].append(capability("update_tag", "Write a tag", tag_id={"type": "integer"}))
+    recompiled = service.compile_tool(changed)
+    results.append(check("changed schema recompiles and replaces the old entry",
+                         list(recompiled) == ["list_tags", "get_snapshot", "update_tag"]
+                         and service.compile_stats["compiles"] == 1
+                         and len([k for k in service._compiled if k[0] == "plant"]) == 1))
+    for listener in memory.listeners:
+        listener("plant")
+    results.append(check("tool registration listener drops the compiled entries",
+                         memory.listeners and not service._compiled
+                         and service.compile_tool(changed) is not recompiled))
+
+    return results
+
+
+def main():
+    print("🧩 Testing compiled capability map")
+    print("=" * 50)
+    results = asyncio.run(run_checks())
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Tool Result Cache Test - single-flight caching in ToolExecutionService
+
+Runs a counting fake tool through ToolExecutionService:
+  1. Concurrent identical reads run the tool once (also from other threads/loops)
+  2. Hits within the TTL, separate entries per params and tenant, expiry
+  3. Results are shared per user unless the capability declares a wider cache_scope
+  4. Writes/deletes invalidate the tenant's results, also reads in flight
+  5. Write actions of "read" capabilities and failures are never cached;
+     refresh=true always reaches the tool and drops the stale entries
+
+Usage:
+    python test_tool_result_cache.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.contracts import (
+    AgentResult, BaseTool, CapabilityType, ExecutionContext, HealthStatus, ToolCapability,
+    ToolConfiguration, ToolMetadata, ToolType
+)
+from core.services.tool_execution_service import ToolExecutionRequest, ToolExecutionService
+
+
+def capability(name, capability_type, **cache):
+    return ToolCapability(name=name, description=name, capability_type=capability_type,
+                          input_schema={}, output_schema={}, **cache)
+
+
+class CountingTool(BaseTool):
+    """Records every execution; reads take a while so calls overlap"""
+
+    def __init__(self):
+        metadata = ToolMetadata(
+            name="plant_tool", description="fake plant tool", version="1.0.0", tool_type=ToolType.PLUGIN,
+            capabilities=[
+                capability("list_tags", CapabilityType.READ, cache_ttl_seconds=30, cache_scope="company"),
+                capability("get_snapshot", CapabilityType.READ, cache_ttl_seconds=1, cache_scope="company"),
+                capability("oauth2_management", CapabilityType.EXECUTE, cache_ttl_seconds=30,
+                           cache_actions=["check_status"]),
+                capability("mail_operations", CapabilityType.READ, cache_ttl_seconds=30),
+                capability("update_tag", CapabilityType.WRITE),
+                capability("delete_tag", CapabilityType.WRITE),
+            ])
+        super().__init__(metadata, ToolConfiguration(tool_name="plant_tool"))
+        self.calls = Counter()
+        self.delay = 0.05
+        self.fail = False
+
+    async def execute(self, capability, input_data, context):
+        self.calls[(capability, input_data["action"])] += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return AgentResult(success=False, error="plant offline")
+        return AgentResult(success=True, data={"company_id": input_data.get("company_id"),
+                                               "served": sum(self.calls.values()), "tags": [1, 2, 3]})
+
+    async def health_check(self):
+        return HealthStatus(healthy=True, component="plant_tool")
+
+    async def validate_input(self, capability, input_data):
+        return []
+
+
+class FakeToolManager:
+    def __init__(self, *tools):
+        self.tools = {tool.metadata.name: tool for tool in tools}
+
+
+def call(service, capability, action, user_id="alice", application_id=None, **parameters):
+    context = ExecutionContext(user_id=user_id, application_id=application_id) if application_id else None
+    return service.execute_tool_capability(ToolExecutionRequest(
+        tool_name="plant_tool", capability=capability, action=action,
+        parameters=parameters, user_id=user_id, context=context))
+
+
+def check(label: str, condition: bool) -> bool:
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+async def run_checks() -> list:
+    results = []
+    tool = CountingTool()
+    service = ToolExecutionService(FakeToolManager(tool))
+    executions = lambda capability, action: tool.calls[(capability, action)]
+
+    # 1. Single flight
+    responses = await asyncio.gather(*(call(service, "list_tags", "list_tags", user_id=f"user{i % 4}", company_id=3)
+                                       for i in range(20)))
+    statuses = Counter(r.cache_status for r in responses)
+    results.append(check("20 concurrent identical reads from 4 users of a company -> 1 execution",
+                         executions("list_tags", "list_tags") == 1 and all(r.success for r in responses)))
+    results.append(check("one miss, the rest coalesced", statuses == Counter({"miss": 1, "coalesced": 19})))
+    responses[1].data["tags"].append(99)
+    hit = await call(service, "list_tags", "list_tags", user_id="user1", company_id=3)
+    results.append(check("cache hit within the TTL returns an unshared copy",
+                         hit.cache_status == "hit" and hit.data["tags"] == [1, 2, 3]
+                         and executions("list_tags", "list_tags") == 1))
+
+    # 2. Keys: param order, params, tenant
+    a = await call(service, "list_tags", "list_tags", company_id=3, search="pump", limit=5)
+    b = await service.execute_tool_capability(ToolExecutionRequest(
+        tool_name="plant_tool", capability="list_tags", action="list_tags",
+        parameters={"limit": 5, "search": "pump", "company_id": 3}, user_id="alice"))
+    c = await call(service, "list_tags", "list_tags", company_id=4, search="pump", limit=5)
+    results.append(check("param order does not matter, other tenant is a separate entry",
+                         (a.cache_status, b.cache_status, c.cache_status) == ("miss", "hit", "miss")))
+
+    # 3. Cache scope: per-user results stay per user whatever company/app the call carries
+    alice = await call(service, "oauth2_management", "check_status", application_id="app-1", company_id=3)
+    bob = await call(service, "oauth2_management", "check_status", user_id="bob", application_id="app-1", company_id=3)
+    alice_again = await call(service, "oauth2_management", "check_status", application_id="app-1", company_id=3)
+    results.append(check("user-scoped check_status is not shared within an app or company",
+                         (alice.cache_status, bob.cache_status, alice_again.cache_status) == ("miss", "miss", "hit")
+                         and executions("oauth2_management", "check_status") == 2))
+    carol = await call(service, "list_tags", "list_tags", user_id="carol", search="valve")
+    dave = await call(service, "list_tags", "list_tags", user_id="dave", search="valve")
+    results.append(check("company-scoped read without company_id falls back to the user",
+                         (carol.cache_status, dave.cache_status) == ("miss", "miss")))
+
+    # 4. Invalidation by writes of the same tenant
+    await call(service, "update_tag", "update_tag", company_id=3, tag_id=1)
+    same = await call(service, "list_tags", "list_tags", company_id=3, search="pump", limit=5)
+    other = await call(service, "list_tags", "list_tags", company_id=4, search="pump", limit=5)
+    results.append(check("write invalidates its tenant only",
+                         same.cache_status == "miss" and other.cache_status == "hit"))
+
+    in_flight = asyncio.ensure_future(call(service, "list_tags", "list_tags", company_id=4, search="boiler"))
+    await asyncio.sleep(0.01)
+    await call(service, "delete_tag", "delete_tag", company_id=4, tag_id=2)
+    await in_flight
+    after = await call(service, "list_tags", "list_tags", company_id=4, search="boiler")
+    results.append(check("read in flight during a delete is not cached", after.cache_status == "miss"))
+
+    # 5. Per-action TTLs and write actions of read capabilities
+    first = await call(service, "oauth2_management", "check_status")
+    second = await call(service, "oauth2_management", "check_status")
+    await call(service, "oauth2_management", "authorize")
+    third = await call(service, "oauth2_management", "check_status")
+    results.append(check("check_status cached, authorize not cached and invalidates",
+                         (first.cache_status, second.cache_status, third.cache_status) == ("miss", "hit", "miss")
+                         and executions("oauth2_management", "authorize") == 1))
+    removed = service.invalidate_cached_results("plant_tool", user_id="alice")
+    fourth = await call(service, "oauth2_management", "check_status")
+    results.append(check("invalidate_cached_results drops a user's entries",
+                         removed >= 1 and fourth.cache_status == "miss"))
+
+    sends = [await call(service, "mail_operations", "send", to="ops@example.com") for _ in range(2)]
+    results.append(check("'send' on a read capability is executed every time",
+                         executions("mail_operations", "send") == 2 and all(s.cache_status is None for s in sends)))
+
+    tool.fail = True
+    failures = [await call(service, "list_tags", "list_tags", company_id=7) for _ in range(2)]
+    tool.fail = False
+    results.append(check("failed results are not cached",
+                         [f.cache_status for f in failures] == ["miss", "miss"] and not failures[0].success))
+
+    statuses = [(await call(service, "list_tags", "list_tags", company_id=11)).cache_status for _ in range(2)]
+    before = executions("list_tags", "list_tags")
+    forced = [await call(service, "list_tags", "list_tags", company_id=11, refresh=True) for _ in range(2)]
+    after_refresh = await call(service, "list_tags", "list_tags", company_id=11)
+    results.append(check("refresh=true bypasses the cache and drops the company's stale entries",
+                         statuses == ["miss", "hit"] and [f.cache_status for f in forced] == ["bypass", "bypass"]
+                         and after_refresh.cache_status == "miss" and executions("list_tags", "list_tags") == before + 3))
+
+    # 6. TTL expiry
+    await call(service, "get_snapshot", "get_snapshot", company_id=3)
+    time.sleep(1.05)
+    expired = await call(service, "get_snapshot", "get_snapshot", company_id=3)
+    results.append(check("entry expires after its TTL", expired.cache_status == "miss"))
+
+    # 7. Coalescing across threads, each with its own event loop (as in the bridge)
+    tool.delay = 0.2
+    before = executions("get_snapshot", "get_snapshot")
+    thread_results = []
+
+    def bridge_request():
+        loop = asyncio.new_event_loop()
+        thread_results.append(loop.run_until_complete(call(service, "get_snapshot", "get_snapshot", company_id=9)))
+        loop.close()
+
+    threads = [threading.Thread(target=bridge_request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.append(check("8 request threads with separate loops -> 1 execution",
+                         executions("get_snapshot", "get_snapshot") == before + 1
+                         and all(r.success for r in thread_results) and len(thread_results) == 8))
+
+    print(f"   statistics: {service.result_cache.get_statistics()}")
+    return results
+
+
+def main():
+    print("🗄️ Testing tool result cache")
+    print("=" * 50)
+    results = asyncio.run(run_checks())
+    print("-" * 50)
+    print(f"{sum(results)}/{len(results)} passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
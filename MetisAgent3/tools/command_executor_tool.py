@@ -10,6 +10,7 @@ CLAUDE.md COMPLIANT:
 - Plugin architecture implementation
 """
 
+import asyncio
 import subprocess
 import platform
 import shlex
@@ -17,6 +18,7 @@ import logging
 import re
 import zipfile
 import tempfile
+import shutil
 import json
 from typing import Dict, Any, List, Optional, Tuple
 import socket
@@ -26,6 +28,7 @@ import os
 from datetime import datetime
 
 from core.contracts.tool_contracts import BaseTool, ToolMetadata, ToolConfiguration, AgentResult, ExecutionContext, CapabilityType, ToolCapability, ToolType, HealthStatus
+from core.services.process_engine import OutputChunk, ProcessEngine, get_process_engine
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +72,8 @@ class CommandExecutorTool(BaseTool):
         
         super().__init__(metadata, config)
         self.conversation_service = conversation_service
+        self.process_engine: ProcessEngine = get_process_engine()
+        self.tool_events_service = None  # Set by the bridge; receives streamed output chunks
         self.platform_info = self._get_platform_info()
         logger.info(f"Command Executor initialized on {self.platform_info['system']}")
     
@@ -90,9 +95,9 @@ class CommandExecutorTool(BaseTool):
             elif capability == "get_platform_info":
                 return await self._get_platform_info_result()
             elif capability == "extract_zip":
-                return await self._extract_zip(input_data)
+                return await self._extract_zip(input_data, context)
             elif capability == "create_zip":
-                return await self._create_zip(input_data)
+                return await self._create_zip(input_data, context)
             elif capability == "list_zip_contents":
                 return await self._list_zip_contents(input_data)
             else:
@@ -105,6 +110,36 @@ class CommandExecutorTool(BaseTool):
             logger.error(f"Command executor error: {e}")
             return AgentResult(success=False, error=str(e))
 
+    def set_tool_events_service(self, tool_events_service):
+        """Stream command output to tool events (tool_call_output)"""
+        self.tool_events_service = tool_events_service
+
+    def _output_forwarder(self, context: ExecutionContext, capability: str, on_output=None):
+        """Callback fanning output chunks out to tool events and an optional caller callback"""
+        events = self.tool_events_service
+        if not events and not on_output:
+            return None
+
+        async def forward(chunk: OutputChunk):
+            if events:
+                events.emit_output(
+                    trace_id=context.trace_id,
+                    request_id=context.metadata.get("request_id", context.trace_id),
+                    tool_name=self.metadata.name,
+                    capability_name=capability,
+                    user_id=context.user_id,
+                    company_id=context.metadata.get("company_id", "default"),
+                    stream=chunk.stream,
+                    text=chunk.text,
+                    offset=chunk.offset
+                )
+            if on_output:
+                outcome = on_output(chunk)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+
+        return forward
+
     async def _measure_ping(self, input_data: Dict[str, Any]) -> AgentResult:
         """Measure average ping in ms to a target using N attempts.
         Falls back to TCP connect latency (port 443) if ICMP ping is unavailable.
@@ -391,8 +426,14 @@ class CommandExecutorTool(BaseTool):
             logger.error(f"port_check error: {e}")
             return AgentResult(success=False, error=str(e))
     
-    async def _execute_command(self, input_data: Dict[str, Any], context: ExecutionContext) -> AgentResult:
-        """Execute a system command with security checks"""
+    async def _execute_command(self, input_data: Dict[str, Any], context: ExecutionContext,
+                               on_output=None) -> AgentResult:
+        """Execute a system command with security checks
+
+        Output is streamed while the command runs (tool events and `on_output`);
+        the response keeps at most ProcessEngine.max_output_bytes per stream and
+        reports the spill file holding the rest.
+        """
         try:
             # Extract parameters
             command = input_data.get("command", "")
@@ -417,42 +458,44 @@ class CommandExecutorTool(BaseTool):
             system = platform.system()
             
             if system == "Windows":
-                cmd = command
-                shell = True
+                cmd = command  # Shell string
             else:
                 # Use bash -c for consistent behavior on Unix-like systems
                 cmd = ["bash", "-c", command]
-                shell = False
             
             # Execute command
             logger.info(f"Executing command on {system}: {command}")
-            start_time = datetime.now()
             
-            result = subprocess.run(
+            result = await self.process_engine.run(
                 cmd,
-                shell=shell,
-                capture_output=True,
-                text=True,
                 timeout=timeout,
-                cwd=working_directory
+                cwd=working_directory,
+                user_id=context.user_id,
+                on_output=self._output_forwarder(context, "execute_command", on_output)
             )
             
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
+            if result.timed_out:
+                return AgentResult(
+                    success=False,
+                    error=f"Command timed out after {timeout} seconds",
+                    data={"stdout": result.stdout, "stderr": result.stderr, **result.output_info()},
+                    metadata={"timeout": True}
+                )
             
             # Prepare response
             response_data = {
                 "command": command,
-                "return_code": result.returncode,
+                "return_code": result.return_code,
                 "stdout": result.stdout,
                 "stderr": result.stderr,
                 "platform": system,
                 "working_directory": working_directory or os.getcwd(),
-                "execution_time_seconds": execution_time,
-                "success": result.returncode == 0
+                "execution_time_seconds": result.duration_seconds,
+                "success": result.return_code == 0,
+                **result.output_info()
             }
             
-            if result.returncode == 0:
+            if result.return_code == 0:
                 return AgentResult(
                     success=True,
                     data=response_data,
@@ -461,17 +504,11 @@ class CommandExecutorTool(BaseTool):
             else:
                 return AgentResult(
                     success=False,
-                    error=f"Command failed with return code {result.returncode}",
+                    error=f"Command failed with return code {result.return_code}",
                     data=response_data,
                     metadata={"status": "completed_with_error"}
                 )
                 
-        except subprocess.TimeoutExpired:
-            return AgentResult(
-                success=False,
-                error=f"Command timed out after {timeout} seconds",
-                metadata={"timeout": True}
-            )
         except FileNotFoundError as e:
             return AgentResult(
                 success=False,
@@ -579,8 +616,34 @@ class CommandExecutorTool(BaseTool):
         
         return {"is_safe": True, "reason": "Command passed security checks"}
     
-    async def _extract_zip(self, input_data: Dict[str, Any]) -> AgentResult:
-        """Extract ZIP file to specified directory"""
+    def _zip_progress(self, context: Optional[ExecutionContext], capability: str):
+        """Progress callback for archive operations (runs on the worker thread)"""
+        events = self.tool_events_service
+        if not events or context is None:
+            return None
+        last_emit = [0.0]
+
+        def report(done_members: int, total_members: int, done_bytes: int, total_bytes: int, name: str):
+            now = time.monotonic()
+            if done_members < total_members and now - last_emit[0] < 0.25:
+                return
+            last_emit[0] = now
+            percent = int(done_bytes * 100 / total_bytes) if total_bytes else int(done_members * 100 / max(total_members, 1))
+            events.emit_progress(
+                trace_id=context.trace_id,
+                request_id=context.metadata.get("request_id", context.trace_id),
+                tool_name=self.metadata.name,
+                capability_name=capability,
+                user_id=context.user_id,
+                company_id=context.metadata.get("company_id", "default"),
+                progress_percent=percent,
+                progress_message=f"{done_members}/{total_members} {name}"
+            )
+
+        return report
+
+    async def _extract_zip(self, input_data: Dict[str, Any], context: Optional[ExecutionContext] = None) -> AgentResult:
+        """Extract ZIP file to specified directory, streaming member by member"""
         try:
             zip_path = Path(input_data.get("zip_path", ""))
             extract_to = input_data.get("extract_to")
@@ -605,50 +668,32 @@ class CommandExecutorTool(BaseTool):
             # Create extraction directory if it doesn't exist
             extract_dir.mkdir(parents=True, exist_ok=True)
             
-            # Extract ZIP file
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Check if password protected
-                if zip_ref.testzip() is not None and password is None:
-                    return AgentResult(
-                        success=False,
-                        error="ZIP file appears corrupted or password protected"
-                    )
-                
-                # Set password if provided
-                pwd = password.encode('utf-8') if password else None
-                
-                # List contents for security check
-                file_list = zip_ref.namelist()
-                
-                # Security check for directory traversal
-                for filename in file_list:
-                    if '..' in filename or filename.startswith('/'):
-                        return AgentResult(
-                            success=False,
-                            error=f"Security violation: unsafe path in ZIP - {filename}",
-                            metadata={"security_violation": True}
-                        )
-                
-                # Extract all files
-                extracted_files = []
-                for filename in file_list:
-                    try:
-                        zip_ref.extract(filename, extract_dir, pwd=pwd)
-                        extracted_files.append(str(extract_dir / filename))
-                    except Exception as e:
-                        logger.warning(f"Failed to extract {filename}: {str(e)}")
-                
+            # Set password if provided
+            pwd = password.encode('utf-8') if password else None
+            
+            # Extract off the event loop; members are copied in fixed-size blocks
+            outcome = await asyncio.to_thread(
+                stream_extract_zip, zip_path, extract_dir, pwd, self._zip_progress(context, "extract_zip")
+            )
+            if outcome.get("error"):
                 return AgentResult(
-                    success=True,
-                    data={
-                        "zip_path": str(zip_path),
-                        "extract_to": str(extract_dir),
-                        "extracted_files": extracted_files,
-                        "total_files": len(extracted_files),
-                        "file_list": file_list,
-                        "extraction_timestamp": datetime.now().isoformat()
-                    }
+                    success=False,
+                    error=outcome["error"],
+                    metadata={"security_violation": True} if outcome.get("security_violation") else {}
                 )
+            
+            return AgentResult(
+                success=True,
+                data={
+                    "zip_path": str(zip_path),
+                    "extract_to": str(extract_dir),
+                    "extracted_files": outcome["extracted_files"],
+                    "total_files": len(outcome["extracted_files"]),
+                    "file_list": outcome["file_list"],
+                    "total_bytes": outcome["total_bytes"],
+                    "extraction_timestamp": datetime.now().isoformat()
+                }
+            )
                 
         except zipfile.BadZipFile:
             return AgentResult(success=False, error="Invalid or corrupted ZIP file")
@@ -661,8 +706,8 @@ class CommandExecutorTool(BaseTool):
             logger.error(f"Error extracting ZIP file: {str(e)}")
             return AgentResult(success=False, error=str(e))
     
-    async def _create_zip(self, input_data: Dict[str, Any]) -> AgentResult:
-        """Create ZIP file from source directory or file"""
+    async def _create_zip(self, input_data: Dict[str, Any], context: Optional[ExecutionContext] = None) -> AgentResult:
+        """Create ZIP file from source directory or file, streaming member by member"""
         try:
             zip_path = Path(input_data.get("zip_path", ""))
             source_path = Path(input_data.get("source_path", ""))
@@ -682,45 +727,29 @@ class CommandExecutorTool(BaseTool):
             # Create parent directory for ZIP file if needed
             zip_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Determine compression method
-            compression = zipfile.ZIP_DEFLATED
             if compression_level < 0 or compression_level > 9:
                 compression_level = 6
             
-            added_files = []
+            if password:
+                logger.warning("Password protection not supported for ZIP creation")
             
-            with zipfile.ZipFile(zip_path, 'w', compression=compression, 
-                               compresslevel=compression_level) as zip_ref:
-                
-                if source_path.is_file():
-                    # Add single file
-                    arcname = source_path.name
-                    if password:
-                        logger.warning("Password protection not supported for ZIP creation")
-                    zip_ref.write(source_path, arcname)
-                    added_files.append(arcname)
-                    
-                elif source_path.is_dir():
-                    # Add directory recursively
-                    for file_path in source_path.rglob('*'):
-                        if file_path.is_file():
-                            # Create relative path for archive
-                            arcname = file_path.relative_to(source_path)
-                            zip_ref.write(file_path, arcname)
-                            added_files.append(str(arcname))
-                
-                return AgentResult(
-                    success=True,
-                    data={
-                        "zip_path": str(zip_path),
-                        "source_path": str(source_path),
-                        "added_files": added_files,
-                        "total_files": len(added_files),
-                        "compression_level": compression_level,
-                        "zip_size_bytes": zip_path.stat().st_size,
-                        "creation_timestamp": datetime.now().isoformat()
-                    }
-                )
+            added_files = await asyncio.to_thread(
+                stream_create_zip, zip_path, source_path, compression_level,
+                self._zip_progress(context, "create_zip")
+            )
+            
+            return AgentResult(
+                success=True,
+                data={
+                    "zip_path": str(zip_path),
+                    "source_path": str(source_path),
+                    "added_files": added_files,
+                    "total_files": len(added_files),
+                    "compression_level": compression_level,
+                    "zip_size_bytes": zip_path.stat().st_size,
+                    "creation_timestamp": datetime.now().isoformat()
+                }
+            )
                 
         except PermissionError:
             return AgentResult(
@@ -865,6 +894,85 @@ class CommandExecutorTool(BaseTool):
         return errors
 
 
+ZIP_COPY_BLOCK = 1024 * 1024
+
+
+def stream_extract_zip(zip_path: Path, extract_dir: Path, pwd: Optional[bytes] = None,
+                       progress=None) -> Dict[str, Any]:
+    """Extract members one at a time through fixed-size buffers
+
+    Returns extracted_files/file_list/total_bytes, or an "error" entry. CRC
+    errors surface while a member is copied, so the archive is read once
+    (no separate testzip() pass).
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        infos = zip_ref.infolist()
+        file_list = [info.filename for info in infos]
+        root = extract_dir.resolve()
+        
+        # Security check for directory traversal
+        for filename in file_list:
+            target = (extract_dir / filename).resolve()
+            if '..' in filename or filename.startswith('/') or (target != root and root not in target.parents):
+                return {"error": f"Security violation: unsafe path in ZIP - {filename}", "security_violation": True}
+        
+        if pwd is None and any(info.flag_bits & 0x1 for info in infos):
+            return {"error": "ZIP file appears corrupted or password protected"}
+        
+        total_bytes = sum(info.file_size for info in infos)
+        done_bytes = 0
+        extracted_files = []
+        for index, info in enumerate(infos, 1):
+            target = extract_dir / info.filename
+            try:
+                if info.is_dir():
+                    target.mkdir(parents=True, exist_ok=True)
+                else:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    partial = target.with_name(target.name + ".part")
+                    try:
+                        with zip_ref.open(info, pwd=pwd) as source, open(partial, "wb") as destination:
+                            shutil.copyfileobj(source, destination, ZIP_COPY_BLOCK)
+                        os.replace(partial, target)
+                    finally:
+                        # Failed copy (CRC error, bad password, disk full): drop the partial file
+                        partial.unlink(missing_ok=True)
+                extracted_files.append(str(target))
+            except zipfile.BadZipFile:
+                return {"error": "ZIP file appears corrupted or password protected"}
+            except Exception as e:
+                logger.warning(f"Failed to extract {info.filename}: {str(e)}")
+            done_bytes += info.file_size
+            if progress:
+                progress(index, len(infos), done_bytes, total_bytes, info.filename)
+        
+        return {"extracted_files": extracted_files, "file_list": file_list, "total_bytes": total_bytes}
+
+
+def stream_create_zip(zip_path: Path, source_path: Path, compression_level: int = 6, progress=None) -> List[str]:
+    """Add files one at a time; ZipFile.write streams each file from disk"""
+    if source_path.is_file():
+        members = [(source_path, source_path.name)]
+    else:
+        members = [
+            (file_path, str(file_path.relative_to(source_path)))
+            for file_path in sorted(source_path.rglob('*')) if file_path.is_file()
+        ]
+    total_bytes = sum(file_path.stat().st_size for file_path, _ in members)
+    done_bytes = 0
+    added_files = []
+    
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=compression_level) as zip_ref:
+        for index, (file_path, arcname) in enumerate(members, 1):
+            zip_ref.write(file_path, arcname)
+            added_files.append(arcname)
+            done_bytes += file_path.stat().st_size
+            if progress:
+                progress(index, len(members), done_bytes, total_bytes, arcname)
+    return added_files
+
+
 # Factory function for creating CommandExecutorTool metadata
 def create_command_executor_tool_metadata() -> Tuple[ToolMetadata, ToolConfiguration, type]:
     """Create command executor tool with metadata and configuration"""
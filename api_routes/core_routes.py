@@ -32,7 +32,7 @@ def register_core_routes(app, registry=None, coordinator=None):
             "status": "online",
             "version": "2.0.0",
             "server_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "active_tools": list(registry.get_all_tools().keys()) if registry else []
+            "active_tools": registry.get_tool_names() if registry else []
         })
 
     @app.route('/api/routes', methods=['GET'])
@@ -0,0 +1,415 @@
+# os_araci/db/document_store.py
+"""Kayıt bazında upsert yapan, write-behind SQLite belge deposu.
+
+Persona ve araçların JSON durum dosyalarının yerine geçer:
+  - Her kayıt (collection, doc_id) anahtarıyla ayrı satırda tutulur; bir
+    taslağın değişmesi tüm dosyanın yeniden yazılmasını gerektirmez.
+  - put/delete çağrıları sadece bekleyen yazma kuyruğuna girer; aynı kayda
+    yapılan ardışık yazmalar birleştirilir ve arka plan iş parçacığı
+    tarafından tek bir transaction ile diske aktarılır (event loop bloklanmaz).
+  - SQLite WAL + transaction ile yazma ya tamamen uygulanır ya hiç uygulanmaz;
+    çökme anında yarım yazılmış JSON dosyası oluşmaz.
+  - DocumentMap / DocumentList görünümleri kayıtları ilk erişimde okur.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DELETED = object()
+
+
+class DocumentStore:
+    """SQLite tabanlı, write-behind belge deposu"""
+
+    def __init__(self, db_path: str, flush_interval: float = 0.5, max_pending: int = 256):
+        """
+        Args:
+            db_path: SQLite dosya yolu
+            flush_interval: Bekleyen yazmaların en geç kaç saniyede diske aktarılacağı
+            max_pending: Bu sayıya ulaşıldığında flush beklemeden tetiklenir
+        """
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                collection TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (collection, doc_id)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_seq ON documents (collection, seq)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY, applied_at REAL NOT NULL)")
+
+        self._conn_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # (collection, doc_id) -> (seq, json metni veya _DELETED)
+        self._pending: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+        self._inflight: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+        self._seq: Dict[str, int] = {}
+
+        self._closed = False
+        self._wakeup = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="document-store-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # --- Yazma -------------------------------------------------------------
+
+    def _next_seq(self, collection: str) -> int:
+        if collection not in self._seq:
+            with self._conn_lock:
+                row = self._conn.execute(
+                    "SELECT MAX(seq) FROM documents WHERE collection = ?", (collection,)
+                ).fetchone()
+            self._seq[collection] = row[0] or 0
+        self._seq[collection] += 1
+        return self._seq[collection]
+
+    def _enqueue(self, collection: str, doc_id: str, value: Any):
+        with self._pending_lock:
+            if self._closed:
+                raise RuntimeError("DocumentStore kapatıldı")
+            key = (collection, doc_id)
+            previous = self._pending.get(key) or self._inflight.get(key)
+            seq = previous[0] if previous else self._next_seq(collection)
+            self._pending[key] = (seq, value)
+            pending_count = len(self._pending)
+        if pending_count >= self.max_pending:
+            self._wakeup.set()
+
+    def put(self, collection: str, doc_id: str, document: Any):
+        """Kaydı ekle/güncelle (diske write-behind olarak yazılır)"""
+        self._enqueue(collection, doc_id, json.dumps(document, ensure_ascii=False))
+
+    def delete(self, collection: str, doc_id: str):
+        """Kaydı sil (diske write-behind olarak yazılır)"""
+        self._enqueue(collection, doc_id, _DELETED)
+
+    def flush(self) -> int:
+        """Bekleyen yazmaları tek transaction ile diske aktar
+
+        Returns:
+            int: Yazılan/silinen kayıt sayısı
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                if not self._pending:
+                    return 0
+                self._inflight, self._pending = self._pending, {}
+                batch = self._inflight
+
+            now = time.time()
+            upserts = [(c, d, seq, value, now) for (c, d), (seq, value) in batch.items() if value is not _DELETED]
+            deletes = [(c, d) for (c, d), (_, value) in batch.items() if value is _DELETED]
+            try:
+                with self._conn_lock:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        self._conn.executemany("""
+                            INSERT INTO documents (collection, doc_id, seq, data, updated_at)
+                            VALUES (?, ?, ?, ?, ?)
+                            ON CONFLICT (collection, doc_id)
+                            DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+                        """, upserts)
+                        self._conn.executemany(
+                            "DELETE FROM documents WHERE collection = ? AND doc_id = ?", deletes
+                        )
+                        self._conn.execute("COMMIT")
+                    except Exception:
+                        self._conn.execute("ROLLBACK")
+                        raise
+            except Exception as e:
+                # Yazılamayan kayıtları, daha yeni yazmaları ezmeden kuyruğa geri koy
+                with self._pending_lock:
+                    for key, value in batch.items():
+                        self._pending.setdefault(key, value)
+                    self._inflight = {}
+                logger.error(f"Belge deposu flush hatası ({self.db_path}): {str(e)}")
+                return 0
+
+            with self._pending_lock:
+                self._inflight = {}
+            return len(batch)
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        """Bekleyen yazmaları aktar ve bağlantıyı kapat"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._flusher.is_alive() and threading.current_thread() is not self._flusher:
+            self._flusher.join(timeout=5)
+        self.flush()
+        with self._conn_lock:
+            self._conn.close()
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
+    # --- Okuma -------------------------------------------------------------
+
+    def _buffered(self, collection: str, doc_id: str):
+        """Henüz diske yazılmamış değer (yoksa None)"""
+        with self._pending_lock:
+            entry = self._pending.get((collection, doc_id)) or self._inflight.get((collection, doc_id))
+        return entry
+
+    def get(self, collection: str, doc_id: str, default: Any = None) -> Any:
+        """Tek bir kaydı oku"""
+        entry = self._buffered(collection, doc_id)
+        if entry is not None:
+            return default if entry[1] is _DELETED else json.loads(entry[1])
+        with self._conn_lock:
+            row = self._conn.execute(
+                "SELECT data FROM documents WHERE collection = ? AND doc_id = ?", (collection, doc_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_many(self, collection: str, doc_ids: List[str]) -> Dict[str, Any]:
+        """Birden fazla kaydı tek sorguyla oku (bulunamayanlar sonuçta yer almaz)"""
+        result = {}
+        missing = []
+        for doc_id in doc_ids:
+            entry = self._buffered(collection, doc_id)
+            if entry is None:
+                missing.append(doc_id)
+            elif entry[1] is not _DELETED:
+                result[doc_id] = json.loads(entry[1])
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._conn_lock:
+                rows = self._conn.execute(
+                    f"SELECT doc_id, data FROM documents WHERE collection = ? AND doc_id IN ({placeholders})",
+                    [collection, *chunk]
+                ).fetchall()
+            for doc_id, data in rows:
+                result[doc_id] = json.loads(data)
+        return result
+
+    def keys(self, collection: str) -> List[str]:
+        """Koleksiyondaki anahtarları ekleme sırasına göre döndür"""
+        with self._conn_lock:
+            rows = self._conn.execute(
+                "SELECT doc_id, seq FROM documents WHERE collection = ? ORDER BY seq", (collection,)
+            ).fetchall()
+        ordered = dict(rows)
+        with self._pending_lock:
+            buffered = {**self._inflight, **self._pending}
+        for (c, doc_id), (seq, value) in buffered.items():
+            if c != collection:
+                continue
+            if value is _DELETED:
+                ordered.pop(doc_id, None)
+            elif doc_id not in ordered:
+                ordered[doc_id] = seq
+        return sorted(ordered, key=ordered.get)
+
+    def count(self, collection: str) -> int:
+        return len(self.keys(collection))
+
+    # --- Eski JSON dosyalarından geçiş -------------------------------------
+
+    def import_json_file(self, collection: str, file_path: str) -> int:
+        """Eski JSON durum dosyasını bir kere içe aktar ve dosyayı '.migrated' olarak yeniden adlandır
+
+        Liste içeren dosyalar sırayla, sözlük içeren dosyalar anahtarlarıyla aktarılır.
+
+        Returns:
+            int: Aktarılan kayıt sayısı
+        """
+        migration = f"{collection}:{os.path.abspath(file_path)}"
+        with self._conn_lock:
+            applied = self._conn.execute("SELECT 1 FROM migrations WHERE name = ?", (migration,)).fetchone()
+        if applied or not os.path.exists(file_path):
+            return 0
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        items = data.items() if isinstance(data, dict) else ((uuid.uuid4().hex, item) for item in data)
+        count = 0
+        for doc_id, document in items:
+            self.put(collection, str(doc_id), document)
+            count += 1
+        self.flush()
+
+        with self._conn_lock:
+            self._conn.execute("INSERT OR REPLACE INTO migrations (name, applied_at) VALUES (?, ?)",
+                               (migration, time.time()))
+        os.replace(file_path, file_path + ".migrated")
+        logger.info(f"{count} kayıt {file_path} dosyasından '{collection}' koleksiyonuna aktarıldı")
+        return count
+
+    def map(self, collection: str) -> 'DocumentMap':
+        return DocumentMap(self, collection)
+
+    def list(self, collection: str, max_items: int = None) -> 'DocumentList':
+        return DocumentList(self, collection, max_items=max_items)
+
+
+class _TrackedDocuments:
+    """Okunan kayıtları önbellekte tutar; sync() yerinde değiştirilenleri depoya yazar"""
+
+    def __init__(self, store: DocumentStore, collection: str):
+        self.store = store
+        self.collection = collection
+        self._cache: Dict[str, Any] = {}
+        self._serialized: Dict[str, str] = {}
+
+    def _load(self, doc_ids: List[str]):
+        missing = [doc_id for doc_id in doc_ids if doc_id not in self._cache]
+        if missing:
+            for doc_id, document in self.store.get_many(self.collection, missing).items():
+                self._remember(doc_id, document)
+
+    def _remember(self, doc_id: str, document: Any, serialized: str = None):
+        self._cache[doc_id] = document
+        self._serialized[doc_id] = serialized if serialized is not None else json.dumps(document, ensure_ascii=False)
+
+    def _write(self, doc_id: str, document: Any):
+        serialized = json.dumps(document, ensure_ascii=False)
+        self.store._enqueue(self.collection, doc_id, serialized)
+        self._remember(doc_id, document, serialized)
+
+    def _forget(self, doc_id: str):
+        self._cache.pop(doc_id, None)
+        self._serialized.pop(doc_id, None)
+        self.store.delete(self.collection, doc_id)
+
+    def sync(self) -> int:
+        """Okunduktan sonra yerinde değiştirilen kayıtları depoya yaz
+
+        Returns:
+            int: Depoya gönderilen kayıt sayısı
+        """
+        changed = 0
+        for doc_id, document in list(self._cache.items()):
+            serialized = json.dumps(document, ensure_ascii=False)
+            if serialized != self._serialized.get(doc_id):
+                self.store._enqueue(self.collection, doc_id, serialized)
+                self._serialized[doc_id] = serialized
+                changed += 1
+        return changed
+
+
+class DocumentMap(_TrackedDocuments, MutableMapping):
+    """Bir koleksiyonu dict gibi gösteren, kayıtları ilk erişimde okuyan görünüm"""
+
+    def __getitem__(self, doc_id: str) -> Any:
+        if doc_id not in self._cache:
+            self._load([doc_id])
+            if doc_id not in self._cache:
+                raise KeyError(doc_id)
+        return self._cache[doc_id]
+
+    def __setitem__(self, doc_id: str, document: Any):
+        self._write(doc_id, document)
+
+    def __delitem__(self, doc_id: str):
+        if doc_id not in self:
+            raise KeyError(doc_id)
+        self._forget(doc_id)
+
+    def __contains__(self, doc_id) -> bool:
+        if doc_id in self._cache:
+            return True
+        return self.store.get(self.collection, doc_id, _DELETED) is not _DELETED
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.keys(self.collection))
+
+    def __len__(self) -> int:
+        return self.store.count(self.collection)
+
+    def items(self):
+        keys = self.store.keys(self.collection)
+        self._load(keys)
+        return [(doc_id, self._cache[doc_id]) for doc_id in keys if doc_id in self._cache]
+
+    def values(self):
+        return [document for _, document in self.items()]
+
+
+class DocumentList(_TrackedDocuments):
+    """Bir koleksiyonu ekleme sıralı liste gibi gösteren görünüm
+
+    Anahtar listesi ilk erişimde okunur; kayıt gövdeleri ancak gerektiğinde yüklenir.
+    """
+
+    def __init__(self, store: DocumentStore, collection: str, max_items: int = None):
+        super().__init__(store, collection)
+        self.max_items = max_items
+        self._keys: Optional[List[str]] = None
+
+    @property
+    def _ordered_keys(self) -> List[str]:
+        if self._keys is None:
+            self._keys = self.store.keys(self.collection)
+        return self._keys
+
+    def append(self, document: Any):
+        doc_id = uuid.uuid4().hex
+        self._write(doc_id, document)
+        self._ordered_keys.append(doc_id)
+        if self.max_items is not None:
+            while len(self._ordered_keys) > self.max_items:
+                self.pop(0)
+
+    def pop(self, index: int = -1) -> Any:
+        doc_id = self._ordered_keys[index]
+        self._load([doc_id])
+        document = self._cache.get(doc_id)
+        del self._ordered_keys[index]
+        self._forget(doc_id)
+        return document
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            keys = self._ordered_keys[index]
+            self._load(keys)
+            return [self._cache.get(doc_id) for doc_id in keys]
+        doc_id = self._ordered_keys[index]
+        self._load([doc_id])
+        return self._cache.get(doc_id)
+
+    def __setitem__(self, index: int, document: Any):
+        self._write(self._ordered_keys[index], document)
+
+    def __iter__(self) -> Iterator[Any]:
+        keys = list(self._ordered_keys)
+        self._load(keys)
+        return (self._cache.get(doc_id) for doc_id in keys)
+
+    def __len__(self) -> int:
+        return len(self._ordered_keys)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from os_araci.db.document_store import DocumentStore
+
+
+class TestDocumentStore(unittest.TestCase):
+    """Unit tests for the write-behind document store"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "state.db")
+        # Long interval: flushes happen only when the test asks for them
+        self.store = DocumentStore(self.db_path, flush_interval=60)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp)
+
+    def _rows_on_disk(self, collection):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return dict(conn.execute(
+                "SELECT doc_id, data FROM documents WHERE collection = ?", (collection,)
+            ).fetchall())
+        finally:
+            conn.close()
+
+    def test_writes_are_coalesced_until_flush(self):
+        for i in range(5):
+            self.store.put("drafts", "post_1", {"version": i})
+
+        self.assertEqual(self._rows_on_disk("drafts"), {})
+        self.assertEqual(self.store.get("drafts", "post_1"), {"version": 4})
+
+        self.assertEqual(self.store.flush(), 1)
+        self.assertEqual(json.loads(self._rows_on_disk("drafts")["post_1"]), {"version": 4})
+
+    def test_map_is_lazy_and_syncs_in_place_changes(self):
+        self.store.put("drafts", "a", {"status": "active"})
+        self.store.put("drafts", "b", {"status": "active"})
+        self.store.flush()
+
+        drafts = self.store.map("drafts")
+        self.assertEqual(drafts._cache, {})
+
+        drafts["a"]["status"] = "scheduled"
+        self.assertEqual(list(drafts._cache), ["a"])
+        self.assertEqual(drafts.sync(), 1)
+        self.assertEqual(drafts.sync(), 0)
+        self.store.flush()
+
+        reopened = DocumentStore(self.db_path, flush_interval=60)
+        try:
+            self.assertEqual(reopened.get("drafts", "a"), {"status": "scheduled"})
+            self.assertEqual(sorted(reopened.map("drafts")), ["a", "b"])
+        finally:
+            reopened.close()
+
+    def test_map_delete(self):
+        drafts = self.store.map("drafts")
+        drafts["a"] = {"x": 1}
+        self.store.flush()
+
+        del drafts["a"]
+        self.assertNotIn("a", drafts)
+        self.store.flush()
+        self.assertEqual(self._rows_on_disk("drafts"), {})
+
+    def test_list_preserves_order_and_cap(self):
+        history = self.store.list("history", max_items=3)
+        for i in range(5):
+            history.append({"n": i})
+        self.store.flush()
+
+        reopened = DocumentStore(self.db_path, flush_interval=60)
+        try:
+            self.assertEqual(list(reopened.list("history")), [{"n": 2}, {"n": 3}, {"n": 4}])
+        finally:
+            reopened.close()
+
+    def test_close_flushes_pending_writes(self):
+        self.store.put("posts", "p", {"ok": True})
+        self.store.close()
+        self.assertIn("p", self._rows_on_disk("posts"))
+
+    def test_import_legacy_json_once(self):
+        legacy = os.path.join(self.tmp, "content_drafts.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump({"post_1": {"status": "active"}, "post_2": {"status": "draft"}}, f)
+
+        self.assertEqual(self.store.import_json_file("content_drafts", legacy), 2)
+        self.assertFalse(os.path.exists(legacy))
+        self.assertTrue(os.path.exists(legacy + ".migrated"))
+        self.assertEqual(self.store.get("content_drafts", "post_2"), {"status": "draft"})
+        self.assertEqual(self.store.import_json_file("content_drafts", legacy), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -254,6 +254,23 @@ class RateLimiter:
         # Yeni istek zamanını kaydet
         self.request_times.append(time.time())
 
+    async def async_wait_if_needed(self):
+        """wait_if_needed'in event loop'u bloklamayan sürümü"""
+        import asyncio
+        import time
+        current_time = time.time()
+
+        one_minute_ago = current_time - 60
+        self.request_times = [t for t in self.request_times if t > one_minute_ago]
+
+        if len(self.request_times) >= self.requests_per_minute:
+            wait_time = min(self.request_times) + 60 - current_time
+            if wait_time > 0:
+                logger.info(f"Hız sınırlaması nedeniyle {wait_time:.2f} saniye bekleniyor")
+                await asyncio.sleep(wait_time)
+
+        self.request_times.append(time.time())
+
 class RetryHandler:
     """API isteklerini yeniden deneme stratejileri için yardımcı sınıf"""
     
@@ -307,4 +324,31 @@ class RetryHandler:
                 time.sleep(wait_time)
                 
                 # Backoff süresini arttır
+                backoff *= self.backoff_factor
+
+    async def execute_with_retry_async(self, func: Callable, *args, **kwargs) -> Any:
+        """execute_with_retry'ın coroutine fonksiyonları için sürümü
+
+        Args:
+            func: Çalıştırılacak coroutine fonksiyonu
+            *args, **kwargs: Fonksiyona geçirilecek parametreler
+
+        Returns:
+            Fonksiyon sonucu
+        """
+        import asyncio
+        import random
+
+        backoff = self.initial_backoff
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or getattr(e, "status_code", None) in (401, 403):
+                    raise
+
+                wait_time = backoff * random.uniform(0.8, 1.2)
+                logger.warning(f"Deneme {attempt+1}/{self.max_retries} başarısız. {wait_time:.2f} saniye sonra tekrar denenecek. Hata: {str(e)}")
+                await asyncio.sleep(wait_time)
                 backoff *= self.backoff_factor
\ No newline at end of file
@@ -0,0 +1,632 @@
+# mcp_core/adapters/async_remote_proxy.py
+"""Uzak MCP sunucuları için asyncio tabanlı proxy katmanı.
+
+Her uzak URL için tek bir havuzlanmış HTTP istemcisi (httpx.AsyncClient) ve
+tek bir kalıcı WebSocket bağlantısı tutulur. Streaming çağrılar bu tek
+bağlantı üzerinden çağrı kimliği (id) ile çoklanır. Aksiyon şemaları ve
+metadata ETag doğrulamalı olarak önbelleğe alınır.
+
+Stream protokolü:
+- Çoklanmış uç nokta: /api/ws/registry/stream. İstemci her çağrı için
+  {"id", "tool", "action", "params"} gönderir, iptal için {"id", "type": "cancel"}.
+  Sunucu {"id", "type": "chunk"|"end"|"error", ...} mesajlarıyla yanıt verir.
+- Eski sunucular yalnızca çağrı başına bağlantı açılan
+  /api/ws/registry/stream/{tool}/{action} uç noktasını sunar. Çoklanmış uç nokta
+  el sıkışmada reddedilirse (ör. HTTP 404) o sunucu için eski uç noktaya geçilir.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+
+from os_araci.mcp_core.adapters.adapter_base import (
+    AuthHandlerFactory,
+    RateLimiter,
+    RetryHandler
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "MCPRemoteToolProxy/1.0",
+    "Accept": "application/json",
+    "Content-Type": "application/json"
+}
+
+
+class RemoteCallError(Exception):
+    """Uzak çağrı hatası (HTTP durum kodunu taşır)"""
+
+    def __init__(self, message: str, status_code: int = 500):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def build_auth_headers(auth_info: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Kimlik doğrulama bilgilerinden HTTP başlıkları oluştur"""
+    if not auth_info:
+        return {}
+    auth_type = auth_info.get("type", "bearer")
+    auth_handler = AuthHandlerFactory.create_auth_handler(auth_type)
+    return auth_handler.get_auth_headers(auth_info) or {}
+
+
+def auth_identity(auth_info: Optional[Dict[str, Any]]) -> str:
+    """Kimlik doğrulama başlıklarının özeti (farklı kimlikler önbelleği paylaşmaz)"""
+    headers = build_auth_headers(auth_info)
+    if not headers:
+        return "anonymous"
+    canonical = json.dumps(headers, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def rejected_handshake_status(error: Exception) -> Optional[int]:
+    """WebSocket el sıkışması HTTP durumuyla reddedildiyse durum kodu"""
+    for candidate in (error, getattr(error, "response", None)):
+        status = getattr(candidate, "status_code", None) or getattr(candidate, "status", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+class ETagCache:
+    """ETag doğrulamalı yanıt önbelleği
+
+    Anahtar (kimlik özeti + yol) başına son ETag ve gövde saklanır. Sonraki isteklerde
+    If-None-Match gönderilir; sunucu 304 dönerse önbellekteki gövde kullanılır.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[str, Any, float]] = {}  # url -> (etag, body, stored_at)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Koşullu istek başlıklarını döndür"""
+        entry = self._entries.get(url)
+        if entry and entry[0]:
+            return {"If-None-Match": entry[0]}
+        return {}
+
+    def get(self, url: str) -> Optional[Any]:
+        """Önbellekteki gövdeyi döndür"""
+        entry = self._entries.get(url)
+        return entry[1] if entry else None
+
+    def store(self, url: str, etag: Optional[str], body: Any):
+        """Yanıtı önbelleğe al (ETag yoksa saklanmaz)"""
+        if not etag:
+            self._entries.pop(url, None)
+            return
+        if len(self._entries) >= self.max_entries and url not in self._entries:
+            # En eski kaydı çıkar
+            oldest = min(self._entries.items(), key=lambda item: item[1][2])[0]
+            self._entries.pop(oldest, None)
+        self._entries[url] = (etag, body, time.time())
+
+    def invalidate(self, url: Optional[str] = None):
+        """Tek bir URL'yi veya tüm önbelleği temizle"""
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(url, None)
+
+
+class StreamMultiplexer:
+    """Tek bir WebSocket üzerinde birden fazla streaming çağrıyı çoklar
+
+    Gönderilen her çağrı bir `id` taşır; sunucudan gelen mesajlar aynı `id`
+    ile ilgili çağrının kuyruğuna yönlendirilir.
+    """
+
+    def __init__(self, ws_url: str, headers_provider, connect=None, legacy_url: str = None):
+        """
+        Args:
+            ws_url: Çoklanmış stream uç noktası
+            headers_provider: Bağlantı başlıklarını döndüren fonksiyon
+            connect: Bağlantı fabrikası (varsayılan: websockets.connect)
+            legacy_url: Çağrı başına eski uç nokta şablonu ({tool}, {action});
+                çoklanmış uç nokta reddedilirse kullanılır
+        """
+        self.ws_url = ws_url
+        self.legacy_url = legacy_url
+        self.legacy = False
+        self._headers_provider = headers_provider
+        self._connect = connect
+        self._ws = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._pending: Dict[str, asyncio.Queue] = {}
+
+    @property
+    def active_calls(self) -> int:
+        """Devam eden streaming çağrı sayısı"""
+        return len(self._pending)
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and self._reader_task is not None and not self._reader_task.done()
+
+    def _connector(self):
+        if self._connect is not None:
+            return self._connect
+        import websockets
+        return websockets.connect
+
+    async def _ensure_connected(self):
+        """Bağlantı yoksa kur (eşzamanlı çağrılar tek bağlantı paylaşır)"""
+        if self.connected:
+            return
+        async with self._connect_lock:
+            if self.connected:
+                return
+            headers = self._headers_provider()
+            self._ws = await self._connector()(self.ws_url, additional_headers=headers)
+            self._reader_task = asyncio.create_task(self._reader())
+            logger.info(f"Stream WebSocket bağlantısı kuruldu: {self.ws_url}")
+
+    async def _reader(self):
+        """Gelen mesajları çağrı kimliğine göre dağıt"""
+        error: Optional[str] = None
+        try:
+            async for raw in self._ws:
+                try:
+                    message = json.loads(raw)
+                except (TypeError, ValueError):
+                    logger.warning(f"Geçersiz stream mesajı yok sayıldı: {raw!r}")
+                    continue
+                queue = self._pending.get(message.get("id"))
+                if queue is not None:
+                    queue.put_nowait(message)
+        except asyncio.CancelledError:
+            error = "Stream bağlantısı kapatıldı"
+            raise
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Stream WebSocket hatası: {error}")
+        finally:
+            self._ws = None
+            # Bekleyen tüm çağrıları sonlandır
+            for call_id, queue in list(self._pending.items()):
+                queue.put_nowait({
+                    "id": call_id,
+                    "type": "error",
+                    "error": error or "Stream bağlantısı kapandı"
+                })
+
+    async def stream(self, tool_name: str, action_name: str, params: Dict[str, Any]) -> AsyncIterator[str]:
+        """Bir streaming çağrı başlat ve chunk'ları sırayla üret
+
+        Raises:
+            RemoteCallError: Sunucu hata mesajı gönderirse
+        """
+        if not self.legacy:
+            try:
+                await self._ensure_connected()
+            except Exception as e:
+                status = rejected_handshake_status(e)
+                if self.legacy_url is None or status is None or status in (401, 403):
+                    raise
+                logger.warning(f"Çoklanmış stream uç noktası reddedildi (HTTP {status}), "
+                               f"çağrı başına eski uç noktaya geçiliyor: {self.ws_url}")
+                self.legacy = True
+        if self.legacy:
+            async for content in self._legacy_stream(tool_name, action_name, params):
+                yield content
+            return
+
+        call_id = str(uuid.uuid4())
+        queue: asyncio.Queue = asyncio.Queue()
+        self._pending[call_id] = queue
+        finished = False
+        try:
+            await self._ws.send(json.dumps({
+                "id": call_id,
+                "tool": tool_name,
+                "action": action_name,
+                "params": params
+            }))
+            while True:
+                message = await queue.get()
+                message_type = message.get("type")
+                if message_type == "chunk":
+                    content = message.get("content", "")
+                    if content:
+                        yield content
+                elif message_type == "end":
+                    finished = True
+                    return
+                elif message_type == "error":
+                    finished = True
+                    raise RemoteCallError(message.get("error", "Bilinmeyen hata"))
+        finally:
+            self._pending.pop(call_id, None)
+            # Tüketici erken bıraktıysa sunucuya iptal bildir
+            if not finished and self._ws is not None:
+                try:
+                    await self._ws.send(json.dumps({"id": call_id, "type": "cancel"}))
+                except Exception:
+                    pass
+
+    async def _legacy_stream(self, tool_name: str, action_name: str, params: Dict[str, Any]) -> AsyncIterator[str]:
+        """Eski protokol: çağrı başına ayrı WebSocket bağlantısı"""
+        url = self.legacy_url.format(tool=tool_name, action=action_name)
+        ws = await self._connector()(url, additional_headers=self._headers_provider())
+        try:
+            await ws.send(json.dumps({"id": str(uuid.uuid4()), "params": params}))
+            async for raw in ws:
+                try:
+                    message = json.loads(raw)
+                except (TypeError, ValueError):
+                    logger.warning(f"Geçersiz stream mesajı yok sayıldı: {raw!r}")
+                    continue
+                message_type = message.get("type")
+                if message_type == "chunk":
+                    content = message.get("content", "")
+                    if content:
+                        yield content
+                elif message_type == "end":
+                    return
+                elif message_type == "error":
+                    raise RemoteCallError(message.get("error", "Bilinmeyen hata"))
+            raise RemoteCallError("Stream bağlantısı kapandı")
+        finally:
+            try:
+                await ws.close()
+            except Exception as e:
+                logger.debug(f"Stream bağlantısı kapatılırken hata: {e}")
+
+    async def close(self):
+        """Bağlantıyı ve okuyucu görevi kapat"""
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception as e:
+                logger.debug(f"Stream bağlantısı kapatılırken hata: {e}")
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader_task = None
+
+
+class RemoteEndpoint:
+    """Tek bir uzak MCP sunucusu için paylaşılan bağlantı kaynakları"""
+
+    def __init__(self, remote_url: str, auth_info: Dict = None,
+                 requests_per_minute: int = 100, max_connections: int = 20,
+                 http_client=None, ws_connect=None):
+        self.remote_url = remote_url.rstrip('/')
+        self.auth_info = auth_info or {}
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.retry_handler = RetryHandler()
+        self.etag_cache = ETagCache()
+        self.max_connections = max_connections
+        self._client = http_client
+        self._ws_connect = ws_connect
+        self._multiplexer: Optional[StreamMultiplexer] = None
+
+    @property
+    def client(self):
+        """Havuzlanmış HTTP istemcisi (ilk kullanımda oluşturulur)"""
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                base_url=self.remote_url,
+                headers=DEFAULT_HEADERS,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=httpx.Timeout(30.0, connect=10.0)
+            )
+        return self._client
+
+    @property
+    def multiplexer(self) -> StreamMultiplexer:
+        """Uzak sunucu için tek WebSocket çoklayıcısı"""
+        if self._multiplexer is None:
+            ws_protocol = "wss" if self.remote_url.startswith("https") else "ws"
+            base_url = self.remote_url.replace("https://", "").replace("http://", "")
+            self._multiplexer = StreamMultiplexer(
+                f"{ws_protocol}://{base_url}/api/ws/registry/stream",
+                self.headers,
+                connect=self._ws_connect,
+                legacy_url=f"{ws_protocol}://{base_url}/api/ws/registry/stream/{{tool}}/{{action}}"
+            )
+        return self._multiplexer
+
+    def headers(self, auth_info: Dict = None) -> Dict[str, str]:
+        """İstek başlıklarını oluştur"""
+        headers = dict(DEFAULT_HEADERS)
+        headers.update(build_auth_headers(auth_info if auth_info is not None else self.auth_info))
+        return headers
+
+    async def request(self, method: str, path: str, auth_info: Dict = None,
+                      timeout: float = None, **kwargs):
+        """Havuzlanmış istemci üzerinden HTTP isteği gönder"""
+        await self.rate_limiter.async_wait_if_needed()
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return await self.client.request(method, path, headers=self.headers(auth_info), **kwargs)
+
+    async def get_json_cached(self, path: str, auth_info: Dict = None, timeout: float = 10) -> Any:
+        """GET isteğini ETag doğrulaması ile yap
+
+        Önbellek anahtarı kimlik özetini içerir; farklı kimlik bilgileriyle
+        yapılan istekler birbirinin gövdesini görmez.
+        """
+        await self.rate_limiter.async_wait_if_needed()
+        effective_auth = auth_info if auth_info is not None else self.auth_info
+        cache_key = f"{auth_identity(effective_auth)}:{path}"
+        headers = self.headers(auth_info)
+        headers.update(self.etag_cache.conditional_headers(cache_key))
+        response = await self.client.get(path, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            cached = self.etag_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            # Önbellek boşaldıysa koşulsuz tekrar iste
+            self.etag_cache.invalidate(cache_key)
+            response = await self.client.get(path, headers=self.headers(auth_info), timeout=timeout)
+        response.raise_for_status()
+        body = response.json()
+        self.etag_cache.store(cache_key, response.headers.get("ETag"), body)
+        return body
+
+    async def aclose(self):
+        """Tüm bağlantıları kapat"""
+        if self._multiplexer is not None:
+            await self._multiplexer.close()
+            self._multiplexer = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class AsyncMCPRemoteProxy:
+    """Uzak MCP aracını temsil eden asyncio proxy sınıfı"""
+
+    def __init__(self, name: str, endpoint: RemoteEndpoint, auth_info: Dict = None):
+        self.name = name
+        self.endpoint = endpoint
+        self.remote_url = endpoint.remote_url
+        self.auth_info = auth_info if auth_info is not None else endpoint.auth_info
+
+        # Metadata ve capabilities önbelleği
+        self._metadata_cache = None
+        self._capabilities_cache = None
+        self._actions_cache = None
+
+    def get_headers(self) -> Dict[str, str]:
+        """İstek headers'larını oluştur"""
+        return self.endpoint.headers(self.auth_info)
+
+    async def call_action(self, action_name: str, **kwargs) -> Any:
+        """Uzak araç üzerinde bir aksiyonu çağır
+
+        Returns:
+            Aksiyon sonucu veya hata durumunda (hata, durum kodu) ikilisi
+        """
+        path = f"/api/registry/call/{self.name}/{action_name}"
+        payload = {"params": kwargs}
+
+        async def make_request():
+            response = await self.endpoint.request("POST", path, auth_info=self.auth_info,
+                                                   json=payload, timeout=30)
+            if response.status_code in (401, 403):
+                raise RemoteCallError(f"Yetkilendirme hatası: HTTP {response.status_code}",
+                                      response.status_code)
+            response.raise_for_status()
+            if response.content:
+                return response.json()
+            return {"status": "success"}
+
+        try:
+            return await self.endpoint.retry_handler.execute_with_retry_async(make_request)
+        except RemoteCallError as e:
+            if e.status_code in (401, 403) and await self._refresh_auth():
+                logger.info(f"Token yenilendi, isteği tekrar deneniyor: {action_name}")
+                return await self.call_action(action_name, **kwargs)
+            logger.error(f"API isteği başarısız: {str(e)}")
+            return {"error": str(e), "status": "error"}, e.status_code
+        except Exception as e:
+            status_code = getattr(getattr(e, "response", None), "status_code", 500)
+            logger.error(f"API isteği başarısız: {str(e)}")
+            return {"error": str(e), "status": "error"}, status_code
+
+    async def _refresh_auth(self) -> bool:
+        """Token'ı yenilemeyi dene (bloklayan yenileme thread'de çalışır)"""
+        if not self.auth_info:
+            return False
+        auth_type = self.auth_info.get("type", "bearer")
+        auth_handler = AuthHandlerFactory.create_auth_handler(auth_type)
+        new_auth_info = await asyncio.to_thread(auth_handler.refresh_token, self.auth_info)
+        if new_auth_info != self.auth_info:
+            self.auth_info = new_auth_info
+            return True
+        return False
+
+    async def get_metadata(self) -> Dict[str, Any]:
+        """Uzak aracın metadata bilgilerini getir"""
+        if self._metadata_cache:
+            return self._metadata_cache
+        try:
+            self._metadata_cache = await self.endpoint.get_json_cached(
+                f"/api/registry/tool/{self.name}", self.auth_info)
+            return self._metadata_cache
+        except Exception as e:
+            logger.error(f"Metadata alınırken hata: {str(e)}")
+            return {}
+
+    async def get_capabilities(self) -> List[str]:
+        """Uzak aracın yeteneklerini getir"""
+        if self._capabilities_cache:
+            return self._capabilities_cache
+        metadata = await self.get_metadata()
+        self._capabilities_cache = metadata.get("capabilities", [])
+        return self._capabilities_cache
+
+    async def get_actions(self) -> List[str]:
+        """Uzak aracın desteklediği aksiyonları getir"""
+        if self._actions_cache:
+            return self._actions_cache
+        try:
+            data = await self.endpoint.get_json_cached(
+                f"/api/registry/tool/{self.name}/actions", self.auth_info)
+            self._actions_cache = data.get("actions", [])
+            return self._actions_cache
+        except Exception as e:
+            logger.error(f"Aksiyonlar alınırken hata: {str(e)}")
+            return []
+
+    async def get_action_schema(self, action_name: str) -> Dict[str, Any]:
+        """Belirli bir aksiyonun şemasını al (ETag doğrulamalı önbellek)"""
+        try:
+            return await self.endpoint.get_json_cached(
+                f"/api/registry/tool/{self.name}/action/{action_name}", self.auth_info)
+        except Exception as e:
+            logger.error(f"Aksiyon şeması alınırken hata: {action_name}, {str(e)}")
+            return {}
+
+    async def check_health(self) -> bool:
+        """Uzak aracın sağlık durumunu kontrol et"""
+        try:
+            response = await self.endpoint.request(
+                "GET", f"/api/registry/tool/{self.name}/health",
+                auth_info=self.auth_info, timeout=5)
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"Sağlık kontrolü başarısız: {str(e)}")
+            return False
+
+    def stream(self, action_name: str, **kwargs) -> AsyncIterator[str]:
+        """Paylaşılan WebSocket üzerinden streaming çağrı yap
+
+        Returns:
+            Chunk'ları üreten async iterator
+        """
+        return self.endpoint.multiplexer.stream(self.name, action_name, kwargs)
+
+
+class AsyncRemoteToolProxy:
+    """Uzak MCP sunucuları için asyncio adaptörü
+
+    Uzak URL başına tek bir `RemoteEndpoint` (HTTP havuzu + WebSocket) tutar.
+    Endpoint'ler oluşturuldukları event loop'a bağlıdır.
+    """
+
+    def __init__(self, requests_per_minute: int = 100, http_client_factory=None, ws_connect=None):
+        """
+        Args:
+            requests_per_minute: Uzak sunucu başına dakikalık istek sınırı
+            http_client_factory: Test için URL -> istemci fabrikası
+            ws_connect: Test için WebSocket bağlantı fabrikası
+        """
+        self.requests_per_minute = requests_per_minute
+        self.endpoints: Dict[str, RemoteEndpoint] = {}  # url -> RemoteEndpoint
+        self.proxies: Dict[str, AsyncMCPRemoteProxy] = {}  # url:name -> proxy
+        self._http_client_factory = http_client_factory
+        self._ws_connect = ws_connect
+
+    def get_endpoint(self, remote_url: str, auth_info: Dict = None) -> RemoteEndpoint:
+        """Uzak URL için paylaşılan endpoint'i döndür (yoksa oluştur)"""
+        key = remote_url.rstrip('/')
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            http_client = self._http_client_factory(key) if self._http_client_factory else None
+            endpoint = RemoteEndpoint(key, auth_info, self.requests_per_minute,
+                                      http_client=http_client, ws_connect=self._ws_connect)
+            self.endpoints[key] = endpoint
+        return endpoint
+
+    async def create_proxy(self, name: str, remote_url: str, auth_info: Dict = None) -> Optional[AsyncMCPRemoteProxy]:
+        """Uzak MCP sunucusundaki bir araç için proxy oluştur"""
+        proxy_key = f"{remote_url.rstrip('/')}:{name}"
+        if proxy_key in self.proxies:
+            return self.proxies[proxy_key]
+
+        if not await self.handshake(remote_url, auth_info):
+            logger.error(f"Uzak sunucu ile handshake başarısız: {remote_url}")
+            return None
+
+        proxy = AsyncMCPRemoteProxy(name, self.get_endpoint(remote_url, auth_info), auth_info)
+        self.proxies[proxy_key] = proxy
+        logger.info(f"Uzak araç proxy'si oluşturuldu: {name} ({remote_url})")
+        return proxy
+
+    async def handshake(self, remote_url: str, auth_info: Dict = None) -> bool:
+        """Uzak MCP sunucusu ile handshake yap"""
+        try:
+            endpoint = self.get_endpoint(remote_url, auth_info)
+            response = await endpoint.request(
+                "POST", "/api/handshake", auth_info=auth_info,
+                json={"client": "mcp_remote_proxy", "version": "1.0.0"}, timeout=10)
+            if response.status_code != 200:
+                logger.error(f"Handshake başarısız, HTTP {response.status_code}: {response.text}")
+                return False
+
+            data = response.json()
+            server_version = data.get("version", "")
+            if not data.get("compatible", False):
+                logger.warning(f"Uzak sunucu uyumlu değil: {remote_url}, version: {server_version}")
+                return False
+
+            logger.info(f"Uzak sunucu ile handshake başarılı: {remote_url}, version: {server_version}")
+            return True
+        except Exception as e:
+            logger.error(f"Handshake sırasında hata: {str(e)}")
+            return False
+
+    async def list_remote_tools(self, remote_url: str, auth_info: Dict = None) -> List[Dict[str, Any]]:
+        """Uzak MCP sunucusundaki tüm araçları listele"""
+        try:
+            if not await self.handshake(remote_url, auth_info):
+                return []
+            endpoint = self.get_endpoint(remote_url, auth_info)
+            response = await endpoint.request("GET", "/api/registry/tools", auth_info=auth_info, timeout=10)
+            response.raise_for_status()
+            return response.json().get("tools", [])
+        except Exception as e:
+            logger.error(f"Uzak araçları listelerken hata: {str(e)}")
+            return []
+
+    async def get_tool_metadata(self, remote_url: str, tool_name: str, auth_info: Dict = None) -> Dict[str, Any]:
+        """Uzak MCP sunucusundaki bir aracın metadata bilgilerini al"""
+        try:
+            endpoint = self.get_endpoint(remote_url, auth_info)
+            return await endpoint.get_json_cached(f"/api/registry/tool/{tool_name}", auth_info)
+        except Exception as e:
+            logger.error(f"Araç metadata'sı alınırken hata: {tool_name}, {str(e)}")
+            return {}
+
+    async def ping(self, remote_url: str, auth_info: Dict = None) -> bool:
+        """Uzak MCP sunucusunu ping'le"""
+        try:
+            endpoint = self.get_endpoint(remote_url, auth_info)
+            response = await endpoint.request("GET", "/api/ping", auth_info=auth_info, timeout=5)
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"Ping başarısız: {str(e)}")
+            return False
+
+    async def get_remote_schema(self, remote_url: str, auth_info: Dict = None) -> Dict[str, Any]:
+        """Uzak MCP sunucusunun API şemasını al (ETag doğrulamalı önbellek)"""
+        try:
+            endpoint = self.get_endpoint(remote_url, auth_info)
+            return await endpoint.get_json_cached("/api/schema", auth_info)
+        except Exception as e:
+            logger.error(f"API şeması alınırken hata: {str(e)}")
+            return {}
+
+    async def aclose(self):
+        """Tüm uzak bağlantıları kapat"""
+        for endpoint in list(self.endpoints.values()):
+            await endpoint.aclose()
+        self.endpoints.clear()
+        self.proxies.clear()
@@ -0,0 +1,285 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from os_araci.mcp_core.adapters.async_remote_proxy import (
+    AsyncRemoteToolProxy,
+    ETagCache,
+    RemoteCallError,
+    StreamMultiplexer
+)
+
+
+class FakeResponse:
+    """Minimal httpx.Response stand-in"""
+
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+        self.content = json.dumps(body).encode() if body is not None else b""
+        self.text = self.content.decode()
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RemoteCallError(f"HTTP {self.status_code}", self.status_code)
+
+
+class FakeHttpClient:
+    """Records requests and serves canned responses keyed by (method, path)"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    async def request(self, method, path, headers=None, **kwargs):
+        self.calls.append((method, path, dict(headers or {})))
+        handler = self.routes[(method, path)]
+        return handler(headers or {}) if callable(handler) else handler
+
+    async def get(self, path, headers=None, **kwargs):
+        return await self.request("GET", path, headers=headers, **kwargs)
+
+    async def aclose(self):
+        pass
+
+
+class FakeServerSocket:
+    """Fake multiplexed stream server: echoes each param back as chunks"""
+
+    def __init__(self):
+        self.sent = []
+        self._incoming = asyncio.Queue()
+        self.closed = False
+
+    async def send(self, raw):
+        message = json.loads(raw)
+        self.sent.append(message)
+        if message.get("type") == "cancel":
+            return
+        for word in message["params"]["text"].split():
+            await self._incoming.put(json.dumps({"id": message["id"], "type": "chunk", "content": word}))
+        await self._incoming.put(json.dumps({"id": message["id"], "type": "end"}))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raw = await self._incoming.get()
+        if raw is None:
+            raise StopAsyncIteration
+        return raw
+
+    async def close(self):
+        self.closed = True
+        await self._incoming.put(None)
+
+
+class TestETagCache(unittest.TestCase):
+    """Unit tests for ETagCache"""
+
+    def test_store_and_conditional_headers(self):
+        cache = ETagCache()
+        cache.store("/a", '"v1"', {"x": 1})
+        self.assertEqual(cache.conditional_headers("/a"), {"If-None-Match": '"v1"'})
+        self.assertEqual(cache.get("/a"), {"x": 1})
+
+    def test_store_without_etag_is_not_cached(self):
+        cache = ETagCache()
+        cache.store("/a", None, {"x": 1})
+        self.assertIsNone(cache.get("/a"))
+        self.assertEqual(cache.conditional_headers("/a"), {})
+
+    def test_eviction_when_full(self):
+        cache = ETagCache(max_entries=2)
+        cache.store("/a", "1", 1)
+        cache.store("/b", "2", 2)
+        cache.store("/c", "3", 3)
+        self.assertIsNone(cache.get("/a"))
+        self.assertEqual(cache.get("/c"), 3)
+
+
+class TestAsyncRemoteToolProxy(unittest.TestCase):
+    """Unit tests for AsyncRemoteToolProxy"""
+
+    def setUp(self):
+        self.clients = {}
+        self.schema_requests = 0
+
+        def schema_route(headers):
+            self.schema_requests += 1
+            if headers.get("If-None-Match") == '"s1"':
+                return FakeResponse(304)
+            return FakeResponse(200, {"name": "echo"}, {"ETag": '"s1"'})
+
+        routes = {
+            ("POST", "/api/handshake"): FakeResponse(200, {"version": "1.0", "compatible": True}),
+            ("GET", "/api/ping"): FakeResponse(200, {}),
+            ("GET", "/api/registry/tool/echo/action/say"): schema_route,
+            ("POST", "/api/registry/call/echo/say"): FakeResponse(200, {"status": "success", "echo": "hi"}),
+        }
+
+        def client_factory(url):
+            self.clients[url] = FakeHttpClient(routes)
+            return self.clients[url]
+
+        self.sockets = []
+
+        async def ws_connect(url, additional_headers=None):
+            socket = FakeServerSocket()
+            self.sockets.append((url, socket))
+            return socket
+
+        self.engine = AsyncRemoteToolProxy(http_client_factory=client_factory, ws_connect=ws_connect)
+
+    def test_one_client_per_remote_url(self):
+        """Handshake, ping and proxy creation share one pooled client"""
+        async def scenario():
+            await self.engine.ping("http://remote:5000/")
+            await self.engine.create_proxy("echo", "http://remote:5000")
+            await self.engine.ping("http://remote:5000")
+
+        asyncio.run(scenario())
+        self.assertEqual(list(self.clients.keys()), ["http://remote:5000"])
+        self.assertEqual(len(self.clients["http://remote:5000"].calls), 3)
+
+    def test_action_schema_revalidated_with_etag(self):
+        """Second schema lookup sends If-None-Match and reuses cached body on 304"""
+        async def scenario():
+            proxy = await self.engine.create_proxy("echo", "http://remote:5000")
+            first = await proxy.get_action_schema("say")
+            second = await proxy.get_action_schema("say")
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(first, {"name": "echo"})
+        self.assertEqual(second, {"name": "echo"})
+        self.assertEqual(self.schema_requests, 2)
+        last_headers = self.clients["http://remote:5000"].calls[-1][2]
+        self.assertEqual(last_headers.get("If-None-Match"), '"s1"')
+
+    def test_call_action(self):
+        async def scenario():
+            proxy = await self.engine.create_proxy("echo", "http://remote:5000")
+            return await proxy.call_action("say", text="hi")
+
+        self.assertEqual(asyncio.run(scenario()), {"status": "success", "echo": "hi"})
+
+    def test_streams_multiplexed_over_single_socket(self):
+        """Concurrent streaming calls share one WebSocket and are routed by call id"""
+        async def collect(proxy, text):
+            return [chunk async for chunk in proxy.stream("say", text=text)]
+
+        async def scenario():
+            proxy = await self.engine.create_proxy("echo", "http://remote:5000")
+            results = await asyncio.gather(
+                collect(proxy, "a b c"),
+                collect(proxy, "d e"),
+                collect(proxy, "f"),
+            )
+            await self.engine.aclose()
+            return results
+
+        results = asyncio.run(scenario())
+        self.assertEqual(results, [["a", "b", "c"], ["d", "e"], ["f"]])
+        self.assertEqual(len(self.sockets), 1)
+        self.assertEqual(self.sockets[0][0], "ws://remote:5000/api/ws/registry/stream")
+        call_ids = {message["id"] for message in self.sockets[0][1].sent}
+        self.assertEqual(len(call_ids), 3)
+
+    def test_etag_cache_is_per_auth_identity(self):
+        """A body cached for one token is never served to another"""
+        def schema_route(headers):
+            token = headers.get("Authorization", "")
+            etag = '"shared"'
+            if headers.get("If-None-Match") == etag:
+                return FakeResponse(304)
+            return FakeResponse(200, {"owner": token}, {"ETag": etag})
+
+        client = FakeHttpClient({("GET", "/api/schema"): schema_route})
+        engine = AsyncRemoteToolProxy(http_client_factory=lambda url: client)
+
+        async def scenario():
+            alice = await engine.get_remote_schema("http://remote:5000", {"type": "bearer", "token": "alice"})
+            bob = await engine.get_remote_schema("http://remote:5000", {"type": "bearer", "token": "bob"})
+            alice_again = await engine.get_remote_schema("http://remote:5000", {"type": "bearer", "token": "alice"})
+            return alice, bob, alice_again
+
+        alice, bob, alice_again = asyncio.run(scenario())
+        self.assertEqual(alice, {"owner": "Bearer alice"})
+        self.assertEqual(bob, {"owner": "Bearer bob"})
+        self.assertEqual(alice_again, alice)
+        # Bob's first request was unconditional, Alice's second one revalidated
+        self.assertNotIn("If-None-Match", client.calls[1][2])
+        self.assertEqual(client.calls[2][2].get("If-None-Match"), '"shared"')
+
+    def test_falls_back_to_legacy_stream_endpoint(self):
+        """Servers without the multiplexed endpoint get one connection per call"""
+        class Rejected(Exception):
+            status_code = 404
+
+        class LegacySocket(FakeServerSocket):
+            async def send(self, raw):
+                message = json.loads(raw)
+                self.sent.append(message)
+                for word in message["params"]["text"].split():
+                    await self._incoming.put(json.dumps({"id": message["id"], "type": "chunk", "content": word}))
+                await self._incoming.put(json.dumps({"id": message["id"], "type": "end"}))
+
+        urls = []
+
+        async def ws_connect(url, additional_headers=None):
+            urls.append(url)
+            if url.endswith("/api/ws/registry/stream"):
+                raise Rejected("server rejected WebSocket connection: HTTP 404")
+            return LegacySocket()
+
+        self.engine._ws_connect = ws_connect
+
+        async def scenario():
+            proxy = await self.engine.create_proxy("echo", "http://remote:5000")
+            first = [chunk async for chunk in proxy.stream("say", text="a b")]
+            second = [chunk async for chunk in proxy.stream("say", text="c")]
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual((first, second), (["a", "b"], ["c"]))
+        self.assertEqual(urls, [
+            "ws://remote:5000/api/ws/registry/stream",
+            "ws://remote:5000/api/ws/registry/stream/echo/say",
+            "ws://remote:5000/api/ws/registry/stream/echo/say",
+        ])
+
+
+class TestStreamMultiplexer(unittest.TestCase):
+    """Unit tests for StreamMultiplexer error propagation"""
+
+    def test_pending_calls_fail_when_socket_drops(self):
+        class DroppingSocket(FakeServerSocket):
+            async def send(self, raw):
+                self.sent.append(json.loads(raw))
+                await self._incoming.put(None)
+
+        async def connect(url, additional_headers=None):
+            return DroppingSocket()
+
+        async def scenario():
+            multiplexer = StreamMultiplexer("ws://x/api/ws/registry/stream", dict, connect=connect)
+            with self.assertRaises(RemoteCallError):
+                async for _ in multiplexer.stream("echo", "say", {"text": "a"}):
+                    pass
+            self.assertEqual(multiplexer.active_calls, 0)
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
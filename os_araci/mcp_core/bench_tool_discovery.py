@@ -0,0 +1,85 @@
+# os_araci/mcp_core/bench_tool_discovery.py
+"""Araç keşfi soğuk başlangıç ölçümü.
+
+Her mod ayrı bir Python sürecinde (boş modül önbelleğiyle) çalıştırılır:
+  eager       - pkgutil + importlib ile tüm modülleri import eden eski yol
+  lazy-cold   - manifesto önbelleği yokken statik AST taraması
+  lazy-warm   - geçerli manifesto önbelleğiyle tarama
+
+Kullanım:
+    python -m os_araci.mcp_core.bench_tool_discovery [--package os_araci.tools] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+
+CHILD_SCRIPT = """
+import json, logging, sys, time
+logging.disable(logging.CRITICAL)
+started = time.perf_counter()
+from os_araci.mcp_core.tool_discovery import ToolDiscovery
+discovery = ToolDiscovery(None, scan_packages=[{package!r}], lazy={lazy}, manifest_path={manifest!r})
+discover_started = time.perf_counter()
+tools = discovery.discover_tools()
+finished = time.perf_counter()
+print(json.dumps({{
+    "discover_ms": (finished - discover_started) * 1000,
+    "total_ms": (finished - started) * 1000,
+    "tools": len(tools),
+    "modules_loaded": len(sys.modules)
+}}))
+"""
+
+
+def run_child(package: str, lazy: bool, manifest_path: str) -> dict:
+    """Tek bir ölçümü yeni bir süreçte çalıştır"""
+    script = CHILD_SCRIPT.format(package=package, lazy=lazy, manifest=manifest_path)
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(name: str, samples: list) -> str:
+    discover = [s["discover_ms"] for s in samples]
+    total = [s["total_ms"] for s in samples]
+    return (f"{name:<10} discover median {statistics.median(discover):8.1f} ms | "
+            f"process median {statistics.median(total):8.1f} ms | "
+            f"tools {samples[-1]['tools']:3d} | modules {samples[-1]['modules_loaded']:5d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Araç keşfi soğuk başlangıç ölçümü")
+    parser.add_argument("--package", default="os_araci.tools")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_path = os.path.join(tmp, "tool_manifest.json")
+        results = {"eager": [], "lazy-cold": [], "lazy-warm": []}
+
+        for _ in range(args.runs):
+            results["eager"].append(run_child(args.package, False, manifest_path))
+
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            results["lazy-cold"].append(run_child(args.package, True, manifest_path))
+            results["lazy-warm"].append(run_child(args.package, True, manifest_path))
+
+        print(f"Paket: {args.package}, tekrar: {args.runs}")
+        for name, samples in results.items():
+            print(summarize(name, samples))
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    main()
+    print(f"Toplam süre: {time.perf_counter() - started:.1f} s")
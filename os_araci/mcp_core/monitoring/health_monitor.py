@@ -2,45 +2,132 @@
 import logging
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, Any, Optional, List
 
 logger = logging.getLogger(__name__)
 
+
+class ToolHealthHistory:
+    """Bir aracın kayan pencereli gecikme/erişilebilirlik geçmişi"""
+
+    def __init__(self, window: int = 50):
+        """
+        Args:
+            window: Saklanacak son gözlem sayısı
+        """
+        self.samples = deque(maxlen=window)  # (timestamp, success, latency_ms, source)
+        self.last_observed = 0.0
+        self.last_passive = 0.0
+
+    def record(self, success: bool, latency_ms: Optional[float], source: str = "probe"):
+        """Yeni bir gözlem ekle (source: probe veya passive)"""
+        now = time.time()
+        self.samples.append((now, success, latency_ms, source))
+        self.last_observed = now
+        if source == "passive":
+            self.last_passive = now
+
+    def availability(self) -> Optional[float]:
+        """Penceredeki başarılı gözlem oranı (gözlem yoksa None)"""
+        if not self.samples:
+            return None
+        return sum(1 for sample in self.samples if sample[1]) / len(self.samples)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Başarılı gözlemlerin gecikme yüzdeliği (ms)"""
+        latencies = sorted(sample[2] for sample in self.samples if sample[1] and sample[2] is not None)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(percentile / 100.0 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def consecutive_failures(self) -> int:
+        """Sondan başlayarak ardışık başarısız gözlem sayısı"""
+        count = 0
+        for sample in reversed(self.samples):
+            if sample[1]:
+                break
+            count += 1
+        return count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": len(self.samples),
+            "availability": self.availability(),
+            "latency_p50_ms": self.latency_percentile(50),
+            "latency_p95_ms": self.latency_percentile(95),
+            "consecutive_failures": self.consecutive_failures(),
+            "last_observed": self.last_observed or None,
+            "last_passive": self.last_passive or None
+        }
+
+
 class ToolHealthMonitor:
-    """Araç sağlık durumunu izleme servisi"""
-    
-    def __init__(self, registry, check_interval: int = 300):
+    """Araç sağlık durumunu izleme servisi
+
+    Dış kaynak ve uzak araçlar eşzamanlılık sınırı altında paralel yoklanır.
+    Gerçek çağrı sonuçları (pasif sağlık) yakın zamanda gözlenen araçlar için
+    gereksiz yoklamaları atlatır. Kontrol aralığı uyarlanır: sağlıksız araç
+    varken kısa, sistem kararlı kaldıkça `check_interval`'a kadar uzar.
+    """
+
+    def __init__(self, registry, check_interval: int = 300, min_interval: int = 15,
+                 max_concurrency: int = 8, probe_timeout: float = 10.0, history_window: int = 50):
         """
         Sağlık izleme servisi başlatıcı
-        
+
         Args:
             registry: MCP Registry örneği
-            check_interval: Kontrol aralığı (saniye)
+            check_interval: Kararlı durumdaki en uzun kontrol aralığı (saniye)
+            min_interval: Sağlıksız araç varken kullanılan kontrol aralığı (saniye)
+            max_concurrency: Aynı anda yapılabilecek en fazla yoklama
+            probe_timeout: Tek bir yoklama için beklenecek en uzun süre (saniye)
+            history_window: Araç başına saklanan gözlem sayısı
         """
         self.registry = registry
         self.check_interval = check_interval
+        self.min_interval = min(min_interval, check_interval)
+        self.max_concurrency = max_concurrency
+        self.probe_timeout = probe_timeout
+        self.history_window = history_window
         self.health_status = {}  # tool_id -> health_status
+        self.history: Dict[str, ToolHealthHistory] = {}  # tool_id -> ToolHealthHistory
+        self.current_interval = self.min_interval
         self.running = False
         self.thread = None
-    
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._in_flight = set()  # Henüz bitmemiş yoklamaların tool_id'leri
+        self._executor: Optional[ThreadPoolExecutor] = None
+
     def start(self):
         """Sağlık izleme servisini başlat"""
         if self.running:
             return
-        
+
         self.running = True
+        self._wakeup.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="tool-health")
         self.thread = threading.Thread(target=self._monitor_loop)
         self.thread.daemon = True
         self.thread.start()
-        logger.info(f"Araç sağlık izleme servisi başlatıldı (kontrol aralığı: {self.check_interval}s)")
-    
+        logger.info(f"Araç sağlık izleme servisi başlatıldı (kontrol aralığı: {self.min_interval}-{self.check_interval}s, "
+                    f"eşzamanlılık: {self.max_concurrency})")
+
     def stop(self):
         """Sağlık izleme servisini durdur"""
         self.running = False
+        self._wakeup.set()
         if self.thread:
             self.thread.join(timeout=1.0)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         logger.info("Araç sağlık izleme servisi durduruldu")
-    
+
     def _monitor_loop(self):
         """Sağlık izleme döngüsü"""
         while self.running:
@@ -48,75 +135,203 @@ class ToolHealthMonitor:
                 self._check_all_tools()
             except Exception as e:
                 logger.error(f"Sağlık izleme hatası: {str(e)}")
-            
-            # Bir sonraki kontrole kadar bekle
-            time.sleep(self.check_interval)
-    
-    def _check_all_tools(self):
-        """Tüm araçların sağlık durumunu kontrol et"""
-        # Registry'deki ToolSourceType sınıfını kullanmak için import
+
+            self.current_interval = self._next_interval()
+
+            # Bir sonraki kontrole kadar bekle (pasif hata erken uyandırabilir)
+            self._wakeup.wait(self.current_interval)
+            self._wakeup.clear()
+
+    def _next_interval(self) -> float:
+        """Sağlıksız araç varsa kısa, yoksa kademeli uzayan aralık"""
+        with self._lock:
+            degraded = any(status.get("status") != "healthy" for status in self.health_status.values()
+                           if status.get("status") != "unknown")
+        if degraded:
+            return self.min_interval
+        return min(self.check_interval, max(self.min_interval, self.current_interval * 2))
+
+    def _probe_candidates(self) -> List[tuple]:
+        """Yoklanması gereken (tool_id, metadata) çiftlerini döndür"""
         try:
             from os_araci.mcp_core.registry import ToolSourceType
         except ImportError:
-            # Registry modülünü import edemezse
             logger.error("ToolSourceType import edilemedi")
-            return
-            
-        # Dış kaynak ve uzak araçları kontrol et
+            return []
+
+        now = time.time()
+        candidates = []
         for tool_id, metadata in self.registry.get_all_metadata().items():
-            if metadata.source_type in [ToolSourceType.EXTERNAL, ToolSourceType.REMOTE]:
-                tool = self.registry.get_tool_by_id(tool_id)
-                if not tool:
-                    continue
-                
-                try:
-                    # Sağlık kontrolü yap
-                    if hasattr(tool, 'check_health') and callable(tool.check_health):
-                        health_status = tool.check_health()
+            if metadata.source_type not in [ToolSourceType.EXTERNAL, ToolSourceType.REMOTE]:
+                continue
+            if tool_id in self._in_flight:
+                continue
+
+            # Son aralıkta gerçek bir çağrı başarıyla gözlendiyse yoklama gereksiz
+            history = self.history.get(tool_id)
+            if history and history.last_passive and now - history.last_passive < self.current_interval \
+                    and history.consecutive_failures() == 0:
+                continue
+
+            candidates.append((tool_id, metadata))
+        return candidates
+
+    def _check_all_tools(self):
+        """Tüm araçların sağlık durumunu eşzamanlı olarak kontrol et"""
+        candidates = self._probe_candidates()
+        if not candidates:
+            return
+
+        executor = self._executor
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="tool-health")
+
+        try:
+            futures = {}
+            for tool_id, metadata in candidates:
+                self._in_flight.add(tool_id)
+                future = executor.submit(self._probe_tool, tool_id, metadata)
+                future.add_done_callback(lambda _, tid=tool_id: self._in_flight.discard(tid))
+                futures[future] = tool_id
+
+            # Sıradaki bekleme süresi de yoklama bütçesine dahil
+            batches = (len(futures) + self.max_concurrency - 1) // self.max_concurrency
+            _, not_done = wait(futures, timeout=self.probe_timeout * batches)
+
+            for future in not_done:
+                tool_id = futures[future]
+                self._update_status(tool_id, {
+                    "status": "timeout",
+                    "message": f"Sağlık kontrolü {self.probe_timeout}s içinde tamamlanmadı",
+                    "timestamp": time.time()
+                }, success=False, latency_ms=None, source="probe")
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False)
+
+    def _probe_tool(self, tool_id: str, metadata) -> None:
+        """Tek bir aracı yokla ve sonucu kaydet"""
+        from os_araci.mcp_core.registry import ToolSourceType
+
+        tool = self.registry.get_tool_by_id(tool_id)
+        if not tool:
+            return
+
+        started = time.perf_counter()
+        try:
+            # Sağlık kontrolü yap
+            if hasattr(tool, 'check_health') and callable(tool.check_health):
+                health_status = tool.check_health()
+                if isinstance(health_status, bool):
+                    health_status = {"status": "healthy" if health_status else "unhealthy",
+                                     "timestamp": time.time()}
+            else:
+                # Özel sağlık kontrolü yoksa basit bir kontrol yap
+                if metadata.source_type == ToolSourceType.REMOTE:
+                    remote_proxy = getattr(self.registry, '_remote_proxy', None)
+                    if hasattr(tool, 'remote_url') and hasattr(remote_proxy, 'ping'):
+                        health_status = {
+                            "status": "healthy" if remote_proxy.ping(tool.remote_url, tool.auth_info) else "unhealthy",
+                            "timestamp": time.time()
+                        }
                     else:
-                        # Özel sağlık kontrolü yoksa basit bir kontrol yap
-                        if metadata.source_type == ToolSourceType.REMOTE:
-                            if hasattr(tool, 'remote_url') and hasattr(self.registry._remote_proxy, 'ping'):
-                                health_status = {
-                                    "status": "healthy" if self.registry._remote_proxy.ping(tool.remote_url, tool.auth_info) else "unhealthy",
-                                    "timestamp": time.time()
-                                }
-                            else:
-                                health_status = {"status": "unknown", "timestamp": time.time()}
-                        else:  # EXTERNAL
-                            health_status = {"status": "unknown", "timestamp": time.time()}
-                    
-                    # Sağlık durumunu güncelle
-                    self.health_status[tool_id] = health_status
-                    
-                    # Durumu logla
-                    status = health_status.get("status", "unknown")
-                    if status != "healthy":
-                        logger.warning(f"Araç sağlık durumu: {tool_id} - {status}")
-                    
-                except Exception as e:
-                    logger.error(f"Araç sağlık kontrolü başarısız: {tool_id}, {str(e)}")
-                    self.health_status[tool_id] = {
-                        "status": "error",
-                        "message": str(e),
-                        "timestamp": time.time()
-                    }
-    
+                        health_status = {"status": "unknown", "timestamp": time.time()}
+                else:  # EXTERNAL
+                    health_status = {"status": "unknown", "timestamp": time.time()}
+
+            latency_ms = (time.perf_counter() - started) * 1000
+            status = health_status.get("status", "unknown")
+            if status != "unknown":
+                health_status.setdefault("latency_ms", round(latency_ms, 2))
+            self._update_status(tool_id, health_status,
+                                success=None if status == "unknown" else status == "healthy",
+                                latency_ms=latency_ms, source="probe")
+
+            if status != "healthy":
+                logger.warning(f"Araç sağlık durumu: {tool_id} - {status}")
+
+        except Exception as e:
+            logger.error(f"Araç sağlık kontrolü başarısız: {tool_id}, {str(e)}")
+            self._update_status(tool_id, {
+                "status": "error",
+                "message": str(e),
+                "timestamp": time.time()
+            }, success=False, latency_ms=None, source="probe")
+
+    def _update_status(self, tool_id: str, health_status: Dict[str, Any], success: Optional[bool],
+                       latency_ms: Optional[float], source: str):
+        """Durum ve geçmişi tek noktadan güncelle"""
+        with self._lock:
+            if success is not None:
+                history = self.history.get(tool_id)
+                if history is None:
+                    history = self.history[tool_id] = ToolHealthHistory(self.history_window)
+                history.record(success, latency_ms, source)
+            self.health_status[tool_id] = health_status
+
+    def record_call(self, tool_id: str, success: bool, latency_ms: float = None):
+        """Gerçek bir çağrının sonucunu pasif sağlık gözlemi olarak kaydet
+
+        Args:
+            tool_id: Araç ID'si
+            success: Çağrı araca ulaşıp yanıt aldı mı (uygulama hataları başarılı sayılır)
+            latency_ms: Çağrı süresi (ms)
+        """
+        previous = self.health_status.get(tool_id, {}).get("status")
+        self._update_status(tool_id, {
+            "status": "healthy" if success else "unhealthy",
+            "source": "passive",
+            "latency_ms": round(latency_ms, 2) if latency_ms is not None else None,
+            "timestamp": time.time()
+        }, success=success, latency_ms=latency_ms, source="passive")
+
+        # Sağlıklı araç yeni bozulduysa bir sonraki taramayı öne çek
+        if not success and previous == "healthy" and self.running:
+            self.current_interval = self.min_interval
+            self._wakeup.set()
+
     def get_status(self, tool_id: str = None) -> Dict[str, Any]:
         """Araç(lar)ın sağlık durumunu getir"""
         if tool_id:
             return self.health_status.get(tool_id, {"status": "unknown"})
         return self.health_status
-    
+
+    def get_history(self, tool_id: str = None) -> Dict[str, Any]:
+        """Araç(lar)ın kayan pencereli gecikme/erişilebilirlik özetini getir"""
+        with self._lock:
+            if tool_id:
+                history = self.history.get(tool_id)
+                return history.to_dict() if history else {}
+            return {tid: history.to_dict() for tid, history in self.history.items()}
+
+    def rank_tools(self, tool_ids: List[str]) -> List[str]:
+        """Araçları yönlendirme için sağlık geçmişine göre sırala
+
+        Yüksek erişilebilirlik ve düşük p95 gecikme önce gelir; geçmişi olmayan
+        araçlar ölçülmüş sağlıklı araçlardan sonra, sağlıksızlardan önce yer alır.
+        """
+        def sort_key(tool_id: str):
+            with self._lock:
+                history = self.history.get(tool_id)
+                if history is None or not history.samples:
+                    return (1, -0.5, 0.0)
+                availability = history.availability()
+                p95 = history.latency_percentile(95)
+            group = 0 if availability >= 0.5 else 2
+            return (group, -availability, p95 if p95 is not None else float("inf"))
+
+        return sorted(tool_ids, key=sort_key)
+
     def is_healthy(self, tool_id: str) -> bool:
         """Aracın sağlıklı olup olmadığını kontrol et"""
         status = self.health_status.get(tool_id, {}).get("status", "unknown")
         return status == "healthy"
-    
+
     def get_unhealthy_tools(self) -> List[str]:
         """Sağlıksız araçların listesini getir"""
         unhealthy = []
         for tool_id, status in self.health_status.items():
             if status.get("status", "unknown") != "healthy":
                 unhealthy.append(tool_id)
-        return unhealthy
\ No newline at end of file
+        return unhealthy
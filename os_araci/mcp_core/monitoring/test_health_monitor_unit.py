@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from os_araci.mcp_core.registry import ToolSourceType
+from os_araci.mcp_core.monitoring.health_monitor import ToolHealthMonitor, ToolHealthHistory
+
+
+class FakeMetadata:
+    def __init__(self, source_type):
+        self.source_type = source_type
+
+
+class FakeTool:
+    """Remote-like tool whose health check takes `delay` seconds"""
+
+    def __init__(self, healthy=True, delay=0.0):
+        self.healthy = healthy
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def check_health(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.healthy
+
+
+class FakeRegistry:
+    def __init__(self, tools):
+        self.tools = tools
+        self._remote_proxy = None
+
+    def get_all_metadata(self):
+        return {tool_id: FakeMetadata(ToolSourceType.REMOTE) for tool_id in self.tools}
+
+    def get_tool_by_id(self, tool_id):
+        return self.tools.get(tool_id)
+
+
+class TestToolHealthMonitor(unittest.TestCase):
+    """Unit tests for concurrent, adaptive health probing"""
+
+    def test_probes_run_concurrently(self):
+        """A sweep over slow tools takes about one probe, not the sum"""
+        tools = {f"remote.t{i}.1.0": FakeTool(delay=0.3) for i in range(6)}
+        monitor = ToolHealthMonitor(FakeRegistry(tools), max_concurrency=6, probe_timeout=2)
+
+        started = time.perf_counter()
+        monitor._check_all_tools()
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertTrue(all(monitor.is_healthy(tool_id) for tool_id in tools))
+        self.assertIn("latency_ms", monitor.get_status("remote.t0.1.0"))
+
+    def test_hung_probe_reported_as_timeout(self):
+        tools = {"remote.slow.1.0": FakeTool(delay=1.0), "remote.fast.1.0": FakeTool()}
+        monitor = ToolHealthMonitor(FakeRegistry(tools), max_concurrency=2, probe_timeout=0.2)
+
+        monitor._check_all_tools()
+
+        self.assertEqual(monitor.get_status("remote.slow.1.0")["status"], "timeout")
+        self.assertTrue(monitor.is_healthy("remote.fast.1.0"))
+
+    def test_recent_passive_success_skips_probe(self):
+        tool = FakeTool()
+        monitor = ToolHealthMonitor(FakeRegistry({"remote.a.1.0": tool}))
+        monitor.current_interval = 60
+
+        monitor.record_call("remote.a.1.0", True, 12.0)
+        monitor._check_all_tools()
+
+        self.assertEqual(tool.calls, 0)
+        self.assertEqual(monitor.get_status("remote.a.1.0")["source"], "passive")
+
+    def test_passive_failure_does_not_skip_probe(self):
+        tool = FakeTool()
+        monitor = ToolHealthMonitor(FakeRegistry({"remote.a.1.0": tool}))
+        monitor.current_interval = 60
+
+        monitor.record_call("remote.a.1.0", False, None)
+        monitor._check_all_tools()
+
+        self.assertEqual(tool.calls, 1)
+        self.assertTrue(monitor.is_healthy("remote.a.1.0"))
+
+    def test_interval_adapts_to_health(self):
+        tools = {"remote.a.1.0": FakeTool()}
+        monitor = ToolHealthMonitor(FakeRegistry(tools), check_interval=120, min_interval=10)
+
+        monitor._check_all_tools()
+        intervals = []
+        for _ in range(5):
+            monitor.current_interval = monitor._next_interval()
+            intervals.append(monitor.current_interval)
+        self.assertEqual(intervals, [20, 40, 80, 120, 120])
+
+        tools["remote.a.1.0"].healthy = False
+        monitor._check_all_tools()
+        self.assertEqual(monitor._next_interval(), 10)
+
+    def test_rank_tools_prefers_available_and_fast(self):
+        monitor = ToolHealthMonitor(FakeRegistry({}))
+        for _ in range(5):
+            monitor.record_call("slow", True, 300.0)
+            monitor.record_call("fast", True, 20.0)
+            monitor.record_call("down", False, None)
+
+        self.assertEqual(monitor.rank_tools(["down", "unknown", "slow", "fast"]),
+                         ["fast", "slow", "unknown", "down"])
+
+
+class TestToolHealthHistory(unittest.TestCase):
+
+    def test_rolling_window(self):
+        history = ToolHealthHistory(window=4)
+        for success, latency in [(False, None), (True, 10), (True, 20), (True, 30), (False, None)]:
+            history.record(success, latency)
+
+        self.assertEqual(history.availability(), 0.75)
+        self.assertEqual(history.latency_percentile(50), 20)
+        self.assertEqual(history.consecutive_failures(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -138,6 +138,7 @@ class MCPRegistry:
             logger.info("Genişletilmiş MCPRegistry başlatılıyor...")
             # Araçları kaynak tipine göre ayırma
             self._local_tools = {}     # Yerel MCP araçları
+            self._lazy_tools = {}      # Henüz import edilmemiş yerel araçlar (name -> ToolManifestEntry)
             self._external_tools = {}  # Dış kaynak araçları
             self._remote_tools = {}    # Uzak MCP araçları
             
@@ -184,7 +185,7 @@ class MCPRegistry:
         try:
             # Adaptör sınıflarını lazy-loading ile yükle
             from os_araci.mcp_core.adapters.external_tool_adapter import ExternalToolAdapter
-            from os_araci.mcp_core.adapters.remote_tool_proxy import RemoteToolProxy
+            from os_araci.mcp_core.adapters.RemoteToolProxy import RemoteToolProxy
             
             self._external_adapter = ExternalToolAdapter()
             self._remote_proxy = RemoteToolProxy()
@@ -200,6 +201,11 @@ class MCPRegistry:
         if tool.name in self._local_tools:
             logger.warning(f"Araç zaten kayıtlı: {tool.name}")
             return False
+
+        # Tembel kayıt varsa yerini gerçek örnek alır
+        lazy_entry = self._lazy_tools.pop(tool.name, None)
+        if lazy_entry is not None:
+            self._tool_metadata.pop(f"local.{lazy_entry.name}.{lazy_entry.version}", None)
         
         # Araç için benzersiz ID oluştur
         tool_id = f"local.{tool.name}.{tool.version}"
@@ -229,6 +235,62 @@ class MCPRegistry:
         logger.info(f"Yerel araç kaydedildi: {tool.name} (v{tool.version})")
         return True
     
+    def register_lazy_tool(self, entry, save: bool = True) -> bool:
+        """Manifesto kaydından yerel aracı import etmeden kaydet
+
+        Araç sınıfı ilk get_tool çağrısında import edilip örneklenir.
+
+        Args:
+            entry: ToolManifestEntry (adı statik olarak çözülmüş olmalı)
+            save: Kayıttan sonra yapılandırmayı kaydet
+        """
+        if not entry.is_static:
+            logger.warning(f"Araç adı statik olarak çözülemedi: {entry.module}.{entry.class_name}")
+            return False
+        if entry.name in self._local_tools or entry.name in self._lazy_tools:
+            logger.warning(f"Araç zaten kayıtlı: {entry.name}")
+            return False
+
+        tool_id = f"local.{entry.name}.{entry.version}"
+        self._lazy_tools[entry.name] = entry
+        self._tool_metadata[tool_id] = ToolMetadata(
+            tool_id=tool_id,
+            name=entry.name,
+            version=entry.version,
+            source_type=ToolSourceType.LOCAL,
+            description=entry.description,
+            capabilities=list(entry.capabilities),
+            category=entry.category
+        )
+
+        if save:
+            self._save_configuration()
+
+        logger.debug(f"Yerel araç tembel olarak kaydedildi: {entry.name} ({entry.module})")
+        return True
+
+    def _materialize_lazy_tool(self, name: str) -> Optional[MCPTool]:
+        """Tembel kaydedilmiş aracı import et ve örnekle"""
+        entry = self._lazy_tools.get(name)
+        if entry is None:
+            return None
+        try:
+            tool = entry.load_class()()
+        except Exception as e:
+            logger.error(f"Araç başlatılamadı: {name} ({entry.module}.{entry.class_name}), {str(e)}")
+            return None
+
+        self._lazy_tools.pop(name, None)
+        self._local_tools[tool.name] = tool
+
+        # Statik metadata'yı çalışma zamanındaki değerlerle güncelle
+        metadata = self._tool_metadata.get(f"local.{entry.name}.{entry.version}")
+        if metadata is not None and hasattr(tool, 'get_capabilities') and callable(tool.get_capabilities):
+            metadata.capabilities = tool.get_capabilities()
+
+        logger.info(f"Yerel araç ilk kullanımda yüklendi: {tool.name}")
+        return tool
+
     def register_external_tool(self, 
                               name: str, 
                               config: Dict[str, Any],
@@ -368,7 +430,15 @@ class MCPRegistry:
         source_type = metadata.source_type
         
         # Kaynağına göre aracı bul
-        if source_type == ToolSourceType.LOCAL and name in self._local_tools:
+        if source_type == ToolSourceType.LOCAL and name in self._lazy_tools:
+            # Hiç yüklenmemiş aracın kapatılacak örneği yok
+            del self._lazy_tools[name]
+            del self._tool_metadata[tool_id]
+            self._save_configuration()
+            logger.info(f"Yerel araç kaydı kaldırıldı: {name}")
+            return True
+
+        elif source_type == ToolSourceType.LOCAL and name in self._local_tools:
             tool = self._local_tools[name]
             # Araç kapanış fonksiyonunu çağır
             if hasattr(tool, 'shutdown') and callable(tool.shutdown):
@@ -407,14 +477,14 @@ class MCPRegistry:
         """İsimle bir aracı getir, kaynak tipi belirtilirse sadece o kaynakta ara"""
         # Kaynak tipi belirtilmişse sadece o kaynakta ara
         if source_type == ToolSourceType.LOCAL:
-            return self._local_tools.get(tool_name)
+            return self._local_tools.get(tool_name) or self._materialize_lazy_tool(tool_name)
         elif source_type == ToolSourceType.EXTERNAL:
             return self._external_tools.get(tool_name)
         elif source_type == ToolSourceType.REMOTE:
             return self._remote_tools.get(tool_name)
         
         # Kaynak tipi belirtilmemişse tüm kaynaklarda ara
-        tool = self._local_tools.get(tool_name)
+        tool = self._local_tools.get(tool_name) or self._materialize_lazy_tool(tool_name)
         if tool:
             return tool
         
@@ -440,8 +510,30 @@ class MCPRegistry:
         """Tüm araçların metadata bilgilerini getir"""
         return self._tool_metadata.copy()
     
+    def get_tool_names(self, source_type: ToolSourceType = None) -> List[str]:
+        """Kayıtlı araçların adlarını getir
+
+        get_all_tools'un aksine tembel kayıtlı yerel araçları yüklemez; adlar manifestodan gelir.
+        """
+        names = []
+        if source_type in (None, ToolSourceType.LOCAL):
+            names.extend(self._local_tools)
+            names.extend(name for name in self._lazy_tools if name not in self._local_tools)
+        if source_type in (None, ToolSourceType.EXTERNAL):
+            names.extend(self._external_tools)
+        if source_type in (None, ToolSourceType.REMOTE):
+            names.extend(self._remote_tools)
+        return list(dict.fromkeys(names))
+
     def get_all_tools(self, source_type: ToolSourceType = None) -> Dict[str, Any]:
-        """Kayıtlı tüm araçları getir, kaynak tipi belirtilirse sadece o kaynaktakileri getir"""
+        """Kayıtlı tüm araçları getir, kaynak tipi belirtilirse sadece o kaynaktakileri getir
+
+        Tüm araç örnekleri istendiği için tembel kayıtlı yerel araçlar burada yüklenir.
+        """
+        if source_type in (None, ToolSourceType.LOCAL):
+            for name in list(self._lazy_tools):
+                self._materialize_lazy_tool(name)
+
         if source_type == ToolSourceType.LOCAL:
             return self._local_tools.copy()
         elif source_type == ToolSourceType.EXTERNAL:
@@ -524,7 +616,13 @@ class MCPRegistry:
                     logger.error("ExternalToolAdapter sınıfı yüklenemedi")
                     return {"status": "error", "message": "Dış kaynak adaptörü kullanılamıyor"}, 500
                     
-                result = self._external_adapter.call_action(tool, action_name, **kwargs)
+                started = time.perf_counter()
+                try:
+                    result = self._external_adapter.call_action(tool, action_name, **kwargs)
+                except Exception:
+                    self._record_call_health(tool_id, started, failed=True)
+                    raise
+                self._record_call_health(tool_id, started, result)
                     
             elif metadata.source_type == ToolSourceType.REMOTE:
                 # Uzak araç için proxy'yi kullan
@@ -532,7 +630,13 @@ class MCPRegistry:
                     logger.error("RemoteToolProxy sınıfı yüklenemedi")
                     return {"status": "error", "message": "Uzak araç proxy'si kullanılamıyor"}, 500
                     
-                result = self._remote_proxy.call_action(tool, action_name, **kwargs)
+                started = time.perf_counter()
+                try:
+                    result = self._remote_proxy.call_action(tool, action_name, **kwargs)
+                except Exception:
+                    self._record_call_health(tool_id, started, failed=True)
+                    raise
+                self._record_call_health(tool_id, started, result)
             
             # Yanıt formatını standardize et
             if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], int):
@@ -548,6 +652,33 @@ class MCPRegistry:
             logger.error(f"Aksiyon çağrılırken hata: {tool_id}.{action_name}, {str(e)}")
             return {"status": "error", "message": str(e)}, 500
 
+    def _record_call_health(self, tool_id: str, started: float, result: Any = None, failed: bool = False):
+        """Dış/uzak çağrı sonucunu sağlık izleyicisine pasif gözlem olarak bildir
+
+        Araca ulaşılamaması (istisna) veya 5xx yanıtı başarısızlık sayılır;
+        4xx gibi uygulama hataları aracın ayakta olduğunu gösterir.
+        """
+        if not getattr(self, 'health_monitor', None):
+            return
+        if failed:
+            success = False
+        elif isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], int):
+            success = result[1] < 500
+        else:
+            success = True
+        self.health_monitor.record_call(tool_id, success, (time.perf_counter() - started) * 1000)
+
+    def rank_tools_by_health(self, tool_ids: List[str]) -> List[str]:
+        """Araç ID'lerini sağlık geçmişine göre (erişilebilirlik, gecikme) sırala"""
+        if getattr(self, 'health_monitor', None):
+            return self.health_monitor.rank_tools(tool_ids)
+        return list(tool_ids)
+
+    def find_best_tool_by_capabilities(self, capabilities: List[str]) -> Optional[str]:
+        """İstenen yeteneklere sahip araçlar arasından en sağlıklısının ID'sini bul"""
+        ranked = self.rank_tools_by_health(self.find_tools_by_capabilities(capabilities))
+        return ranked[0] if ranked else None
+
     def get_tool_versions(self, name: str) -> List[Dict[str, Any]]:
         """Belirli bir aracın tüm versiyonlarını getir"""
         versions = []
@@ -624,8 +755,18 @@ class MCPRegistry:
             return self.health_monitor.is_healthy(tool_id)
         return False
     
-    def discover_tools(self, package_name: str = 'tools') -> List[str]:
-        """Belirtilen paketteki tüm MCP araçlarını keşfet ve kaydet"""
+    def discover_tools(self, package_name: str = 'tools', lazy: bool = True,
+                       manifest_path: str = None) -> List[str]:
+        """Belirtilen paketteki tüm MCP araçlarını keşfet ve kaydet
+
+        Args:
+            package_name: Taranacak paket
+            lazy: True ise araçlar statik manifestoyla kaydedilir ve ilk kullanımda import edilir
+            manifest_path: Manifesto önbellek dosyası (varsayılan: yapılandırma dosyasının yanında)
+        """
+        if lazy:
+            return self._discover_tools_lazy(package_name, manifest_path)
+
         discovered = []
         
         try:
@@ -653,6 +794,44 @@ class MCPRegistry:
         
         return discovered
     
+    def _discover_tools_lazy(self, package_name: str, manifest_path: str = None) -> List[str]:
+        """discover_tools'un modül import etmeyen sürümü"""
+        from os_araci.mcp_core.tool_manifest import ToolManifest
+
+        manifest = ToolManifest(manifest_path or os.path.join(
+            os.path.dirname(self._config_path), 'tool_manifest.json'))
+        discovered = []
+        eager_modules = set()
+
+        for entry in manifest.scan([package_name]).values():
+            if entry.is_static:
+                if self.register_lazy_tool(entry, save=False):
+                    discovered.append(entry.name)
+            else:
+                eager_modules.add(entry.module)
+
+        # Adı statik çözülemeyen araçlar için eski yol: import edip örnekle
+        for module_name in sorted(eager_modules):
+            try:
+                module = importlib.import_module(module_name)
+                for item_name, item in inspect.getmembers(module, inspect.isclass):
+                    if issubclass(item, MCPTool) and item is not MCPTool and item.__module__ == module_name:
+                        try:
+                            tool_instance = item()
+                            if self.register_local_tool(tool_instance):
+                                discovered.append(tool_instance.name)
+                        except Exception as e:
+                            logger.error(f"Araç başlatılamadı: {item_name}, {str(e)}")
+            except Exception as e:
+                logger.error(f"Modül yüklenemedi: {module_name}, {str(e)}")
+
+        if discovered:
+            self._save_configuration()
+
+        logger.info(f"{len(discovered)} yerel araç keşfedildi (ayrıştırılan: {manifest.stats['parsed']}, "
+                    f"önbellekten: {manifest.stats['reused']})")
+        return discovered
+
     def export_configuration(self, file_path: str) -> bool:
         """Registry yapılandırmasını dışa aktar"""
         try:
@@ -0,0 +1,176 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import textwrap
+import importlib
+import uuid
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from os_araci.mcp_core.tool_manifest import ToolManifest
+
+
+class TestToolManifest(unittest.TestCase):
+    """Unit tests for static, cached tool discovery"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.package = f"manifest_fixture_{uuid.uuid4().hex[:8]}"
+        self.package_dir = os.path.join(self.tmp, self.package)
+        os.makedirs(self.package_dir)
+        self._write("__init__.py", "")
+        self._write("alpha.py", """
+            import this_module_does_not_exist_anywhere
+            from os_araci.mcp_core.tool import MCPTool
+
+            class AlphaTool(MCPTool):
+                def __init__(self):
+                    super().__init__(name="alpha", description="Alpha tool", version="2.0.0", category="demo")
+                    self.register_capability("read_files")
+                    self.register_action("run", self.run)
+
+                def run(self, **kwargs):
+                    return "ok"
+
+            class NotATool:
+                pass
+        """)
+        self._write("beta.py", """
+            from os_araci.mcp_core.tool import MCPTool
+            from .alpha import AlphaTool
+
+            class BetaTool(AlphaTool):
+                tool_name = "beta_key"
+
+                def __init__(self):
+                    MCPTool.__init__(self, "beta", "Beta")
+
+            class GammaTool(MCPTool):
+                def __init__(self, name_suffix="x"):
+                    super().__init__("gamma_" + name_suffix, "Dynamic name")
+        """)
+        self._write("test_ignored.py", """
+            from os_araci.mcp_core.tool import MCPTool
+            class IgnoredTool(MCPTool):
+                pass
+        """)
+        sys.path.insert(0, self.tmp)
+        importlib.invalidate_caches()
+        self.cache_path = os.path.join(self.tmp, "tool_manifest.json")
+
+    def tearDown(self):
+        sys.path.remove(self.tmp)
+        for module_name in [m for m in sys.modules if m.startswith(self.package)]:
+            del sys.modules[module_name]
+        shutil.rmtree(self.tmp)
+
+    def _write(self, filename, source):
+        with open(os.path.join(self.package_dir, filename), "w", encoding="utf-8") as f:
+            f.write(textwrap.dedent(source))
+
+    def test_scan_extracts_static_metadata_without_importing(self):
+        """Tool modules are parsed, not imported (alpha imports a missing module)"""
+        entries = ToolManifest(self.cache_path).scan([self.package])
+
+        self.assertNotIn(f"{self.package}.alpha", sys.modules)
+        self.assertEqual(set(entries), {"AlphaTool", "beta_key", "GammaTool"})
+
+        alpha = entries["AlphaTool"]
+        self.assertEqual(alpha.module, f"{self.package}.alpha")
+        self.assertEqual(alpha.name, "alpha")
+        self.assertEqual(alpha.version, "2.0.0")
+        self.assertEqual(alpha.category, "demo")
+        self.assertEqual(alpha.capabilities, ["read_files"])
+        self.assertEqual(alpha.actions, ["run"])
+        self.assertTrue(alpha.is_static)
+
+    def test_indirect_subclass_and_dynamic_name(self):
+        """Subclasses of discovered tools are found; non-constant names are not static"""
+        entries = ToolManifest(self.cache_path).scan([self.package])
+
+        self.assertEqual(entries["beta_key"].class_name, "BetaTool")
+        self.assertFalse(entries["GammaTool"].is_static)
+
+    def test_cache_reused_until_file_changes(self):
+        """Unchanged files are served from cache; edited files are re-parsed"""
+        first = ToolManifest(self.cache_path)
+        first.scan([self.package])
+        self.assertEqual(first.stats["parsed"], 2)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        second = ToolManifest(self.cache_path)
+        second.scan([self.package])
+        self.assertEqual(second.stats, {"parsed": 0, "reused": 2})
+
+        # Touch without content change: hash matches, no re-parse
+        alpha_path = os.path.join(self.package_dir, "alpha.py")
+        stat = os.stat(alpha_path)
+        os.utime(alpha_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        third = ToolManifest(self.cache_path)
+        third.scan([self.package])
+        self.assertEqual(third.stats, {"parsed": 0, "reused": 2})
+
+        self._write("beta.py", """
+            from os_araci.mcp_core.tool import MCPTool
+
+            class DeltaTool(MCPTool):
+                def __init__(self):
+                    super().__init__(name="delta", description="Delta")
+        """)
+        fourth = ToolManifest(self.cache_path)
+        entries = fourth.scan([self.package])
+        self.assertEqual(fourth.stats, {"parsed": 1, "reused": 1})
+        self.assertIn("DeltaTool", entries)
+        self.assertNotIn("beta_key", entries)
+
+    def test_removed_module_dropped_from_cache(self):
+        ToolManifest(self.cache_path).scan([self.package])
+        os.remove(os.path.join(self.package_dir, "beta.py"))
+
+        entries = ToolManifest(self.cache_path).scan([self.package])
+        self.assertEqual(set(entries), {"AlphaTool"})
+
+    def test_load_class_imports_on_demand(self):
+        self._write("plain.py", """
+            from os_araci.mcp_core.tool import MCPTool
+
+            class PlainTool(MCPTool):
+                def __init__(self):
+                    super().__init__(name="plain", description="Plain")
+        """)
+        entry = ToolManifest().scan([self.package])["PlainTool"]
+        self.assertNotIn(f"{self.package}.plain", sys.modules)
+
+        tool = entry.load_class()()
+        self.assertEqual(tool.name, "plain")
+
+    def test_tool_names_listed_without_loading(self):
+        from os_araci.mcp_core.registry import MCPRegistry
+
+        registry = object.__new__(MCPRegistry)
+        registry._local_tools, registry._lazy_tools = {}, {}
+        registry._external_tools, registry._remote_tools = {}, {}
+        registry._tool_metadata = {}
+        for entry in ToolManifest().scan([self.package]).values():
+            if entry.is_static:
+                registry.register_lazy_tool(entry, save=False)
+
+        self.assertEqual(registry.get_tool_names(), ["alpha"])
+        self.assertNotIn(f"{self.package}.alpha", sys.modules)
+        self.assertEqual(registry._local_tools, {})
+
+    def test_discovery_manifest_next_to_registry_config(self):
+        from os_araci.mcp_core.registry import MCPRegistry
+        from os_araci.mcp_core.tool_discovery import ToolDiscovery
+
+        registry = object.__new__(MCPRegistry)
+        registry._config_path = os.path.join(self.tmp, "conf", "registry_config.json")
+        discovery = ToolDiscovery(registry, scan_packages=[self.package])
+        self.assertEqual(discovery.manifest.cache_path, os.path.join(self.tmp, "conf", "tool_manifest.json"))
+
+
+if __name__ == '__main__':
+    unittest.main()
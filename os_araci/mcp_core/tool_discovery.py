@@ -3,36 +3,60 @@ import importlib
 import pkgutil
 import inspect
 import logging
+import json
 import os
-from typing import List, Dict, Any, Type
+from typing import List, Dict, Any, Type, Union
 from os_araci.mcp_core.tool import MCPTool
 from os_araci.mcp_core.registry import MCPRegistry
+from os_araci.mcp_core.tool_manifest import ToolManifest, ToolManifestEntry
 
 logger = logging.getLogger(__name__)
 
 class ToolDiscovery:
     """MCP araçlarını keşfetme ve kaydedilmesi için sınıf"""
     
-    def __init__(self, registry: MCPRegistry, scan_packages: List[str] = None):
+    def __init__(self, registry: MCPRegistry, scan_packages: List[str] = None,
+                 lazy: bool = True, manifest_path: str = None):
         """
         ToolDiscovery başlatıcı
         
         Args:
             registry: MCP araçlarının kaydedileceği registry
             scan_packages: Taranacak paketlerin listesi
+            lazy: True ise modüller import edilmeden statik manifestoyla keşfedilir
+            manifest_path: Manifesto önbellek dosyası
         """
         self.registry = registry
         self.scan_packages = scan_packages or ["os_araci.tools"]
-        self.discovered_tools = {}  # tool_name -> tool_class
-        self.registered_tools = {}  # tool_name -> tool_instance
+        self.lazy = lazy
+        self.manifest = ToolManifest(manifest_path or self._default_manifest_path(registry))
+        self.discovered_tools = {}  # tool_name -> tool_class veya ToolManifestEntry
+        self.registered_tools = {}  # tool_name -> tool_instance veya ToolManifestEntry
     
-    def discover_tools(self) -> Dict[str, Type[MCPTool]]:
+    @staticmethod
+    def _default_manifest_path(registry: MCPRegistry) -> str:
+        """Manifestoyu registry yapılandırma dosyasının yanına koy (MCPRegistry.discover_tools ile aynı yer)"""
+        config_path = getattr(registry, '_config_path', None)
+        config_dir = os.path.dirname(os.path.abspath(config_path)) if config_path else \
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return os.path.join(config_dir, 'tool_manifest.json')
+
+    def discover_tools(self) -> Dict[str, Union[Type[MCPTool], ToolManifestEntry]]:
         """
         Belirtilen paketlerdeki tüm MCP araçlarını keşfet
         
+        Tembel modda modüller import edilmez; sonuç manifesto kayıtlarıdır.
+        
         Returns:
-            Dict[str, Type[MCPTool]]: Keşfedilen araç sınıflarının sözlüğü
+            Dict[str, Union[Type[MCPTool], ToolManifestEntry]]: Keşfedilen araçların sözlüğü
         """
+        if self.lazy:
+            discovered = self.manifest.scan(self.scan_packages)
+            self.discovered_tools = discovered
+            logger.info(f"{len(discovered)} MCP aracı manifestodan keşfedildi "
+                        f"(ayrıştırılan: {self.manifest.stats['parsed']}, önbellekten: {self.manifest.stats['reused']})")
+            return discovered
+
         discovered = {}
         
         for package_name in self.scan_packages:
@@ -89,6 +113,16 @@ class ToolDiscovery:
         
         for tool_name, tool_class in tool_classes.items():
             try:
+                if isinstance(tool_class, ToolManifestEntry):
+                    if tool_class.is_static:
+                        # İlk get_tool çağrısında import edilecek
+                        if self.registry.register_lazy_tool(tool_class, save=False):
+                            registered[tool_name] = tool_class
+                            logger.info(f"MCP aracı tembel olarak kaydedildi: {tool_name}")
+                        continue
+                    # Adı statik çözülemedi, sınıfı yükle
+                    tool_class = tool_class.load_class()
+
                 # Aracın bir örneğini oluştur
                 tool_instance = tool_class()
                 
@@ -99,6 +133,9 @@ class ToolDiscovery:
             except Exception as e:
                 logger.error(f"Araç başlatılamadı: {tool_name}, {str(e)}")
         
+        if any(isinstance(tool, ToolManifestEntry) for tool in registered.values()):
+            self.registry._save_configuration()
+
         self.registered_tools = registered
         logger.info(f"{len(registered)} MCP aracı registry'ye kaydedildi")
         return registered
@@ -147,6 +184,12 @@ class ToolDiscovery:
                     # Kayıtlı araçları kontrol et
                     for registered_name, tool in self.registered_tools.items():
                         if registered_name.lower() == tool_name.lower():
+                            if isinstance(tool, ToolManifestEntry):
+                                # Yapılandırma için aracı yükle
+                                tool = self.registry.get_tool(tool.name)
+                                if tool is None:
+                                    continue
+                                self.registered_tools[registered_name] = tool
                             # Aracın yapılandırmasını ayarla
                             if hasattr(tool, 'configure') and callable(tool.configure):
                                 tool.configure(config)
@@ -0,0 +1,349 @@
+# os_araci/mcp_core/tool_manifest.py
+"""Statik AST taramasıyla oluşturulan araç keşif manifestosu.
+
+Manifesto; modül yolu, sınıf adı, araç adı, sürüm, yetenekler ve aksiyonları
+modülleri import etmeden çıkarır. Sonuçlar dosya bazında (mtime/boyut,
+gerekirse SHA-256) doğrulanarak JSON önbelleğe yazılır. Araç sınıfları ancak
+ilk kullanımda import edilir.
+"""
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+BASE_TOOL_CLASS = "MCPTool"
+
+
+class ToolManifestEntry:
+    """Manifestodaki tek bir araç sınıfının statik bilgileri"""
+
+    def __init__(self,
+                 module: str,
+                 class_name: str,
+                 tool_name: str,
+                 name: Optional[str] = None,
+                 description: str = "",
+                 version: str = "1.0.0",
+                 category: str = "general",
+                 capabilities: List[str] = None,
+                 actions: List[str] = None,
+                 file_path: str = None):
+        self.module = module
+        self.class_name = class_name
+        self.tool_name = tool_name      # ToolDiscovery anahtarı (tool_name özniteliği veya sınıf adı)
+        self.name = name                # MCPTool.name (statik çözülemezse None)
+        self.description = description
+        self.version = version
+        self.category = category
+        self.capabilities = capabilities or []
+        self.actions = actions or []
+        self.file_path = file_path
+
+    @property
+    def is_static(self) -> bool:
+        """Registry adı import etmeden biliniyor mu?"""
+        return bool(self.name)
+
+    def load_class(self):
+        """Araç sınıfını import et (ilk kullanımda çağrılır)"""
+        module = importlib.import_module(self.module)
+        return getattr(module, self.class_name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "module": self.module,
+            "class_name": self.class_name,
+            "tool_name": self.tool_name,
+            "name": self.name,
+            "description": self.description,
+            "version": self.version,
+            "category": self.category,
+            "capabilities": self.capabilities,
+            "actions": self.actions,
+            "file_path": self.file_path
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ToolManifestEntry':
+        return cls(**data)
+
+    def __repr__(self):
+        return f"ToolManifestEntry({self.module}.{self.class_name} -> {self.name or self.tool_name})"
+
+
+class _ToolClassVisitor:
+    """Bir modülün AST'sinden araç sınıfı adaylarını çıkarır"""
+
+    def __init__(self, module_name: str, file_path: str, tree: ast.Module):
+        self.module_name = module_name
+        self.file_path = file_path
+        self.tree = tree
+
+    @staticmethod
+    def _base_names(node: ast.ClassDef) -> List[str]:
+        names = []
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                names.append(base.id)
+            elif isinstance(base, ast.Attribute):
+                names.append(base.attr)
+        return names
+
+    @staticmethod
+    def _const_str(node) -> Optional[str]:
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        return None
+
+    @classmethod
+    def _call_name(cls, call: ast.Call) -> Optional[str]:
+        func = call.func
+        if isinstance(func, ast.Attribute):
+            return func.attr
+        if isinstance(func, ast.Name):
+            return func.id
+        return None
+
+    @classmethod
+    def _first_arg(cls, call: ast.Call, keyword: str) -> Optional[str]:
+        if call.args:
+            return cls._const_str(call.args[0])
+        for kw in call.keywords:
+            if kw.arg == keyword:
+                return cls._const_str(kw.value)
+        return None
+
+    def classes(self) -> List[Dict[str, Any]]:
+        """Modül seviyesindeki sınıfları ve statik araç bilgilerini döndür"""
+        results = []
+        for node in self.tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+
+            info = {
+                "class_name": node.name,
+                "bases": self._base_names(node),
+                "tool_name": None,
+                "init": {},
+                "capabilities": [],
+                "actions": []
+            }
+
+            for item in node.body:
+                # tool_name = "..." sınıf özniteliği
+                if isinstance(item, ast.Assign):
+                    for target in item.targets:
+                        if isinstance(target, ast.Name) and target.id == "tool_name":
+                            info["tool_name"] = self._const_str(item.value)
+
+            for sub in ast.walk(node):
+                if not isinstance(sub, ast.Call):
+                    continue
+                call_name = self._call_name(sub)
+                if call_name == "__init__" and isinstance(sub.func, ast.Attribute) \
+                        and isinstance(sub.func.value, ast.Call) and self._call_name(sub.func.value) == "super":
+                    info["init"] = self._init_values(sub)
+                elif call_name == "register_capability":
+                    capability = self._first_arg(sub, "capability")
+                    if capability and capability not in info["capabilities"]:
+                        info["capabilities"].append(capability)
+                elif call_name == "register_action":
+                    action = self._first_arg(sub, "name")
+                    if action and action not in info["actions"]:
+                        info["actions"].append(action)
+
+            results.append(info)
+        return results
+
+    def _init_values(self, call: ast.Call) -> Dict[str, str]:
+        """super().__init__(...) çağrısındaki sabit değerleri oku"""
+        positional = ["name", "description", "version", "category"]
+        values = {}
+        for index, arg in enumerate(call.args[:len(positional)]):
+            value = self._const_str(arg)
+            if value is not None:
+                values[positional[index]] = value
+        for kw in call.keywords:
+            if kw.arg in positional:
+                value = self._const_str(kw.value)
+                if value is not None:
+                    values[kw.arg] = value
+        return values
+
+
+class ToolManifest:
+    """Paketlerdeki MCP araçlarının önbellekli, statik manifestosu"""
+
+    def __init__(self, cache_path: str = None):
+        """
+        Args:
+            cache_path: Manifesto önbellek dosyası (None ise önbellek diske yazılmaz)
+        """
+        self.cache_path = cache_path
+        self._files: Dict[str, Dict[str, Any]] = {}  # file_path -> {mtime_ns, size, sha256, module, classes}
+        self._dirty = False
+        self.stats = {"parsed": 0, "reused": 0}
+        self._load_cache()
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self._files = data.get("files", {})
+        except Exception as e:
+            logger.warning(f"Araç manifestosu okunamadı, yeniden oluşturulacak: {str(e)}")
+            self._files = {}
+
+    def save(self) -> bool:
+        """Manifestoyu atomik olarak diske yaz (değişiklik yoksa yazmaz)"""
+        if not self.cache_path or not self._dirty:
+            return False
+        try:
+            directory = os.path.dirname(os.path.abspath(self.cache_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tool_manifest_", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": MANIFEST_VERSION, "files": self._files}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+            return True
+        except Exception as e:
+            logger.error(f"Araç manifestosu kaydedilemedi: {str(e)}")
+            return False
+
+    @staticmethod
+    def _package_dirs(package_name: str) -> List[str]:
+        """Paketi import etmeden dizinlerini bul"""
+        spec = importlib.util.find_spec(package_name)
+        if spec is None or not spec.submodule_search_locations:
+            raise ImportError(f"Paket bulunamadı: {package_name}")
+        return list(spec.submodule_search_locations)
+
+    @staticmethod
+    def _sha256(file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _file_record(self, module_name: str, file_path: str) -> Dict[str, Any]:
+        """Dosyanın manifesto kaydını döndür; değiştiyse yeniden ayrıştır"""
+        stat = os.stat(file_path)
+        record = self._files.get(file_path)
+
+        if record and record.get("module") == module_name:
+            if record.get("mtime_ns") == stat.st_mtime_ns and record.get("size") == stat.st_size:
+                self.stats["reused"] += 1
+                return record
+            # mtime değişti ama içerik aynı olabilir (checkout, touch)
+            sha256 = self._sha256(file_path)
+            if record.get("sha256") == sha256:
+                record["mtime_ns"] = stat.st_mtime_ns
+                record["size"] = stat.st_size
+                self._dirty = True
+                self.stats["reused"] += 1
+                return record
+        else:
+            sha256 = self._sha256(file_path)
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        try:
+            classes = _ToolClassVisitor(module_name, file_path, ast.parse(source, filename=file_path)).classes()
+        except SyntaxError as e:
+            logger.error(f"Modül ayrıştırılamadı: {module_name}, {str(e)}")
+            classes = []
+
+        record = {
+            "module": module_name,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256,
+            "classes": classes
+        }
+        self._files[file_path] = record
+        self._dirty = True
+        self.stats["parsed"] += 1
+        return record
+
+    def scan_package(self, package_name: str) -> Dict[str, ToolManifestEntry]:
+        """Bir paketteki araç sınıflarını statik olarak bul
+
+        Returns:
+            Dict[str, ToolManifestEntry]: tool_name -> manifesto kaydı
+        """
+        records = []
+        for package_dir in self._package_dirs(package_name):
+            seen = set()
+            for filename in sorted(os.listdir(package_dir)):
+                if not filename.endswith(".py") or filename == "__init__.py" or filename.startswith("test_"):
+                    continue
+                file_path = os.path.join(package_dir, filename)
+                module_name = f"{package_name}.{filename[:-3]}"
+                seen.add(file_path)
+                try:
+                    records.append((file_path, self._file_record(module_name, file_path)))
+                except OSError as e:
+                    logger.error(f"Modül okunamadı: {module_name}, {str(e)}")
+
+            # Silinmiş modüllerin kayıtlarını temizle
+            for file_path in list(self._files):
+                if os.path.dirname(file_path) == package_dir and file_path not in seen:
+                    del self._files[file_path]
+                    self._dirty = True
+
+        # MCPTool'dan (dolaylı olarak da) türeyen sınıf adlarını bul
+        tool_class_names = {BASE_TOOL_CLASS}
+        changed = True
+        while changed:
+            changed = False
+            for _, record in records:
+                for info in record["classes"]:
+                    if info["class_name"] not in tool_class_names and \
+                            any(base in tool_class_names for base in info["bases"]):
+                        tool_class_names.add(info["class_name"])
+                        changed = True
+
+        entries = {}
+        for file_path, record in records:
+            for info in record["classes"]:
+                if info["class_name"] == BASE_TOOL_CLASS or info["class_name"] not in tool_class_names:
+                    continue
+                init = info.get("init", {})
+                tool_name = info.get("tool_name") or info["class_name"]
+                entries[tool_name] = ToolManifestEntry(
+                    module=record["module"],
+                    class_name=info["class_name"],
+                    tool_name=tool_name,
+                    name=init.get("name"),
+                    description=init.get("description", ""),
+                    version=init.get("version", "1.0.0"),
+                    category=init.get("category", "general"),
+                    capabilities=list(info.get("capabilities", [])),
+                    actions=list(info.get("actions", [])),
+                    file_path=file_path
+                )
+        return entries
+
+    def scan(self, package_names: List[str]) -> Dict[str, ToolManifestEntry]:
+        """Birden fazla paketi tara ve önbelleği kaydet"""
+        entries = {}
+        for package_name in package_names:
+            try:
+                entries.update(self.scan_package(package_name))
+            except ImportError as e:
+                logger.error(f"Paket yüklenemedi: {package_name}, {str(e)}")
+        self.save()
+        return entries
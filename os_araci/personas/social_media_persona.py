@@ -1,15 +1,212 @@
 # personas/social_media_persona.py - Tam kod
 import asyncio
+import copy
+import functools
+import hashlib
 import logging
+import re
 import time
 import json
 import os
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Union
 from os_araci.personas.persona_agent import PersonaAgent
 from os_araci.a2a_protocol.message import A2AMessage
+from os_araci.db.document_store import DocumentStore
 
 logger = logging.getLogger(__name__)
 
+# Hızlı yanıt ve platform tespiti tabloları (modül yüklenirken bir kez derlenir)
+PLATFORM_KEYWORDS = {
+    'instagram': ['instagram', 'insta', 'ig', 'story', 'reel', 'igtv'],
+    'linkedin': ['linkedin', 'profesyonel', 'professional', 'career', 'business'],
+    'twitter': ['twitter', 'tweet', 'x.com', 'trending', 'thread'],
+    'facebook': ['facebook', 'fb', 'community', 'group', 'event'],
+    'tiktok': ['tiktok', 'viral', 'trend', 'challenge', 'duet']
+}
+
+PLATFORM_QUICK_RESPONSES = {
+    'instagram': {
+        'greeting': "Merhaba! Instagram için görsel odaklı içerik oluşturmaya hazırım. 📸 Story, Reel, Feed Post - hangisi olsun?",
+        'content_type': {
+            'story': "Instagram Story için harika! Hangi konuda story paylaşmak istiyorsun? (Behind-the-scenes, günlük yaşam, duyuru...)",
+            'reel': "Instagram Reel için mükemmel seçim! 🎬 Trending audio ile mi, orijinal içerik mi düşünüyorsun?",
+            'post': "Instagram feed postu için hazırım! 📱 Hangi türde post? (Fotoğraf, carousel, video post)",
+            'carousel': "Carousel post süper fikir! 🗂️ Kaç slayt düşünüyorsun? Hangi konuda bilgi vereceğiz?"
+        }
+    },
+    'linkedin': {
+        'greeting': "Merhaba! LinkedIn için profesyonel içerik oluşturmaya hazırım. 💼 Hangi sektörde ve konuda yazalım?",
+        'content_type': {
+            'article': "LinkedIn makalesi harika fikir! 📝 Hangi profesyonel konuda expertise paylaşalım?",
+            'post': "LinkedIn postu için hazırım! 🚀 Thought leadership mi, industry insight mi, career advice mi?",
+            'professional': "Profesyonel içerik için mükemmel! 👔 Hedef kitlen kimler? (HR, Sales, Tech, Management...)"
+        }
+    },
+    'twitter': {
+        'greeting': "Merhaba! Twitter/X için real-time içerik oluşturmaya hazırım. ⚡ Hangi konuda tweet atalım?",
+        'content_type': {
+            'tweet': "Twitter postu için hazırım! 🐦 280 karakterde etkili mesaj mı, yoksa thread mi?",
+            'thread': "Thread harika fikir! 🧵 Hangi konuyu detaylandıralım? Kaç tweet düşünüyorsun?",
+            'trending': "Trending topic'e katılalım! 📈 Hangi güncel konuya perspektif katmak istiyorsun?"
+        }
+    },
+    'facebook': {
+        'greeting': "Merhaba! Facebook için community odaklı içerik oluşturmaya hazırım. 👥 Hangi konuda paylaşım yapalım?",
+        'content_type': {
+            'post': "Facebook postu için hazırım! 📢 Community engagement odaklı mı, yoksa bilgilendirici mi?",
+            'event': "Facebook event için süper! 🎉 Hangi türde etkinlik organize ediyorsun?",
+            'group': "Grup paylaşımı için mükemmel! 👫 Hangi community'de paylaşacağız?"
+        }
+    },
+    'tiktok': {
+        'greeting': "Merhaba! TikTok için viral içerik oluşturmaya hazırım. 🎵 Hangi trend'i takip edelim?",
+        'content_type': {
+            'video': "TikTok videosu için harika! 📹 Educational content mi, entertainment mi, trend participation mı?",
+            'trend': "Trend takibi süper fikir! 🔥 Hangi viral challenge'ı adapt edelim?",
+            'duet': "Duet içeriği için mükemmel! 🎭 Hangi creator'ın hangi videosuna response verelim?"
+        }
+    }
+}
+
+GREETING_KEYWORDS = ["merhaba", "selam", "hello", "hi", "hey", "merhabalar"]
+DEFAULT_GREETING_RESPONSE = "Merhaba! Sosyal medya içeriği oluşturmak için buradayım. 🎨 Hangi platform için başlayalım? (Instagram, LinkedIn, Twitter, Facebook, TikTok)"
+
+CONTENT_TYPE_QUICK_RESPONSES = {
+    'video': "Video içeriği için harika! 🎬 Hangi platform için hazırlayalım?",
+    'photo': "Fotoğraf içeriği süper! 📸 Hangi style düşünüyorsun?",
+    'carousel': "Carousel post mükemmel seçim! 🗂️ Hangi konuda bilgi aktaralım?",
+    'story': "Story içeriği için hazırım! ⏰ Hangi platformda paylaşacağız?",
+    'reel': "Reel içeriği harika! 🎵 Instagram için mi?",
+    'post': "Post hazırlığı için buradayım! 📝 Hangi platform için yazalım?"
+}
+
+TOPIC_QUICK_RESPONSES = [
+    (['hedef kitle', 'audience', 'target', 'kimler', 'yaş grubu', 'demographic'],
+     "Hedef kitle belirleme süper! 🎯 Hangi yaş grubu ve demografiye odaklanıyoruz? (Örn: 18-25 genç yetişkinler, 25-35 profesyoneller...)"),
+    (['engagement', 'etkileşim', 'like', 'comment', 'share', 'viral'],
+     "Engagement artırma stratejileri için buradayım! 🚀 Hangi platform için engagement taktikleri geliştirelim?"),
+    (['hashtag', 'tag', 'etiket', '#'],
+     "Hashtag stratejisi için mükemmel! #️⃣ Hangi platform için ve hangi konuda hashtag önerileri hazırlayalım?"),
+    (['trend', 'trending', 'viral', 'popüler', 'gündem'],
+     "Trend takibi için buradayım! 📈 Hangi platformdaki trendleri takip etmek istiyorsun?")
+]
+
+
+def _compile_keywords(keywords: List[str]) -> "re.Pattern":
+    """Anahtar kelime listesini tek bir alt dizgi arama desenine derle"""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+class QuickResponseMatcher:
+    """Operatörün tekrar eden mesajlarını LLM'e gitmeden yanıtlayan derlenmiş desen kümesi
+
+    Eşleşme kuralları `_check_quick_response`'un eski sırasıyla birebir aynıdır
+    (küçük harfe çevrilmiş mesajda alt dizgi araması); her kural grubu tek bir
+    regex olarak derlenir ve sonuçlar normalize mesaja göre önbelleklenir.
+    """
+
+    def __init__(self, cache_size: int = 512):
+        self.platform_patterns = [(platform, _compile_keywords(keywords))
+                                  for platform, keywords in PLATFORM_KEYWORDS.items()]
+        self.greeting_pattern = _compile_keywords(GREETING_KEYWORDS)
+        self.content_type_patterns = [(_compile_keywords([keyword]), response)
+                                      for keyword, response in CONTENT_TYPE_QUICK_RESPONSES.items()]
+        self.topic_patterns = [(_compile_keywords(keywords), response)
+                               for keywords, response in TOPIC_QUICK_RESPONSES]
+        self.match = functools.lru_cache(maxsize=cache_size)(self._match)
+
+    def detect_platform(self, message_lower: str) -> Optional[str]:
+        for platform, pattern in self.platform_patterns:
+            if pattern.search(message_lower):
+                return platform
+        return None
+
+    def _match(self, message_lower: str) -> Optional[str]:
+        detected_platform = self.detect_platform(message_lower)
+
+        # Greeting kontrolü - platform-aware
+        if self.greeting_pattern.search(message_lower):
+            if detected_platform:
+                return PLATFORM_QUICK_RESPONSES[detected_platform]['greeting']
+            return DEFAULT_GREETING_RESPONSE
+
+        # Platform selection response
+        if detected_platform:
+            return PLATFORM_QUICK_RESPONSES[detected_platform]['greeting']
+
+        # General content type responses
+        for pattern, response in self.content_type_patterns:
+            if pattern.search(message_lower):
+                return response
+
+        # Hedef kitle, engagement, hashtag ve trend konuları
+        for pattern, response in self.topic_patterns:
+            if pattern.search(message_lower):
+                return response
+
+        return None
+
+
+QUICK_RESPONSE_MATCHER = QuickResponseMatcher()
+
+_NORMALIZE_PATTERN = re.compile(r"[^\w\s#@]+")
+
+
+class ResponseCache:
+    """LLM analiz sonuçları için TTL'li, boyutu sınırlı önbellek
+
+    Anahtar; normalize edilmiş mesaj, platform, taslak aşaması, kullanıcı ve
+    taslağın post_data özetidir. Analiz sonucu taslağa yazıldığı için ("evet",
+    "tamam" gibi kısa yanıtlar) başka bir kullanıcının veya taslağın sonucu
+    asla yeniden kullanılmaz.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Küçük harf, noktalama temizliği ve boşluk sadeleştirmesi"""
+        return " ".join(_NORMALIZE_PATTERN.sub(" ", message.lower()).split())
+
+    def key(self, message: str, platform: str, stage: str,
+            user_id: str = "default", post_data: Optional[Dict[str, Any]] = None) -> tuple:
+        draft_digest = hashlib.sha256(
+            json.dumps(post_data or {}, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+        return (self.normalize(message), platform, stage, user_id, draft_digest)
+
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] >= self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: tuple, response: Dict[str, Any]):
+        self._entries[key] = (time.time(), copy.deepcopy(response))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: tuple) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+
+
 class SocialMediaPersona(PersonaAgent):
     """Sosyal medya içerik oluşturma ve yönetme için özelleştirilmiş persona"""
     
@@ -53,9 +250,13 @@ class SocialMediaPersona(PersonaAgent):
         self.post_history = []
         self.scheduled_posts = []
         self.content_drafts = {}
+        self._store: Optional[DocumentStore] = None  # _initialize'da açılır
         
         # UX İyileştirmeleri için cache
-        self.response_cache = {}
+        self.response_cache = ResponseCache(
+            ttl=self.settings.get("response_cache_ttl", 300),
+            max_entries=self.settings.get("response_cache_size", 256)
+        )
         self.last_analysis_time = 0
         
         # Hızlı yanıt şablonları
@@ -174,30 +375,24 @@ class SocialMediaPersona(PersonaAgent):
             return False
 
     async def _load_cache_data(self):
-        """Cache verilerini yükle"""
+        """Kalıcı durum deposunu aç (kayıtlar ilk erişimde okunur)"""
         try:
             working_dir = self.settings.get("working_dir", "./social_media")
+            self._store = await asyncio.to_thread(
+                DocumentStore, os.path.join(working_dir, "social_media_state.db")
+            )
+            
+            # Eski JSON dosyalarını bir kereliğine depoya aktar
+            for collection, filename in [("post_history", "post_history.json"),
+                                         ("scheduled_posts", "scheduled_posts.json"),
+                                         ("content_drafts", "content_drafts.json")]:
+                await asyncio.to_thread(
+                    self._store.import_json_file, collection, os.path.join(working_dir, filename)
+                )
             
-            # Post geçmişini yükle
-            history_file = os.path.join(working_dir, "post_history.json")
-            if os.path.exists(history_file):
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    self.post_history = json.load(f)
-                logger.info(f"{len(self.post_history)} adet post geçmişi yüklendi")
-            
-            # Planlanmış içerikleri yükle
-            scheduled_file = os.path.join(working_dir, "scheduled_posts.json")
-            if os.path.exists(scheduled_file):
-                with open(scheduled_file, 'r', encoding='utf-8') as f:
-                    self.scheduled_posts = json.load(f)
-                logger.info(f"{len(self.scheduled_posts)} adet planlanmış post yüklendi")
-            
-            # Taslakları yükle
-            drafts_file = os.path.join(working_dir, "content_drafts.json")
-            if os.path.exists(drafts_file):
-                with open(drafts_file, 'r', encoding='utf-8') as f:
-                    self.content_drafts = json.load(f)
-                logger.info(f"{len(self.content_drafts)} adet içerik taslağı yüklendi")
+            self.post_history = self._store.list("post_history", max_items=100)
+            self.scheduled_posts = self._store.list("scheduled_posts")
+            self.content_drafts = self._store.map("content_drafts")
                 
         except Exception as e:
             logger.warning(f"Cache verileri yüklenirken hata: {str(e)}")
@@ -206,34 +401,30 @@ class SocialMediaPersona(PersonaAgent):
         """Persona kapanırken çağrılır"""
         try:
             await self._save_data_async()
+            if self._store:
+                await asyncio.to_thread(self._store.close)
             logger.info(f"Sosyal medya personası verileri kaydedildi: {self.persona_id}")
             return True
         except Exception as e:
             logger.error(f"Sosyal medya personası verileri kaydedilirken hata: {str(e)}")
             return False
 
-    async def _save_data_async(self):
-        """Verileri asenkron kaydet"""
+    def _persist_state(self):
+        """Yerinde değiştirilen kayıtları write-behind kuyruğuna gönder (disk I/O yapmaz)"""
+        if not self._store:
+            return
         try:
-            working_dir = self.settings.get("working_dir", "./social_media")
-            
-            # Post geçmişini kaydet
-            history_file = os.path.join(working_dir, "post_history.json")
-            with open(history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.post_history, f, ensure_ascii=False, indent=2)
-            
-            # Planlanmış içerikleri kaydet
-            scheduled_file = os.path.join(working_dir, "scheduled_posts.json")
-            with open(scheduled_file, 'w', encoding='utf-8') as f:
-                json.dump(self.scheduled_posts, f, ensure_ascii=False, indent=2)
-            
-            # Taslakları kaydet
-            drafts_file = os.path.join(working_dir, "content_drafts.json")
-            with open(drafts_file, 'w', encoding='utf-8') as f:
-                json.dump(self.content_drafts, f, ensure_ascii=False, indent=2)
-                
+            self.content_drafts.sync()
+            self.scheduled_posts.sync()
+            self.post_history.sync()
         except Exception as e:
             logger.error(f"Veri kaydetme hatası: {str(e)}")
+
+    async def _save_data_async(self):
+        """Bekleyen değişiklikleri event loop dışında diske aktar"""
+        self._persist_state()
+        if self._store:
+            await asyncio.to_thread(self._store.flush)
         
     def format_conversation_history(self, conversation_history, limit=3):
         """Konuşma geçmişini formatlayarak string olarak döndürür"""
@@ -272,29 +463,30 @@ class SocialMediaPersona(PersonaAgent):
             # Mesaj geçmişini güncelle
             self._update_conversation_history(draft, user_message)
             
-            # LLM analizini yap (cache kontrolü ile)
-            current_time = time.time()
-            cache_key = f"{current_post_id}_{hash(user_message)}"
+            # LLM analizini yap (mesaj + platform + aşama + kullanıcı + taslak anahtarlı cache ile)
+            if stored_context.get('platform') and stored_context.get('post_type'):
+                cache_platform = stored_context['platform']
+            else:
+                cache_platform = self._detect_platform_from_context(draft, user_message)
+            workflow_stage = draft.get('workflow_stage', 'initial')
+            cache_key = self.response_cache.key(
+                user_message, cache_platform, workflow_stage, user_id, draft.get('post_data', {})
+            )
             
-            if (cache_key in self.response_cache and 
-                current_time - self.response_cache[cache_key]['timestamp'] < 300):  # 5 dakika cache
-                
-                # Cache'den yanıt al
-                analysis_result = self.response_cache[cache_key]['response']
+            analysis_result = self.response_cache.get(cache_key)
+            if analysis_result is not None:
                 logger.info("Cache'den yanıt alındı")
-                
             else:
                 # Yeni LLM analizi
                 analysis_result = await self._analyze_with_llm(draft, user_message)
                 
-                # Cache'e kaydet
-                self.response_cache[cache_key] = {
-                    'response': analysis_result,
-                    'timestamp': current_time
-                }
+                # Hata/fallback yanıtları ve taslağı tamamlayan review analizleri cache'lenmez
+                if not analysis_result.get('fallback') and workflow_stage != 'review':
+                    self.response_cache.put(cache_key, analysis_result)
             
             # Context güncellemelerini uygula
             context_updates = await self._apply_analysis_results(draft, analysis_result)
+            self._persist_state()
             
             # Context'i memory'ye kaydet/güncelle
             if context_updates:
@@ -309,123 +501,8 @@ class SocialMediaPersona(PersonaAgent):
             await self._send_error_reply(message, str(e))
 
     async def _check_quick_response(self, user_message: str) -> Optional[str]:
-        """Platform-aware hızlı yanıt kontrolü"""
-        message_lower = user_message.lower()
-        
-        # Platform detection for quick responses
-        detected_platform = None
-        platform_keywords = {
-            'instagram': ['instagram', 'insta', 'ig', 'story', 'reel', 'igtv'],
-            'linkedin': ['linkedin', 'profesyonel', 'professional', 'career', 'business'],
-            'twitter': ['twitter', 'tweet', 'x.com', 'trending', 'thread'],
-            'facebook': ['facebook', 'fb', 'community', 'group', 'event'],
-            'tiktok': ['tiktok', 'viral', 'trend', 'challenge', 'duet']
-        }
-        
-        for platform, keywords in platform_keywords.items():
-            if any(keyword in message_lower for keyword in keywords):
-                detected_platform = platform
-                break
-        
-        # Platform-specific quick responses
-        platform_responses = {
-            'instagram': {
-                'greeting': "Merhaba! Instagram için görsel odaklı içerik oluşturmaya hazırım. 📸 Story, Reel, Feed Post - hangisi olsun?",
-                'content_type': {
-                    'story': "Instagram Story için harika! Hangi konuda story paylaşmak istiyorsun? (Behind-the-scenes, günlük yaşam, duyuru...)",
-                    'reel': "Instagram Reel için mükemmel seçim! 🎬 Trending audio ile mi, orijinal içerik mi düşünüyorsun?",
-                    'post': "Instagram feed postu için hazırım! 📱 Hangi türde post? (Fotoğraf, carousel, video post)",
-                    'carousel': "Carousel post süper fikir! 🗂️ Kaç slayt düşünüyorsun? Hangi konuda bilgi vereceğiz?"
-                }
-            },
-            'linkedin': {
-                'greeting': "Merhaba! LinkedIn için profesyonel içerik oluşturmaya hazırım. 💼 Hangi sektörde ve konuda yazalım?",
-                'content_type': {
-                    'article': "LinkedIn makalesi harika fikir! 📝 Hangi profesyonel konuda expertise paylaşalım?",
-                    'post': "LinkedIn postu için hazırım! 🚀 Thought leadership mi, industry insight mi, career advice mi?",
-                    'professional': "Profesyonel içerik için mükemmel! 👔 Hedef kitlen kimler? (HR, Sales, Tech, Management...)"
-                }
-            },
-            'twitter': {
-                'greeting': "Merhaba! Twitter/X için real-time içerik oluşturmaya hazırım. ⚡ Hangi konuda tweet atalım?",
-                'content_type': {
-                    'tweet': "Twitter postu için hazırım! 🐦 280 karakterde etkili mesaj mı, yoksa thread mi?",
-                    'thread': "Thread harika fikir! 🧵 Hangi konuyu detaylandıralım? Kaç tweet düşünüyorsun?",
-                    'trending': "Trending topic'e katılalım! 📈 Hangi güncel konuya perspektif katmak istiyorsun?"
-                }
-            },
-            'facebook': {
-                'greeting': "Merhaba! Facebook için community odaklı içerik oluşturmaya hazırım. 👥 Hangi konuda paylaşım yapalım?",
-                'content_type': {
-                    'post': "Facebook postu için hazırım! 📢 Community engagement odaklı mı, yoksa bilgilendirici mi?",
-                    'event': "Facebook event için süper! 🎉 Hangi türde etkinlik organize ediyorsun?",
-                    'group': "Grup paylaşımı için mükemmel! 👫 Hangi community'de paylaşacağız?"
-                }
-            },
-            'tiktok': {
-                'greeting': "Merhaba! TikTok için viral içerik oluşturmaya hazırım. 🎵 Hangi trend'i takip edelim?",
-                'content_type': {
-                    'video': "TikTok videosu için harika! 📹 Educational content mi, entertainment mi, trend participation mı?",
-                    'trend': "Trend takibi süper fikir! 🔥 Hangi viral challenge'ı adapt edelim?",
-                    'duet': "Duet içeriği için mükemmel! 🎭 Hangi creator'ın hangi videosuna response verelim?"
-                }
-            }
-        }
-        
-        # Greeting kontrolü - platform-aware
-        greetings = ["merhaba", "selam", "hello", "hi", "hey", "merhabalar"]
-        if any(greeting in message_lower for greeting in greetings):
-            if detected_platform:
-                return platform_responses[detected_platform]['greeting']
-            else:
-                return "Merhaba! Sosyal medya içeriği oluşturmak için buradayım. 🎨 Hangi platform için başlayalım? (Instagram, LinkedIn, Twitter, Facebook, TikTok)"
-        
-        # Platform selection response
-        if detected_platform:
-            return platform_responses[detected_platform]['greeting']
-        
-        # Content type detection within platform context
-        if detected_platform:
-            platform_content_types = platform_responses[detected_platform]['content_type']
-            for content_type, response in platform_content_types.items():
-                if content_type in message_lower:
-                    return response
-        
-        # General content type responses
-        content_type_keywords = {
-            'video': "Video içeriği için harika! 🎬 Hangi platform için hazırlayalım?",
-            'photo': "Fotoğraf içeriği süper! 📸 Hangi style düşünüyorsun?",
-            'carousel': "Carousel post mükemmel seçim! 🗂️ Hangi konuda bilgi aktaralım?",
-            'story': "Story içeriği için hazırım! ⏰ Hangi platformda paylaşacağız?",
-            'reel': "Reel içeriği harika! 🎵 Instagram için mi?",
-            'post': "Post hazırlığı için buradayım! 📝 Hangi platform için yazalım?"
-        }
-        
-        for keyword, response in content_type_keywords.items():
-            if keyword in message_lower:
-                return response
-        
-        # Audience targeting detection
-        audience_keywords = ['hedef kitle', 'audience', 'target', 'kimler', 'yaş grubu', 'demographic']
-        if any(keyword in message_lower for keyword in audience_keywords):
-            return "Hedef kitle belirleme süper! 🎯 Hangi yaş grubu ve demografiye odaklanıyoruz? (Örn: 18-25 genç yetişkinler, 25-35 profesyoneller...)"
-        
-        # Engagement tactics
-        engagement_keywords = ['engagement', 'etkileşim', 'like', 'comment', 'share', 'viral']
-        if any(keyword in message_lower for keyword in engagement_keywords):
-            return "Engagement artırma stratejileri için buradayım! 🚀 Hangi platform için engagement taktikleri geliştirelim?"
-        
-        # Hashtag related
-        hashtag_keywords = ['hashtag', 'tag', 'etiket', '#']
-        if any(keyword in message_lower for keyword in hashtag_keywords):
-            return "Hashtag stratejisi için mükemmel! #️⃣ Hangi platform için ve hangi konuda hashtag önerileri hazırlayalım?"
-        
-        # Trend related
-        trend_keywords = ['trend', 'trending', 'viral', 'popüler', 'gündem']
-        if any(keyword in message_lower for keyword in trend_keywords):
-            return "Trend takibi için buradayım! 📈 Hangi platformdaki trendleri takip etmek istiyorsun?"
-        
-        return None
+        """Platform-aware hızlı yanıt kontrolü (derlenmiş desen kümesiyle)"""
+        return QUICK_RESPONSE_MATCHER.match(user_message.lower())
 
     async def _get_or_create_draft(self, user_message: str = "", stored_context: Dict[str, Any] = None) -> str:
         """Aktif taslağı al veya yeni oluştur - memory context ile entegre"""
@@ -499,7 +576,22 @@ class SocialMediaPersona(PersonaAgent):
         if len(draft['conversation_history']) > 10:
             draft['conversation_history'] = draft['conversation_history'][-10:]
 
+    _platform_prompts: Optional[Dict[str, Dict]] = None
+
     def _get_platform_specific_prompts(self) -> Dict[str, Dict]:
+        """Platform-specific prompt templates (sınıf düzeyinde bir kez oluşturulur, salt okunur)"""
+        if SocialMediaPersona._platform_prompts is None:
+            prompts = self._build_platform_specific_prompts()
+            for config in prompts.values():
+                # Her analizde yeniden serileştirilmesin
+                config["characteristics_json"] = json.dumps(
+                    config.get("characteristics", {}), indent=2, ensure_ascii=False
+                )
+            SocialMediaPersona._platform_prompts = prompts
+        return SocialMediaPersona._platform_prompts
+
+    @staticmethod
+    def _build_platform_specific_prompts() -> Dict[str, Dict]:
         """Platform-specific prompt templates ve optimizasyon kuralları"""
         return {
             "instagram": {
@@ -813,7 +905,7 @@ class SocialMediaPersona(PersonaAgent):
                 GÖREV: Toplanan bilgileri platform özelliklerine göre optimize edip tamamla.
                 
                 Platform: {detected_platform.title()}
-                Platform Özellikleri: {json.dumps(platform_config.get('characteristics', {}), indent=2, ensure_ascii=False)}
+                Platform Özellikleri: {platform_config.get('characteristics_json', '{}')}
                 
                 Toplanan Bilgiler: {json.dumps(post_data, indent=2, ensure_ascii=False)}
                 Kullanıcı Mesajı: "{user_message}"
@@ -860,7 +952,7 @@ class SocialMediaPersona(PersonaAgent):
                 GÖREV: Kullanıcı mesajını platform özelliklerine göre analiz et.
                 
                 Platform: {detected_platform.title()}
-                Platform Limits: {json.dumps(platform_config.get('characteristics', {}), indent=2, ensure_ascii=False)}
+                Platform Limits: {platform_config.get('characteristics_json', '{}')}
                 
                 Mevcut Bilgiler: {json.dumps(post_data, ensure_ascii=False)}
                 Kullanıcı Mesajı: "{user_message}"
@@ -956,18 +1048,9 @@ class SocialMediaPersona(PersonaAgent):
                 return platforms.lower()
         
         # Mesajdan platform tespit et
-        message_lower = user_message.lower()
-        platform_keywords = {
-            'instagram': ['instagram', 'insta', 'ig', 'story', 'reel', 'igtv'],
-            'linkedin': ['linkedin', 'profesyonel', 'professional', 'career', 'business'],
-            'twitter': ['twitter', 'tweet', 'x.com', 'trending', 'thread'],
-            'facebook': ['facebook', 'fb', 'community', 'group', 'event'],
-            'tiktok': ['tiktok', 'viral', 'trend', 'challenge', 'duet']
-        }
-        
-        for platform, keywords in platform_keywords.items():
-            if any(keyword in message_lower for keyword in keywords):
-                return platform
+        platform = QUICK_RESPONSE_MATCHER.detect_platform(user_message.lower())
+        if platform:
+            return platform
         
         # Default platform
         return 'instagram'
@@ -1039,7 +1122,8 @@ class SocialMediaPersona(PersonaAgent):
                 "content_type": "Henüz belirlenmedi",
                 "format_tips": [f"{platform.title()} için optimize edilecek"],
                 "optimization_tips": ["Platform-specific öneriler gelecek"]
-            }
+            },
+            "fallback": True
         }
 
     async def _generate_error_response(self, stage: str) -> Dict:
@@ -1050,7 +1134,8 @@ class SocialMediaPersona(PersonaAgent):
             "next_question": "Hangi platform için içerik hazırlamak istiyorsunuz?",
             "progress": {"stage": stage, "percentage": 0},
             "context_updates": {},
-            "error": "LLM analysis failed"
+            "error": "LLM analysis failed",
+            "fallback": True
         }
 
     async def _apply_analysis_results(self, draft: Dict, analysis: Dict) -> Dict:
@@ -1371,6 +1456,7 @@ class SocialMediaPersona(PersonaAgent):
             if len(self.post_history) >= 100:
                 self.post_history.pop(0)  # En eski kaydı sil
             self.post_history.append(task_history_entry)
+            self._persist_state()
             
             # Yanıt mesajı
             reply = original_message.create_reply(
@@ -1407,6 +1493,7 @@ class SocialMediaPersona(PersonaAgent):
             if len(self.post_history) >= 100:
                 self.post_history.pop(0)  # En eski kaydı sil
             self.post_history.append(task_history_entry)
+            self._persist_state()
             
             # Yanıt mesajı
             reply = original_message.create_reply(
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from os_araci.personas.social_media_persona import (
+    QuickResponseMatcher, ResponseCache, SocialMediaPersona,
+    PLATFORM_KEYWORDS, PLATFORM_QUICK_RESPONSES, GREETING_KEYWORDS, DEFAULT_GREETING_RESPONSE,
+    CONTENT_TYPE_QUICK_RESPONSES, TOPIC_QUICK_RESPONSES
+)
+
+
+def reference_quick_response(user_message):
+    """The original keyword-scanning rules, used as the oracle for the compiled matcher"""
+    message_lower = user_message.lower()
+    detected_platform = None
+    for platform, keywords in PLATFORM_KEYWORDS.items():
+        if any(keyword in message_lower for keyword in keywords):
+            detected_platform = platform
+            break
+    if any(greeting in message_lower for greeting in GREETING_KEYWORDS):
+        if detected_platform:
+            return PLATFORM_QUICK_RESPONSES[detected_platform]['greeting']
+        return DEFAULT_GREETING_RESPONSE
+    if detected_platform:
+        return PLATFORM_QUICK_RESPONSES[detected_platform]['greeting']
+    for keyword, response in CONTENT_TYPE_QUICK_RESPONSES.items():
+        if keyword in message_lower:
+            return response
+    for keywords, response in TOPIC_QUICK_RESPONSES:
+        if any(keyword in message_lower for keyword in keywords):
+            return response
+    return None
+
+
+class TestQuickResponseMatcher(unittest.TestCase):
+    """The compiled pattern set must answer exactly like the keyword scan"""
+
+    MESSAGES = [
+        "Merhaba", "selam, LinkedIn için yazalım", "Hello there", "tiktok", "x.com hesabım",
+        "bir video çekelim", "Photo paylaşımı", "carousel olsun", "Hedef kitle kimler?",
+        "etkileşim nasıl artar", "#etiket önerisi", "gündemde ne var", "raporu gönder",
+        "Bir post hazırla", "Business stratejisi", "", "hashtag ve trend", "EVENT duyurusu",
+        "kampanya planı", "REEL mi STORY mi"
+    ]
+
+    def test_matches_reference_rules(self):
+        matcher = QuickResponseMatcher()
+        for message in self.MESSAGES:
+            with self.subTest(message=message):
+                self.assertEqual(matcher.match(message.lower()), reference_quick_response(message))
+
+    def test_detect_platform_keeps_priority_order(self):
+        matcher = QuickResponseMatcher()
+        # "trend" belongs to tiktok, "trending" to twitter, which is checked first
+        self.assertEqual(matcher.detect_platform("trending konular"), "twitter")
+        self.assertEqual(matcher.detect_platform("trend konular"), "tiktok")
+        self.assertIsNone(matcher.detect_platform("rapor"))
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_key_normalizes_message(self):
+        cache = ResponseCache()
+        self.assertEqual(cache.key("  Merhaba,  Instagram!! ", "instagram", "initial"),
+                         cache.key("merhaba instagram", "instagram", "initial"))
+        self.assertNotEqual(cache.key("merhaba", "instagram", "initial"),
+                            cache.key("merhaba", "instagram", "review"))
+
+    def test_key_separates_users_and_drafts(self):
+        cache = ResponseCache()
+        draft = {"platform": "instagram", "caption": "Yeni ürün"}
+        key = cache.key("evet", "instagram", "content", "alice", draft)
+        self.assertEqual(key, cache.key("Evet!", "instagram", "content", "alice", dict(draft)))
+        self.assertNotEqual(key, cache.key("evet", "instagram", "content", "bob", draft))
+        self.assertNotEqual(key, cache.key("evet", "instagram", "content", "alice",
+                                           {**draft, "caption": "Kampanya"}))
+
+    def test_ttl_expiry_and_copy_on_read(self):
+        cache = ResponseCache(ttl=300)
+        key = cache.key("post", "instagram", "initial")
+        with patch("os_araci.personas.social_media_persona.time.time", return_value=1000):
+            cache.put(key, {"response": "ok", "detected_fields": {}})
+        with patch("os_araci.personas.social_media_persona.time.time", return_value=1200):
+            cached = cache.get(key)
+            cached["detected_fields"]["platform"] = "mutated"
+            self.assertEqual(cache.get(key), {"response": "ok", "detected_fields": {}})
+        with patch("os_araci.personas.social_media_persona.time.time", return_value=1300):
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_bound(self):
+        cache = ResponseCache(max_entries=2)
+        for message in ["a", "b", "c"]:
+            cache.put(cache.key(message, "instagram", "initial"), {"m": message})
+        self.assertIsNone(cache.get(cache.key("a", "instagram", "initial")))
+        self.assertEqual(len(cache), 2)
+
+
+class TestPlatformPrompts(unittest.TestCase):
+
+    def test_prompts_built_once(self):
+        SocialMediaPersona._platform_prompts = None
+        with patch.object(SocialMediaPersona, "_build_platform_specific_prompts",
+                          wraps=SocialMediaPersona._build_platform_specific_prompts) as build:
+            persona = SocialMediaPersona.__new__(SocialMediaPersona)
+            first = persona._get_platform_specific_prompts()
+            second = persona._get_platform_specific_prompts()
+        self.assertIs(first, second)
+        self.assertEqual(build.call_count, 1)
+        self.assertIn('"max_caption_length": 2200', first["instagram"]["characteristics_json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
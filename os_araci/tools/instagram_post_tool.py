@@ -8,6 +8,7 @@ from typing import Dict, List, Any, Optional, Union
 from datetime import datetime, timedelta
 
 from os_araci.mcp_core.tool import MCPTool
+from os_araci.db.document_store import DocumentStore
 
 logger = logging.getLogger(__name__)
 
@@ -51,17 +52,18 @@ class InstagramPoster(MCPTool):
             if not self.instagram_user_id:
                 logger.warning("Instagram User ID bulunamadı. Instagram API kullanılamayacak.")
         
-        # Post, taslak ve zamanlanan içerikler
-        self.posts = {}  # Onaylanmış ve yayınlanmış postlar
-        self.drafts = {}  # Taslak postlar
-        self.scheduled_posts = {}  # Zaman planlamalı postlar
-        
         # Klasörü oluştur
         if not os.path.exists(self.posts_storage_path):
             os.makedirs(self.posts_storage_path, exist_ok=True)
             logger.info(f"Instagram post depolama klasörü oluşturuldu: {self.posts_storage_path}")
+        
+        # Post, taslak ve zamanlanan içerikler (kayıt bazında, write-behind depo)
+        self._store = DocumentStore(os.path.join(self.posts_storage_path, "instagram_posts.db"))
+        self.posts = self._store.map("posts")  # Onaylanmış ve yayınlanmış postlar
+        self.drafts = self._store.map("drafts")  # Taslak postlar
+        self.scheduled_posts = self._store.map("scheduled")  # Zaman planlamalı postlar
             
-        # Önceki verileri yükle (gerçek uygulamada)
+        # Eski JSON dosyalarını depoya aktar
         self._load_data()
     
     def get_all_actions(self) -> Dict[str, Dict[str, Any]]:
@@ -681,48 +683,26 @@ class InstagramPoster(MCPTool):
     
     def _save_data(self) -> None:
         """
-        Tüm post verilerini diske kaydeder.
-        Gerçek uygulamada veritabanına kaydedilecektir.
+        Değişen post kayıtlarını write-behind kuyruğuna gönderir.
+        Diske yazma arka plan iş parçacığında, kayıt bazında yapılır.
         """
         try:
-            # Taslakları kaydet
-            with open(os.path.join(self.posts_storage_path, "drafts.json"), "w", encoding="utf-8") as f:
-                json.dump(self.drafts, f, ensure_ascii=False, indent=2)
-            
-            # Planlanmışları kaydet
-            with open(os.path.join(self.posts_storage_path, "scheduled.json"), "w", encoding="utf-8") as f:
-                json.dump(self.scheduled_posts, f, ensure_ascii=False, indent=2)
-            
-            # Yayınlanmışları kaydet
-            with open(os.path.join(self.posts_storage_path, "posts.json"), "w", encoding="utf-8") as f:
-                json.dump(self.posts, f, ensure_ascii=False, indent=2)
-                
+            self.drafts.sync()
+            self.scheduled_posts.sync()
+            self.posts.sync()
         except Exception as e:
             logger.error(f"Veri kaydetme hatası: {str(e)}")
     
     def _load_data(self) -> None:
         """
-        Tüm post verilerini diskten yükler.
-        Gerçek uygulamada veritabanından yüklenecektir.
+        Eski JSON dosyalarını (varsa) bir kereliğine depoya aktarır.
+        Kayıtlar ilk erişimde okunur.
         """
         try:
-            # Taslakları yükle
-            drafts_path = os.path.join(self.posts_storage_path, "drafts.json")
-            if os.path.exists(drafts_path):
-                with open(drafts_path, "r", encoding="utf-8") as f:
-                    self.drafts = json.load(f)
-            
-            # Planlanmışları yükle
-            scheduled_path = os.path.join(self.posts_storage_path, "scheduled.json")
-            if os.path.exists(scheduled_path):
-                with open(scheduled_path, "r", encoding="utf-8") as f:
-                    self.scheduled_posts = json.load(f)
-            
-            # Yayınlanmışları yükle
-            posts_path = os.path.join(self.posts_storage_path, "posts.json")
-            if os.path.exists(posts_path):
-                with open(posts_path, "r", encoding="utf-8") as f:
-                    self.posts = json.load(f)
+            for collection, filename in [("drafts", "drafts.json"),
+                                         ("scheduled", "scheduled.json"),
+                                         ("posts", "posts.json")]:
+                self._store.import_json_file(collection, os.path.join(self.posts_storage_path, filename))
                     
             logger.info(f"Instagram post verileri yüklendi: {len(self.drafts)} taslak, {len(self.scheduled_posts)} planlanmış, {len(self.posts)} yayınlanmış")
             